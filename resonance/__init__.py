@@ -21,10 +21,25 @@ You should have received a copy of the GNU General Public License along
 with this program; if not, see <https://www.gnu.org/licenses/>.
 """
 
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from resonance.server import ResonanceServer
+
 __version__ = "0.1.0"
 __author__ = "Stephan"
 __license__ = "GPL-2.0"
 
-from resonance.server import ResonanceServer
-
 __all__ = ["ResonanceServer", "__version__"]
+
+
+def __getattr__(name: str) -> type[ResonanceServer]:
+    # Loaded on first access so `import resonance` (and `python -m resonance`
+    # before argument parsing) does not pull in the whole server.
+    if name == "ResonanceServer":
+        from resonance.server import ResonanceServer
+
+        return ResonanceServer
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
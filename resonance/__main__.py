@@ -10,7 +10,13 @@ import logging
 import sys
 from pathlib import Path
 
-from resonance.server import ResonanceServer
+from resonance.core.db.maintenance import (
+    DEFAULT_CACHE_SIZE_KIB,
+    DEFAULT_MMAP_SIZE,
+    MaintenanceConfig,
+)
+from resonance.core.db.tracing import DEFAULT_SLOW_MS, sql_tracer
+from resonance.player.frame_trace import frame_tracer
 
 
 def setup_logging(verbose: bool = False) -> None:
@@ -63,6 +69,58 @@ def parse_args() -> argparse.Namespace:
         help="Web/Streaming port (default: 9000)",
     )
 
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Watch music folders and update the library as files change",
+    )
+
+    parser.add_argument(
+        "--trace-frames",
+        action="store_true",
+        help="Record recent Slimproto frames per player (see /api/debug/frames)",
+    )
+
+    parser.add_argument(
+        "--trace-sql",
+        nargs="?",
+        type=float,
+        const=DEFAULT_SLOW_MS,
+        default=None,
+        metavar="SLOW_MS",
+        help=(
+            "Trace library SQL and log statements slower than SLOW_MS "
+            f"(default {DEFAULT_SLOW_MS:g}; see /api/admin/sql)"
+        ),
+    )
+
+    parser.add_argument(
+        "--db-cache-mb",
+        type=int,
+        default=DEFAULT_CACHE_SIZE_KIB // 1024,
+        help="Library DB page cache in MiB (default: %(default)s)",
+    )
+
+    parser.add_argument(
+        "--db-mmap-mb",
+        type=int,
+        default=DEFAULT_MMAP_SIZE // (1024 * 1024),
+        help="Library DB memory-mapped I/O in MiB, 0 to disable (default: %(default)s)",
+    )
+
+    parser.add_argument(
+        "--db-incremental-vacuum",
+        action="store_true",
+        help="Give free library DB pages back to the filesystem while idle",
+    )
+
+    parser.add_argument(
+        "--admin-token",
+        type=str,
+        default=None,
+        help="Bearer token for the /api/admin/* diagnostics (profiler, loop stalls, SQL trace)",
+    )
+
     parser.add_argument(
         "--version",
         action="version",
@@ -72,9 +130,26 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
-async def run_server(host: str, port: int, web_port: int) -> None:
+async def run_server(
+    host: str,
+    port: int,
+    web_port: int,
+    watch: bool = False,
+    admin_token: str | None = None,
+    db_maintenance: MaintenanceConfig | None = None,
+) -> None:
     """Start and run the Resonance server."""
-    server = ResonanceServer(host=host, port=port, web_port=web_port)
+    # Imported after argument parsing and logging setup (`--help` stays instant).
+    from resonance.server import ResonanceServer
+
+    server = ResonanceServer(
+        host=host,
+        port=port,
+        web_port=web_port,
+        watch_library=watch,
+        admin_token=admin_token,
+        db_maintenance=db_maintenance,
+    )
     await server.run()
 
 
@@ -86,8 +161,26 @@ def main() -> int:
     logger = logging.getLogger(__name__)
     logger.info("Starting Resonance Music Server...")
 
+    if args.trace_frames:
+        frame_tracer.enable()
+    if args.trace_sql is not None:
+        sql_tracer.enable(slow_ms=args.trace_sql)
+
     try:
-        asyncio.run(run_server(host=args.host, port=args.port, web_port=args.web_port))
+        asyncio.run(
+            run_server(
+                host=args.host,
+                port=args.port,
+                web_port=args.web_port,
+                watch=args.watch,
+                admin_token=args.admin_token,
+                db_maintenance=MaintenanceConfig(
+                    cache_size_kib=args.db_cache_mb * 1024,
+                    mmap_size=args.db_mmap_mb * 1024 * 1024,
+                    incremental_vacuum=args.db_incremental_vacuum,
+                ),
+            )
+        )
     except KeyboardInterrupt:
         logger.info("Shutdown requested by user")
     except Exception as e:
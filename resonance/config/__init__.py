@@ -41,6 +41,7 @@ class DeviceCapabilities:
     devices: list[str] = field(default_factory=list)
     native_formats: list[str] = field(default_factory=list)
     transcode_required: list[str] = field(default_factory=list)
+    remux_formats: list[str] = field(default_factory=list)
     streaming_protocols: list[str] = field(default_factory=list)
 
 
@@ -152,6 +153,20 @@ class DeviceConfig:
         # Otherwise, transcode if not natively supported
         return not self.can_decode_natively(device_type, format)
 
+    def can_remux(self, device_type: DeviceType | str, format: str) -> bool:
+        """
+        Check if a device accepts this container's AAC remuxed to ADTS.
+
+        Args:
+            device_type: DeviceType enum or string name.
+            format: Audio format extension (e.g., "m4b").
+
+        Returns:
+            True if the server may stream the file without decoding.
+        """
+        caps = self.get_capabilities(device_type)
+        return format.lower().lstrip(".") in [f.lower() for f in caps.remux_formats]
+
     def is_legacy(self, device_type: "DeviceType | str") -> bool:
         """Check if a device is legacy hardware."""
         return self.get_tier(device_type) == DeviceTier.LEGACY
@@ -169,6 +184,7 @@ def _parse_capabilities(data: dict[str, object], tier: DeviceTier) -> DeviceCapa
         devices=list(data.get("devices", [])),  # type: ignore[arg-type]
         native_formats=list(data.get("native_formats", [])),  # type: ignore[arg-type]
         transcode_required=list(data.get("transcode_required", [])),  # type: ignore[arg-type]
+        remux_formats=list(data.get("remux_formats", [])),  # type: ignore[arg-type]
         streaming_protocols=list(data.get("streaming_protocols", [])),  # type: ignore[arg-type]
     )
 
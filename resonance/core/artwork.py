@@ -1,17 +1,25 @@
 import asyncio
 import hashlib
+import importlib.util
 import io
 import logging
 from pathlib import Path
 from typing import Any, Optional
 
-from mutagen import File as mutagen_file
-from mutagen.flac import FLAC
-from mutagen.id3 import ID3
-from mutagen.mp4 import MP4, MP4Cover
+from resonance.core.metrics import metrics
 
 logger = logging.getLogger(__name__)
 
+CACHE_LOOKUPS = metrics.counter(
+    "resonance_artwork_cache_lookups_total",
+    "Artwork/BlurHash disk cache lookups (hit ratio = hit / all).",
+    ("cache", "result"),
+)
+_ARTWORK_HIT = ("artwork", "hit")
+_ARTWORK_MISS = ("artwork", "miss")
+_BLURHASH_HIT = ("blurhash", "hit")
+_BLURHASH_MISS = ("blurhash", "miss")
+
 # Limit concurrent cache writes to prevent task explosion under load
 _MAX_CONCURRENT_WRITES = 4
 
@@ -50,19 +58,15 @@ class ArtworkManager:
         self._blurhash_available = self._check_blurhash_available()
 
     def _check_blurhash_available(self) -> bool:
-        """Check if blurhash and PIL are available."""
-        try:
-            import blurhash  # noqa: F401
-            from PIL import Image  # noqa: F401
-
+        """Check if blurhash and PIL are available (without importing them yet)."""
+        if importlib.util.find_spec("blurhash") and importlib.util.find_spec("PIL"):
             return True
-        except ImportError:
-            logger.warning(
-                "blurhash-python or Pillow not installed. "
-                "BlurHash placeholders will not be available. "
-                "Install with: pip install blurhash-python pillow"
-            )
-            return False
+        logger.warning(
+            "blurhash-python or Pillow not installed. "
+            "BlurHash placeholders will not be available. "
+            "Install with: pip install blurhash-python pillow"
+        )
+        return False
 
     def _compute_cache_key(self, path: Path, mtime_ns: int, size: int) -> str:
         """
@@ -149,9 +153,11 @@ class ArtworkManager:
             try:
                 data = await asyncio.to_thread(cache_file.read_bytes)
                 mime = await asyncio.to_thread(mime_file.read_text)
+                CACHE_LOOKUPS.inc(labels=_ARTWORK_HIT)
                 return data, mime.strip(), etag
             except Exception as e:
                 logger.warning("Failed to read artwork cache for %s: %s", path, e)
+        CACHE_LOOKUPS.inc(labels=_ARTWORK_MISS)
 
         # Extract from file
         result = await asyncio.to_thread(self._extract_from_file, path)
@@ -234,9 +240,11 @@ class ArtworkManager:
         if blurhash_file.exists():
             try:
                 blurhash_str = await asyncio.to_thread(blurhash_file.read_text)
+                CACHE_LOOKUPS.inc(labels=_BLURHASH_HIT)
                 return blurhash_str.strip()
             except Exception as e:
                 logger.debug("Failed to read BlurHash cache for %s: %s", path, e)
+        CACHE_LOOKUPS.inc(labels=_BLURHASH_MISS)
 
         # Need to get artwork first to generate BlurHash
         artwork_result = await self.get_artwork(track_path)
@@ -295,6 +303,12 @@ class ArtworkManager:
 
     def _extract_from_file(self, path: Path) -> Optional[tuple[bytes, str]]:
         """Synchronous extraction using mutagen."""
+        # Imported here (worker thread) to keep mutagen out of server startup.
+        from mutagen import File as mutagen_file
+        from mutagen.flac import FLAC
+        from mutagen.id3 import ID3
+        from mutagen.mp4 import MP4, MP4Cover
+
         try:
             audio = mutagen_file(path)
             if audio is None:
@@ -12,7 +12,7 @@ External code should continue to import `LibraryDb` from `resonance.core.library
 from __future__ import annotations
 
 # Models / DTOs
-from .models import AlbumRow, ArtistRow, TrackRow, UpsertTrack
+from .models import AlbumRow, ArtistRow, PlaylistStateRow, TrackRow, UpsertTrack
 
 # Schema / migrations
 from .schema import ensure_schema, migrate
@@ -21,6 +21,7 @@ __all__ = [
     # models
     "ArtistRow",
     "AlbumRow",
+    "PlaylistStateRow",
     "TrackRow",
     "UpsertTrack",
     # schema
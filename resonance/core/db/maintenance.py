@@ -0,0 +1,315 @@
+"""
+SQLite maintenance for the library DB: tuning pragmas, ANALYZE/optimize,
+WAL checkpoints and (optional) incremental vacuum.
+
+Without it the planner works from statistics gathered before the first big
+scan (or none at all), and the WAL only shrinks when SQLite's automatic
+checkpoint happens to find a quiet moment, which a long scan never offers.
+
+Design:
+- `MaintenanceConfig` is handed to `LibraryDb`; `open()` applies the page
+  cache and mmap sizes and, if asked for, switches to incremental
+  auto-vacuum.
+- The statements are plain helpers taking a connection (like the
+  `queries_*` modules) behind `LibraryDb` methods (`analyze`, `optimize`,
+  `checkpoint`, `incremental_vacuum`, `vacuum`), each timed into
+  ``resonance_db_maintenance_seconds{task}``.
+- After each scan `MusicLibrary` refreshes the statistics
+  (`LibraryDb.after_scan`): a full ANALYZE only when the track count moved by
+  more than `ANALYZE_CHANGE_RATIO` since the last one, otherwise the much
+  cheaper `PRAGMA optimize`. Both run under `LibraryDb.write_lock`.
+- `DbMaintenance` is the periodic part, owned by the server. It wakes every
+  `tick_seconds` and uses the connection's change counter to tell whether
+  the DB has been written to. Once it has been idle for
+  `checkpoint_idle_seconds` it truncates the WAL and, with incremental
+  vacuum on, returns free pages to the filesystem. `PRAGMA optimize` runs
+  every `optimize_interval` and on shutdown.
+
+Notes:
+- Every pass (and the final one in `stop()`) holds `LibraryDb.write_lock`, so
+  maintenance never interleaves with a scan batch or a playlist flush that
+  is suspended between statements; it still skips a pass if a transaction
+  is open on the connection.
+- Switching an existing DB to incremental auto-vacuum needs a one-time full
+  VACUUM; it is done on the first idle tick, not during startup.
+- WAL and DB file sizes are read at scrape time (``resonance_db_wal_bytes``,
+  ``resonance_db_file_bytes``).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import sqlite3
+import time
+from contextlib import contextmanager, suppress
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from resonance.core.metrics import Gauge, Metric, metrics
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    import aiosqlite
+
+    from resonance.core.library_db import LibraryDb
+
+logger = logging.getLogger(__name__)
+
+# Page cache per connection (SQLite's default is 2 MiB).
+DEFAULT_CACHE_SIZE_KIB = 64 * 1024
+
+# Memory-mapped I/O window; reads of mapped pages skip a copy into the cache.
+DEFAULT_MMAP_SIZE = 256 * 1024 * 1024
+
+# Re-ANALYZE after a scan once the track count moved by this fraction.
+ANALYZE_CHANGE_RATIO = 0.25
+
+MAINTENANCE_SECONDS = metrics.histogram(
+    "resonance_db_maintenance_seconds",
+    "Duration of SQLite maintenance tasks.",
+    ("task",),
+)
+CHECKPOINT_PAGES = metrics.counter(
+    "resonance_db_checkpoint_pages_total",
+    "WAL pages written back to the database by maintenance checkpoints.",
+)
+VACUUM_PAGES = metrics.counter(
+    "resonance_db_vacuum_pages_total",
+    "Free pages returned to the filesystem by incremental vacuum.",
+)
+FREELIST_PAGES = metrics.gauge(
+    "resonance_db_freelist_pages",
+    "Unused pages in the library DB at the last maintenance tick.",
+)
+
+
+@dataclass(frozen=True, slots=True)
+class MaintenanceConfig:
+    """Tuning and scheduling for library DB maintenance."""
+
+    # Page cache per connection (PRAGMA cache_size = -KiB).
+    cache_size_kib: int = DEFAULT_CACHE_SIZE_KIB
+    # Memory-mapped I/O window in bytes (0 disables mmap).
+    mmap_size: int = DEFAULT_MMAP_SIZE
+    # Refresh planner statistics after every library scan.
+    analyze_after_scan: bool = True
+    # Seconds between `PRAGMA optimize` runs (0 disables the periodic run).
+    optimize_interval: float = 3600.0
+    # Checkpoint (TRUNCATE) the WAL once no writes happened for this long.
+    checkpoint_idle_seconds: float = 30.0
+    # Use auto_vacuum=INCREMENTAL and release free pages while idle.
+    incremental_vacuum: bool = False
+    # Only vacuum once at least this many pages are free.
+    vacuum_min_free_pages: int = 2048
+    # How often the scheduler wakes up.
+    tick_seconds: float = 10.0
+
+
+@contextmanager
+def _timed(task: str) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        MAINTENANCE_SECONDS.observe(elapsed, (task,))
+        logger.debug("DB %s took %.1f ms", task, elapsed * 1000)
+
+
+async def apply_pragmas(conn: aiosqlite.Connection, config: MaintenanceConfig) -> bool:
+    """
+    Apply cache/mmap sizes and the auto-vacuum mode.
+
+    Returns True if an existing DB must be VACUUMed once for incremental
+    auto-vacuum to take effect.
+    """
+    await conn.execute(f"PRAGMA cache_size = -{int(config.cache_size_kib)};")
+    await conn.execute(f"PRAGMA mmap_size = {int(config.mmap_size)};")
+    if not config.incremental_vacuum:
+        return False
+    if await _pragma_int(conn, "auto_vacuum") == 2:  # INCREMENTAL
+        return False
+    # Takes effect at once only on a DB without pages yet; check it did.
+    await conn.execute("PRAGMA auto_vacuum = INCREMENTAL;")
+    return await _pragma_int(conn, "auto_vacuum") != 2
+
+
+async def _pragma_int(conn: aiosqlite.Connection, name: str) -> int:
+    cursor = await conn.execute(f"PRAGMA {name};")
+    row = await cursor.fetchone()
+    return int(row[0]) if row is not None else 0
+
+
+async def analyze(conn: aiosqlite.Connection) -> None:
+    with _timed("analyze"):
+        await conn.execute("ANALYZE;")
+
+
+async def optimize(conn: aiosqlite.Connection) -> None:
+    with _timed("optimize"):
+        await conn.execute("PRAGMA optimize;")
+
+
+async def analyzed_rows(conn: aiosqlite.Connection, table: str) -> int | None:
+    """Rows `table` had when ANALYZE last ran, or None without statistics."""
+    try:
+        cursor = await conn.execute(
+            "SELECT stat FROM sqlite_stat1 WHERE tbl = ? LIMIT 1;", (table,)
+        )
+    except sqlite3.OperationalError:  # no sqlite_stat1 before the first ANALYZE
+        return None
+    row = await cursor.fetchone()
+    return int(str(row[0]).split()[0]) if row is not None else None
+
+
+async def refresh_statistics(conn: aiosqlite.Connection) -> None:
+    """ANALYZE if the track count moved significantly, else PRAGMA optimize."""
+    cursor = await conn.execute("SELECT COUNT(*) FROM tracks;")
+    row = await cursor.fetchone()
+    tracks = int(row[0]) if row is not None else 0
+    analyzed = await analyzed_rows(conn, "tracks")
+    if analyzed is None:
+        stale = tracks > 0
+    else:
+        stale = abs(tracks - analyzed) > ANALYZE_CHANGE_RATIO * max(analyzed, 1)
+    if stale:
+        await analyze(conn)
+    else:
+        await optimize(conn)
+
+
+async def checkpoint(conn: aiosqlite.Connection) -> int:
+    """Checkpoint and truncate the WAL. Returns the number of pages written back."""
+    with _timed("checkpoint"):
+        # TRUNCATE resets the log and then reports 0 frames; PASSIVE does the
+        # copying and reports how much there was.
+        cursor = await conn.execute("PRAGMA wal_checkpoint(PASSIVE);")
+        row = await cursor.fetchone()
+        await conn.execute("PRAGMA wal_checkpoint(TRUNCATE);")
+    pages = max(row[2], 0) if row is not None else 0
+    CHECKPOINT_PAGES.inc(pages)
+    return pages
+
+
+async def freelist_count(conn: aiosqlite.Connection) -> int:
+    free = await _pragma_int(conn, "freelist_count")
+    FREELIST_PAGES.set(free)
+    return free
+
+
+async def incremental_vacuum(conn: aiosqlite.Connection) -> int:
+    """Release all free pages. Returns how many were released."""
+    before = await freelist_count(conn)
+    with _timed("incremental_vacuum"):
+        # Each step frees one page and produces no row, so `execute` would stop
+        # after the first one; `executescript` steps it to completion.
+        await conn.executescript("PRAGMA incremental_vacuum;")
+    freed = before - await freelist_count(conn)
+    VACUUM_PAGES.inc(freed)
+    return freed
+
+
+async def vacuum(conn: aiosqlite.Connection) -> None:
+    with _timed("vacuum"):
+        await conn.execute("VACUUM;")
+
+
+class DbMaintenance:
+    """Runs periodic and idle-time maintenance for one `LibraryDb`."""
+
+    def __init__(self, db: LibraryDb) -> None:
+        self._db = db
+        self.config = db.maintenance_config
+        self._task: asyncio.Task[None] | None = None
+        self._last_changes = -1
+        self._last_write = time.monotonic()
+        self._checkpointed_changes = -1
+        self._last_optimize = time.monotonic()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def start(self) -> None:
+        if self._task is None:
+            metrics.add_collector("db_files", self._collect_metrics)
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the scheduler and leave the DB optimized and checkpointed."""
+        task, self._task = self._task, None
+        if task is None:
+            return
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+        metrics.remove_collector("db_files", self._collect_metrics)
+        async with self._db.write_lock:
+            if self._db.is_open and not self._db.in_transaction:
+                try:
+                    await self._db.optimize()
+                    await self._db.checkpoint()
+                except Exception:
+                    logger.exception("Final DB maintenance failed")
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.config.tick_seconds)
+            try:
+                await self.tick()
+            except Exception:
+                logger.exception("DB maintenance tick failed")
+
+    async def tick(self, now: float | None = None) -> None:
+        """One scheduler pass (exposed for tests and manual runs)."""
+        async with self._db.write_lock:
+            await self._tick(now)
+
+    async def _tick(self, now: float | None) -> None:
+        db = self._db
+        if not db.is_open or db.in_transaction:
+            return
+        now = time.monotonic() if now is None else now
+        config = self.config
+
+        changes = db.total_changes
+        if changes != self._last_changes:
+            self._last_changes = changes
+            self._last_write = now
+
+        if config.optimize_interval and now - self._last_optimize >= config.optimize_interval:
+            self._last_optimize = now
+            await db.optimize()
+
+        if now - self._last_write < config.checkpoint_idle_seconds:
+            return
+
+        wrote = False
+        if db.needs_vacuum:
+            logger.info("Rebuilding the library DB for incremental auto-vacuum")
+            await db.vacuum()
+            wrote = True
+        free = await db.freelist_count()
+        if config.incremental_vacuum and free >= config.vacuum_min_free_pages:
+            freed = await db.incremental_vacuum()
+            logger.info("Released %d free DB pages", freed)
+            wrote = True
+        if wrote or changes != self._checkpointed_changes:
+            self._checkpointed_changes = changes
+            await db.checkpoint()
+
+    def _collect_metrics(self) -> list[Metric]:
+        path = self._db.path
+        if path is None:
+            return []
+        wal = Gauge("resonance_db_wal_bytes", "Size of the library DB's write-ahead log.")
+        size = Gauge("resonance_db_file_bytes", "Size of the library DB file.")
+        for gauge, file in ((wal, Path(f"{path}-wal")), (size, path)):
+            try:
+                gauge.set(file.stat().st_size)
+            except OSError:
+                gauge.set(0)
+        return [wal, size]
@@ -38,9 +38,15 @@ class TrackRow:
     """
     Canonical track record as stored in SQLite.
 
+    This is the single in-memory track representation: the DB layer materializes
+    it, `MusicLibrary` returns it as `Track`, playlists store it and the JSON-RPC
+    builders read from it. Slotted and frozen to keep per-track memory small.
+
     Notes:
     - `path` is the stable unique identifier for a local file.
     - `artist_id` and `album_id` are FKs to the artists/albums tables (schema v4+).
+    - `artist_name` / `album_title` / `track_id` are read-only aliases for
+      code written against the former `Track` and `PlaylistTrack` shapes.
     """
 
     id: int
@@ -65,6 +71,18 @@ class TrackRow:
     bitrate: int | None = None
     channels: int | None = None
 
+    @property
+    def artist_name(self) -> str | None:
+        return self.artist
+
+    @property
+    def album_title(self) -> str | None:
+        return self.album
+
+    @property
+    def track_id(self) -> int:
+        return self.id
+
 
 @dataclass(frozen=True, slots=True)
 class UpsertTrack:
@@ -100,6 +118,24 @@ class UpsertTrack:
     channels: int | None = None
 
 
+@dataclass(frozen=True, slots=True)
+class PlaylistStateRow:
+    """
+    Persisted per-player queue (schema v9+).
+
+    `track_ids` / `shuffle_order` are little-endian int64 arrays; negative ids
+    are path-only entries whose paths live in `adhoc_paths` (JSON object).
+    """
+
+    player_id: str
+    track_ids: bytes
+    shuffle_order: bytes | None = None
+    adhoc_paths: str | None = None
+    current_index: int = 0
+    repeat_mode: int = 0
+    shuffle_mode: int = 0
+
+
 def normalize_text(value: str | None) -> str | None:
     """
     Normalize optional text fields:
@@ -117,3 +153,26 @@ def normalize_int(value: int | None) -> int | None:
     if value is None:
         return None
     return int(value)
+
+
+# Leading articles ignored when sorting (LMS default `ignoredarticles`).
+SORT_ARTICLES: frozenset[str] = frozenset({"the", "el", "la", "los", "las", "le", "les"})
+
+
+def sort_key(value: str | None) -> str:
+    """
+    Build the normalized sort key stored in the `*_sort` columns.
+
+    - casefolded (Unicode-aware, unlike SQLite's ASCII-only NOCASE)
+    - a leading article is dropped ("The Beatles" -> "beatles")
+    - never NULL, so indexes on the column sort without COALESCE
+    """
+    if not value:
+        return ""
+    key = value.strip().casefold()
+    article, sep, rest = key.partition(" ")
+    if sep and article in SORT_ARTICLES:
+        rest = rest.lstrip()
+        if rest:
+            return rest
+    return key
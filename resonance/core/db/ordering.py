@@ -2,8 +2,9 @@
 Shared ORDER BY clause helpers for LibraryDb queries.
 
 These helpers centralize the translation from higher-level sort keys into
-SQL snippets (including reasonable COLLATE/NULLS handling) so the logic
-doesn't get duplicated across query modules.
+SQL snippets so the logic doesn't get duplicated across query modules.
+Casefolding, article stripping and NULL handling are done once at write
+time into the `*_sort` columns (see `models.sort_key`).
 
 Important:
 - The returned strings are intended to be *static SQL fragments* selected
@@ -47,51 +48,28 @@ def tracks_order_clause(order_by: str) -> str:
     Expected order_by values are a small whitelist (see TracksOrderBy),
     but we accept `str` to keep call sites ergonomic. Unknown values
     fall back to a sensible default.
+
+    Clauses sort on the normalized `*_sort` columns (schema v10), each of
+    which is backed by a composite index ending in the rowid, so paging
+    does not need a temp B-tree.
     """
     # NOTE: Keep these as static fragments (no user input interpolation).
     if order_by == "tracknum":
         # Disc then track then title as tiebreaker.
-        return (
-            "ORDER BY "
-            "COALESCE(t.disc_no, 0) ASC, "
-            "COALESCE(t.track_no, 0) ASC, "
-            "t.title COLLATE NOCASE ASC, "
-            "t.id ASC"
-        )
+        return "ORDER BY t.disc_sort, t.track_sort, t.title_sort, t.id"
     if order_by == "album":
-        return (
-            "ORDER BY "
-            "t.album COLLATE NOCASE ASC, "
-            "COALESCE(t.disc_no, 0) ASC, "
-            "COALESCE(t.track_no, 0) ASC, "
-            "t.title COLLATE NOCASE ASC, "
-            "t.id ASC"
-        )
+        return "ORDER BY t.album_sort, t.disc_sort, t.track_sort, t.title_sort, t.id"
     if order_by == "artist":
         return (
-            "ORDER BY "
-            "t.artist COLLATE NOCASE ASC, "
-            "t.album COLLATE NOCASE ASC, "
-            "COALESCE(t.disc_no, 0) ASC, "
-            "COALESCE(t.track_no, 0) ASC, "
-            "t.title COLLATE NOCASE ASC, "
-            "t.id ASC"
+            "ORDER BY t.artist_sort, t.album_sort, t.disc_sort, t.track_sort, t.title_sort, t.id"
         )
     if order_by == "year":
-        return (
-            "ORDER BY "
-            "t.year ASC, "
-            "t.album COLLATE NOCASE ASC, "
-            "COALESCE(t.disc_no, 0) ASC, "
-            "COALESCE(t.track_no, 0) ASC, "
-            "t.title COLLATE NOCASE ASC, "
-            "t.id ASC"
-        )
+        return "ORDER BY t.year, t.album_sort, t.disc_sort, t.track_sort, t.title_sort, t.id"
     if order_by == "id":
         return "ORDER BY t.id ASC"
 
     # Default: title
-    return "ORDER BY t.title COLLATE NOCASE ASC, t.id ASC"
+    return "ORDER BY t.title_sort, t.id"
 
 
 def albums_order_clause(order_by: str) -> str:
@@ -101,17 +79,17 @@ def albums_order_clause(order_by: str) -> str:
     Uses common, stable tie-breakers to avoid flickering pagination.
     """
     if order_by in ("album", "title"):
-        return "ORDER BY a.title COLLATE NOCASE ASC, a.id ASC"
+        return "ORDER BY a.title_sort, a.id"
     if order_by == "artist":
-        # Prefer artist name (join-provided alias) then album title.
-        return "ORDER BY artist_name COLLATE NOCASE ASC, a.title COLLATE NOCASE ASC, a.id ASC"
+        # Album artist's sort key is denormalized onto albums (indexable).
+        return "ORDER BY a.artist_sort, a.title_sort, a.id"
     if order_by == "year":
-        return "ORDER BY a.year ASC, a.title COLLATE NOCASE ASC, a.id ASC"
+        return "ORDER BY a.year, a.title_sort, a.id"
     if order_by == "id":
         return "ORDER BY a.id ASC"
 
     # Default: album title
-    return "ORDER BY a.title COLLATE NOCASE ASC, a.id ASC"
+    return "ORDER BY a.title_sort, a.id"
 
 
 def artists_order_clause(order_by: str) -> str:
@@ -120,15 +98,16 @@ def artists_order_clause(order_by: str) -> str:
 
     Notes:
     - Some artist queries compute album counts; `albums` ordering assumes an
-      `album_count` column/alias exists in the SELECT.
+      `album_count` column/alias exists in the SELECT. That order is computed
+      per row and therefore always sorts in a temp B-tree.
     """
     if order_by in ("artist", "name"):
-        return "ORDER BY ar.name COLLATE NOCASE ASC, ar.id ASC"
+        return "ORDER BY ar.name_sort, ar.id"
     if order_by == "albums":
         # Descending album_count, then name for stable paging.
-        return "ORDER BY album_count DESC, ar.name COLLATE NOCASE ASC, ar.id ASC"
+        return "ORDER BY album_count DESC, ar.name_sort, ar.id"
     if order_by == "id":
         return "ORDER BY ar.id ASC"
 
     # Default: name
-    return "ORDER BY ar.name COLLATE NOCASE ASC, ar.id ASC"
+    return "ORDER BY ar.name_sort, ar.id"
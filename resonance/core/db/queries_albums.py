@@ -66,7 +66,7 @@ async def list_all_albums(
             a.id, a.title, a.title_sort, a.artist_id, ar.name AS artist_name, a.year
         FROM albums a
         LEFT JOIN artists ar ON a.artist_id = ar.id
-        ORDER BY a.title COLLATE NOCASE
+        ORDER BY a.title_sort, a.id
         LIMIT ? OFFSET ?;
         """,
         (int(limit), int(offset)),
@@ -89,7 +89,7 @@ async def list_albums_by_artist(
         FROM albums a
         LEFT JOIN artists ar ON a.artist_id = ar.id
         WHERE a.artist_id = ?
-        ORDER BY a.title COLLATE NOCASE
+        ORDER BY a.title_sort, a.id
         LIMIT ? OFFSET ?;
         """,
         (int(artist_id), int(limit), int(offset)),
@@ -577,7 +577,7 @@ async def list_albums_with_track_counts_by_compilation_and_genre_id(
     order_clause = albums_order_clause(order_by)
     cursor = await conn.execute(
         f"""
-        SELECT DISTINCT
+        SELECT
             a.id,
             a.title,
             a.artist_id,
@@ -586,9 +586,12 @@ async def list_albums_with_track_counts_by_compilation_and_genre_id(
             (SELECT COUNT(*) FROM tracks t2 WHERE t2.album_id = a.id) AS track_count
         FROM albums a
         LEFT JOIN artists ar ON a.artist_id = ar.id
-        JOIN tracks t ON t.album_id = a.id
-        JOIN track_genres tg ON tg.track_id = t.id
-        WHERE a.compilation = ? AND tg.genre_id = ?
+        WHERE a.compilation = ?
+          AND EXISTS (
+            SELECT 1 FROM tracks t
+            JOIN track_genres tg ON tg.track_id = t.id
+            WHERE t.album_id = a.id AND tg.genre_id = ?
+        )
         {order_clause}
         LIMIT ? OFFSET ?;
         """,
@@ -639,7 +642,7 @@ async def list_albums_by_genre_id(
     order_clause = albums_order_clause(order_by)
     cursor = await conn.execute(
         f"""
-        SELECT DISTINCT
+        SELECT
             a.id,
             a.title,
             a.artist_id,
@@ -648,9 +651,11 @@ async def list_albums_by_genre_id(
             (SELECT COUNT(*) FROM tracks t2 WHERE t2.album_id = a.id) AS track_count
         FROM albums a
         LEFT JOIN artists ar ON a.artist_id = ar.id
-        JOIN tracks t ON t.album_id = a.id
-        JOIN track_genres tg ON tg.track_id = t.id
-        WHERE tg.genre_id = ?
+        WHERE EXISTS (
+            SELECT 1 FROM tracks t
+            JOIN track_genres tg ON tg.track_id = t.id
+            WHERE t.album_id = a.id AND tg.genre_id = ?
+        )
         {order_clause}
         LIMIT ? OFFSET ?;
         """,
@@ -699,7 +704,7 @@ async def list_albums_by_genre_and_year(
     order_clause = albums_order_clause(order_by)
     cursor = await conn.execute(
         f"""
-        SELECT DISTINCT
+        SELECT
             a.id,
             a.title,
             a.artist_id,
@@ -708,9 +713,12 @@ async def list_albums_by_genre_and_year(
             (SELECT COUNT(*) FROM tracks t2 WHERE t2.album_id = a.id) AS track_count
         FROM albums a
         LEFT JOIN artists ar ON a.artist_id = ar.id
-        JOIN tracks t ON t.album_id = a.id
-        JOIN track_genres tg ON tg.track_id = t.id
-        WHERE tg.genre_id = ? AND a.year = ?
+        WHERE EXISTS (
+            SELECT 1 FROM tracks t
+            JOIN track_genres tg ON tg.track_id = t.id
+            WHERE t.album_id = a.id AND tg.genre_id = ?
+        )
+          AND a.year = ?
         {order_clause}
         LIMIT ? OFFSET ?;
         """,
@@ -759,7 +767,7 @@ async def list_albums_by_genre_and_artist(
     order_clause = albums_order_clause(order_by)
     cursor = await conn.execute(
         f"""
-        SELECT DISTINCT
+        SELECT
             a.id,
             a.title,
             a.artist_id,
@@ -768,9 +776,12 @@ async def list_albums_by_genre_and_artist(
             (SELECT COUNT(*) FROM tracks t2 WHERE t2.album_id = a.id) AS track_count
         FROM albums a
         LEFT JOIN artists ar ON a.artist_id = ar.id
-        JOIN tracks t ON t.album_id = a.id
-        JOIN track_genres tg ON tg.track_id = t.id
-        WHERE tg.genre_id = ? AND a.artist_id = ?
+        WHERE EXISTS (
+            SELECT 1 FROM tracks t
+            JOIN track_genres tg ON tg.track_id = t.id
+            WHERE t.album_id = a.id AND tg.genre_id = ?
+        )
+          AND a.artist_id = ?
         {order_clause}
         LIMIT ? OFFSET ?;
         """,
@@ -820,7 +831,7 @@ async def list_albums_by_genre_artist_and_year(
     order_clause = albums_order_clause(order_by)
     cursor = await conn.execute(
         f"""
-        SELECT DISTINCT
+        SELECT
             a.id,
             a.title,
             a.artist_id,
@@ -829,9 +840,13 @@ async def list_albums_by_genre_artist_and_year(
             (SELECT COUNT(*) FROM tracks t2 WHERE t2.album_id = a.id) AS track_count
         FROM albums a
         LEFT JOIN artists ar ON a.artist_id = ar.id
-        JOIN tracks t ON t.album_id = a.id
-        JOIN track_genres tg ON tg.track_id = t.id
-        WHERE tg.genre_id = ? AND a.artist_id = ? AND a.year = ?
+        WHERE EXISTS (
+            SELECT 1 FROM tracks t
+            JOIN track_genres tg ON tg.track_id = t.id
+            WHERE t.album_id = a.id AND tg.genre_id = ?
+        )
+          AND a.artist_id = ?
+          AND a.year = ?
         {order_clause}
         LIMIT ? OFFSET ?;
         """,
@@ -882,7 +897,7 @@ async def list_albums_with_track_counts_by_role_id(
     order_clause = albums_order_clause(order_by)
     cursor = await conn.execute(
         f"""
-        SELECT DISTINCT
+        SELECT
             a.id,
             a.title,
             a.artist_id,
@@ -891,9 +906,11 @@ async def list_albums_with_track_counts_by_role_id(
             (SELECT COUNT(*) FROM tracks t2 WHERE t2.album_id = a.id) AS track_count
         FROM albums a
         LEFT JOIN artists ar ON a.artist_id = ar.id
-        JOIN tracks t ON t.album_id = a.id
-        JOIN contributor_tracks ct ON ct.track_id = t.id
-        WHERE ct.role_id = ?
+        WHERE EXISTS (
+            SELECT 1 FROM tracks t
+            JOIN contributor_tracks ct ON ct.track_id = t.id
+            WHERE t.album_id = a.id AND ct.role_id = ?
+        )
         {order_clause}
         LIMIT ? OFFSET ?;
         """,
@@ -943,7 +960,7 @@ async def list_albums_with_track_counts_by_role_and_genre_id(
     order_clause = albums_order_clause(order_by)
     cursor = await conn.execute(
         f"""
-        SELECT DISTINCT
+        SELECT
             a.id,
             a.title,
             a.artist_id,
@@ -952,10 +969,12 @@ async def list_albums_with_track_counts_by_role_and_genre_id(
             (SELECT COUNT(*) FROM tracks t2 WHERE t2.album_id = a.id) AS track_count
         FROM albums a
         LEFT JOIN artists ar ON a.artist_id = ar.id
-        JOIN tracks t ON t.album_id = a.id
-        JOIN contributor_tracks ct ON ct.track_id = t.id
-        JOIN track_genres tg ON tg.track_id = t.id
-        WHERE ct.role_id = ? AND tg.genre_id = ?
+        WHERE EXISTS (
+            SELECT 1 FROM tracks t
+            JOIN contributor_tracks ct ON ct.track_id = t.id
+            JOIN track_genres tg ON tg.track_id = t.id
+            WHERE t.album_id = a.id AND ct.role_id = ? AND tg.genre_id = ?
+        )
         {order_clause}
         LIMIT ? OFFSET ?;
         """,
@@ -1002,7 +1021,7 @@ async def list_albums_with_track_counts_by_role_and_year(
     order_clause = albums_order_clause(order_by)
     cursor = await conn.execute(
         f"""
-        SELECT DISTINCT
+        SELECT
             a.id,
             a.title,
             a.artist_id,
@@ -1011,9 +1030,12 @@ async def list_albums_with_track_counts_by_role_and_year(
             (SELECT COUNT(*) FROM tracks t2 WHERE t2.album_id = a.id) AS track_count
         FROM albums a
         LEFT JOIN artists ar ON a.artist_id = ar.id
-        JOIN tracks t ON t.album_id = a.id
-        JOIN contributor_tracks ct ON ct.track_id = t.id
-        WHERE ct.role_id = ? AND a.year = ?
+        WHERE EXISTS (
+            SELECT 1 FROM tracks t
+            JOIN contributor_tracks ct ON ct.track_id = t.id
+            WHERE t.album_id = a.id AND ct.role_id = ?
+        )
+          AND a.year = ?
         {order_clause}
         LIMIT ? OFFSET ?;
         """,
@@ -1062,7 +1084,7 @@ async def list_albums_with_track_counts_by_role_and_compilation(
     order_clause = albums_order_clause(order_by)
     cursor = await conn.execute(
         f"""
-        SELECT DISTINCT
+        SELECT
             a.id,
             a.title,
             a.artist_id,
@@ -1071,9 +1093,12 @@ async def list_albums_with_track_counts_by_role_and_compilation(
             (SELECT COUNT(*) FROM tracks t2 WHERE t2.album_id = a.id) AS track_count
         FROM albums a
         LEFT JOIN artists ar ON a.artist_id = ar.id
-        JOIN tracks t ON t.album_id = a.id
-        JOIN contributor_tracks ct ON ct.track_id = t.id
-        WHERE ct.role_id = ? AND a.compilation = ?
+        WHERE EXISTS (
+            SELECT 1 FROM tracks t
+            JOIN contributor_tracks ct ON ct.track_id = t.id
+            WHERE t.album_id = a.id AND ct.role_id = ?
+        )
+          AND a.compilation = ?
         {order_clause}
         LIMIT ? OFFSET ?;
         """,
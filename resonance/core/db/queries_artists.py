@@ -74,7 +74,7 @@ async def list_all_artists(
         """
         SELECT id, name, name_sort
         FROM artists
-        ORDER BY name COLLATE NOCASE ASC, id ASC
+        ORDER BY name_sort, id
         LIMIT ? OFFSET ?;
         """,
         (int(limit), int(offset)),
@@ -182,13 +182,15 @@ async def list_artists_with_album_counts_by_compilation(
     order_clause = artists_order_clause(order_by)
     cursor = await conn.execute(
         f"""
-        SELECT DISTINCT
+        SELECT
             ar.id,
             ar.name,
             (SELECT COUNT(DISTINCT al.id) FROM albums al WHERE al.artist_id = ar.id) AS album_count
         FROM artists ar
-        JOIN tracks t ON t.artist_id = ar.id
-        WHERE t.compilation = ?
+        WHERE EXISTS (
+            SELECT 1 FROM tracks t INDEXED BY idx_tracks_artist_id_sort
+            WHERE t.artist_id = ar.id AND t.compilation = ?
+        )
         {order_clause}
         LIMIT ? OFFSET ?;
         """,
@@ -225,13 +227,15 @@ async def list_artists_with_album_counts_by_year(
     order_clause = artists_order_clause(order_by)
     cursor = await conn.execute(
         f"""
-        SELECT DISTINCT
+        SELECT
             ar.id,
             ar.name,
             (SELECT COUNT(DISTINCT al.id) FROM albums al WHERE al.artist_id = ar.id) AS album_count
         FROM artists ar
-        JOIN tracks t ON t.artist_id = ar.id
-        WHERE t.year = ?
+        WHERE EXISTS (
+            SELECT 1 FROM tracks t INDEXED BY idx_tracks_artist_id_sort
+            WHERE t.artist_id = ar.id AND t.year = ?
+        )
         {order_clause}
         LIMIT ? OFFSET ?;
         """,
@@ -274,14 +278,16 @@ async def list_artists_by_genre_id(
     order_clause = artists_order_clause(order_by)
     cursor = await conn.execute(
         f"""
-        SELECT DISTINCT
+        SELECT
             ar.id,
             ar.name,
             (SELECT COUNT(DISTINCT al.id) FROM albums al WHERE al.artist_id = ar.id) AS album_count
         FROM artists ar
-        JOIN tracks t ON t.artist_id = ar.id
-        JOIN track_genres tg ON tg.track_id = t.id
-        WHERE tg.genre_id = ?
+        WHERE EXISTS (
+            SELECT 1 FROM tracks t INDEXED BY idx_tracks_artist_id_sort
+            JOIN track_genres tg ON tg.track_id = t.id
+            WHERE t.artist_id = ar.id AND tg.genre_id = ?
+        )
         {order_clause}
         LIMIT ? OFFSET ?;
         """,
@@ -325,14 +331,16 @@ async def list_artists_by_genre_and_year(
     order_clause = artists_order_clause(order_by)
     cursor = await conn.execute(
         f"""
-        SELECT DISTINCT
+        SELECT
             ar.id,
             ar.name,
             (SELECT COUNT(DISTINCT al.id) FROM albums al WHERE al.artist_id = ar.id) AS album_count
         FROM artists ar
-        JOIN tracks t ON t.artist_id = ar.id
-        JOIN track_genres tg ON tg.track_id = t.id
-        WHERE tg.genre_id = ? AND t.year = ?
+        WHERE EXISTS (
+            SELECT 1 FROM tracks t INDEXED BY idx_tracks_artist_id_sort
+            JOIN track_genres tg ON tg.track_id = t.id
+            WHERE t.artist_id = ar.id AND tg.genre_id = ? AND t.year = ?
+        )
         {order_clause}
         LIMIT ? OFFSET ?;
         """,
@@ -360,14 +368,16 @@ async def list_artists_with_album_counts_by_role_id(
     order_clause = artists_order_clause(order_by)
     cursor = await conn.execute(
         f"""
-        SELECT DISTINCT
+        SELECT
             ar.id,
             ar.name,
             (SELECT COUNT(DISTINCT al.id) FROM albums al WHERE al.artist_id = ar.id) AS album_count
         FROM artists ar
-        JOIN tracks t ON t.artist_id = ar.id
-        JOIN contributor_tracks ct ON ct.track_id = t.id
-        WHERE ct.role_id = ?
+        WHERE EXISTS (
+            SELECT 1 FROM tracks t INDEXED BY idx_tracks_artist_id_sort
+            JOIN contributor_tracks ct ON ct.track_id = t.id
+            WHERE t.artist_id = ar.id AND ct.role_id = ?
+        )
         {order_clause}
         LIMIT ? OFFSET ?;
         """,
@@ -406,15 +416,17 @@ async def list_artists_with_album_counts_by_role_and_genre_id(
     order_clause = artists_order_clause(order_by)
     cursor = await conn.execute(
         f"""
-        SELECT DISTINCT
+        SELECT
             ar.id,
             ar.name,
             (SELECT COUNT(DISTINCT al.id) FROM albums al WHERE al.artist_id = ar.id) AS album_count
         FROM artists ar
-        JOIN tracks t ON t.artist_id = ar.id
-        JOIN contributor_tracks ct ON ct.track_id = t.id
-        JOIN track_genres tg ON tg.track_id = t.id
-        WHERE ct.role_id = ? AND tg.genre_id = ?
+        WHERE EXISTS (
+            SELECT 1 FROM tracks t INDEXED BY idx_tracks_artist_id_sort
+            JOIN contributor_tracks ct ON ct.track_id = t.id
+            JOIN track_genres tg ON tg.track_id = t.id
+            WHERE t.artist_id = ar.id AND ct.role_id = ? AND tg.genre_id = ?
+        )
         {order_clause}
         LIMIT ? OFFSET ?;
         """,
@@ -456,14 +468,16 @@ async def list_artists_with_album_counts_by_role_and_year(
     order_clause = artists_order_clause(order_by)
     cursor = await conn.execute(
         f"""
-        SELECT DISTINCT
+        SELECT
             ar.id,
             ar.name,
             (SELECT COUNT(DISTINCT al.id) FROM albums al WHERE al.artist_id = ar.id) AS album_count
         FROM artists ar
-        JOIN tracks t ON t.artist_id = ar.id
-        JOIN contributor_tracks ct ON ct.track_id = t.id
-        WHERE ct.role_id = ? AND t.year = ?
+        WHERE EXISTS (
+            SELECT 1 FROM tracks t INDEXED BY idx_tracks_artist_id_sort
+            JOIN contributor_tracks ct ON ct.track_id = t.id
+            WHERE t.artist_id = ar.id AND ct.role_id = ? AND t.year = ?
+        )
         {order_clause}
         LIMIT ? OFFSET ?;
         """,
@@ -504,14 +518,16 @@ async def list_artists_with_album_counts_by_role_and_compilation(
     order_clause = artists_order_clause(order_by)
     cursor = await conn.execute(
         f"""
-        SELECT DISTINCT
+        SELECT
             ar.id,
             ar.name,
             (SELECT COUNT(DISTINCT al.id) FROM albums al WHERE al.artist_id = ar.id) AS album_count
         FROM artists ar
-        JOIN tracks t ON t.artist_id = ar.id
-        JOIN contributor_tracks ct ON ct.track_id = t.id
-        WHERE ct.role_id = ? AND t.compilation = ?
+        WHERE EXISTS (
+            SELECT 1 FROM tracks t INDEXED BY idx_tracks_artist_id_sort
+            JOIN contributor_tracks ct ON ct.track_id = t.id
+            WHERE t.artist_id = ar.id AND ct.role_id = ? AND t.compilation = ?
+        )
         {order_clause}
         LIMIT ? OFFSET ?;
         """,
@@ -4,7 +4,7 @@ Meta-related DB queries extracted from `resonance.core.library_db.LibraryDb`.
 This module contains queries for:
 - Genres
 - Roles
-- Music folders
+- Music folders (and the directory mtimes recorded when walking them)
 
 Design:
 - Functions are *pure DB helpers*: they take an open `aiosqlite.Connection`
@@ -17,7 +17,8 @@ Important:
 
 from __future__ import annotations
 
-from typing import Any
+import os
+from typing import Any, cast
 
 import aiosqlite
 
@@ -39,7 +40,7 @@ async def list_genres(
             g.name,
             (SELECT COUNT(*) FROM track_genres tg WHERE tg.genre_id = g.id) AS track_count
         FROM genres g
-        ORDER BY g.name COLLATE NOCASE
+        ORDER BY g.name_sort, g.id
         LIMIT ? OFFSET ?;
         """,
         (int(limit), int(offset)),
@@ -89,7 +90,7 @@ async def list_roles(
         """
         SELECT id, name
         FROM roles
-        ORDER BY name COLLATE NOCASE
+        ORDER BY name COLLATE NOCASE, id
         LIMIT ? OFFSET ?;
         """,
         (int(limit), int(offset)),
@@ -185,6 +186,36 @@ async def set_music_folders(conn: aiosqlite.Connection, paths: list[str]) -> Non
     await conn.commit()
 
 
+async def load_directory_mtimes(conn: aiosqlite.Connection, root: str) -> dict[str, int]:
+    """Directory mtimes recorded by the last walk of `root` (root included)."""
+    prefix = root.rstrip(os.sep) + os.sep
+    cursor = await conn.execute(
+        """
+        SELECT path, mtime_ns
+        FROM scan_directories
+        WHERE path = ? OR (path >= ? AND path < ?);
+        """,
+        (root, prefix, prefix[:-1] + chr(ord(os.sep) + 1)),
+    )
+    cursor.row_factory = None
+    return dict(cast("list[tuple[str, int]]", await cursor.fetchall()))
+
+
+async def replace_directory_mtimes(
+    conn: aiosqlite.Connection, root: str, mtimes: dict[str, int]
+) -> None:
+    """Replace the recorded directory mtimes under `root` with a fresh walk's."""
+    prefix = root.rstrip(os.sep) + os.sep
+    await conn.execute(
+        "DELETE FROM scan_directories WHERE path = ? OR (path >= ? AND path < ?);",
+        (root, prefix, prefix[:-1] + chr(ord(os.sep) + 1)),
+    )
+    await conn.executemany(
+        "INSERT OR REPLACE INTO scan_directories (path, mtime_ns) VALUES (?, ?);",
+        mtimes.items(),
+    )
+
+
 async def clear_music_folders(conn: aiosqlite.Connection) -> None:
     """Remove all music folders."""
     await conn.execute("DELETE FROM music_folders;")
@@ -0,0 +1,89 @@
+"""
+Player playlist (queue) persistence queries.
+
+Design:
+- Functions are *pure DB helpers*: they take an open `aiosqlite.Connection`
+  and return rows/materialized dataclasses.
+- One row per player; track ids are stored as a packed int64 BLOB, so a
+  20k-entry queue is a single ~160 KB write.
+- These functions assume `conn.row_factory = aiosqlite.Row`.
+- Callers own the transaction (see `LibraryDb.save_player_playlists`).
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from resonance.core.db.models import PlaylistStateRow
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    import aiosqlite
+
+
+async def save_playlists(conn: aiosqlite.Connection, states: Sequence[PlaylistStateRow]) -> None:
+    if not states:
+        return
+    await conn.executemany(
+        """
+        INSERT INTO player_playlists (
+            player_id, track_ids, shuffle_order, adhoc_paths,
+            current_index, repeat_mode, shuffle_mode, updated_at
+        )
+        VALUES (?, ?, ?, ?, ?, ?, ?, CAST(strftime('%s', 'now') AS INTEGER))
+        ON CONFLICT(player_id) DO UPDATE SET
+            track_ids = excluded.track_ids,
+            shuffle_order = excluded.shuffle_order,
+            adhoc_paths = excluded.adhoc_paths,
+            current_index = excluded.current_index,
+            repeat_mode = excluded.repeat_mode,
+            shuffle_mode = excluded.shuffle_mode,
+            updated_at = excluded.updated_at;
+        """,
+        [
+            (
+                s.player_id,
+                s.track_ids,
+                s.shuffle_order,
+                s.adhoc_paths,
+                int(s.current_index),
+                int(s.repeat_mode),
+                int(s.shuffle_mode),
+            )
+            for s in states
+        ],
+    )
+
+
+async def delete_playlists(conn: aiosqlite.Connection, player_ids: Sequence[str]) -> None:
+    if not player_ids:
+        return
+    await conn.executemany(
+        "DELETE FROM player_playlists WHERE player_id = ?;",
+        [(pid,) for pid in player_ids],
+    )
+
+
+async def load_playlists(conn: aiosqlite.Connection) -> list[PlaylistStateRow]:
+    cursor = await conn.execute(
+        """
+        SELECT player_id, track_ids, shuffle_order, adhoc_paths,
+               current_index, repeat_mode, shuffle_mode
+        FROM player_playlists
+        ORDER BY player_id;
+        """
+    )
+    rows = await cursor.fetchall()
+    return [
+        PlaylistStateRow(
+            player_id=str(r["player_id"]),
+            track_ids=bytes(r["track_ids"]),
+            shuffle_order=bytes(r["shuffle_order"]) if r["shuffle_order"] is not None else None,
+            adhoc_paths=r["adhoc_paths"],
+            current_index=int(r["current_index"]),
+            repeat_mode=int(r["repeat_mode"]),
+            shuffle_mode=int(r["shuffle_mode"]),
+        )
+        for r in rows
+    ]
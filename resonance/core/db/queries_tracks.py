@@ -5,7 +5,9 @@ Design:
 - Functions are *pure DB helpers*: they take an open `aiosqlite.Connection`
   and return rows/materialized dataclasses.
 - Ordering is centralized via `resonance.core.db.ordering.tracks_order_clause`.
-- These functions assume `conn.row_factory = aiosqlite.Row`.
+- These functions assume `conn.row_factory = aiosqlite.Row`. Track queries
+  override the row factory per cursor (`track_row_factory`) so rows are mapped
+  to `TrackRow` in a single pass, in the DB worker thread.
 
 Important:
 - Do NOT interpolate user input into SQL. Any dynamic SQL here is limited to
@@ -14,80 +16,95 @@ Important:
 
 from __future__ import annotations
 
-from typing import Any
+import functools
+import operator
+import os
+from collections.abc import Callable
+from dataclasses import fields
+from typing import TYPE_CHECKING, Any, cast
 
 import aiosqlite
 
 from resonance.core.db.models import TrackRow
 from resonance.core.db.ordering import tracks_order_clause
 
+if TYPE_CHECKING:
+    from collections.abc import Sequence
 
-def _row_to_track(row: aiosqlite.Row) -> TrackRow:
-    """Convert an aiosqlite Row to a TrackRow dataclass."""
-    # Defensive access for columns that may be missing in older databases
-    try:
-        has_artwork = row["has_artwork"]
-    except (KeyError, IndexError):
-        has_artwork = 0
-
-    try:
-        artist_id = row["artist_id"]
-    except (KeyError, IndexError):
-        artist_id = None
-
-    try:
-        album_id = row["album_id"]
-    except (KeyError, IndexError):
-        album_id = None
-
-    try:
-        compilation = row["compilation"]
-    except (KeyError, IndexError):
-        compilation = 0
-
-    # Audio quality fields (added in schema v8)
-    try:
-        sample_rate = row["sample_rate"]
-    except (KeyError, IndexError):
-        sample_rate = None
-
-    try:
-        bit_depth = row["bit_depth"]
-    except (KeyError, IndexError):
-        bit_depth = None
-
-    try:
-        bitrate = row["bitrate"]
-    except (KeyError, IndexError):
-        bitrate = None
-
-    try:
-        channels = row["channels"]
-    except (KeyError, IndexError):
-        channels = None
-
-    return TrackRow(
-        id=int(row["id"]),
-        path=str(row["path"]),
-        title=row["title"],
-        artist=row["artist"],
-        album=row["album"],
-        album_artist=row["album_artist"],
-        track_no=row["track_no"],
-        disc_no=row["disc_no"],
-        year=row["year"],
-        duration_ms=row["duration_ms"],
-        file_size=row["file_size"],
-        mtime_ns=row["mtime_ns"],
-        has_artwork=has_artwork if has_artwork is not None else 0,
-        compilation=int(compilation) if compilation is not None else 0,
-        artist_id=artist_id,
-        album_id=album_id,
-        sample_rate=sample_rate,
-        bit_depth=bit_depth,
-        bitrate=bitrate,
-        channels=channels,
-    )
+
+# Columns added by later schema versions and their values on older databases.
+# Every other TrackRow field maps to a column that exists since schema v1.
+_TRACK_COLUMN_DEFAULTS: dict[str, Any] = {
+    "has_artwork": 0,  # v2
+    "artist_id": None,  # v4
+    "album_id": None,  # v4
+    "compilation": 0,  # v6
+    "sample_rate": None,  # v8
+    "bit_depth": None,  # v8
+    "bitrate": None,  # v8
+    "channels": None,  # v8
+}
+
+_TRACK_FIELDS: tuple[str, ...] = tuple(f.name for f in fields(TrackRow))
+
+TrackRowFactory = Callable[[Any, tuple[Any, ...]], TrackRow]
+
+
+@functools.lru_cache(maxsize=32)
+def track_row_factory(columns: tuple[str, ...]) -> TrackRowFactory:
+    """
+    Build a sqlite3 row factory that maps `tracks` result tuples to TrackRow.
+
+    The column layout of `SELECT * FROM tracks` only depends on the schema
+    version, so the mapping (which result position feeds which field, and which
+    fields fall back to defaults on older schemas) is resolved once per layout
+    and cached. Each row is then mapped in a single pass without building an
+    intermediate `sqlite3.Row`.
+    """
+    index: dict[str, int] = {}
+    for i, name in enumerate(columns):
+        index.setdefault(name, i)
+
+    missing = [name for name in _TRACK_FIELDS if name not in index]
+    unknown = [name for name in missing if name not in _TRACK_COLUMN_DEFAULTS]
+    if unknown:
+        raise ValueError(f"Result set is missing track columns: {', '.join(unknown)}")
+
+    if not missing:
+        pick = operator.itemgetter(*(index[name] for name in _TRACK_FIELDS))
+
+        def _factory(_cursor: Any, row: tuple[Any, ...]) -> TrackRow:
+            return TrackRow(*pick(row))
+
+        return _factory
+
+    # Older schema: fill absent columns with the defaults later migrations add.
+    plan = tuple((index.get(name), _TRACK_COLUMN_DEFAULTS.get(name)) for name in _TRACK_FIELDS)
+
+    def _factory_with_defaults(_cursor: Any, row: tuple[Any, ...]) -> TrackRow:
+        values: tuple[Any, ...] = tuple(
+            row[i] if i is not None else default for i, default in plan
+        )
+        return TrackRow(*values)
+
+    return _factory_with_defaults
+
+
+def _use_track_rows(cursor: aiosqlite.Cursor) -> None:
+    """Make `cursor` yield TrackRow objects for its current result set."""
+    columns = tuple(d[0] for d in cursor.description)
+    # aiosqlite types row_factory as a class; any sqlite3 row factory callable works.
+    cursor.row_factory = cast("type", track_row_factory(columns))
+
+
+async def _fetch_track(cursor: aiosqlite.Cursor) -> TrackRow | None:
+    _use_track_rows(cursor)
+    return cast("TrackRow | None", await cursor.fetchone())
+
+
+async def _fetch_tracks(cursor: aiosqlite.Cursor) -> list[TrackRow]:
+    _use_track_rows(cursor)
+    return cast("list[TrackRow]", list(await cursor.fetchall()))
 
 
 # ---------------------------------------------------------------------------
@@ -97,14 +114,73 @@ def _row_to_track(row: aiosqlite.Row) -> TrackRow:
 
 async def get_track_by_id(conn: aiosqlite.Connection, track_id: int) -> TrackRow | None:
     cursor = await conn.execute("SELECT * FROM tracks WHERE id = ?;", (track_id,))
-    row = await cursor.fetchone()
-    return _row_to_track(row) if row else None
+    return await _fetch_track(cursor)
 
 
 async def get_track_by_path(conn: aiosqlite.Connection, path: str) -> TrackRow | None:
     cursor = await conn.execute("SELECT * FROM tracks WHERE path = ?;", (path,))
-    row = await cursor.fetchone()
-    return _row_to_track(row) if row else None
+    return await _fetch_track(cursor)
+
+
+# SQLite's default host parameter limit is 999 on older builds.
+_MAX_IN_PARAMS = 500
+
+
+async def get_tracks_by_ids(conn: aiosqlite.Connection, track_ids: Sequence[int]) -> list[TrackRow]:
+    """Load tracks for a batch of ids (unordered; unknown ids are skipped)."""
+    result: list[TrackRow] = []
+    for i in range(0, len(track_ids), _MAX_IN_PARAMS):
+        chunk = [int(t) for t in track_ids[i : i + _MAX_IN_PARAMS]]
+        placeholders = ",".join("?" * len(chunk))
+        cursor = await conn.execute(
+            f"SELECT * FROM tracks WHERE id IN ({placeholders});",
+            chunk,
+        )
+        result.extend(await _fetch_tracks(cursor))
+    return result
+
+
+async def list_track_ids(
+    conn: aiosqlite.Connection,
+    *,
+    album_id: int | None = None,
+    artist_id: int | None = None,
+    genre_id: int | None = None,
+    order_by: str,
+) -> list[int]:
+    """
+    Return the ids of every matching track in `order_by` order (no LIMIT).
+
+    Used to enqueue large selections: only ids cross into Python, metadata is
+    loaded lazily by the playlist. Filters are ANDed; none means all tracks.
+    """
+    where: list[str] = []
+    args: list[int] = []
+    if album_id is not None:
+        where.append("t.album_id = ?")
+        args.append(int(album_id))
+    if artist_id is not None:
+        where.append("t.artist_id = ?")
+        args.append(int(artist_id))
+    if genre_id is not None:
+        where.append(
+            "EXISTS (SELECT 1 FROM track_genres tg WHERE tg.track_id = t.id AND tg.genre_id = ?)"
+        )
+        args.append(int(genre_id))
+
+    where_clause = f"WHERE {' AND '.join(where)}" if where else ""
+    order_clause = tracks_order_clause(order_by)
+    cursor = await conn.execute(
+        f"""
+        SELECT t.id FROM tracks t
+        {where_clause}
+        {order_clause};
+        """,
+        args,
+    )
+    cursor.row_factory = None
+    rows = await cursor.fetchall()
+    return [row[0] for row in rows]
 
 
 async def list_tracks(
@@ -123,8 +199,7 @@ async def list_tracks(
         """,
         (int(limit), int(offset)),
     )
-    rows = await cursor.fetchall()
-    return [_row_to_track(r) for r in rows]
+    return await _fetch_tracks(cursor)
 
 
 async def count_tracks(conn: aiosqlite.Connection) -> int:
@@ -145,13 +220,12 @@ async def search_tracks(
         """
         SELECT * FROM tracks t
         WHERE title LIKE ? OR artist LIKE ? OR album LIKE ?
-        ORDER BY title COLLATE NOCASE
+        ORDER BY t.title_sort, t.id
         LIMIT ? OFFSET ?;
         """,
         (like_pattern, like_pattern, like_pattern, int(limit), int(offset)),
     )
-    rows = await cursor.fetchall()
-    return [_row_to_track(r) for r in rows]
+    return await _fetch_tracks(cursor)
 
 
 async def delete_track_by_path(conn: aiosqlite.Connection, path: str) -> bool:
@@ -160,6 +234,36 @@ async def delete_track_by_path(conn: aiosqlite.Connection, path: str) -> bool:
     return cursor.rowcount > 0
 
 
+async def delete_tracks_by_paths(conn: aiosqlite.Connection, paths: Sequence[str]) -> int:
+    """Delete tracks by path (unknown paths are skipped). Returns count of deleted tracks."""
+    deleted = 0
+    for i in range(0, len(paths), _MAX_IN_PARAMS):
+        chunk = list(paths[i : i + _MAX_IN_PARAMS])
+        placeholders = ",".join("?" * len(chunk))
+        cursor = await conn.execute(f"DELETE FROM tracks WHERE path IN ({placeholders});", chunk)
+        deleted += cursor.rowcount
+    return deleted
+
+
+async def list_track_files_under(
+    conn: aiosqlite.Connection, directory: str, *, sep: str = os.sep
+) -> dict[str, tuple[int | None, int | None]]:
+    """
+    Return `{path: (mtime_ns, file_size)}` for every track below `directory`.
+
+    The prefix is matched as a half-open range on `path` (`dir/` <= path < `dir0`),
+    which the UNIQUE index on `tracks.path` serves directly; `LIKE` would not.
+    """
+    prefix = directory.rstrip(sep) + sep
+    upper = prefix[:-1] + chr(ord(sep) + 1)
+    cursor = await conn.execute(
+        "SELECT path, mtime_ns, file_size FROM tracks WHERE path >= ? AND path < ?;",
+        (prefix, upper),
+    )
+    cursor.row_factory = None
+    return {path: (mtime_ns, size) for path, mtime_ns, size in await cursor.fetchall()}
+
+
 async def delete_tracks_by_album_id(conn: aiosqlite.Connection, album_id: int) -> int:
     """Delete all tracks belonging to an album. Returns count of deleted tracks."""
     cursor = await conn.execute("DELETE FROM tracks WHERE album_id = ?;", (album_id,))
@@ -195,8 +299,7 @@ async def list_tracks_by_album(
         """,
         (int(album_id), int(limit), int(offset)),
     )
-    rows = await cursor.fetchall()
-    return [_row_to_track(r) for r in rows]
+    return await _fetch_tracks(cursor)
 
 
 async def list_tracks_by_artist(
@@ -217,8 +320,7 @@ async def list_tracks_by_artist(
         """,
         (int(artist_id), int(limit), int(offset)),
     )
-    rows = await cursor.fetchall()
-    return [_row_to_track(r) for r in rows]
+    return await _fetch_tracks(cursor)
 
 
 async def count_tracks_by_album(conn: aiosqlite.Connection, album_id: int) -> int:
@@ -271,8 +373,7 @@ async def list_tracks_by_year(
         """,
         (int(year), int(limit), int(offset)),
     )
-    rows = await cursor.fetchall()
-    return [_row_to_track(r) for r in rows]
+    return await _fetch_tracks(cursor)
 
 
 async def count_tracks_by_artist_and_year(
@@ -305,8 +406,7 @@ async def list_tracks_by_artist_and_year(
         """,
         (int(artist_id), int(year), int(limit), int(offset)),
     )
-    rows = await cursor.fetchall()
-    return [_row_to_track(r) for r in rows]
+    return await _fetch_tracks(cursor)
 
 
 async def count_tracks_by_album_and_year(
@@ -339,8 +439,7 @@ async def list_tracks_by_album_and_year(
         """,
         (int(album_id), int(year), int(limit), int(offset)),
     )
-    rows = await cursor.fetchall()
-    return [_row_to_track(r) for r in rows]
+    return await _fetch_tracks(cursor)
 
 
 # ---------------------------------------------------------------------------
@@ -375,8 +474,7 @@ async def list_tracks_by_compilation(
         """,
         (int(compilation), int(limit), int(offset)),
     )
-    rows = await cursor.fetchall()
-    return [_row_to_track(r) for r in rows]
+    return await _fetch_tracks(cursor)
 
 
 async def count_tracks_by_compilation_and_year(
@@ -409,8 +507,7 @@ async def list_tracks_by_compilation_and_year(
         """,
         (int(compilation), int(year), int(limit), int(offset)),
     )
-    rows = await cursor.fetchall()
-    return [_row_to_track(r) for r in rows]
+    return await _fetch_tracks(cursor)
 
 
 async def count_tracks_by_compilation_and_artist(
@@ -443,8 +540,7 @@ async def list_tracks_by_compilation_and_artist(
         """,
         (int(compilation), int(artist_id), int(limit), int(offset)),
     )
-    rows = await cursor.fetchall()
-    return [_row_to_track(r) for r in rows]
+    return await _fetch_tracks(cursor)
 
 
 async def count_tracks_by_compilation_artist_and_year(
@@ -478,8 +574,7 @@ async def list_tracks_by_compilation_artist_and_year(
         """,
         (int(compilation), int(artist_id), int(year), int(limit), int(offset)),
     )
-    rows = await cursor.fetchall()
-    return [_row_to_track(r) for r in rows]
+    return await _fetch_tracks(cursor)
 
 
 async def count_tracks_by_compilation_and_album(
@@ -512,8 +607,7 @@ async def list_tracks_by_compilation_and_album(
         """,
         (int(compilation), int(album_id), int(limit), int(offset)),
     )
-    rows = await cursor.fetchall()
-    return [_row_to_track(r) for r in rows]
+    return await _fetch_tracks(cursor)
 
 
 async def count_tracks_by_compilation_album_and_year(
@@ -547,8 +641,7 @@ async def list_tracks_by_compilation_album_and_year(
         """,
         (int(compilation), int(album_id), int(year), int(limit), int(offset)),
     )
-    rows = await cursor.fetchall()
-    return [_row_to_track(r) for r in rows]
+    return await _fetch_tracks(cursor)
 
 
 async def count_tracks_by_compilation_and_genre_id(
@@ -579,17 +672,16 @@ async def list_tracks_by_compilation_and_genre_id(
     order_clause = tracks_order_clause(order_by)
     cursor = await conn.execute(
         f"""
-        SELECT DISTINCT t.*
+        SELECT t.*
         FROM tracks t
-        JOIN track_genres tg ON tg.track_id = t.id
-        WHERE t.compilation = ? AND tg.genre_id = ?
+        WHERE t.compilation = ?
+          AND EXISTS (SELECT 1 FROM track_genres tg WHERE tg.track_id = t.id AND tg.genre_id = ?)
         {order_clause}
         LIMIT ? OFFSET ?;
         """,
         (int(compilation), int(genre_id), int(limit), int(offset)),
     )
-    rows = await cursor.fetchall()
-    return [_row_to_track(r) for r in rows]
+    return await _fetch_tracks(cursor)
 
 
 # ---------------------------------------------------------------------------
@@ -622,17 +714,15 @@ async def list_tracks_by_genre_id(
     order_clause = tracks_order_clause(order_by)
     cursor = await conn.execute(
         f"""
-        SELECT DISTINCT t.*
+        SELECT t.*
         FROM tracks t
-        JOIN track_genres tg ON tg.track_id = t.id
-        WHERE tg.genre_id = ?
+        WHERE EXISTS (SELECT 1 FROM track_genres tg WHERE tg.track_id = t.id AND tg.genre_id = ?)
         {order_clause}
         LIMIT ? OFFSET ?;
         """,
         (int(genre_id), int(limit), int(offset)),
     )
-    rows = await cursor.fetchall()
-    return [_row_to_track(r) for r in rows]
+    return await _fetch_tracks(cursor)
 
 
 async def count_tracks_by_genre_and_year(
@@ -663,17 +753,16 @@ async def list_tracks_by_genre_and_year(
     order_clause = tracks_order_clause(order_by)
     cursor = await conn.execute(
         f"""
-        SELECT DISTINCT t.*
+        SELECT t.*
         FROM tracks t
-        JOIN track_genres tg ON tg.track_id = t.id
-        WHERE tg.genre_id = ? AND t.year = ?
+        WHERE EXISTS (SELECT 1 FROM track_genres tg WHERE tg.track_id = t.id AND tg.genre_id = ?)
+          AND t.year = ?
         {order_clause}
         LIMIT ? OFFSET ?;
         """,
         (int(genre_id), int(year), int(limit), int(offset)),
     )
-    rows = await cursor.fetchall()
-    return [_row_to_track(r) for r in rows]
+    return await _fetch_tracks(cursor)
 
 
 async def count_tracks_by_genre_and_artist(
@@ -704,17 +793,16 @@ async def list_tracks_by_genre_and_artist(
     order_clause = tracks_order_clause(order_by)
     cursor = await conn.execute(
         f"""
-        SELECT DISTINCT t.*
+        SELECT t.*
         FROM tracks t
-        JOIN track_genres tg ON tg.track_id = t.id
-        WHERE tg.genre_id = ? AND t.artist_id = ?
+        WHERE EXISTS (SELECT 1 FROM track_genres tg WHERE tg.track_id = t.id AND tg.genre_id = ?)
+          AND t.artist_id = ?
         {order_clause}
         LIMIT ? OFFSET ?;
         """,
         (int(genre_id), int(artist_id), int(limit), int(offset)),
     )
-    rows = await cursor.fetchall()
-    return [_row_to_track(r) for r in rows]
+    return await _fetch_tracks(cursor)
 
 
 async def count_tracks_by_genre_artist_and_year(
@@ -746,17 +834,17 @@ async def list_tracks_by_genre_artist_and_year(
     order_clause = tracks_order_clause(order_by)
     cursor = await conn.execute(
         f"""
-        SELECT DISTINCT t.*
+        SELECT t.*
         FROM tracks t
-        JOIN track_genres tg ON tg.track_id = t.id
-        WHERE tg.genre_id = ? AND t.artist_id = ? AND t.year = ?
+        WHERE EXISTS (SELECT 1 FROM track_genres tg WHERE tg.track_id = t.id AND tg.genre_id = ?)
+          AND t.artist_id = ?
+          AND t.year = ?
         {order_clause}
         LIMIT ? OFFSET ?;
         """,
         (int(genre_id), int(artist_id), int(year), int(limit), int(offset)),
     )
-    rows = await cursor.fetchall()
-    return [_row_to_track(r) for r in rows]
+    return await _fetch_tracks(cursor)
 
 
 async def count_tracks_by_genre_and_album(
@@ -787,17 +875,16 @@ async def list_tracks_by_genre_and_album(
     order_clause = tracks_order_clause(order_by)
     cursor = await conn.execute(
         f"""
-        SELECT DISTINCT t.*
+        SELECT t.*
         FROM tracks t
-        JOIN track_genres tg ON tg.track_id = t.id
-        WHERE tg.genre_id = ? AND t.album_id = ?
+        WHERE EXISTS (SELECT 1 FROM track_genres tg WHERE tg.track_id = t.id AND tg.genre_id = ?)
+          AND t.album_id = ?
         {order_clause}
         LIMIT ? OFFSET ?;
         """,
         (int(genre_id), int(album_id), int(limit), int(offset)),
     )
-    rows = await cursor.fetchall()
-    return [_row_to_track(r) for r in rows]
+    return await _fetch_tracks(cursor)
 
 
 async def count_tracks_by_genre_album_and_year(
@@ -829,17 +916,17 @@ async def list_tracks_by_genre_album_and_year(
     order_clause = tracks_order_clause(order_by)
     cursor = await conn.execute(
         f"""
-        SELECT DISTINCT t.*
+        SELECT t.*
         FROM tracks t
-        JOIN track_genres tg ON tg.track_id = t.id
-        WHERE tg.genre_id = ? AND t.album_id = ? AND t.year = ?
+        WHERE EXISTS (SELECT 1 FROM track_genres tg WHERE tg.track_id = t.id AND tg.genre_id = ?)
+          AND t.album_id = ?
+          AND t.year = ?
         {order_clause}
         LIMIT ? OFFSET ?;
         """,
         (int(genre_id), int(album_id), int(year), int(limit), int(offset)),
     )
-    rows = await cursor.fetchall()
-    return [_row_to_track(r) for r in rows]
+    return await _fetch_tracks(cursor)
 
 
 # ---------------------------------------------------------------------------
@@ -872,17 +959,15 @@ async def list_tracks_by_role_id(
     order_clause = tracks_order_clause(order_by)
     cursor = await conn.execute(
         f"""
-        SELECT DISTINCT t.*
+        SELECT t.*
         FROM tracks t
-        JOIN contributor_tracks ct ON ct.track_id = t.id
-        WHERE ct.role_id = ?
+        WHERE EXISTS (SELECT 1 FROM contributor_tracks ct WHERE ct.track_id = t.id AND ct.role_id = ?)
         {order_clause}
         LIMIT ? OFFSET ?;
         """,
         (int(role_id), int(limit), int(offset)),
     )
-    rows = await cursor.fetchall()
-    return [_row_to_track(r) for r in rows]
+    return await _fetch_tracks(cursor)
 
 
 async def count_tracks_by_role_and_genre_id(
@@ -914,18 +999,16 @@ async def list_tracks_by_role_and_genre_id(
     order_clause = tracks_order_clause(order_by)
     cursor = await conn.execute(
         f"""
-        SELECT DISTINCT t.*
+        SELECT t.*
         FROM tracks t
-        JOIN contributor_tracks ct ON ct.track_id = t.id
-        JOIN track_genres tg ON tg.track_id = t.id
-        WHERE ct.role_id = ? AND tg.genre_id = ?
+        WHERE EXISTS (SELECT 1 FROM contributor_tracks ct WHERE ct.track_id = t.id AND ct.role_id = ?)
+          AND EXISTS (SELECT 1 FROM track_genres tg WHERE tg.track_id = t.id AND tg.genre_id = ?)
         {order_clause}
         LIMIT ? OFFSET ?;
         """,
         (int(role_id), int(genre_id), int(limit), int(offset)),
     )
-    rows = await cursor.fetchall()
-    return [_row_to_track(r) for r in rows]
+    return await _fetch_tracks(cursor)
 
 
 async def count_tracks_by_role_and_year(conn: aiosqlite.Connection, role_id: int, year: int) -> int:
@@ -954,17 +1037,16 @@ async def list_tracks_by_role_and_year(
     order_clause = tracks_order_clause(order_by)
     cursor = await conn.execute(
         f"""
-        SELECT DISTINCT t.*
+        SELECT t.*
         FROM tracks t
-        JOIN contributor_tracks ct ON ct.track_id = t.id
-        WHERE ct.role_id = ? AND t.year = ?
+        WHERE EXISTS (SELECT 1 FROM contributor_tracks ct WHERE ct.track_id = t.id AND ct.role_id = ?)
+          AND t.year = ?
         {order_clause}
         LIMIT ? OFFSET ?;
         """,
         (int(role_id), int(year), int(limit), int(offset)),
     )
-    rows = await cursor.fetchall()
-    return [_row_to_track(r) for r in rows]
+    return await _fetch_tracks(cursor)
 
 
 async def count_tracks_by_role_and_compilation(
@@ -995,14 +1077,13 @@ async def list_tracks_by_role_and_compilation(
     order_clause = tracks_order_clause(order_by)
     cursor = await conn.execute(
         f"""
-        SELECT DISTINCT t.*
+        SELECT t.*
         FROM tracks t
-        JOIN contributor_tracks ct ON ct.track_id = t.id
-        WHERE ct.role_id = ? AND t.compilation = ?
+        WHERE EXISTS (SELECT 1 FROM contributor_tracks ct WHERE ct.track_id = t.id AND ct.role_id = ?)
+          AND t.compilation = ?
         {order_clause}
         LIMIT ? OFFSET ?;
         """,
         (int(role_id), int(compilation), int(limit), int(offset)),
     )
-    rows = await cursor.fetchall()
-    return [_row_to_track(r) for r in rows]
+    return await _fetch_tracks(cursor)
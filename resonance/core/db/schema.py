@@ -23,8 +23,10 @@ from typing import Final
 
 import aiosqlite
 
+from resonance.core.db.models import sort_key
+
 # Bump when you change the schema and add a migration in `migrate()`.
-SCHEMA_VERSION: Final[int] = 8
+SCHEMA_VERSION: Final[int] = 11
 
 
 async def ensure_schema(conn: aiosqlite.Connection) -> None:
@@ -364,5 +366,135 @@ async def migrate(conn: aiosqlite.Connection, *, from_version: int, to_version:
         await conn.commit()
         from_version = 8
 
+    # v8 -> v9
+    if from_version == 8 and to_version >= 9:
+        # Persistent per-player queues (compact id arrays, see core/playlist.py)
+        await conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS player_playlists (
+                player_id TEXT PRIMARY KEY,
+                track_ids BLOB NOT NULL,
+                shuffle_order BLOB,
+                adhoc_paths TEXT,
+                current_index INTEGER NOT NULL DEFAULT 0,
+                repeat_mode INTEGER NOT NULL DEFAULT 0,
+                shuffle_mode INTEGER NOT NULL DEFAULT 0,
+                updated_at INTEGER NOT NULL DEFAULT (CAST(strftime('%s', 'now') AS INTEGER))
+            )
+            """
+        )
+
+        await conn.commit()
+        from_version = 9
+
+    # v9 -> v10
+    if from_version == 9 and to_version >= 10:
+        # Normalized sort keys (see models.sort_key) so browse ORDER BYs can be
+        # served from plain BINARY indexes instead of a temp B-tree per page.
+        await conn.execute("ALTER TABLE tracks ADD COLUMN title_sort TEXT NOT NULL DEFAULT '';")
+        await conn.execute("ALTER TABLE tracks ADD COLUMN album_sort TEXT NOT NULL DEFAULT '';")
+        await conn.execute("ALTER TABLE tracks ADD COLUMN artist_sort TEXT NOT NULL DEFAULT '';")
+        await conn.execute("ALTER TABLE tracks ADD COLUMN disc_sort INTEGER NOT NULL DEFAULT 0;")
+        await conn.execute("ALTER TABLE tracks ADD COLUMN track_sort INTEGER NOT NULL DEFAULT 0;")
+        await conn.execute("ALTER TABLE albums ADD COLUMN artist_sort TEXT NOT NULL DEFAULT '';")
+
+        await _backfill_sort_keys(conn, "artists", {"name": "name_sort"})
+        await _backfill_sort_keys(conn, "genres", {"name": "name_sort"})
+        await _backfill_sort_keys(conn, "contributors", {"name": "name_sort"})
+        await _backfill_sort_keys(conn, "albums", {"title": "title_sort"})
+        await _backfill_sort_keys(
+            conn,
+            "tracks",
+            {"title": "title_sort", "album": "album_sort", "artist": "artist_sort"},
+        )
+        await conn.execute(
+            "UPDATE tracks SET disc_sort = COALESCE(disc_no, 0), track_sort = COALESCE(track_no, 0);"
+        )
+        await conn.execute(
+            """
+            UPDATE albums
+            SET artist_sort = COALESCE(
+                (SELECT ar.name_sort FROM artists ar WHERE ar.id = albums.artist_id), ''
+            )
+            """
+        )
+
+        # Composite indexes per (filter, order) pair used by the browse queries
+        # (see ordering.py). The rowid is the implicit last key, which serves the
+        # `id ASC` tiebreaker. The filter-only indexes they supersede are dropped.
+        for name, columns in (
+            ("idx_tracks_title_sort", "title_sort"),
+            ("idx_tracks_tracknum_sort", "disc_sort, track_sort, title_sort"),
+            ("idx_tracks_album_sort", "album_sort, disc_sort, track_sort, title_sort"),
+            ("idx_tracks_artist_sort", "artist_sort, album_sort, disc_sort, track_sort, title_sort"),
+            ("idx_tracks_year_sort", "year, album_sort, disc_sort, track_sort, title_sort"),
+            ("idx_tracks_year_title_sort", "year, title_sort"),
+            ("idx_tracks_compilation_sort", "compilation, title_sort"),
+            ("idx_tracks_album_id_sort", "album_id, disc_sort, track_sort, title_sort"),
+            ("idx_tracks_artist_id_sort", "artist_id, album_sort, disc_sort, track_sort, title_sort"),
+        ):
+            await conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON tracks({columns});")
+        for name, columns in (
+            ("idx_albums_title_sort", "title_sort"),
+            ("idx_albums_artist_sort", "artist_sort, title_sort"),
+            ("idx_albums_year_sort", "year, title_sort"),
+            ("idx_albums_compilation_sort", "compilation, title_sort"),
+            ("idx_albums_artist_id_sort", "artist_id, title_sort"),
+        ):
+            await conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON albums({columns});")
+        await conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_track_genres_genre_track ON track_genres(genre_id, track_id);"
+        )
+        await conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_contributor_tracks_contributor_role "
+            "ON contributor_tracks(contributor_id, role_id);"
+        )
+        await conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_roles_name_nocase ON roles(name COLLATE NOCASE);"
+        )
+        for name in (
+            "idx_tracks_artist_id",
+            "idx_tracks_album_id",
+            "idx_albums_artist_id",
+            "idx_albums_year",
+            "idx_albums_compilation",
+            "idx_track_genres_genre",
+            "idx_contributor_tracks_contributor",
+        ):
+            await conn.execute(f"DROP INDEX IF EXISTS {name};")
+
+        await conn.commit()
+        from_version = 10
+
+    # v10 -> v11
+    if from_version == 10 and to_version >= 11:
+        # Directory mtimes from the last walk, so incremental rescans can skip
+        # listing directories whose entries have not changed (see scanner.walk_audio_files).
+        await conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS scan_directories (
+                path TEXT PRIMARY KEY,
+                mtime_ns INTEGER NOT NULL
+            ) WITHOUT ROWID
+            """
+        )
+
+        await conn.commit()
+        from_version = 11
+
     if from_version != to_version:
         raise RuntimeError(f"No migration path from {from_version} to {to_version}.")
+
+
+async def _backfill_sort_keys(
+    conn: aiosqlite.Connection, table: str, columns: dict[str, str]
+) -> None:
+    """Fill `*_sort` columns from their source columns (Python-side casefolding)."""
+    sources = ", ".join(columns)
+    targets = ", ".join(f"{target} = ?" for target in columns.values())
+    cursor = await conn.execute(f"SELECT id, {sources} FROM {table};")
+    rows = await cursor.fetchall()
+    await conn.executemany(
+        f"UPDATE {table} SET {targets} WHERE id = ?;",
+        [(*(sort_key(v) for v in tuple(row)[1:]), row[0]) for row in rows],
+    )
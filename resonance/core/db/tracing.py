@@ -0,0 +1,314 @@
+"""
+Opt-in SQL tracing and slow-query log for `LibraryDb`.
+
+When browse gets slow, the per-function histogram (`resonance_db_query_seconds`)
+shows which `queries_*` function is slow but not which statement, how many
+rows it produced or how SQLite executed it. The tracer answers that.
+
+Design:
+- Disabled by default. `LibraryDb._require_conn()` hands out the raw
+  connection unless ``sql_tracer.enabled``, so a disabled tracer costs one
+  attribute lookup per query.
+- When enabled, callers get a `TracedConnection`: `execute` and
+  `executemany` are timed, and the returned cursor counts the rows fetched
+  and adds the fetch time to the same statement.
+- Statements are aggregated by their SQL text with whitespace collapsed and
+  ``IN (?, ?, ...)`` lists folded, so chunked queries share one entry.
+- A statement whose execute + fetch time reaches `slow_ms` goes to the slow
+  log (a ring) and to the log, with its `EXPLAIN QUERY PLAN`. The plan is
+  looked up once per statement and reused.
+- The `queries_*` function that issued a statement (the `_TimedQueries`
+  label in library_db) is kept as the statement's source.
+
+Notes:
+- Like `frame_tracer`, the tracer is a process-wide instance; enable it with
+  ``--trace-sql`` or at runtime via ``POST /api/admin/sql``.
+- Bound parameters can contain paths and search terms, so the slow log keeps
+  a truncated repr of them and is only served by the admin endpoints.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import sqlite3
+import time
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import aiosqlite
+
+logger = logging.getLogger(__name__)
+
+# Statements at least this slow (execute + fetch) are logged with their plan.
+DEFAULT_SLOW_MS = 50.0
+
+# Slow executions kept for /api/admin/sql.
+SLOW_LOG_CAPACITY = 100
+
+# Statements returned by `top()` unless asked otherwise.
+DEFAULT_TOP_N = 20
+
+# Distinct statements tracked; beyond this, new statements are not aggregated.
+MAX_STATEMENTS = 1000
+
+# Characters of the bound parameters' repr kept in the slow log.
+PARAMS_REPR_LIMIT = 200
+
+_WHITESPACE = re.compile(r"\s+")
+_PLACEHOLDER_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+_EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE", "REPLACE")
+
+# `queries_*` function currently running (set by `_TimedQueries` while tracing)
+current_query: ContextVar[str | None] = ContextVar("current_query", default=None)
+
+
+def normalize_sql(sql: str) -> str:
+    """Collapse whitespace and fold placeholder lists (``IN (?, ?, ?)`` -> ``IN (?...)``)."""
+    return _PLACEHOLDER_LIST.sub("?...", _WHITESPACE.sub(" ", sql).strip())
+
+
+@dataclass(slots=True)
+class StatementStats:
+    """Aggregated timings for one normalized statement."""
+
+    sql: str
+    sources: set[str] = field(default_factory=set)
+    calls: int = 0
+    seconds: float = 0.0
+    max_seconds: float = 0.0
+    rows: int = 0
+    slow: int = 0
+    plan: list[str] | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "sql": self.sql,
+            "sources": sorted(self.sources),
+            "calls": self.calls,
+            "total_ms": round(self.seconds * 1000, 3),
+            "mean_ms": round(self.seconds * 1000 / self.calls, 3) if self.calls else 0.0,
+            "max_ms": round(self.max_seconds * 1000, 3),
+            "rows": self.rows,
+            "slow": self.slow,
+            "plan": self.plan,
+        }
+
+
+class _Execution:
+    """One execution of a statement; grows as its cursor is fetched."""
+
+    __slots__ = ("params", "rows", "seconds", "slow_entry", "source", "sql", "stats")
+
+    def __init__(self, stats: StatementStats, sql: str, params: Any, source: str | None) -> None:
+        self.stats = stats
+        self.sql = sql
+        self.params = params
+        self.source = source
+        self.seconds = 0.0
+        self.rows = 0
+        self.slow_entry: dict[str, Any] | None = None  # kept current while fetching
+
+
+class SqlTracer:
+    """Per-statement latency/row stats and a slow-query log."""
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.slow_ms = DEFAULT_SLOW_MS
+        self._stats: dict[str, StatementStats] = {}
+        self._slow: deque[dict[str, Any]] = deque(maxlen=SLOW_LOG_CAPACITY)
+
+    def enable(self, slow_ms: float | None = None) -> None:
+        if slow_ms is not None:
+            self.slow_ms = slow_ms
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def clear(self) -> None:
+        self._stats.clear()
+        self._slow.clear()
+
+    def top(self, n: int = DEFAULT_TOP_N, by: str = "total") -> list[dict[str, Any]]:
+        """The `n` heaviest statements by "total", "max", "mean", "calls" or "rows"."""
+        keys = {
+            "total": lambda s: s.seconds,
+            "max": lambda s: s.max_seconds,
+            "mean": lambda s: s.seconds / s.calls if s.calls else 0.0,
+            "calls": lambda s: s.calls,
+            "rows": lambda s: s.rows,
+        }
+        if by not in keys:
+            raise ValueError(f"by must be one of {', '.join(keys)}")
+        ranked = sorted(self._stats.values(), key=keys[by], reverse=True)
+        return [stats.to_dict() for stats in ranked[:n]]
+
+    def slow_log(self, limit: int | None = None) -> list[dict[str, Any]]:
+        """Slow executions, newest first."""
+        entries = list(reversed(self._slow))
+        return entries[:limit] if limit is not None else entries
+
+    def log_summary(self, n: int = 10) -> None:
+        """Log the `n` statements with the highest total time."""
+        for entry in self.top(n):
+            logger.info(
+                "SQL %8.1f ms total, %5d calls, %7d rows: %s",
+                entry["total_ms"],
+                entry["calls"],
+                entry["rows"],
+                entry["sql"][:200],
+            )
+
+    def _begin(self, sql: str, params: Any) -> _Execution | None:
+        key = normalize_sql(sql)
+        stats = self._stats.get(key)
+        if stats is None:
+            if len(self._stats) >= MAX_STATEMENTS:
+                return None
+            stats = self._stats[key] = StatementStats(key)
+        source = current_query.get()
+        if source is not None:
+            stats.sources.add(source)
+        stats.calls += 1
+        return _Execution(stats, sql, params, source)
+
+    async def _add(
+        self,
+        conn: aiosqlite.Connection,
+        execution: _Execution,
+        seconds: float,
+        rows: int = 0,
+    ) -> None:
+        stats = execution.stats
+        execution.seconds += seconds
+        execution.rows += rows
+        stats.seconds += seconds
+        stats.rows += rows
+        stats.max_seconds = max(stats.max_seconds, execution.seconds)
+        entry = execution.slow_entry
+        if entry is not None:
+            entry["ms"] = round(execution.seconds * 1000, 3)
+            entry["rows"] = execution.rows
+            return
+        if execution.seconds * 1000 < self.slow_ms:
+            return
+
+        stats.slow += 1
+        if stats.plan is None:
+            stats.plan = await _explain(conn, execution.sql, execution.params)
+        execution.slow_entry = {
+            "at": time.time(),
+            "ms": round(execution.seconds * 1000, 3),
+            "rows": execution.rows,
+            "sql": stats.sql,
+            "params": repr(execution.params)[:PARAMS_REPR_LIMIT],
+            "source": execution.source,
+            "plan": stats.plan,
+        }
+        self._slow.append(execution.slow_entry)
+        logger.warning(
+            "Slow query (%.1f ms, %d rows so far) from %s: %s\n  plan: %s",
+            execution.seconds * 1000,
+            execution.rows,
+            execution.source or "LibraryDb",
+            stats.sql[:500],
+            "; ".join(stats.plan) or "-",
+        )
+
+
+async def _explain(conn: aiosqlite.Connection, sql: str, params: Any) -> list[str]:
+    if params is None or not sql.lstrip("( \n").upper().startswith(_EXPLAINABLE):
+        return []
+    try:
+        cursor = await conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        rows = await cursor.fetchall()
+    except (sqlite3.Error, ValueError) as e:
+        logger.debug("EXPLAIN QUERY PLAN failed: %s", e)
+        return []
+    return [str(row[3]) for row in rows]
+
+
+sql_tracer = SqlTracer()
+
+
+class TracedCursor:
+    """Cursor proxy adding fetch time and row counts to its execution."""
+
+    def __init__(
+        self,
+        cursor: aiosqlite.Cursor,
+        conn: aiosqlite.Connection,
+        execution: _Execution,
+    ) -> None:
+        self._cursor = cursor
+        self._conn = conn
+        self._execution = execution
+
+    @property
+    def row_factory(self) -> Any:
+        return self._cursor.row_factory
+
+    @row_factory.setter
+    def row_factory(self, factory: Any) -> None:
+        self._cursor.row_factory = factory
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._cursor, name)
+
+    async def fetchone(self) -> Any:
+        started = time.perf_counter()
+        row = await self._cursor.fetchone()
+        elapsed = time.perf_counter() - started
+        await sql_tracer._add(self._conn, self._execution, elapsed, 0 if row is None else 1)
+        return row
+
+    async def fetchmany(self, size: int | None = None) -> Any:
+        started = time.perf_counter()
+        rows = list(await (self._cursor.fetchmany(size) if size else self._cursor.fetchmany()))
+        elapsed = time.perf_counter() - started
+        await sql_tracer._add(self._conn, self._execution, elapsed, len(rows))
+        return rows
+
+    async def fetchall(self) -> Any:
+        started = time.perf_counter()
+        rows = list(await self._cursor.fetchall())
+        elapsed = time.perf_counter() - started
+        await sql_tracer._add(self._conn, self._execution, elapsed, len(rows))
+        return rows
+
+
+class TracedConnection:
+    """`aiosqlite.Connection` proxy that feeds `sql_tracer`."""
+
+    def __init__(self, conn: aiosqlite.Connection) -> None:
+        self._conn = conn
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._conn, name)
+
+    async def execute(self, sql: str, parameters: Any = None) -> Any:
+        execution = sql_tracer._begin(sql, () if parameters is None else parameters)
+        started = time.perf_counter()
+        if parameters is None:
+            cursor = await self._conn.execute(sql)
+        else:
+            cursor = await self._conn.execute(sql, parameters)
+        if execution is None:
+            return cursor
+        rows = max(cursor.rowcount, 0)
+        await sql_tracer._add(self._conn, execution, time.perf_counter() - started, rows)
+        return TracedCursor(cursor, self._conn, execution)
+
+    async def executemany(self, sql: str, parameters: Any) -> Any:
+        execution = sql_tracer._begin(sql, None)
+        started = time.perf_counter()
+        cursor = await self._conn.executemany(sql, parameters)
+        if execution is not None:
+            rows = max(cursor.rowcount, 0)
+            await sql_tracer._add(self._conn, execution, time.perf_counter() - started, rows)
+        return cursor
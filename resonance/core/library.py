@@ -2,12 +2,30 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from dataclasses import dataclass
+import os
+from dataclasses import dataclass, field, replace
 from pathlib import Path
-from typing import Iterable, NewType, Sequence
-
-from resonance.core.library_db import LibraryDb, UpsertTrack
-from resonance.core.scanner import ScanConfig, scan_music_folder
+from typing import TYPE_CHECKING, NewType
+
+from resonance.core.library_db import LibraryDb, TrackRow, UpsertTrack
+from resonance.core.scanner import (
+    DEFAULT_AUDIO_EXTENSIONS,
+    DEFAULT_SCAN_CONCURRENCY,
+    DeviceBudget,
+    ScanConfig,
+    TrackMetadata,
+    device_budget,
+    scan_music_folder,
+    scan_paths,
+)
+from resonance.core.watcher import (
+    DEFAULT_DEBOUNCE_SECONDS,
+    DEFAULT_POLL_INTERVAL_SECONDS,
+    LibraryWatcher,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Mapping, Sequence
 
 logger = logging.getLogger(__name__)
 
@@ -34,25 +52,9 @@ class Album:
     track_count: int | None = None
 
 
-@dataclass(frozen=True, slots=True)
-class Track:
-    id: TrackId
-    path: str
-    title: str
-    artist_id: ArtistId | None = None
-    album_id: AlbumId | None = None
-    artist_name: str | None = None
-    album_title: str | None = None
-    year: int | None = None
-    duration_ms: int | None = None
-    disc_no: int | None = None
-    track_no: int | None = None
-    compilation: int = 0
-    # Audio quality metadata
-    sample_rate: int | None = None
-    bit_depth: int | None = None
-    bitrate: int | None = None
-    channels: int | None = None
+# Tracks share one representation across the DB, playlist and JSON layers.
+# (`TrackRow` also exposes `artist_name` / `album_title` for this API.)
+Track = TrackRow
 
 
 @dataclass(frozen=True, slots=True)
@@ -64,9 +66,35 @@ class ScanResult:
     errors: int
 
 
+@dataclass
+class RootScanStatus:
+    """Progress of one music root within a scan."""
+
+    path: str
+    device: int = 0
+    device_kind: str = "unknown"
+    max_concurrency: int = DEFAULT_SCAN_CONCURRENCY
+    state: str = "pending"  # pending | scanning | done | failed
+    files_total: int = 0
+    files_done: int = 0
+    tracks_found: int = 0
+    errors: int = 0
+
+    @property
+    def progress(self) -> float:
+        if self.state in ("done", "failed"):
+            return 1.0
+        return self.files_done / self.files_total if self.files_total else 0.0
+
+
 @dataclass
 class ScanStatus:
-    """Status of a running or completed scan."""
+    """
+    Status of a running or completed scan.
+
+    Roots are scanned concurrently (one worker per device), so the aggregate
+    fields are derived from `roots` by `refresh()`.
+    """
 
     is_running: bool = False
     progress: float = 0.0  # 0.0 to 1.0
@@ -76,6 +104,19 @@ class ScanStatus:
     tracks_found: int = 0
     errors: int = 0
     last_result: ScanResult | None = None
+    roots: list[RootScanStatus] = field(default_factory=list)
+
+    def refresh(self) -> None:
+        """Recompute the aggregate fields from the per-root progress."""
+        if not self.roots:
+            return
+        self.folders_total = len(self.roots)
+        self.folders_done = sum(1 for r in self.roots if r.state in ("done", "failed"))
+        self.progress = sum(r.progress for r in self.roots) / len(self.roots)
+        self.tracks_found = sum(r.tracks_found for r in self.roots)
+        self.errors = sum(r.errors for r in self.roots)
+        active = [r.path for r in self.roots if r.state == "scanning"]
+        self.current_folder = active[0] if active else ""
 
 
 @dataclass(frozen=True, slots=True)
@@ -113,6 +154,7 @@ class MusicLibrary:
         self._initialized = False
         self._scan_status = ScanStatus()
         self._scan_task: asyncio.Task | None = None
+        self._watcher: LibraryWatcher | None = None
 
     @property
     def initialized(self) -> bool:
@@ -132,6 +174,11 @@ class MusicLibrary:
         """Check if a scan is currently running."""
         return self._scan_status.is_running
 
+    @property
+    def generation(self) -> int:
+        """Library content generation (see `LibraryDb.generation`)."""
+        return self._db.generation
+
     async def initialize(self) -> None:
         """
         Initialize underlying storage and prepare the library.
@@ -148,13 +195,18 @@ class MusicLibrary:
         await self._db.ensure_schema()
         self._initialized = True
 
-    async def scan(self, *, roots: Sequence[Path] | None = None) -> ScanResult:
+    async def scan(
+        self, *, roots: Sequence[Path] | None = None, incremental: bool = False
+    ) -> ScanResult:
         """
         Scan music folders and update the library DB.
 
         We keep scanning & persistence separate internally:
         - scanner returns normalized metadata
         - db upserts rows (idempotent)
+
+        With `incremental=True`, directories whose mtime is unchanged since the
+        previous scan are not listed or re-read (see `scanner.walk_audio_files`).
         """
         self._require_initialized()
 
@@ -164,55 +216,226 @@ class MusicLibrary:
         if not scan_roots:
             raise MusicLibraryError("No scan roots provided and no music_root configured.")
 
-        scanned_files = 0
-        errors = 0
-        upserted = 0
-
-        for root in scan_roots:
-            scan_cfg = ScanConfig(root=root)
-            result = await scan_music_folder(scan_cfg)
-
-            scanned_files += len(result.tracks) + len(result.issues)
-            errors += len(result.issues)
-
-            to_upsert: list[UpsertTrack] = []
-            for tm in result.tracks:
-                stat = tm.path.stat()
-                to_upsert.append(
-                    UpsertTrack(
-                        path=str(tm.path),
-                        title=tm.title,
-                        artist=tm.artist,
-                        album=tm.album,
-                        album_artist=tm.album_artist,
-                        track_no=tm.track_number,
-                        disc_no=tm.disc_number,
-                        year=tm.year,
-                        duration_ms=tm.duration_ms,
-                        file_size=stat.st_size,
-                        mtime_ns=stat.st_mtime_ns,
-                        has_artwork=tm.has_artwork,
-                        genres=tm.genres,
-                        compilation=tm.compilation,
-                        contributors=tm.contributors,
-                        sample_rate=tm.sample_rate,
-                        bit_depth=tm.bit_depth,
-                        bitrate=tm.bitrate,
-                        channels=tm.channels,
-                    )
+        statuses = [RootScanStatus(path=str(root)) for root in scan_roots]
+        failures = await self._scan_roots(scan_roots, statuses, incremental=incremental)
+        await self._after_scan()
+        if failures:
+            raise failures[0]
+        return _scan_result(statuses)
+
+    async def _scan_roots(
+        self,
+        roots: Sequence[Path],
+        statuses: Sequence[RootScanStatus],
+        status: ScanStatus | None = None,
+        *,
+        incremental: bool = False,
+    ) -> list[Exception]:
+        """
+        Scan `roots` concurrently, one worker per device (`st_dev`).
+
+        Roots on the same device run one after another and share that device's
+        extraction budget (see `scanner.device_budget`), so a spinning disk is
+        not hit by several tree walks at once while other devices sit idle.
+        Per-root progress is written to `statuses` (and `status.refresh()`d).
+        Returns the exceptions of roots that failed.
+        """
+        budgets = await asyncio.to_thread(lambda: [_safe_device_budget(r) for r in roots])
+
+        groups: dict[int, list[int]] = {}
+        for i, budget in enumerate(budgets):
+            statuses[i].device = budget.device
+            statuses[i].device_kind = budget.kind
+            statuses[i].max_concurrency = budget.max_concurrency
+            # Unknown devices (-1) each get their own worker.
+            groups.setdefault(budget.device if budget.device >= 0 else -1 - i, []).append(i)
+
+        failures: list[Exception] = []
+
+        def _refresh() -> None:
+            if status is not None:
+                status.refresh()
+
+        async def _device_worker(indexes: list[int]) -> None:
+            budget = budgets[indexes[0]]
+            semaphore = asyncio.Semaphore(max(1, budget.max_concurrency))
+            for i in indexes:
+                root, root_status = roots[i], statuses[i]
+                root_status.state = "scanning"
+                _refresh()
+                logger.info(
+                    "Scanning %s (%s device, concurrency %d)",
+                    root,
+                    budget.kind,
+                    budget.max_concurrency,
                 )
+                try:
+                    await self._scan_root(
+                        root, semaphore, root_status, _refresh, incremental=incremental
+                    )
+                except Exception as e:
+                    logger.error("Error scanning folder %s: %s", root, e)
+                    root_status.state = "failed"
+                    root_status.errors += 1
+                    failures.append(e)
+                else:
+                    root_status.state = "done"
+                _refresh()
+
+        await asyncio.gather(*(_device_worker(indexes) for indexes in groups.values()))
+        return failures
+
+    async def _after_scan(self) -> None:
+        """Refresh the planner's statistics for the new library contents."""
+        async with self._db.write_lock:
+            try:
+                await self._db.after_scan()
+            except Exception as e:
+                logger.warning("Post-scan DB maintenance failed: %s", e)
+
+    async def _scan_root(
+        self,
+        root: Path,
+        semaphore: asyncio.Semaphore,
+        root_status: RootScanStatus,
+        refresh: Callable[[], None],
+        *,
+        incremental: bool = False,
+    ) -> None:
+        def _on_progress(done: int, total: int) -> None:
+            root_status.files_done = done
+            root_status.files_total = total
+            refresh()
+
+        known = await self._db.load_directory_mtimes(str(root)) if incremental else None
+        scan_cfg = ScanConfig(
+            root=root, max_concurrency=root_status.max_concurrency, known_directories=known
+        )
+        result = await scan_music_folder(scan_cfg, semaphore=semaphore, on_progress=_on_progress)
 
-            upserted += await self._db.upsert_tracks(to_upsert)
+        root_status.files_total = len(result.tracks) + len(result.issues)
+        root_status.files_done = root_status.files_total
+        root_status.errors = len(result.issues)
 
-        # For MVP we don't distinguish added vs updated yet (DB layer could be extended later).
+        to_upsert = [_to_upsert(tm) for tm in result.tracks]
+        async with self._db.write_lock:
+            root_status.tracks_found = await self._db.upsert_tracks(to_upsert)
+            await self._db.replace_directory_mtimes(str(root), result.directories)
+            await self._db.commit()
+
+    async def sync_directories(self, directories: Mapping[Path, bool]) -> ScanResult:
+        """
+        Reconcile the DB with the current contents of `directories`.
+
+        Each value says whether the whole subtree (True) or only the files
+        directly inside the directory (False) are compared. Only files whose
+        mtime/size differ from the DB are re-extracted; tracks whose files are
+        gone are deleted. This is what the filesystem watcher feeds.
+
+        A directory whose files are gone is skipped, not emptied, while the
+        music folder containing it is missing, unreadable or empty: that is
+        what an unmounted NFS/SMB share looks like, and deleting its tracks
+        would give them new ids (breaking saved queues) once it is back.
+        """
+        self._require_initialized()
+
+        roots = await self._watch_roots()
+        unavailable: set[Path] = set()
+        changed: list[Path] = []
+        removed: list[str] = []
+        for directory, recursive in directories.items():
+            known = await self._db.list_track_files_under(str(directory))
+            if not recursive:
+                known = {p: st for p, st in known.items() if Path(p).parent == directory}
+            on_disk = await asyncio.to_thread(_stat_audio_files, directory, recursive)
+            gone = [p for p in known if p not in on_disk]
+            if gone:
+                root = _root_of(directory, roots)
+                if root is not None and (
+                    root in unavailable or not await asyncio.to_thread(_has_entries, root)
+                ):
+                    if root not in unavailable:
+                        unavailable.add(root)
+                        logger.warning(
+                            "Not syncing %s: music folder is missing, unreadable or empty "
+                            "(unmounted?); keeping its tracks",
+                            root,
+                        )
+                    continue
+            changed.extend(Path(p) for p, st in on_disk.items() if known.get(p) != st)
+            removed.extend(gone)
+
+        result = await scan_paths(changed)
+        async with self._db.write_lock:
+            upserted = await self._db.upsert_tracks(_to_upsert(tm) for tm in result.tracks)
+            deleted = 0
+            if removed:
+                deleted = await self._db.delete_tracks_by_paths(removed)
+                await self._db.cleanup_orphans()
+            await self._db.commit()
+
+        if upserted or deleted:
+            logger.info(
+                "Synced %d directories: %d tracks updated, %d removed",
+                len(directories),
+                upserted,
+                deleted,
+            )
         return ScanResult(
-            scanned_files=scanned_files,
+            scanned_files=len(changed),
             added_tracks=0,
             updated_tracks=upserted,
             skipped_files=0,
-            errors=errors,
+            errors=len(result.issues),
         )
 
+    # ---- Filesystem watcher ----
+
+    @property
+    def is_watching(self) -> bool:
+        return self._watcher is not None
+
+    async def start_watching(
+        self,
+        *,
+        debounce: float = DEFAULT_DEBOUNCE_SECONDS,
+        poll_interval: float = DEFAULT_POLL_INTERVAL_SECONDS,
+        use_inotify: bool = True,
+    ) -> None:
+        """
+        Keep the library in sync with the music folders as files change.
+
+        Uses inotify on local Linux filesystems and directory polling elsewhere
+        (see `resonance.core.watcher`). Folder changes made through this facade
+        update the watched roots automatically.
+        """
+        self._require_initialized()
+        if self._watcher is not None:
+            return
+        self._watcher = LibraryWatcher(
+            self.sync_directories,
+            debounce=debounce,
+            poll_interval=poll_interval,
+            use_inotify=use_inotify,
+        )
+        await self._watcher.start(await self._watch_roots())
+
+    async def stop_watching(self) -> None:
+        if self._watcher is None:
+            return
+        watcher, self._watcher = self._watcher, None
+        await watcher.stop()
+
+    async def _watch_roots(self) -> list[Path]:
+        roots = [Path(p) for p in await self._db.list_music_folders()]
+        if self._music_root is not None and self._music_root not in roots:
+            roots.append(self._music_root)
+        return roots
+
+    async def _refresh_watch_roots(self) -> None:
+        if self._watcher is not None:
+            await self._watcher.set_roots(await self._watch_roots())
+
     # ---- Browse APIs (build the web UI / JSON-RPC on top of these) ----
 
     async def get_artists(self, *, offset: int = 0, limit: int = 100) -> tuple[Artist, ...]:
@@ -280,41 +503,14 @@ class MusicLibrary:
         else:
             rows = await self._db.list_tracks_by_album(int(album_id), limit=limit, offset=offset)
 
-        return tuple(
-            Track(
-                id=TrackId(r.id),
-                path=r.path,
-                title=r.title or Path(r.path).stem,
-                artist_id=ArtistId(r.artist_id) if r.artist_id else None,
-                album_id=AlbumId(r.album_id) if r.album_id else None,
-                artist_name=r.artist,
-                album_title=r.album,
-                year=r.year,
-                duration_ms=r.duration_ms,
-                disc_no=r.disc_no,
-                track_no=r.track_no,
-            )
-            for r in rows
-        )
+        return tuple(_with_display_title(r) for r in rows)
 
     async def get_track_by_id(self, track_id: TrackId) -> Track | None:
         self._require_initialized()
         row = await self._db.get_track_by_id(int(track_id))
         if row is None:
             return None
-        return Track(
-            id=TrackId(row.id),
-            path=row.path,
-            title=row.title or Path(row.path).stem,
-            artist_id=ArtistId(row.artist_id) if row.artist_id else None,
-            album_id=AlbumId(row.album_id) if row.album_id else None,
-            artist_name=row.artist,
-            album_title=row.album,
-            year=row.year,
-            duration_ms=row.duration_ms,
-            disc_no=row.disc_no,
-            track_no=row.track_no,
-        )
+        return _with_display_title(row)
 
     async def get_track_by_path(self, path: str | Path) -> Track | None:
         """
@@ -325,19 +521,7 @@ class MusicLibrary:
         row = await self._db.get_track_by_path(str(path))
         if row is None:
             return None
-        return Track(
-            id=TrackId(row.id),
-            path=row.path,
-            title=row.title or Path(row.path).stem,
-            artist_id=ArtistId(row.artist_id) if row.artist_id else None,
-            album_id=AlbumId(row.album_id) if row.album_id else None,
-            artist_name=row.artist,
-            album_title=row.album,
-            year=row.year,
-            duration_ms=row.duration_ms,
-            disc_no=row.disc_no,
-            track_no=row.track_no,
-        )
+        return _with_display_title(row)
 
     async def search(self, query: str, *, limit: int = 50) -> SearchResult:
         self._require_initialized()
@@ -347,22 +531,7 @@ class MusicLibrary:
             raise ValueError("limit must be > 0")
 
         rows = await self._db.search_tracks(query, limit=limit, offset=0)
-        tracks = tuple(
-            Track(
-                id=TrackId(r.id),
-                path=r.path,
-                title=r.title or Path(r.path).stem,
-                artist_id=ArtistId(r.artist_id) if r.artist_id else None,
-                album_id=AlbumId(r.album_id) if r.album_id else None,
-                artist_name=r.artist,
-                album_title=r.album,
-                year=r.year,
-                duration_ms=r.duration_ms,
-                disc_no=r.disc_no,
-                track_no=r.track_no,
-            )
-            for r in rows
-        )
+        tracks = tuple(_with_display_title(r) for r in rows)
 
         # MVP: we don't compute separate artist/album results yet; tracks cover the UX.
         return SearchResult(artists=tuple(), albums=tuple(), tracks=tracks)
@@ -404,6 +573,7 @@ class MusicLibrary:
 
         folder_id = await self._db.add_music_folder(str(folder_path))
         logger.info("Added music folder: %s", folder_path)
+        await self._refresh_watch_roots()
         return folder_id
 
     async def remove_music_folder(self, path: str | Path) -> bool:
@@ -421,6 +591,7 @@ class MusicLibrary:
         removed = await self._db.remove_music_folder(folder_path)
         if removed:
             logger.info("Removed music folder: %s", folder_path)
+            await self._refresh_watch_roots()
         return removed
 
     async def set_music_folders(self, paths: list[str | Path]) -> int:
@@ -446,14 +617,18 @@ class MusicLibrary:
 
         count = await self._db.set_music_folders(resolved)
         logger.info("Set %d music folders", count)
+        await self._refresh_watch_roots()
         return count
 
     # ---- Background Scan ----
 
-    async def start_scan(self) -> bool:
+    async def start_scan(self, *, incremental: bool = False) -> bool:
         """
         Start a background scan of all configured music folders.
 
+        Args:
+            incremental: Skip directories unchanged since the previous scan.
+
         Returns:
             True if scan started, False if already running.
         """
@@ -470,67 +645,45 @@ class MusicLibrary:
             return False
 
         # Start background task
-        self._scan_task = asyncio.create_task(self._run_scan(folders))
+        self._scan_task = asyncio.create_task(self._run_scan(folders, incremental=incremental))
         return True
 
-    async def _run_scan(self, folders: list[str]) -> None:
+    async def _run_scan(self, folders: list[str], *, incremental: bool = False) -> None:
         """Run the scan in the background."""
-        self._scan_status = ScanStatus(
+        roots = [Path(folder) for folder in folders]
+        status = ScanStatus(
             is_running=True,
             folders_total=len(folders),
+            roots=[RootScanStatus(path=folder) for folder in folders],
         )
-
-        total_scanned = 0
-        total_upserted = 0
-        total_errors = 0
+        self._scan_status = status
 
         try:
-            for i, folder in enumerate(folders):
-                self._scan_status.current_folder = folder
-                self._scan_status.folders_done = i
-                self._scan_status.progress = i / len(folders) if folders else 0
-
-                logger.info("Scanning folder %d/%d: %s", i + 1, len(folders), folder)
+            await self._scan_roots(roots, status.roots, status, incremental=incremental)
+            await self._after_scan()
 
-                try:
-                    result = await self.scan(roots=[Path(folder)])
-                    total_scanned += result.scanned_files
-                    total_upserted += result.updated_tracks
-                    total_errors += result.errors
-                    self._scan_status.tracks_found = total_upserted
-                    self._scan_status.errors = total_errors
-                except Exception as e:
-                    logger.error("Error scanning folder %s: %s", folder, e)
-                    total_errors += 1
-                    self._scan_status.errors = total_errors
-
-            self._scan_status.folders_done = len(folders)
-            self._scan_status.progress = 1.0
-            self._scan_status.last_result = ScanResult(
-                scanned_files=total_scanned,
-                added_tracks=0,
-                updated_tracks=total_upserted,
-                skipped_files=0,
-                errors=total_errors,
-            )
+            status.refresh()
+            status.progress = 1.0
+            status.last_result = _scan_result(status.roots)
             logger.info(
                 "Scan complete: %d files, %d tracks, %d errors",
-                total_scanned,
-                total_upserted,
-                total_errors,
+                status.last_result.scanned_files,
+                status.last_result.updated_tracks,
+                status.last_result.errors,
             )
 
         finally:
-            self._scan_status.is_running = False
-            self._scan_status.current_folder = ""
+            status.is_running = False
+            status.current_folder = ""
 
-    async def rescan(self) -> bool:
+    async def rescan(self, *, incremental: bool = True) -> bool:
         """
         Convenience method to trigger a rescan.
 
-        Same as start_scan(), but clearer intent.
+        Like LMS `rescan`, this looks for new and changed music by default
+        (incremental); pass `incremental=False` to re-read every file.
         """
-        return await self.start_scan()
+        return await self.start_scan(incremental=incremental)
 
     def _require_initialized(self) -> None:
         if not self._initialized:
@@ -546,3 +699,96 @@ class MusicLibrary:
             raise ValueError("limit must be > 0")
         if limit > 10_000:
             raise ValueError("limit is unreasonably large")
+
+
+def _safe_device_budget(root: Path) -> DeviceBudget:
+    try:
+        return device_budget(root)
+    except OSError:
+        # Missing/unreadable root: scan it alone so the scanner reports the error.
+        return DeviceBudget(device=-1, kind="unknown", max_concurrency=1)
+
+
+def _scan_result(statuses: Sequence[RootScanStatus]) -> ScanResult:
+    # For MVP we don't distinguish added vs updated yet (DB layer could be extended later).
+    return ScanResult(
+        scanned_files=sum(r.files_total for r in statuses),
+        added_tracks=0,
+        updated_tracks=sum(r.tracks_found for r in statuses),
+        skipped_files=0,
+        errors=sum(r.errors for r in statuses),
+    )
+
+
+def _to_upsert(tm: TrackMetadata) -> UpsertTrack:
+    stat = tm.path.stat()
+    return UpsertTrack(
+        path=str(tm.path),
+        title=tm.title,
+        artist=tm.artist,
+        album=tm.album,
+        album_artist=tm.album_artist,
+        track_no=tm.track_number,
+        disc_no=tm.disc_number,
+        year=tm.year,
+        duration_ms=tm.duration_ms,
+        file_size=stat.st_size,
+        mtime_ns=stat.st_mtime_ns,
+        has_artwork=tm.has_artwork,
+        genres=tm.genres,
+        compilation=tm.compilation,
+        contributors=tm.contributors,
+        sample_rate=tm.sample_rate,
+        bit_depth=tm.bit_depth,
+        bitrate=tm.bitrate,
+        channels=tm.channels,
+    )
+
+
+def _root_of(directory: Path, roots: Iterable[Path]) -> Path | None:
+    """The innermost music folder containing `directory`, if any."""
+    containing = [r for r in roots if r == directory or r in directory.parents]
+    return max(containing, key=lambda r: len(r.parts), default=None)
+
+
+def _has_entries(directory: Path) -> bool:
+    """True if `directory` can be listed and is not empty."""
+    try:
+        with os.scandir(directory) as entries:
+            return next(entries, None) is not None
+    except OSError:
+        return False
+
+
+def _stat_audio_files(directory: Path, recursive: bool) -> dict[str, tuple[int, int]]:
+    """Return `{path: (mtime_ns, size)}` for audio files in `directory` (missing dir -> {})."""
+    found: dict[str, tuple[int, int]] = {}
+    pending = [directory]
+    while pending:
+        current = pending.pop()
+        try:
+            entries = list(os.scandir(current))
+        except OSError:
+            continue
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive:
+                        pending.append(Path(entry.path))
+                    continue
+                if not entry.is_file(follow_symlinks=False):
+                    continue
+                if Path(entry.name).suffix.lower() not in DEFAULT_AUDIO_EXTENSIONS:
+                    continue
+                st = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            found[entry.path] = (st.st_mtime_ns, st.st_size)
+    return found
+
+
+def _with_display_title(row: TrackRow) -> Track:
+    """Return the row itself, or a copy titled after the file stem if it has no title."""
+    if row.title:
+        return row
+    return replace(row, title=Path(row.path).stem)
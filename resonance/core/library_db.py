@@ -13,26 +13,119 @@ Note:
 - Schema/migrations live in `resonance.core.db.schema`
 - Query functions live in `resonance.core.db.queries_*` modules
 - `LibraryDb` remains the public facade used by the rest of the codebase
+- Query modules are reached through `_TimedQueries`, which records per-function
+  latency in the `resonance_db_query_seconds` histogram (see core.metrics)
+- Per-statement tracing and the slow-query log are opt-in (`core.db.tracing`)
+- Pragma tuning, ANALYZE/optimize, checkpoints and vacuum live in
+  `core.db.maintenance`
 """
 
 from __future__ import annotations
 
+import asyncio
+import functools
+import inspect
+import time
 from pathlib import Path
-from typing import Any, Iterable, Mapping, Sequence
+from typing import TYPE_CHECKING, Any, ParamSpec, TypeVar, cast
 
 import aiosqlite
 
 # Import query modules for delegation
-from resonance.core.db import queries_albums, queries_artists, queries_meta, queries_tracks
+from resonance.core.db import maintenance
+from resonance.core.db import queries_albums as _queries_albums
+from resonance.core.db import queries_artists as _queries_artists
+from resonance.core.db import queries_meta as _queries_meta
+from resonance.core.db import queries_playlists as _queries_playlists
+from resonance.core.db import queries_tracks as _queries_tracks
+from resonance.core.db.maintenance import MaintenanceConfig
 from resonance.core.db.models import (
     AlbumRow,
     ArtistRow,
-    TrackRow,
-    UpsertTrack,
+    PlaylistStateRow,
     normalize_int,
     normalize_text,
+    sort_key,
 )
+from resonance.core.db.models import TrackRow as TrackRow  # re-exported
+from resonance.core.db.models import UpsertTrack as UpsertTrack  # re-exported
 from resonance.core.db.schema import ensure_schema as ensure_schema_sql
+from resonance.core.db.tracing import TracedConnection, current_query, sql_tracer
+from resonance.core.metrics import metrics
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Coroutine, Iterable, Mapping, Sequence
+    from types import ModuleType
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+QUERY_SECONDS = metrics.histogram(
+    "resonance_db_query_seconds",
+    "Latency of LibraryDb query functions (resonance.core.db.queries_*).",
+    ("query",),
+)
+
+
+def _timed(
+    func: Callable[P, Coroutine[Any, Any, R]], label: str
+) -> Callable[P, Coroutine[Any, Any, R]]:
+    """Wrap a `queries_*` coroutine function to record QUERY_SECONDS under `label`."""
+    labels = (label,)
+
+    @functools.wraps(func)
+    async def timed(*args: P.args, **kwargs: P.kwargs) -> R:
+        token = current_query.set(label) if sql_tracer.enabled else None
+        started = time.perf_counter()
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            QUERY_SECONDS.observe(time.perf_counter() - started, labels)
+            if token is not None:
+                current_query.reset(token)
+
+    return timed
+
+
+class _TimedQueries:
+    """
+    A `queries_*` module whose coroutine functions record QUERY_SECONDS.
+
+    Wrappers are built on first access and reused while the module attribute
+    is unchanged, so later calls cost a dict lookup, one extra frame and two
+    clock reads, and monkeypatched query functions are still picked up. While
+    SQL tracing is on, the wrapper also names itself as the source of the
+    statements it runs. Type checkers see the module itself (see below): the
+    wrappers keep the wrapped signatures.
+    """
+
+    def __init__(self, module: ModuleType) -> None:
+        self._module = module
+        self._prefix = module.__name__.rsplit(".", 1)[-1]
+        self._wrappers: dict[str, Callable[..., Coroutine[Any, Any, Any]]] = {}
+
+    def __getattr__(self, name: str) -> Any:
+        func = getattr(self._module, name)
+        if not inspect.iscoroutinefunction(func):
+            return func
+        wrapper = self._wrappers.get(name)
+        if wrapper is None or wrapper.__wrapped__ is not func:  # type: ignore[attr-defined]
+            wrapper = self._wrappers[name] = _timed(func, f"{self._prefix}.{name}")
+        return wrapper
+
+
+if TYPE_CHECKING:
+    queries_albums = _queries_albums
+    queries_artists = _queries_artists
+    queries_meta = _queries_meta
+    queries_playlists = _queries_playlists
+    queries_tracks = _queries_tracks
+else:
+    queries_albums = _TimedQueries(_queries_albums)
+    queries_artists = _TimedQueries(_queries_artists)
+    queries_meta = _TimedQueries(_queries_meta)
+    queries_playlists = _TimedQueries(_queries_playlists)
+    queries_tracks = _TimedQueries(_queries_tracks)
 
 
 class LibraryDb:
@@ -49,21 +142,76 @@ class LibraryDb:
     Notes:
     - This class is designed to be injected into other components.
     - Connections are not pooled; for now we keep a single connection.
+    - `generation` is bumped by every write that changes library content
+      (upserts, deletes, orphan cleanup). Read-side caches key on it.
+    - `maintenance_config` sets the page cache/mmap sizes applied on open and
+      is what `DbMaintenance` schedules against.
+    - `write_lock` serializes write batches on the shared connection (scan and
+      watcher batches, queue flushes, maintenance). `upsert_tracks` uses a named
+      SAVEPOINT and awaits between rows, so nothing else may commit meanwhile.
+      Batches take it around their writes and the final `commit()`; the methods
+      that commit on their own (`save_player_playlists`, `clear_all`) take it
+      themselves.
     """
 
-    def __init__(self, db_path: str | Path) -> None:
+    def __init__(
+        self, db_path: str | Path, maintenance_config: MaintenanceConfig | None = None
+    ) -> None:
         self._db_path = str(db_path)
+        self.maintenance_config = maintenance_config or MaintenanceConfig()
+        self._needs_vacuum = False
         self._conn: aiosqlite.Connection | None = None
+        self._traced: TracedConnection | None = None
+        self._generation = 0
+        self.write_lock = asyncio.Lock()
 
     @property
     def is_open(self) -> bool:
         return self._conn is not None
 
+    @property
+    def path(self) -> Path | None:
+        """DB file path (None for in-memory databases)."""
+        if self._db_path in ("", ":memory:") or self._db_path.startswith("file:"):
+            return None
+        return Path(self._db_path)
+
+    @property
+    def in_transaction(self) -> bool:
+        return self._conn is not None and self._conn.in_transaction
+
+    @property
+    def total_changes(self) -> int:
+        """Rows changed through this connection since it was opened."""
+        return self._conn.total_changes if self._conn is not None else 0
+
+    @property
+    def needs_vacuum(self) -> bool:
+        """A one-time VACUUM is pending (switch to incremental auto-vacuum)."""
+        return self._needs_vacuum
+
+    @property
+    def generation(self) -> int:
+        """Monotonic counter of library content changes (in-process only)."""
+        return self._generation
+
+    def bump_generation(self) -> int:
+        """Invalidate read-side caches keyed on `generation`. Returns the new value."""
+        self._generation += 1
+        return self._generation
+
     async def open(self) -> None:
         if self._conn is not None:
             return
         self._conn = await aiosqlite.connect(self._db_path)
         self._conn.row_factory = aiosqlite.Row
+        self._traced = TracedConnection(self._conn)
+
+        # Before WAL: a new DB file gets its first page (and its auto-vacuum
+        # mode) as soon as the journal mode is switched.
+        self._needs_vacuum = await maintenance.apply_pragmas(
+            self._conn, self.maintenance_config
+        )
 
         # Pragmas: modern defaults without being clever.
         await self._conn.execute("PRAGMA foreign_keys = ON;")
@@ -74,12 +222,17 @@ class LibraryDb:
     async def close(self) -> None:
         if self._conn is None:
             return
+        if sql_tracer.enabled:
+            sql_tracer.log_summary()
         await self._conn.close()
         self._conn = None
+        self._traced = None
 
     def _require_conn(self) -> aiosqlite.Connection:
         if self._conn is None:
             raise RuntimeError("LibraryDb is not open. Call await db.open() first.")
+        if sql_tracer.enabled:
+            return cast("aiosqlite.Connection", self._traced)
         return self._conn
 
     async def ensure_schema(self) -> None:
@@ -95,6 +248,36 @@ class LibraryDb:
         conn = self._require_conn()
         await conn.commit()
 
+    # ===========================================================================
+    # Maintenance (see core.db.maintenance)
+    # ===========================================================================
+
+    async def after_scan(self) -> None:
+        """Refresh planner statistics after a library scan (if configured)."""
+        if self.maintenance_config.analyze_after_scan:
+            await maintenance.refresh_statistics(self._require_conn())
+
+    async def analyze(self) -> None:
+        await maintenance.analyze(self._require_conn())
+
+    async def optimize(self) -> None:
+        await maintenance.optimize(self._require_conn())
+
+    async def checkpoint(self) -> int:
+        """Checkpoint and truncate the WAL. Returns pages written back."""
+        return await maintenance.checkpoint(self._require_conn())
+
+    async def freelist_count(self) -> int:
+        return await maintenance.freelist_count(self._require_conn())
+
+    async def incremental_vacuum(self) -> int:
+        """Release free pages (incremental auto-vacuum). Returns pages released."""
+        return await maintenance.incremental_vacuum(self._require_conn())
+
+    async def vacuum(self) -> None:
+        await maintenance.vacuum(self._require_conn())
+        self._needs_vacuum = False
+
     # ===========================================================================
     # Tracks: upsert (core business logic - stays here)
     # ===========================================================================
@@ -154,13 +337,15 @@ class LibraryDb:
                 track_no, disc_no, year,
                 duration_ms, file_size, mtime_ns, has_artwork, compilation,
                 artist_id, album_id,
-                sample_rate, bit_depth, bitrate, channels
+                sample_rate, bit_depth, bitrate, channels,
+                title_sort, album_sort, artist_sort, disc_sort, track_sort
             ) VALUES (
                 :path, :title, :artist, :album, :album_artist,
                 :track_no, :disc_no, :year,
                 :duration_ms, :file_size, :mtime_ns, :has_artwork, :compilation,
                 :artist_id, :album_id,
-                :sample_rate, :bit_depth, :bitrate, :channels
+                :sample_rate, :bit_depth, :bitrate, :channels,
+                :title_sort, :album_sort, :artist_sort, :disc_sort, :track_sort
             )
             ON CONFLICT(path) DO UPDATE SET
                 title        = excluded.title,
@@ -180,7 +365,12 @@ class LibraryDb:
                 sample_rate  = excluded.sample_rate,
                 bit_depth    = excluded.bit_depth,
                 bitrate      = excluded.bitrate,
-                channels     = excluded.channels
+                channels     = excluded.channels,
+                title_sort   = excluded.title_sort,
+                album_sort   = excluded.album_sort,
+                artist_sort  = excluded.artist_sort,
+                disc_sort    = excluded.disc_sort,
+                track_sort   = excluded.track_sort
             """,
             {
                 "path": path,
@@ -202,9 +392,16 @@ class LibraryDb:
                 "bit_depth": bit_depth,
                 "bitrate": bitrate,
                 "channels": channels,
+                "title_sort": sort_key(title),
+                "album_sort": sort_key(album),
+                "artist_sort": sort_key(artist),
+                "disc_sort": disc_no or 0,
+                "track_sort": track_no or 0,
             },
         )
 
+        self._generation += 1
+
         # Fetch id deterministically
         cursor = await conn.execute("SELECT id FROM tracks WHERE path = ?;", (path,))
         row = await cursor.fetchone()
@@ -268,7 +465,7 @@ class LibraryDb:
 
         await conn.execute(
             "INSERT INTO artists (name, name_sort) VALUES (?, ?);",
-            (name, name),
+            (name, sort_key(name)),
         )
         cursor = await conn.execute("SELECT id FROM artists WHERE name = ?;", (name,))
         row = await cursor.fetchone()
@@ -284,7 +481,7 @@ class LibraryDb:
 
         await conn.execute(
             "INSERT INTO contributors (name, name_sort) VALUES (?, ?);",
-            (name, name),
+            (name, sort_key(name)),
         )
         cursor = await conn.execute("SELECT id FROM contributors WHERE name = ?;", (name,))
         row = await cursor.fetchone()
@@ -321,8 +518,11 @@ class LibraryDb:
             return int(row["id"])
 
         await conn.execute(
-            "INSERT INTO albums (title, title_sort, artist_id, year) VALUES (?, ?, ?, ?);",
-            (title, title, artist_id, year),
+            """
+            INSERT INTO albums (title, title_sort, artist_id, year, artist_sort)
+            VALUES (?, ?, ?, ?, COALESCE((SELECT name_sort FROM artists WHERE id = ?), ''));
+            """,
+            (title, sort_key(title), artist_id, year, artist_id),
         )
         if artist_id is not None:
             cursor = await conn.execute(
@@ -347,7 +547,7 @@ class LibraryDb:
 
         await conn.execute(
             "INSERT INTO genres (name, name_sort) VALUES (?, ?);",
-            (name, name),
+            (name, sort_key(name)),
         )
         cursor = await conn.execute("SELECT id FROM genres WHERE name = ?;", (name,))
         row = await cursor.fetchone()
@@ -379,6 +579,25 @@ class LibraryDb:
     async def get_track_by_path(self, path: str) -> TrackRow | None:
         return await queries_tracks.get_track_by_path(self._require_conn(), path)
 
+    async def get_tracks_by_ids(self, track_ids: Sequence[int]) -> list[TrackRow]:
+        return await queries_tracks.get_tracks_by_ids(self._require_conn(), track_ids)
+
+    async def list_track_ids(
+        self,
+        *,
+        album_id: int | None = None,
+        artist_id: int | None = None,
+        genre_id: int | None = None,
+        order_by: str = "album",
+    ) -> list[int]:
+        return await queries_tracks.list_track_ids(
+            self._require_conn(),
+            album_id=album_id,
+            artist_id=artist_id,
+            genre_id=genre_id,
+            order_by=order_by,
+        )
+
     async def list_tracks(
         self, *, limit: int = 500, offset: int = 0, order_by: str = "title"
     ) -> list[TrackRow]:
@@ -417,15 +636,37 @@ class LibraryDb:
         )
 
     async def delete_track_by_path(self, path: str) -> bool:
-        return await queries_tracks.delete_track_by_path(self._require_conn(), path)
+        deleted = await queries_tracks.delete_track_by_path(self._require_conn(), path)
+        if deleted:
+            self._generation += 1
+        return deleted
+
+    async def delete_tracks_by_paths(self, paths: Sequence[str]) -> int:
+        """Delete tracks by path. Returns count of deleted tracks."""
+        count = await queries_tracks.delete_tracks_by_paths(self._require_conn(), paths)
+        if count:
+            self._generation += 1
+        return count
+
+    async def list_track_files_under(
+        self, directory: str
+    ) -> dict[str, tuple[int | None, int | None]]:
+        """Return `{path: (mtime_ns, file_size)}` for tracks below `directory`."""
+        return await queries_tracks.list_track_files_under(self._require_conn(), directory)
 
     async def delete_tracks_by_album_id(self, album_id: int) -> int:
         """Delete all tracks belonging to an album. Returns count of deleted tracks."""
-        return await queries_tracks.delete_tracks_by_album_id(self._require_conn(), album_id)
+        count = await queries_tracks.delete_tracks_by_album_id(self._require_conn(), album_id)
+        if count:
+            self._generation += 1
+        return count
 
     async def delete_tracks_by_artist_id(self, artist_id: int) -> int:
         """Delete all tracks belonging to an artist. Returns count of deleted tracks."""
-        return await queries_tracks.delete_tracks_by_artist_id(self._require_conn(), artist_id)
+        count = await queries_tracks.delete_tracks_by_artist_id(self._require_conn(), artist_id)
+        if count:
+            self._generation += 1
+        return count
 
     async def delete_album(self, album_id: int, cleanup_orphans: bool = True) -> dict[str, int]:
         """
@@ -448,6 +689,7 @@ class LibraryDb:
         # Delete the album itself
         cursor = await conn.execute("DELETE FROM albums WHERE id = ?;", (album_id,))
         result["album_deleted"] = cursor.rowcount
+        self._generation += 1
 
         # Optionally clean up orphaned data
         if cleanup_orphans:
@@ -504,8 +746,33 @@ class LibraryDb:
         )
         result["orphan_contributors_deleted"] = cursor.rowcount
 
+        if any(result.values()):
+            self._generation += 1
         return result
 
+    async def clear_all(self) -> None:
+        """
+        Delete all library content (tracks, albums, artists, genres, contributors)
+        and the directory mtimes of the last walk, then commit.
+
+        Music folders, roles and persisted player queues are kept.
+        """
+        conn = self._require_conn()
+        async with self.write_lock:
+            for table in (
+                "contributor_tracks",
+                "track_genres",
+                "tracks",
+                "albums",
+                "artists",
+                "genres",
+                "contributors",
+                "scan_directories",
+            ):
+                await conn.execute(f"DELETE FROM {table};")
+            await conn.commit()
+            self._generation += 1
+
     # Track filters: year
     async def count_tracks_by_year(self, year: int) -> int:
         return await queries_tracks.count_tracks_by_year(self._require_conn(), year)
@@ -979,39 +1246,51 @@ class LibraryDb:
         )
 
     # Artist filters: role_id
-    async def count_artists_by_role_id(self, role_id: int) -> int:
-        return await queries_artists.count_artists_by_role_id(self._require_conn(), role_id)
-
-    async def list_artists_with_album_counts_by_role_id(
+    async def _list_role_artists(
         self,
         role_id: int,
         *,
-        limit: int = 500,
-        offset: int = 0,
-        order_by: str = "artist",
+        join: str = "",
+        where: str = "",
+        params: tuple[Any, ...] = (),
+        limit: int,
+        offset: int,
+        order_by: str,
     ) -> list[dict[str, Any]]:
+        """
+        List contributors credited with `role_id` on tracks matching `where`.
+
+        The filter is a correlated EXISTS driven by `idx_contributors_name_sort`,
+        so pages come out of the index in order instead of grouping every
+        matching credit and sorting the result. Counts are computed per page row.
+        Ordering mirrors `artists_order_clause`: by `name_sort`, or by album
+        count for `albums` (which, being computed, always sorts in a temp B-tree).
+        """
         conn = self._require_conn()
-        # order_by for contributors: use name or name_sort
-        if order_by == "artist":
-            order_clause = "c.name_sort COLLATE NOCASE"
+        credits = f"""
+            FROM contributor_tracks ct
+            JOIN tracks t ON t.id = ct.track_id
+            {join}
+            WHERE ct.contributor_id = c.id AND ct.role_id = ?{f" AND {where}" if where else ""}
+        """
+        if order_by == "albums":
+            order_clause = "ORDER BY album_count DESC, c.name_sort, c.id"
         else:
-            order_clause = "c.name COLLATE NOCASE"
+            order_clause = "ORDER BY c.name_sort, c.id"
+        scope = (int(role_id), *params)
         cursor = await conn.execute(
             f"""
             SELECT
                 c.id,
                 c.name,
-                COUNT(DISTINCT ct.track_id) AS track_count,
-                COUNT(DISTINCT t.album_id) AS album_count
+                (SELECT COUNT(*) {credits}) AS track_count,
+                (SELECT COUNT(DISTINCT t.album_id) {credits}) AS album_count
             FROM contributors c
-            JOIN contributor_tracks ct ON ct.contributor_id = c.id
-            JOIN tracks t ON t.id = ct.track_id
-            WHERE ct.role_id = ?
-            GROUP BY c.id, c.name
-            ORDER BY {order_clause}
+            WHERE EXISTS (SELECT 1 {credits})
+            {order_clause}
             LIMIT ? OFFSET ?;
             """,
-            (int(role_id), int(limit), int(offset)),
+            (*scope, *scope, *scope, int(limit), int(offset)),
         )
         rows = await cursor.fetchall()
         return [
@@ -1024,6 +1303,19 @@ class LibraryDb:
             for r in rows
         ]
 
+    async def count_artists_by_role_id(self, role_id: int) -> int:
+        return await queries_artists.count_artists_by_role_id(self._require_conn(), role_id)
+
+    async def list_artists_with_album_counts_by_role_id(
+        self,
+        role_id: int,
+        *,
+        limit: int = 500,
+        offset: int = 0,
+        order_by: str = "artist",
+    ) -> list[dict[str, Any]]:
+        return await self._list_role_artists(role_id, limit=limit, offset=offset, order_by=order_by)
+
     async def count_artists_by_role_and_genre_id(self, role_id: int, genre_id: int) -> int:
         conn = self._require_conn()
         cursor = await conn.execute(
@@ -1049,39 +1341,15 @@ class LibraryDb:
         offset: int = 0,
         order_by: str = "artist",
     ) -> list[dict[str, Any]]:
-        conn = self._require_conn()
-        if order_by == "artist":
-            order_clause = "c.name_sort COLLATE NOCASE"
-        else:
-            order_clause = "c.name COLLATE NOCASE"
-        cursor = await conn.execute(
-            f"""
-            SELECT
-                c.id,
-                c.name,
-                COUNT(DISTINCT ct.track_id) AS track_count,
-                COUNT(DISTINCT t.album_id) AS album_count
-            FROM contributors c
-            JOIN contributor_tracks ct ON ct.contributor_id = c.id
-            JOIN tracks t ON t.id = ct.track_id
-            JOIN track_genres tg ON tg.track_id = t.id
-            WHERE ct.role_id = ? AND tg.genre_id = ?
-            GROUP BY c.id, c.name
-            ORDER BY {order_clause}
-            LIMIT ? OFFSET ?;
-            """,
-            (int(role_id), int(genre_id), int(limit), int(offset)),
+        return await self._list_role_artists(
+            role_id,
+            join="JOIN track_genres tg ON tg.track_id = t.id",
+            where="tg.genre_id = ?",
+            params=(int(genre_id),),
+            limit=limit,
+            offset=offset,
+            order_by=order_by,
         )
-        rows = await cursor.fetchall()
-        return [
-            {
-                "id": int(r["id"]),
-                "name": r["name"],
-                "track_count": int(r["track_count"]),
-                "album_count": int(r["album_count"]),
-            }
-            for r in rows
-        ]
 
     async def count_artists_by_role_and_year(self, role_id: int, year: int) -> int:
         conn = self._require_conn()
@@ -1107,38 +1375,14 @@ class LibraryDb:
         offset: int = 0,
         order_by: str = "artist",
     ) -> list[dict[str, Any]]:
-        conn = self._require_conn()
-        if order_by == "artist":
-            order_clause = "c.name_sort COLLATE NOCASE"
-        else:
-            order_clause = "c.name COLLATE NOCASE"
-        cursor = await conn.execute(
-            f"""
-            SELECT
-                c.id,
-                c.name,
-                COUNT(DISTINCT ct.track_id) AS track_count,
-                COUNT(DISTINCT t.album_id) AS album_count
-            FROM contributors c
-            JOIN contributor_tracks ct ON ct.contributor_id = c.id
-            JOIN tracks t ON t.id = ct.track_id
-            WHERE ct.role_id = ? AND t.year = ?
-            GROUP BY c.id, c.name
-            ORDER BY {order_clause}
-            LIMIT ? OFFSET ?;
-            """,
-            (int(role_id), int(year), int(limit), int(offset)),
+        return await self._list_role_artists(
+            role_id,
+            where="t.year = ?",
+            params=(int(year),),
+            limit=limit,
+            offset=offset,
+            order_by=order_by,
         )
-        rows = await cursor.fetchall()
-        return [
-            {
-                "id": int(r["id"]),
-                "name": r["name"],
-                "track_count": int(r["track_count"]),
-                "album_count": int(r["album_count"]),
-            }
-            for r in rows
-        ]
 
     async def count_artists_by_role_and_compilation(self, role_id: int, compilation: int) -> int:
         conn = self._require_conn()
@@ -1164,47 +1408,23 @@ class LibraryDb:
         offset: int = 0,
         order_by: str = "artist",
     ) -> list[dict[str, Any]]:
-        conn = self._require_conn()
-        if order_by == "artist":
-            order_clause = "c.name_sort COLLATE NOCASE"
-        else:
-            order_clause = "c.name COLLATE NOCASE"
-        cursor = await conn.execute(
-            f"""
-            SELECT
-                c.id,
-                c.name,
-                COUNT(DISTINCT ct.track_id) AS track_count,
-                COUNT(DISTINCT t.album_id) AS album_count
-            FROM contributors c
-            JOIN contributor_tracks ct ON ct.contributor_id = c.id
-            JOIN tracks t ON t.id = ct.track_id
-            WHERE ct.role_id = ? AND t.compilation = ?
-            GROUP BY c.id, c.name
-            ORDER BY {order_clause}
-            LIMIT ? OFFSET ?;
-            """,
-            (int(role_id), int(compilation), int(limit), int(offset)),
+        return await self._list_role_artists(
+            role_id,
+            where="t.compilation = ?",
+            params=(int(compilation),),
+            limit=limit,
+            offset=offset,
+            order_by=order_by,
         )
-        rows = await cursor.fetchall()
-        return [
-            {
-                "id": int(r["id"]),
-                "name": r["name"],
-                "track_count": int(r["track_count"]),
-                "album_count": int(r["album_count"]),
-            }
-            for r in rows
-        ]
 
     # Legacy browse: just artist/album name lists
     async def list_artists(self, *, limit: int = 500, offset: int = 0) -> list[str]:
         conn = self._require_conn()
         cursor = await conn.execute(
             """
-            SELECT DISTINCT name
+            SELECT name
             FROM artists
-            ORDER BY name COLLATE NOCASE
+            ORDER BY name_sort, id
             LIMIT ? OFFSET ?;
             """,
             (int(limit), int(offset)),
@@ -1221,7 +1441,7 @@ class LibraryDb:
                 """
                 SELECT DISTINCT title AS name
                 FROM albums
-                ORDER BY title COLLATE NOCASE
+                ORDER BY title_sort
                 LIMIT ? OFFSET ?;
                 """,
                 (int(limit), int(offset)),
@@ -1233,7 +1453,7 @@ class LibraryDb:
                 FROM albums a
                 LEFT JOIN artists ar ON a.artist_id = ar.id
                 WHERE ar.name = ?
-                ORDER BY a.title COLLATE NOCASE
+                ORDER BY a.title_sort
                 LIMIT ? OFFSET ?;
                 """,
                 (artist, int(limit), int(offset)),
@@ -1608,6 +1828,47 @@ class LibraryDb:
     async def clear_music_folders(self) -> None:
         return await queries_meta.clear_music_folders(self._require_conn())
 
+    async def load_directory_mtimes(self, root: str) -> dict[str, int]:
+        return await queries_meta.load_directory_mtimes(self._require_conn(), root)
+
+    async def replace_directory_mtimes(self, root: str, mtimes: dict[str, int]) -> None:
+        return await queries_meta.replace_directory_mtimes(self._require_conn(), root, mtimes)
+
+    # ===========================================================================
+    # Player playlists (delegated to queries_playlists module)
+    # ===========================================================================
+
+    async def save_player_playlists(
+        self,
+        states: Sequence[PlaylistStateRow],
+        *,
+        deleted: Sequence[str] = (),
+    ) -> None:
+        """
+        Upsert and delete persisted queues in one transaction and commit.
+
+        Runs under `write_lock`. If a transaction is open anyway (a caller
+        writing without the lock), the changes join it and are committed by
+        that caller rather than committing its half-done work here.
+        """
+        conn = self._require_conn()
+        async with self.write_lock:
+            owns_transaction = not conn.in_transaction
+            await conn.execute("SAVEPOINT player_playlists_sp;")
+            try:
+                await queries_playlists.save_playlists(conn, states)
+                await queries_playlists.delete_playlists(conn, deleted)
+                await conn.execute("RELEASE SAVEPOINT player_playlists_sp;")
+            except Exception:
+                await conn.execute("ROLLBACK TO SAVEPOINT player_playlists_sp;")
+                await conn.execute("RELEASE SAVEPOINT player_playlists_sp;")
+                raise
+            if owns_transaction:
+                await conn.commit()
+
+    async def load_player_playlists(self) -> list[PlaylistStateRow]:
+        return await queries_playlists.load_playlists(self._require_conn())
+
     # Track count helper for artist (moved from queries_artists for convenience)
     async def get_artist_track_count(self, artist_id: int) -> int:
         conn = self._require_conn()
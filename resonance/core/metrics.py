@@ -0,0 +1,274 @@
+"""
+In-process metrics with a Prometheus text exposition (``GET /metrics``).
+
+Counters, gauges and histograms for the hot paths: JSON-RPC commands, SQLite
+queries, Cometd delivery, audio streams, transcode spawns, artwork caches and
+event-loop lag.
+
+Design:
+- Recording is a dict lookup and an add on plain Python numbers. There are no
+  locks: everything records from the event-loop thread, and a scrape runs on
+  that thread too.
+- Labels are passed as a tuple of values (``observe(0.01, ("status",))``), so
+  recording does not allocate child objects. Label values must come from a
+  bounded set (command names, player MACs, stream modes).
+- Histograms use fixed bucket bounds in seconds. `observe` is one bisect.
+- Values that already live elsewhere (scheduler stats, Cometd queues, active
+  streams) are read at scrape time by collectors instead of being mirrored.
+- The registry is a process-wide module instance (`metrics`), like `event_bus`.
+
+Usage:
+    from resonance.core.metrics import metrics
+
+    REQUESTS = metrics.counter("resonance_x_total", "Things done.", ("kind",))
+    REQUESTS.inc(labels=("a",))
+"""
+
+from __future__ import annotations
+
+import abc
+import asyncio
+import bisect
+import logging
+import math
+from collections.abc import Callable, Iterable
+from typing import TypeVar
+
+logger = logging.getLogger(__name__)
+
+LabelValues = tuple[str, ...]
+
+# Seconds; spans sub-millisecond SQLite reads up to slow transcoder starts.
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+# How often the loop-lag monitor wakes up.
+LOOP_LAG_INTERVAL = 0.5
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple[str, ...], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=False)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric(abc.ABC):
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.label_names = labels
+
+    @abc.abstractmethod
+    def _samples(self) -> Iterable[str]:
+        """Exposition lines for every label set, without HELP/TYPE."""
+
+    def expose(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """Monotonically increasing total."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()) -> None:
+        super().__init__(name, help, labels)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, labels: LabelValues = ()) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, labels: LabelValues = ()) -> float:
+        return self._values.get(labels, 0.0)
+
+    def _samples(self) -> Iterable[str]:
+        for labels, value in self._values.items():
+            yield f"{self.name}{_format_labels(self.label_names, labels)} {_format_value(value)}"
+
+
+class Gauge(Counter):
+    """Value that can go up and down."""
+
+    kind = "gauge"
+
+    def set(self, value: float, labels: LabelValues = ()) -> None:
+        self._values[labels] = value
+
+    def dec(self, amount: float = 1.0, labels: LabelValues = ()) -> None:
+        self.inc(-amount, labels)
+
+
+class _HistogramSeries:
+    __slots__ = ("buckets", "count", "sum")
+
+    def __init__(self, size: int) -> None:
+        self.buckets = [0] * size
+        self.count = 0
+        self.sum = 0.0
+
+
+class Histogram(_Metric):
+    """Distribution of durations (seconds) in fixed buckets."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, help, labels)
+        self.bounds = tuple(sorted(buckets))
+        self._series: dict[LabelValues, _HistogramSeries] = {}
+
+    def observe(self, value: float, labels: LabelValues = ()) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = _HistogramSeries(len(self.bounds))
+        index = bisect.bisect_left(self.bounds, value)
+        if index < len(self.bounds):
+            series.buckets[index] += 1
+        series.count += 1
+        series.sum += value
+
+    def count(self, labels: LabelValues = ()) -> int:
+        series = self._series.get(labels)
+        return series.count if series else 0
+
+    def _samples(self) -> Iterable[str]:
+        for labels, series in self._series.items():
+            cumulative = 0
+            for bound, hits in zip(self.bounds, series.buckets, strict=True):
+                cumulative += hits
+                le = _format_labels(self.label_names, labels, f'le="{_format_value(bound)}"')
+                yield f"{self.name}_bucket{le} {cumulative}"
+            inf = _format_labels(self.label_names, labels, 'le="+Inf"')
+            yield f"{self.name}_bucket{inf} {series.count}"
+            plain = _format_labels(self.label_names, labels)
+            yield f"{self.name}_sum{plain} {_format_value(series.sum)}"
+            yield f"{self.name}_count{plain} {series.count}"
+
+
+Metric = Counter | Gauge | Histogram
+Collector = Callable[[], Iterable[Metric]]
+_M = TypeVar("_M", Counter, Gauge, Histogram)
+
+
+class MetricsRegistry:
+    """Named metrics plus scrape-time collectors."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, Metric] = {}
+        self._collectors: dict[str, Collector] = {}
+
+    def _register(self, metric: _M) -> _M:
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            if type(existing) is not type(metric):
+                raise ValueError(f"Metric {metric.name} already registered as {existing.kind}")
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labels: tuple[str, ...] = ()) -> Counter:
+        """Get or create a counter."""
+        return self._register(Counter(name, help, labels))
+
+    def gauge(self, name: str, help: str, labels: tuple[str, ...] = ()) -> Gauge:
+        """Get or create a gauge."""
+        return self._register(Gauge(name, help, labels))
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """Get or create a histogram."""
+        return self._register(Histogram(name, help, labels, buckets))
+
+    def add_collector(self, key: str, collector: Collector) -> None:
+        """
+        Add (or replace) a collector called on every scrape.
+
+        Collectors return fresh metric objects built from live state; they are
+        not registered and must not be recorded into between scrapes.
+        """
+        self._collectors[key] = collector
+
+    def remove_collector(self, key: str, collector: Collector | None = None) -> None:
+        """Remove a collector (only if it is still `collector`, when given)."""
+        if collector is None or self._collectors.get(key) == collector:
+            self._collectors.pop(key, None)
+
+    def expose(self) -> str:
+        """Everything in Prometheus text format (version 0.0.4)."""
+        blocks = [metric.expose() for metric in self._metrics.values()]
+        for key, collector in list(self._collectors.items()):
+            try:
+                blocks.extend(metric.expose() for metric in collector())
+            except Exception:
+                logger.exception("Metrics collector %s failed", key)
+        return "\n".join(blocks) + "\n"
+
+
+metrics = MetricsRegistry()
+
+LOOP_LAG_SECONDS = metrics.histogram(
+    "resonance_event_loop_lag_seconds",
+    "How late the event loop woke a periodic timer.",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+
+
+async def monitor_loop_lag(
+    interval: float = LOOP_LAG_INTERVAL, on_tick: Callable[[float], None] | None = None
+) -> None:
+    """
+    Sample event-loop lag into LOOP_LAG_SECONDS until cancelled.
+
+    `on_tick` gets each measured lag; the stall watchdog
+    (resonance.core.profiling) uses it as its heartbeat.
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        started = loop.time()
+        await asyncio.sleep(interval)
+        lag = max(0.0, loop.time() - started - interval)
+        LOOP_LAG_SECONDS.observe(lag)
+        if on_tick is not None:
+            on_tick(lag)
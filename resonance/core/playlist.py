@@ -6,22 +6,47 @@ Each player has its own playlist (queue) of tracks that can be
 played sequentially.
 
 Design decisions:
-- Simple list-based queue (not a database table for MVP)
-- Each PlayerClient gets its own Playlist instance
-- Supports basic operations: add, play, clear, next, previous
-- Track references are by ID (TrackId) or path string
+- Entries are stored as track ids in a compact `array('q')` (8 bytes each),
+  not as track objects. Path-only entries (files not in the library) get
+  negative ids backed by a small side table of PlaylistTrack objects.
+- Shuffle is a permutation array over those ids (play position -> entry).
+  The canonical order is never copied, so turning shuffle off restores it
+  without searching.
+- Track metadata (TrackRow / PlaylistTrack) lives in a bounded LRU and is
+  hydrated lazily from the DB for the window being played or displayed
+  (`await playlist.hydrate(...)`). Entries around the current index are
+  never evicted, so synchronous navigation (`next()`, `current_track`) keeps
+  working between hydrations. A hydrated window is kept whole until the
+  next hydration, even if it is larger than the cache. Tracks that are no
+  longer in the library are dropped from the queue when hydration finds
+  them missing.
+- With a LibraryDb attached, PlaylistManager persists queues write-behind:
+  mutations mark a playlist dirty and a debounced task saves all dirty
+  playlists in one transaction. `flush()` writes immediately (shutdown).
 """
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import json
 import logging
-from dataclasses import dataclass, field
+import random
+import sys
+from array import array
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterable, Iterator, Sequence
+from dataclasses import dataclass
 from enum import Enum
-from typing import TYPE_CHECKING, Any, NewType
+from typing import TYPE_CHECKING, Any, NewType, overload
+
+from resonance.core.db.models import PlaylistStateRow
 
 if TYPE_CHECKING:
     from pathlib import Path
 
+    from resonance.core.library_db import LibraryDb
+
 logger = logging.getLogger(__name__)
 
 # Use NewType for type safety, but it's just an int at runtime
@@ -29,6 +54,15 @@ ArtistId = NewType("ArtistId", int)
 AlbumId = NewType("AlbumId", int)
 TrackId = NewType("TrackId", int)
 
+# Async callable that loads track rows for a batch of library track ids.
+TrackLoader = Callable[[Sequence[int]], Awaitable[Sequence[Any]]]
+
+# Metadata entries kept per playlist when a track loader is available.
+DEFAULT_METADATA_CACHE_SIZE = 512
+
+# Debounce for write-behind persistence (seconds).
+DEFAULT_WRITE_DELAY = 2.0
+
 
 class RepeatMode(Enum):
     """Repeat mode for playlist."""
@@ -52,6 +86,10 @@ class PlaylistTrack:
 
     We store both track_id (for DB lookups) and path (for streaming).
     This allows the playlist to work even if the DB is not available.
+
+    Tracks resolved from the library are stored as their `TrackRow` directly
+    (it exposes the same `track_id`/`path`/`title`/`artist`/`album` fields),
+    so only path-only entries need a PlaylistTrack.
     """
 
     track_id: TrackId | None
@@ -63,6 +101,18 @@ class PlaylistTrack:
     album: str = ""
     duration_ms: int = 0
 
+    @property
+    def id(self) -> TrackId | None:
+        return self.track_id
+
+    @property
+    def artist_name(self) -> str:
+        return self.artist
+
+    @property
+    def album_title(self) -> str:
+        return self.album
+
     @classmethod
     def from_path(cls, path: str | Path) -> PlaylistTrack:
         """Create a playlist track from just a file path."""
@@ -78,7 +128,56 @@ class PlaylistTrack:
         )
 
 
-@dataclass
+def _pack_ids(ids: array[int]) -> bytes:
+    """Serialize an id array as little-endian int64 (portable on-disk format)."""
+    if sys.byteorder == "big":
+        ids = array("q", ids)
+        ids.byteswap()
+    return ids.tobytes()
+
+
+def _unpack_ids(blob: bytes | None) -> array[int]:
+    ids = array("q")
+    if blob:
+        ids.frombytes(blob)
+        if sys.byteorder == "big":
+            ids.byteswap()
+    return ids
+
+
+class _PlaylistView(Sequence[Any]):
+    """Read-only sequence of the playlist's tracks in play order."""
+
+    __slots__ = ("_playlist",)
+
+    def __init__(self, playlist: Playlist) -> None:
+        self._playlist = playlist
+
+    def __len__(self) -> int:
+        return len(self._playlist)
+
+    @overload
+    def __getitem__(self, index: int) -> Any: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Any]: ...
+
+    def __getitem__(self, index: int | slice) -> Any:
+        playlist = self._playlist
+        if isinstance(index, slice):
+            return [playlist.track_at(i) for i in range(*index.indices(len(playlist)))]
+        if index < 0:
+            index += len(playlist)
+        if not 0 <= index < len(playlist):
+            raise IndexError("playlist index out of range")
+        return playlist.track_at(index)
+
+    def __iter__(self) -> Iterator[Any]:
+        playlist = self._playlist
+        for i in range(len(playlist)):
+            yield playlist.track_at(i)
+
+
 class Playlist:
     """
     Playlist (queue) for a single player.
@@ -86,37 +185,81 @@ class Playlist:
     This class manages an ordered list of tracks that will be played
     sequentially. It supports:
     - Adding tracks (at end or at specific position)
-    - Removing tracks
+    - Removing and moving tracks
     - Navigation (next, previous, jump to index)
     - Repeat and shuffle modes
 
-    The playlist is in-memory only (not persisted to DB in MVP).
+    Tracks are stored as ids; see the module docstring for the storage model.
     """
 
-    player_id: str
-    tracks: list[PlaylistTrack] = field(default_factory=list)
-    current_index: int = 0
-    repeat_mode: RepeatMode = RepeatMode.OFF
-    shuffle_mode: ShuffleMode = ShuffleMode.OFF
-
-    # Original order (for unshuffle)
-    _original_order: list[PlaylistTrack] = field(default_factory=list)
+    def __init__(
+        self,
+        player_id: str,
+        *,
+        track_loader: TrackLoader | None = None,
+        metadata_cache_size: int = DEFAULT_METADATA_CACHE_SIZE,
+        on_change: Callable[[Playlist], None] | None = None,
+    ) -> None:
+        self.player_id = player_id
+        self.repeat_mode = RepeatMode.OFF
+        self.shuffle_mode = ShuffleMode.OFF
+
+        # Entry ids in canonical (unshuffled) order. >0: library track id, <0: path-only entry.
+        self._ids = array("q")
+        # Shuffle permutation: play position -> index into `_ids` (None = not shuffled).
+        self._order: array[int] | None = None
+        self._current_index = 0
+
+        self._meta: OrderedDict[int, Any] = OrderedDict()
+        self._adhoc: dict[int, PlaylistTrack] = {}
+        self._next_adhoc_id = -1
+        # Bumped by clear(); background loaders use it to detect a replaced queue.
+        self.epoch = 0
+
+        # Without a loader evicted metadata could not be restored, so the cache is unbounded.
+        self._track_loader = track_loader
+        self._metadata_cache_size = max(8, metadata_cache_size)
+        self._on_change = on_change
+
+    # ---- Size / state ----
 
     def __len__(self) -> int:
         """Return number of tracks in playlist."""
-        return len(self.tracks)
+        return len(self._ids)
 
     @property
     def is_empty(self) -> bool:
         """Check if playlist is empty."""
-        return len(self.tracks) == 0
+        return len(self._ids) == 0
+
+    @property
+    def current_index(self) -> int:
+        return self._current_index
+
+    @current_index.setter
+    def current_index(self, value: int) -> None:
+        self._current_index = value
+        self._changed()
 
     @property
-    def current_track(self) -> PlaylistTrack | None:
+    def tracks(self) -> _PlaylistView:
+        """Tracks in play order (lazily materialized from ids)."""
+        return _PlaylistView(self)
+
+    @property
+    def track_ids(self) -> list[int]:
+        """Entry ids in play order (negative ids are path-only entries)."""
+        if self._order is None:
+            return self._ids.tolist()
+        ids = self._ids
+        return [ids[k] for k in self._order]
+
+    @property
+    def current_track(self) -> Any:
         """Get the current track, or None if playlist is empty."""
-        if self.is_empty or self.current_index >= len(self.tracks):
+        if self.is_empty or self._current_index >= len(self._ids):
             return None
-        return self.tracks[self.current_index]
+        return self.track_at(self._current_index)
 
     @property
     def has_next(self) -> bool:
@@ -125,7 +268,7 @@ class Playlist:
             return False
         if self.repeat_mode in (RepeatMode.ONE, RepeatMode.ALL):
             return True
-        return self.current_index < len(self.tracks) - 1
+        return self._current_index < len(self._ids) - 1
 
     @property
     def has_previous(self) -> bool:
@@ -134,28 +277,178 @@ class Playlist:
             return False
         if self.repeat_mode in (RepeatMode.ONE, RepeatMode.ALL):
             return True
-        return self.current_index > 0
+        return self._current_index > 0
+
+    # ---- Entry storage ----
+
+    def _entry_id(self, position: int) -> int:
+        order = self._order
+        return self._ids[order[position] if order is not None else position]
+
+    def track_at(self, position: int) -> Any:
+        """
+        Return the track at a play position.
 
-    def add(self, track: PlaylistTrack, *, position: int | None = None) -> int:
+        If the metadata was evicted and not hydrated again yet, a placeholder
+        PlaylistTrack carrying only the id is returned.
+        """
+        entry_id = self._entry_id(position)
+        if entry_id < 0:
+            return self._adhoc[entry_id]
+        track = self._meta.get(entry_id)
+        if track is None:
+            logger.debug("playlist %s: track %d not hydrated", self.player_id, entry_id)
+            return PlaylistTrack(track_id=TrackId(entry_id), path="")
+        self._meta.move_to_end(entry_id)
+        return track
+
+    def _register(self, track: Any) -> int:
+        """Return the entry id for `track`, caching its metadata."""
+        track_id = getattr(track, "track_id", None)
+        if track_id is not None and track_id > 0:
+            entry_id = int(track_id)
+            self._meta[entry_id] = track
+            self._meta.move_to_end(entry_id)
+            return entry_id
+
+        entry_id = self._next_adhoc_id
+        self._next_adhoc_id -= 1
+        self._adhoc[entry_id] = track
+        return entry_id
+
+    def _pinned_ids(self) -> set[int]:
+        """Ids that synchronous navigation may need without hydrating first."""
+        n = len(self._ids)
+        if n == 0:
+            return set()
+        cur = self._current_index
+        positions = {cur - 1, cur, cur + 1, 0, n - 1}
+        return {self._entry_id(p) for p in positions if 0 <= p < n}
+
+    def _evict(self, keep: set[int] | None = None) -> None:
+        if self._track_loader is None or len(self._meta) <= self._metadata_cache_size:
+            return
+        pinned = self._pinned_ids()
+        if keep:
+            pinned |= keep
+        meta = self._meta
+        skipped = 0
+        while len(meta) > self._metadata_cache_size and skipped < len(meta):
+            entry_id = next(iter(meta))
+            if entry_id in pinned:
+                meta.move_to_end(entry_id)
+                skipped += 1
+                continue
+            del meta[entry_id]
+
+    def _changed(self) -> None:
+        if self._on_change is not None:
+            self._on_change(self)
+
+    # ---- Hydration ----
+
+    async def hydrate(self, start: int = 0, count: int | None = None) -> None:
+        """
+        Load metadata for play positions [start, start + count) if missing.
+
+        No-op without a track loader (all metadata is then kept in memory).
+        """
+        if self._track_loader is None or self.is_empty:
+            return
+        n = len(self._ids)
+        start = max(0, start)
+        stop = n if count is None else min(n, start + max(0, count))
+        await self._hydrate_positions(range(start, stop))
+
+    async def hydrate_current(self) -> None:
+        """Hydrate the current entry and its navigation neighbours (incl. wrap-around)."""
+        if self._track_loader is None or self.is_empty:
+            return
+        n = len(self._ids)
+        cur = self._current_index
+        await self._hydrate_positions(p for p in (cur - 1, cur, cur + 1, 0, n - 1) if 0 <= p < n)
+
+    async def _hydrate_positions(self, positions: Iterable[int]) -> None:
+        assert self._track_loader is not None
+        missing: list[int] = []
+        window: set[int] = set()
+        for position in positions:
+            entry_id = self._entry_id(position)
+            if entry_id > 0 and entry_id not in window:
+                window.add(entry_id)
+                if entry_id not in self._meta:
+                    missing.append(entry_id)
+        if not missing:
+            return
+
+        epoch = self.epoch
+        rows = await self._track_loader(missing)
+        if epoch != self.epoch:
+            return  # cleared while loading
+        for row in rows:
+            self._meta[int(row.id)] = row
+        # The caller is about to read the whole window: evict around it.
+        self._evict(keep=window)
+
+        gone = set(missing).difference(self._meta)
+        if gone:
+            self._drop_entries(gone)
+
+    def _drop_entries(self, entry_ids: set[int]) -> None:
+        """Remove every occurrence of `entry_ids` (tracks deleted from the library)."""
+        ids = self._ids
+        keep = [k for k in range(len(ids)) if ids[k] not in entry_ids]
+        removed = len(ids) - len(keep)
+        if not removed:
+            return
+
+        if self._order is None:
+            dropped_before = sum(1 for k in range(self._current_index) if ids[k] in entry_ids)
+        else:
+            new_index = {k: i for i, k in enumerate(keep)}
+            order = self._order
+            dropped_before = sum(
+                1 for p in range(min(self._current_index, len(order))) if ids[order[p]] in entry_ids
+            )
+            self._order = array("q", (new_index[k] for k in order if k in new_index))
+        self._ids = array("q", (ids[k] for k in keep))
+        self._current_index = max(0, min(self._current_index - dropped_before, len(self._ids) - 1))
+
+        self._changed()
+        logger.info(
+            "playlist %s: dropped %d entries no longer in the library", self.player_id, removed
+        )
+
+    # ---- Mutation ----
+
+    def add(self, track: Any, *, position: int | None = None) -> int:
         """
         Add a track to the playlist.
 
         Args:
-            track: The track to add.
+            track: The track to add (TrackRow or PlaylistTrack).
             position: Optional position to insert at. None = append at end.
 
         Returns:
             The index where the track was inserted.
         """
-        old_current_index = self.current_index
+        old_current_index = self._current_index
         was_empty = self.is_empty
+        n = len(self._ids)
+        entry_id = self._register(track)
 
         if position is None:
-            self.tracks.append(track)
-            idx = len(self.tracks) - 1
+            self._ids.append(entry_id)
+            if self._order is not None:
+                self._order.append(n)
+            idx = n
         else:
-            position = max(0, min(position, len(self.tracks)))
-            self.tracks.insert(position, track)
+            position = max(0, min(position, n))
+            if self._order is None:
+                self._ids.insert(position, entry_id)
+            else:
+                self._ids.append(entry_id)
+                self._order.insert(position, n)
             idx = position
             # Adjust current_index if we inserted before it.
             #
@@ -163,20 +456,69 @@ class Playlist:
             # - When the playlist is empty, current_index is 0 and must remain 0.
             #   Shifting it to 1 would make the newly inserted first track "not current",
             #   which can manifest as immediately playing track +1 after a manual start.
-            if not was_empty and position <= self.current_index:
-                self.current_index += 1
+            if not was_empty and position <= self._current_index:
+                self._current_index += 1
+
+        self._evict()
+        self._changed()
 
         logger.info(
             "playlist.add: track=%s, position=%s, idx=%d, current_index: %d -> %d, len=%d",
-            track.title or track.path,
+            getattr(track, "title", None) or track.path,
             position,
             idx,
             old_current_index,
-            self.current_index,
-            len(self.tracks),
+            self._current_index,
+            len(self._ids),
         )
         return idx
 
+    def insert(self, position: int, track: Any) -> int:
+        """Insert a track at `position` (alias for `add(track, position=...)`)."""
+        return self.add(track, position=position)
+
+    def extend(self, tracks: Iterable[Any]) -> int:
+        """
+        Append many tracks at once.
+
+        Returns:
+            Number of tracks appended.
+        """
+        ids = self._ids
+        order = self._order
+        count = 0
+        for track in tracks:
+            if order is not None:
+                order.append(len(ids))
+            ids.append(self._register(track))
+            count += 1
+            if len(self._meta) > self._metadata_cache_size:
+                self._evict()
+
+        if count:
+            self._changed()
+        logger.info("playlist.extend: added %d tracks, len=%d", count, len(ids))
+        return count
+
+    def extend_ids(self, track_ids: Iterable[int]) -> int:
+        """
+        Append library track ids without metadata (hydrated on demand).
+
+        Returns:
+            Number of tracks appended.
+        """
+        ids = self._ids
+        start = len(ids)
+        ids.extend(int(t) for t in track_ids if t > 0)
+        count = len(ids) - start
+        if self._order is not None:
+            self._order.extend(range(start, start + count))
+
+        if count:
+            self._changed()
+        logger.info("playlist.extend_ids: added %d tracks, len=%d", count, len(ids))
+        return count
+
     def add_path(self, path: str | Path, *, position: int | None = None) -> int:
         """
         Convenience method to add a track by path only.
@@ -191,7 +533,7 @@ class Playlist:
         track = PlaylistTrack.from_path(path)
         return self.add(track, position=position)
 
-    def remove(self, index: int) -> PlaylistTrack | None:
+    def remove(self, index: int) -> Any:
         """
         Remove a track at the given index.
 
@@ -201,20 +543,65 @@ class Playlist:
         Returns:
             The removed track, or None if index was invalid.
         """
-        if index < 0 or index >= len(self.tracks):
+        if index < 0 or index >= len(self._ids):
             return None
 
-        track = self.tracks.pop(index)
+        track = self.track_at(index)
+        entry_id = self._entry_id(index)
+
+        order = self._order
+        if order is None:
+            del self._ids[index]
+        else:
+            k = order.pop(index)
+            del self._ids[k]
+            # Positions after `k` moved down by one; renumber in place.
+            for i, p in enumerate(order):
+                if p > k:
+                    order[i] = p - 1
+
+        if entry_id < 0:
+            self._adhoc.pop(entry_id, None)
 
         # Adjust current_index
-        if index < self.current_index:
-            self.current_index -= 1
-        elif index == self.current_index and self.current_index >= len(self.tracks):
-            self.current_index = max(0, len(self.tracks) - 1)
+        if index < self._current_index:
+            self._current_index -= 1
+        elif index == self._current_index and self._current_index >= len(self._ids):
+            self._current_index = max(0, len(self._ids) - 1)
 
+        self._changed()
         logger.debug("Removed track at index %d from playlist %s", index, self.player_id)
         return track
 
+    def move(self, from_index: int, to_index: int) -> bool:
+        """
+        Move the track at `from_index` to `to_index` (play order).
+
+        Returns:
+            True if the track was moved, False for invalid indices.
+        """
+        n = len(self._ids)
+        if not (0 <= from_index < n and 0 <= to_index < n):
+            return False
+        if from_index == to_index:
+            return True
+
+        seq = self._order if self._order is not None else self._ids
+        value = seq.pop(from_index)
+        seq.insert(to_index, value)
+
+        cur = self._current_index
+        if from_index == cur:
+            cur = to_index
+        elif from_index < cur <= to_index:
+            cur -= 1
+        elif to_index <= cur < from_index:
+            cur += 1
+        self._current_index = cur
+
+        self._changed()
+        return True
+
     def clear(self) -> int:
         """
         Clear all tracks from the playlist.
@@ -222,14 +609,20 @@ class Playlist:
         Returns:
             Number of tracks that were cleared.
         """
-        count = len(self.tracks)
-        self.tracks.clear()
-        self._original_order.clear()
-        self.current_index = 0
+        count = len(self._ids)
+        self._ids = array("q")
+        self._order = None if self.shuffle_mode == ShuffleMode.OFF else array("q")
+        self._meta.clear()
+        self._adhoc.clear()
+        self._current_index = 0
+        self.epoch += 1
+        self._changed()
         logger.info("playlist.clear: cleared %d tracks, current_index reset to 0", count)
         return count
 
-    def play(self, index: int = 0) -> PlaylistTrack | None:
+    # ---- Navigation ----
+
+    def play(self, index: int = 0) -> Any:
         """
         Start playing from a specific index.
 
@@ -243,20 +636,20 @@ class Playlist:
             logger.info("playlist.play: playlist is empty, returning None")
             return None
 
-        old_index = self.current_index
-        index = max(0, min(index, len(self.tracks) - 1))
+        old_index = self._current_index
+        index = max(0, min(index, len(self._ids) - 1))
         self.current_index = index
         track = self.current_track
         logger.info(
             "playlist.play: index=%d (requested), current_index: %d -> %d, track=%s",
             index,
             old_index,
-            self.current_index,
+            self._current_index,
             track.title if track else None,
         )
         return track
 
-    def next(self) -> PlaylistTrack | None:
+    def next(self) -> Any:
         """
         Move to the next track.
 
@@ -274,8 +667,8 @@ class Playlist:
         if self.repeat_mode == RepeatMode.ONE:
             return self.current_track
 
-        if self.current_index < len(self.tracks) - 1:
-            self.current_index += 1
+        if self._current_index < len(self._ids) - 1:
+            self.current_index = self._current_index + 1
         elif self.repeat_mode == RepeatMode.ALL:
             self.current_index = 0
         else:
@@ -283,7 +676,38 @@ class Playlist:
 
         return self.current_track
 
-    def previous(self) -> PlaylistTrack | None:
+    def next_position(self) -> int | None:
+        """
+        Return the play position `next()` would move to, without moving.
+
+        Returns:
+            The upcoming position, or None if playback would stop.
+        """
+        if self.is_empty:
+            return None
+
+        if self.repeat_mode == RepeatMode.ONE:
+            return self._current_index
+
+        if self._current_index < len(self._ids) - 1:
+            return self._current_index + 1
+        if self.repeat_mode == RepeatMode.ALL:
+            return 0
+        return None
+
+    def peek_next(self) -> Any:
+        """
+        Return the track `next()` would move to, without moving.
+
+        The metadata may not be hydrated; see `next_position()`.
+
+        Returns:
+            The upcoming track, or None if playback would stop.
+        """
+        position = self.next_position()
+        return None if position is None else self.track_at(position)
+
+    def previous(self) -> Any:
         """
         Move to the previous track.
 
@@ -301,10 +725,10 @@ class Playlist:
         if self.repeat_mode == RepeatMode.ONE:
             return self.current_track
 
-        if self.current_index > 0:
-            self.current_index -= 1
+        if self._current_index > 0:
+            self.current_index = self._current_index - 1
         elif self.repeat_mode == RepeatMode.ALL:
-            self.current_index = len(self.tracks) - 1
+            self.current_index = len(self._ids) - 1
         else:
             return None
 
@@ -315,44 +739,39 @@ class Playlist:
         if isinstance(mode, int):
             mode = RepeatMode(mode)
         self.repeat_mode = mode
+        self._changed()
         logger.debug("Set repeat mode to %s for playlist %s", mode.name, self.player_id)
 
     def set_shuffle(self, mode: ShuffleMode | int) -> None:
-        """Set the shuffle mode (basic implementation)."""
+        """
+        Set the shuffle mode.
+
+        Enabling shuffle builds a permutation over entry positions with the
+        current track first; disabling it drops the permutation and maps the
+        current index back to canonical order.
+        """
         if isinstance(mode, int):
             mode = ShuffleMode(mode)
 
         if mode == ShuffleMode.ON and self.shuffle_mode == ShuffleMode.OFF:
-            # Enable shuffle: save original order and randomize
-            import random
-
-            self._original_order = list(self.tracks)
-            current = self.current_track
-
-            # Shuffle but keep current track at current position
-            other_tracks = [t for t in self.tracks if t != current]
-            random.shuffle(other_tracks)
-
-            if current:
-                self.tracks = [current, *other_tracks]
-                self.current_index = 0
-            else:
-                self.tracks = other_tracks
+            n = len(self._ids)
+            order = array("q", range(n))
+            if n:
+                cur = min(self._current_index, n - 1)
+                order[0], order[cur] = order[cur], order[0]
+                rest = order[1:]
+                random.shuffle(rest)
+                order[1:] = rest
+            self._order = order
+            self._current_index = 0
 
         elif mode == ShuffleMode.OFF and self.shuffle_mode == ShuffleMode.ON:
-            # Disable shuffle: restore original order
-            if self._original_order:
-                current = self.current_track
-                self.tracks = list(self._original_order)
-                # Find current track in restored order
-                if current:
-                    try:
-                        self.current_index = self.tracks.index(current)
-                    except ValueError:
-                        self.current_index = 0
-                self._original_order.clear()
+            if self._order is not None and self._current_index < len(self._order):
+                self._current_index = self._order[self._current_index]
+            self._order = None
 
         self.shuffle_mode = mode
+        self._changed()
         logger.debug("Set shuffle mode to %s for playlist %s", mode.name, self.player_id)
 
     def get_tracks_info(self) -> list[dict[str, Any]]:
@@ -379,6 +798,52 @@ class Playlist:
             )
         return result
 
+    # ---- Persistence ----
+
+    def to_state(self) -> PlaylistStateRow:
+        """Snapshot the playlist for persistence (ids only, no metadata)."""
+        adhoc = {str(k): t.path for k, t in self._adhoc.items()}
+        return PlaylistStateRow(
+            player_id=self.player_id,
+            track_ids=_pack_ids(self._ids),
+            shuffle_order=_pack_ids(self._order) if self._order is not None else None,
+            adhoc_paths=json.dumps(adhoc) if adhoc else None,
+            current_index=self._current_index,
+            repeat_mode=self.repeat_mode.value,
+            shuffle_mode=self.shuffle_mode.value,
+        )
+
+    @classmethod
+    def from_state(cls, state: PlaylistStateRow, **kwargs: Any) -> Playlist:
+        """Restore a playlist from a persisted snapshot (metadata is hydrated later)."""
+        playlist = cls(state.player_id, **kwargs)
+        playlist._ids = _unpack_ids(state.track_ids)
+        n = len(playlist._ids)
+
+        if state.adhoc_paths:
+            for key, path in json.loads(state.adhoc_paths).items():
+                entry_id = int(key)
+                playlist._adhoc[entry_id] = PlaylistTrack.from_path(path)
+                playlist._next_adhoc_id = min(playlist._next_adhoc_id, entry_id - 1)
+
+        try:
+            playlist.repeat_mode = RepeatMode(state.repeat_mode)
+            playlist.shuffle_mode = ShuffleMode(state.shuffle_mode)
+        except ValueError:
+            playlist.repeat_mode = RepeatMode.OFF
+            playlist.shuffle_mode = ShuffleMode.OFF
+
+        if playlist.shuffle_mode == ShuffleMode.ON:
+            order = _unpack_ids(state.shuffle_order)
+            if len(order) == n and sorted(order) == list(range(n)):
+                playlist._order = order
+            else:
+                # Corrupt/mismatched permutation: fall back to canonical order.
+                playlist.shuffle_mode = ShuffleMode.OFF
+
+        playlist._current_index = max(0, min(state.current_index, n - 1)) if n else 0
+        return playlist
+
 
 class PlaylistManager:
     """
@@ -386,11 +851,37 @@ class PlaylistManager:
 
     This is a central registry that creates and retrieves playlists
     by player ID (MAC address).
+
+    If constructed with a LibraryDb, playlists hydrate metadata from it and
+    are persisted write-behind (see module docstring). Call `load()` after the
+    DB is open and `close()` before it is closed.
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        db: LibraryDb | None = None,
+        *,
+        write_delay: float = DEFAULT_WRITE_DELAY,
+        metadata_cache_size: int = DEFAULT_METADATA_CACHE_SIZE,
+    ) -> None:
         """Initialize the playlist manager."""
         self._playlists: dict[str, Playlist] = {}
+        self._db = db
+        self._write_delay = write_delay
+        self._metadata_cache_size = metadata_cache_size
+
+        self._dirty: set[str] = set()
+        self._deleted: set[str] = set()
+        self._flush_task: asyncio.Task[None] | None = None
+
+    def _playlist_kwargs(self) -> dict[str, Any]:
+        if self._db is None:
+            return {}
+        return {
+            "track_loader": self._db.get_tracks_by_ids,
+            "metadata_cache_size": self._metadata_cache_size,
+            "on_change": self._mark_dirty,
+        }
 
     def get(self, player_id: str) -> Playlist:
         """
@@ -403,7 +894,7 @@ class PlaylistManager:
             The player's playlist (created if it didn't exist).
         """
         if player_id not in self._playlists:
-            self._playlists[player_id] = Playlist(player_id=player_id)
+            self._playlists[player_id] = Playlist(player_id=player_id, **self._playlist_kwargs())
             logger.debug("Created new playlist for player %s", player_id)
         return self._playlists[player_id]
 
@@ -417,7 +908,12 @@ class PlaylistManager:
         Returns:
             The removed playlist, or None if it didn't exist.
         """
-        return self._playlists.pop(player_id, None)
+        playlist = self._playlists.pop(player_id, None)
+        if playlist is not None and self._db is not None:
+            self._dirty.discard(player_id)
+            self._deleted.add(player_id)
+            self._schedule_flush()
+        return playlist
 
     def clear_all(self) -> int:
         """
@@ -427,6 +923,10 @@ class PlaylistManager:
             Number of playlists cleared.
         """
         count = len(self._playlists)
+        if self._db is not None:
+            self._deleted.update(self._playlists)
+            self._dirty.clear()
+            self._schedule_flush()
         self._playlists.clear()
         return count
 
@@ -437,3 +937,86 @@ class PlaylistManager:
     def __contains__(self, player_id: str) -> bool:
         """Check if a playlist exists for a player."""
         return player_id in self._playlists
+
+    # ---- Persistence ----
+
+    async def load(self) -> int:
+        """
+        Restore persisted playlists from the DB.
+
+        Returns:
+            Number of playlists restored.
+        """
+        if self._db is None:
+            return 0
+        states = await self._db.load_player_playlists()
+        for state in states:
+            playlist = Playlist.from_state(state, **self._playlist_kwargs())
+            self._playlists[state.player_id] = playlist
+            # Keep synchronous navigation usable right after a restart.
+            await playlist.hydrate_current()
+        if states:
+            logger.info("Restored %d playlist(s) from DB", len(states))
+        return len(states)
+
+    def _mark_dirty(self, playlist: Playlist) -> None:
+        if self._playlists.get(playlist.player_id) is not playlist:
+            return
+        self._dirty.add(playlist.player_id)
+        self._schedule_flush()
+
+    def _schedule_flush(self) -> None:
+        if self._flush_task is not None and not self._flush_task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No running loop (sync callers): state is written on the next flush().
+            return
+        self._flush_task = loop.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        while True:
+            await asyncio.sleep(self._write_delay)
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Failed to persist playlists")
+                return
+            # Changes made while the write was in flight only marked playlists
+            # dirty (this task was still running); write them in another pass.
+            if not self._dirty and not self._deleted:
+                return
+
+    async def flush(self) -> None:
+        """Write all pending playlist changes to the DB now."""
+        if self._db is None:
+            return
+
+        dirty_ids = [pid for pid in self._dirty if pid in self._playlists]
+        deleted = list(self._deleted)
+        self._dirty.clear()
+        self._deleted.clear()
+        if not dirty_ids and not deleted:
+            return
+
+        states = [self._playlists[pid].to_state() for pid in dirty_ids]
+        try:
+            await self._db.save_player_playlists(states, deleted=deleted)
+        except BaseException:
+            # Keep the changes pending so a later flush can retry (also when
+            # cancelled while waiting for the DB write lock, e.g. by close()).
+            self._dirty.update(dirty_ids)
+            self._deleted.update(deleted)
+            raise
+        logger.debug("Persisted %d playlist(s), deleted %d", len(states), len(deleted))
+
+    async def close(self) -> None:
+        """Cancel the pending write-behind task and flush synchronously."""
+        task = self._flush_task
+        self._flush_task = None
+        if task is not None and not task.done():
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        await self.flush()
@@ -0,0 +1,244 @@
+"""
+Event-loop stall watchdog and on-demand sampling profiler.
+
+Both answer "what was the server doing when a player underran or a Cometd
+stream dropped?" without DEBUG logging or a restart:
+
+- `loop_watchdog` notices when the event loop stops ticking (a blocking call
+  such as an image resize, a synchronous file read or a slow SQLite call)
+  and records the loop thread's stack while it is still blocked.
+- `sample_profile` samples thread stacks for a few seconds and returns them
+  in the collapsed ("folded") format read by flamegraph.pl, speedscope and
+  most other flamegraph tools.
+
+Design:
+- The watchdog is fed by `monitor_loop_lag` (resonance.core.metrics): every
+  tick calls `beat()`. A daemon thread checks the age of the last beat; once
+  the loop is `threshold` late it grabs the loop thread's frame via
+  ``sys._current_frames()``. The stack is taken while the loop is blocked,
+  so it points at the blocking code, not at whatever ran afterwards.
+- When the loop resumes, the next beat stores the measured lag as the
+  stall's duration.
+- The profiler runs in a worker thread (``asyncio.to_thread``) so sampling
+  keeps going while the loop thread is busy. Only one profile runs at a time.
+
+Notes:
+- Like `frame_tracer`, the watchdog is a process-wide instance. Stalls are
+  kept in a small ring and counted in ``resonance_event_loop_stalls_total``.
+- Samples of an idle loop end in the selector's ``select``; that is the
+  loop waiting for I/O, not work.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import collections
+import logging
+import sys
+import threading
+import time
+import traceback
+from dataclasses import asdict, dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from resonance.core.metrics import LOOP_LAG_INTERVAL, metrics
+
+if TYPE_CHECKING:
+    from types import FrameType
+
+logger = logging.getLogger(__name__)
+
+# Loop stalls at least this long (seconds) are recorded.
+STALL_THRESHOLD = 0.1
+
+# Stalls kept for /api/admin/stalls.
+STALL_CAPACITY = 32
+
+# Profiler sampling interval and upper bound on a single profile (seconds).
+DEFAULT_SAMPLE_INTERVAL = 0.005
+# Sampling faster than this mostly measures (and slows) the sampler itself.
+MIN_SAMPLE_INTERVAL = 0.001
+MAX_PROFILE_SECONDS = 60.0
+
+STALLS = metrics.counter(
+    "resonance_event_loop_stalls_total",
+    "Times the event loop was blocked for longer than the stall threshold.",
+)
+
+
+@dataclass(slots=True)
+class Stall:
+    """One recorded event-loop stall."""
+
+    started: float  # wall-clock time (epoch seconds)
+    duration: float  # seconds; grows to the measured lag once the loop resumes
+    task: str | None  # asyncio task running on the loop when it was caught
+    stack: list[str] = field(default_factory=list)
+    resolved: bool = False
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+class LoopWatchdog:
+    """Records event-loop stalls together with the blocking stack."""
+
+    def __init__(self, threshold: float = STALL_THRESHOLD, capacity: int = STALL_CAPACITY) -> None:
+        self.threshold = threshold
+        self._stalls: collections.deque[Stall] = collections.deque(maxlen=capacity)
+        self._open: Stall | None = None
+        self._interval = LOOP_LAG_INTERVAL
+        self._beat = 0.0
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread: int | None = None
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self, interval: float = LOOP_LAG_INTERVAL) -> None:
+        """Watch the running loop; `beat()` must be called every `interval` seconds."""
+        if self._thread is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._interval = interval
+        self._beat = time.monotonic()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="loop-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stop.set()
+            thread.join(timeout=1.0)
+        self._open = None
+
+    def beat(self, lag: float = 0.0) -> None:
+        """Heartbeat from the loop; `lag` is how late this tick fired."""
+        self._beat = time.monotonic()
+        stall, self._open = self._open, None
+        if stall is not None:
+            stall.duration = max(stall.duration, lag)
+            stall.resolved = True
+            logger.info("Event loop resumed after %.0f ms", stall.duration * 1000)
+
+    def stalls(self, limit: int | None = None) -> list[dict[str, Any]]:
+        """Recorded stalls, newest first."""
+        stalls = [stall.to_dict() for stall in reversed(self._stalls)]
+        return stalls[:limit] if limit is not None else stalls
+
+    def clear(self) -> None:
+        self._stalls.clear()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.threshold / 2):
+            late = time.monotonic() - self._beat - self._interval
+            if late >= self.threshold and self._open is None:
+                self._record(late)
+
+    def _record(self, late: float) -> None:
+        frame = sys._current_frames().get(self._loop_thread or 0)
+        stack = traceback.format_stack(frame) if frame is not None else []
+        task = asyncio.current_task(self._loop) if self._loop is not None else None
+        stall = Stall(
+            started=time.time() - late,
+            duration=late,
+            task=task.get_name() if task is not None else None,
+            stack=[line.rstrip() for line in stack],
+        )
+        self._open = stall
+        self._stalls.append(stall)
+        STALLS.inc()
+        logger.warning(
+            "Event loop blocked for %.0f ms (task %s):\n%s",
+            late * 1000,
+            stall.task,
+            "".join(stack),
+        )
+
+
+loop_watchdog = LoopWatchdog()
+
+
+class ProfilerBusyError(RuntimeError):
+    """Raised when a profile is requested while another one is running."""
+
+
+@dataclass(slots=True)
+class Profile:
+    """Result of `sample_profile`: folded stacks and their sample counts."""
+
+    seconds: float
+    interval: float
+    samples: int
+    stacks: collections.Counter[str]
+
+    def collapsed(self) -> str:
+        """Brendan Gregg's folded format: ``frame;frame;leaf count`` per line."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+def _fold(frame: FrameType | None, prefix: str | None = None) -> str:
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{frame.f_globals.get('__name__', '?')}:{code.co_qualname}")
+        frame = frame.f_back
+    if prefix is not None:
+        names.append(prefix)
+    return ";".join(reversed(names))
+
+
+def _sample(
+    thread_id: int | None, seconds: float, interval: float
+) -> tuple[collections.Counter[str], int]:
+    stacks: collections.Counter[str] = collections.Counter()
+    me = threading.get_ident()
+    names = {thread.ident: thread.name for thread in threading.enumerate()}
+    samples = 0
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        for ident, frame in sys._current_frames().items():
+            if ident == me or (thread_id is not None and ident != thread_id):
+                continue
+            prefix = None if thread_id is not None else names.get(ident, str(ident))
+            stacks[_fold(frame, prefix)] += 1
+        samples += 1
+        time.sleep(interval)
+    return stacks, samples
+
+
+_profile_lock = asyncio.Lock()
+
+
+async def sample_profile(
+    seconds: float,
+    interval: float = DEFAULT_SAMPLE_INTERVAL,
+    all_threads: bool = False,
+) -> Profile:
+    """
+    Sample stacks of the event-loop thread (or every thread) for `seconds`.
+
+    With `all_threads`, each stack is rooted at its thread name, so worker
+    threads (``asyncio.to_thread``, the watchdog) show up side by side.
+    `interval` is raised to at least `MIN_SAMPLE_INTERVAL`.
+
+    Raises:
+        ValueError: `seconds` or `interval` out of range.
+        ProfilerBusyError: Another profile is running.
+    """
+    if not 0 < seconds <= MAX_PROFILE_SECONDS:
+        raise ValueError(f"seconds must be in (0, {MAX_PROFILE_SECONDS:g}]")
+    if not 0 < interval <= seconds:
+        raise ValueError("interval must be positive and at most seconds")
+    interval = max(interval, MIN_SAMPLE_INTERVAL)
+    if _profile_lock.locked():
+        raise ProfilerBusyError("A profile is already running")
+    async with _profile_lock:
+        thread_id = None if all_threads else threading.get_ident()
+        stacks, samples = await asyncio.to_thread(_sample, thread_id, seconds, interval)
+    return Profile(seconds=seconds, interval=interval, samples=samples, stacks=stacks)
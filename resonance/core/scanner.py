@@ -1,16 +1,21 @@
 from __future__ import annotations
 
 import asyncio
+import functools
 import logging
-from collections.abc import AsyncIterator, Iterable
-from dataclasses import dataclass
+import os
+import re
+import struct
+import time
+from dataclasses import dataclass, field, replace
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any, cast
 
-from mutagen import File as mutagen_file
-from mutagen.flac import FLAC
-from mutagen.id3 import ID3
-from mutagen.mp4 import MP4
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Callable, Iterable, Mapping
+
+# mutagen is imported where tags are read (scan worker threads), not at module
+# import: the server must not pay for it before players can connect.
 
 logger = logging.getLogger(__name__)
 
@@ -37,6 +42,33 @@ DEFAULT_AUDIO_EXTENSIONS: frozenset[str] = frozenset(
 )
 
 
+# Filesystem types served over the network (NFS/SMB/...). inotify does not see
+# changes made by other hosts on these, and their latency favours deep queues.
+NETWORK_FILESYSTEMS: frozenset[str] = frozenset(
+    {
+        "nfs",
+        "nfs4",
+        "cifs",
+        "smb3",
+        "smbfs",
+        "9p",
+        "afs",
+        "ceph",
+        "glusterfs",
+        "fuse.sshfs",
+        "fuse.rclone",
+        "davfs",
+    }
+)
+
+# Per-device extraction concurrency. Spinning disks lose throughput to seeks
+# when many files are read at once; SSDs and network mounts want deep queues.
+ROTATIONAL_SCAN_CONCURRENCY = 2
+SOLID_STATE_SCAN_CONCURRENCY = 16
+NETWORK_SCAN_CONCURRENCY = 16
+DEFAULT_SCAN_CONCURRENCY = 8
+
+
 @dataclass(frozen=True, slots=True)
 class ScanConfig:
     """
@@ -48,7 +80,10 @@ class ScanConfig:
     root: Path
     extensions: frozenset[str] = DEFAULT_AUDIO_EXTENSIONS
     follow_symlinks: bool = False
-    max_concurrency: int = 8
+    max_concurrency: int = DEFAULT_SCAN_CONCURRENCY
+    # Directory mtimes recorded by the previous walk (`WalkResult.directories`).
+    # When set, directories whose mtime is unchanged are not listed again.
+    known_directories: Mapping[str, int] | None = None
 
 
 @dataclass(frozen=True, slots=True)
@@ -86,6 +121,15 @@ class TrackMetadata:
     channels: int | None = None
 
 
+@dataclass(frozen=True, slots=True)
+class DeviceBudget:
+    """I/O concurrency budget for the block device (`st_dev`) a music root lives on."""
+
+    device: int
+    kind: str  # "rotational" | "ssd" | "network" | "unknown"
+    max_concurrency: int
+
+
 @dataclass(frozen=True, slots=True)
 class ScanIssue:
     path: Path
@@ -96,6 +140,15 @@ class ScanIssue:
 class ScanResult:
     tracks: list[TrackMetadata]
     issues: list[ScanIssue]
+    # Directory mtimes seen by the walk, to be passed back as `known_directories`.
+    directories: dict[str, int] = field(default_factory=dict)
+
+
+@dataclass(frozen=True, slots=True)
+class WalkResult:
+    files: list[str]
+    directories: dict[str, int]
+    pruned: int = 0
 
 
 def _clean_str(value: str | None) -> str | None:
@@ -226,6 +279,10 @@ def _parse_int_maybe(value: Any) -> int | None:
         return None
 
 
+# Split on ; or / or , (with optional whitespace around) but not ampersand
+_GENRE_SEPARATORS = re.compile(r"\s*[;/,]\s*")
+
+
 def _parse_genres(value: Any) -> tuple[str, ...]:
     """
     Parse genre tag value and split into multiple genres.
@@ -241,11 +298,7 @@ def _parse_genres(value: Any) -> tuple[str, ...]:
     if not s:
         return ()
 
-    # Split on common separators (semicolon, slash, comma) but not ampersand
-    import re
-
-    # Split on ; or / or , (with optional whitespace around)
-    parts = re.split(r"\s*[;/,]\s*", s)
+    parts = _GENRE_SEPARATORS.split(s)
 
     # Clean and deduplicate while preserving order
     seen: set[str] = set()
@@ -307,34 +360,518 @@ def _parse_compilation_flag(value: Any) -> bool:
         return False
 
 
-def _tags_get(tags: dict[str, Any] | None, keys: Iterable[str]) -> Any:
-    if not tags:
-        return None
-    for k in keys:
-        if k in tags:
-            return tags.get(k)
+@dataclass(frozen=True, slots=True)
+class _TagKeys:
+    """
+    Where each normalized field lives in one tag format.
+
+    Keys are listed in priority order. The map for a container type is resolved
+    once (`_tag_keys_for`), so extraction does a handful of direct lookups
+    instead of probing every format's spelling on every file.
+    """
+
+    title: tuple[str, ...] = ()
+    artist: tuple[str, ...] = ()
+    album: tuple[str, ...] = ()
+    album_artist: tuple[str, ...] = ()
+    composer: tuple[str, ...] = ()
+    conductor: tuple[str, ...] = ()
+    band: tuple[str, ...] = ()
+    genre: tuple[str, ...] = ()
+    track: tuple[str, ...] = ()
+    disc: tuple[str, ...] = ()
+    year: tuple[str, ...] = ()
+    compilation: tuple[str, ...] = ()
+    # Keys whose mere presence means the file carries embedded artwork.
+    artwork: tuple[str, ...] = ()
+
+    def names(self) -> frozenset[str]:
+        return frozenset(key for keys in (getattr(self, f) for f in self.__slots__) for key in keys)
+
+
+# ID3v2 frame ids (v2.2 ids are mapped onto these by `_read_id3_fields`).
+_ID3_KEYS = _TagKeys(
+    title=("TIT2",),
+    artist=("TPE1",),
+    album=("TALB",),
+    album_artist=("TPE2",),
+    composer=("TCOM",),
+    conductor=("TPE3",),
+    genre=("TCON",),
+    track=("TRCK",),
+    disc=("TPOS",),
+    year=("TDRC", "TYER"),
+    compilation=("TCMP",),
+    artwork=("APIC",),
+)
+
+# Vorbis comments (FLAC, Ogg). Keys are case-insensitive and compared lowercased.
+_VORBIS_KEYS = _TagKeys(
+    title=("title",),
+    artist=("artist",),
+    album=("album",),
+    album_artist=("albumartist", "album artist"),
+    composer=("composer",),
+    conductor=("conductor",),
+    band=("band", "orchestra"),
+    genre=("genre",),
+    track=("tracknumber",),
+    disc=("discnumber",),
+    year=("date", "year"),
+    compilation=("compilation",),
+    artwork=("metadata_block_picture",),
+)
+
+# iTunes-style MP4 atoms.
+_MP4_KEYS = _TagKeys(
+    title=("\xa9nam",),
+    artist=("\xa9ART",),
+    album=("\xa9alb",),
+    album_artist=("aART",),
+    genre=("\xa9gen",),
+    track=("trkn",),
+    disc=("disk",),
+    year=("\xa9day",),
+    compilation=("cpil",),
+    artwork=("covr",),
+)
+
+# APEv2 (WavPack, Monkey's Audio, Musepack). mutagen looks keys up case-insensitively.
+_APE_KEYS = _TagKeys(
+    title=("title",),
+    artist=("artist",),
+    album=("album",),
+    album_artist=("albumartist", "album artist"),
+    composer=("composer",),
+    conductor=("conductor",),
+    band=("band", "orchestra"),
+    genre=("genre",),
+    track=("track", "tracknumber"),
+    disc=("disc", "discnumber"),
+    year=("year", "date"),
+    compilation=("compilation",),
+    artwork=("cover art (front)",),
+)
+
+# Anything else: try every spelling, as for a format we have not specialized yet.
+_FALLBACK_KEYS = _TagKeys(
+    title=("TIT2", "title", "TITLE", "\xa9nam"),
+    artist=("TPE1", "artist", "ARTIST", "\xa9ART"),
+    album=("TALB", "album", "ALBUM", "\xa9alb"),
+    album_artist=("TPE2", "albumartist", "ALBUMARTIST", "aART", "ALBUM ARTIST"),
+    composer=("TCOM", "composer", "COMPOSER"),
+    conductor=("TPE3", "conductor", "CONDUCTOR"),
+    band=("band", "BAND", "orchestra", "ORCHESTRA"),
+    genre=("TCON", "genre", "GENRE", "\xa9gen"),
+    track=("TRCK", "tracknumber", "TRACKNUMBER", "trkn"),
+    disc=("TPOS", "discnumber", "DISCNUMBER", "disk"),
+    year=("TDRC", "TYER", "date", "DATE", "YEAR", "\xa9day"),
+    compilation=("TCMP", "compilation", "COMPILATION", "cpil"),
+    artwork=("metadata_block_picture", "METADATA_BLOCK_PICTURE"),
+)
+
+_ID3_NAMES = _ID3_KEYS.names()
+_VORBIS_NAMES = _VORBIS_KEYS.names()
+_VORBIS_FIELD_NAMES = _VORBIS_NAMES - set(_VORBIS_KEYS.artwork)
+
+_TAG_KEYS_BY_TYPE: dict[type, _TagKeys] = {}
+
+
+def _tag_keys_for(tags: Any) -> _TagKeys:
+    """Resolve (and cache) the key map for a mutagen tag container type."""
+    cls = type(tags)
+    keys = _TAG_KEYS_BY_TYPE.get(cls)
+    if keys is None:
+        from mutagen._vorbis import VComment
+        from mutagen.apev2 import APEv2
+        from mutagen.id3 import ID3
+        from mutagen.mp4 import MP4Tags
+
+        if isinstance(tags, ID3):
+            keys = _ID3_KEYS
+        elif isinstance(tags, VComment):
+            keys = _VORBIS_KEYS
+        elif isinstance(tags, MP4Tags):
+            keys = _MP4_KEYS
+        elif isinstance(tags, APEv2):
+            keys = _APE_KEYS
+        else:
+            keys = _FALLBACK_KEYS
+        _TAG_KEYS_BY_TYPE[cls] = keys
+    return keys
+
+
+def _lookup(fields: Mapping[str, Any], keys: tuple[str, ...]) -> Any:
+    for key in keys:
+        value = fields.get(key)
+        if value is not None:
+            return value
     return None
 
 
-def _extract_metadata(path: Path) -> TrackMetadata:
+@dataclass(frozen=True, slots=True)
+class _StreamInfo:
+    """Audio properties in the shape of mutagen's `info` objects."""
+
+    length: float
+    sample_rate: int
+    channels: int
+    bits_per_sample: int
+    bitrate: int
+
+
+@dataclass(frozen=True, slots=True)
+class _TagRead:
+    info: Any
+    # Either the mutagen tag container itself or a dict holding only the keys we map.
+    fields: Mapping[str, Any]
+    keys: _TagKeys
+    has_artwork: bool
+
+
+# --- Lean readers -----------------------------------------------------------
+#
+# MP3 and FLAC make up most libraries, and mutagen fully decodes every frame and
+# metadata block, including embedded pictures that are often larger than all
+# other metadata combined (and re-slices the ID3 tag buffer once per frame).
+# These readers seek past pictures and unmapped frames and decode only the
+# fields `_extract_metadata` uses. They return None for anything unusual
+# (unsynchronisation, compression, extended headers, inconsistent sizes), in
+# which case the file is read with mutagen as before.
+
+_ID3_HEADER = struct.Struct(">3sBBB4s")
+_ID3_FRAME_HEADER = struct.Struct(">4sIH")
+_ID3_V22_FRAME_HEADER = struct.Struct(">3s3s")
+_ID3_ENCODINGS = ("latin-1", "utf-16", "utf-16-be", "utf-8")
+# v2.3 compression/encryption/grouping, v2.4 grouping/compression/encryption/unsync/length.
+_ID3_V23_UNSUPPORTED_FRAME_FLAGS = 0x00E0
+_ID3_V24_UNSUPPORTED_FRAME_FLAGS = 0x004F
+_U32LE = struct.Struct("<I")
+_ID3_V22_FRAMES = {
+    b"TT2": "TIT2",
+    b"TP1": "TPE1",
+    b"TAL": "TALB",
+    b"TP2": "TPE2",
+    b"TCM": "TCOM",
+    b"TP3": "TPE3",
+    b"TCO": "TCON",
+    b"TRK": "TRCK",
+    b"TPA": "TPOS",
+    b"TYE": "TYER",
+    b"TCP": "TCMP",
+    b"PIC": "APIC",
+}
+
+
+def _syncsafe(data: bytes) -> int | None:
+    if (data[0] | data[1] | data[2] | data[3]) & 0x80:
+        return None
+    return (data[0] << 21) | (data[1] << 14) | (data[2] << 7) | data[3]
+
+
+def _id3_text(data: bytes) -> list[str] | None:
+    if not data or data[0] >= len(_ID3_ENCODINGS):
+        return None
+    try:
+        text = data[1:].decode(_ID3_ENCODINGS[data[0]])
+    except UnicodeDecodeError:
+        return None
+    values = [v.lstrip("\ufeff") for v in text.split("\0")]
+    while values and not values[-1]:
+        values.pop()
+    return values
+
+
+def _read_id3_fields(f: Any) -> tuple[dict[str, Any], bool, int | None] | None:
     """
-    Extract metadata using mutagen.
+    Read the mapped text frames of a leading ID3v2 tag.
 
-    Important: This function is intentionally synchronous; scanning can run it in a thread
-    to keep the asyncio event loop responsive.
+    Returns (fields, has_artwork, audio offset) or None to defer to mutagen.
+    """
+    header = f.read(10)
+    if len(header) < 10 or header[:3] != b"ID3":
+        return {}, False, None
+    _, major, _, flags, raw_size = _ID3_HEADER.unpack(header)
+    size = _syncsafe(raw_size)
+    # Tag-level unsynchronisation, extended headers and v2.2 compression are rare
+    # enough that mutagen can have them.
+    if size is None or major not in (2, 3, 4) or flags & 0xC0:
+        return None
+
+    fields: dict[str, Any] = {}
+    has_artwork = False
+    end = 10 + size
+    pos = 10
+    frame_header_size = 6 if major == 2 else 10
+    while pos + frame_header_size <= end:
+        if major == 2:
+            raw_id, raw_len = _ID3_V22_FRAME_HEADER.unpack(f.read(6))
+            if raw_id == b"\0\0\0":
+                break
+            frame_size = int.from_bytes(raw_len, "big")
+            frame_flags = 0
+            name = _ID3_V22_FRAMES.get(raw_id)
+            known = raw_id.isalnum()
+        else:
+            raw_id, frame_size, frame_flags = _ID3_FRAME_HEADER.unpack(f.read(10))
+            if raw_id == b"\0\0\0\0":
+                break
+            if major == 4:
+                # iTunes used to write plain sizes into v2.4 tags; mutagen guesses.
+                synced_size = _syncsafe(frame_size.to_bytes(4, "big"))
+                if synced_size is None:
+                    return None
+                frame_size = synced_size
+            name = raw_id.decode("latin-1")
+            known = raw_id.isalnum()
+        if not known:
+            return None
+        pos += frame_header_size + frame_size
+        if pos > end:
+            return None
+        if name == "APIC":
+            has_artwork = True
+        elif name in _ID3_NAMES and name not in fields:
+            unsupported = (
+                _ID3_V24_UNSUPPORTED_FRAME_FLAGS if major == 4 else _ID3_V23_UNSUPPORTED_FRAME_FLAGS
+            )
+            if frame_flags & unsupported:
+                return None
+            text = _id3_text(f.read(frame_size))
+            if text is None:
+                return None
+            if text:
+                fields[name] = text
+            continue
+        f.seek(frame_size, os.SEEK_CUR)
+
+    return fields, has_artwork, end + (10 if major == 4 and flags & 0x10 else 0)
+
+
+def _read_mp3(path: Path) -> _TagRead | None:
+    from mutagen.id3 import TCON, ParseID3v1
+    from mutagen.mp3 import MPEGInfo
+
+    # mutagen ships no annotations; pin the shapes this reader relies on.
+    parse_v1 = cast("Callable[[bytes], dict[str, Any] | None]", ParseID3v1)
+    make_tcon = cast("Callable[..., Any]", TCON)
+
+    with path.open("rb") as f:
+        parsed = _read_id3_fields(f)
+        if parsed is None:
+            return None
+        fields, has_artwork, offset = parsed
+
+        # Like mutagen, ID3v1 values fill in frames the v2 tag lacks.
+        if f.seek(0, os.SEEK_END) >= 128:
+            f.seek(-128, os.SEEK_END)
+            v1 = f.read(128)
+            if v1[:3] == b"TAG":
+                for name, frame in (parse_v1(v1) or {}).items():
+                    fields.setdefault(name, frame.text)
+
+        info = MPEGInfo(f, offset)
+
+    # mutagen normalizes TCON on load ("(17)" genre references, ID3v1 genre ids).
+    if "TCON" in fields:
+        fields["TCON"] = make_tcon(encoding=3, text=fields["TCON"]).genres
+    return _TagRead(info=info, fields=fields, keys=_ID3_KEYS, has_artwork=has_artwork)
+
+
+def _parse_vorbis_comment(data: bytes, wanted: frozenset[str]) -> dict[str, Any] | None:
+    """Decode only the wanted keys of a (FLAC, unframed) Vorbis comment block."""
+    try:
+        (vendor_len,) = _U32LE.unpack_from(data, 0)
+        pos = 4 + vendor_len
+        (count,) = _U32LE.unpack_from(data, pos)
+        pos += 4
+        fields: dict[str, Any] = {}
+        for _ in range(count):
+            (length,) = _U32LE.unpack_from(data, pos)
+            pos += 4
+            entry = data[pos : pos + length]
+            pos += length
+            eq = entry.find(b"=")
+            if eq < 0:
+                continue
+            key = entry[:eq].decode("ascii", "replace").lower()
+            if key in wanted:
+                fields.setdefault(key, []).append(entry[eq + 1 :].decode("utf-8", "replace"))
+    except struct.error:
+        return None
+    if pos != len(data):
+        return None
+    return fields
+
+
+_FLAC_STREAMINFO = 0
+_FLAC_VORBIS_COMMENT = 4
+_FLAC_PICTURE = 6
+
+
+def _read_flac(path: Path) -> _TagRead | None:
+    with path.open("rb") as f:
+        # FLAC files with a leading ID3 tag are left to mutagen.
+        if f.read(4) != b"fLaC":
+            return None
+        info: tuple[int, int, int, int] | None = None
+        fields: dict[str, Any] | None = None
+        has_artwork = False
+        while True:
+            header = f.read(4)
+            if len(header) < 4:
+                return None
+            code = header[0] & 0x7F
+            size = int.from_bytes(header[1:4], "big")
+            if code == _FLAC_STREAMINFO and info is None:
+                data = f.read(size)
+                if len(data) < 18:
+                    return None
+                packed = int.from_bytes(data[10:18], "big")
+                info = (
+                    packed >> 44,
+                    ((packed >> 41) & 0x7) + 1,
+                    ((packed >> 36) & 0x1F) + 1,
+                    packed & 0xFFFFFFFFF,
+                )
+            elif code == _FLAC_VORBIS_COMMENT and fields is None:
+                fields = _parse_vorbis_comment(f.read(size), _VORBIS_FIELD_NAMES)
+                if fields is None:
+                    return None
+            else:
+                if code == _FLAC_PICTURE:
+                    has_artwork = True
+                elif code == 0x7F:
+                    return None
+                f.seek(size, os.SEEK_CUR)
+            if header[0] & 0x80:
+                break
+        start = f.tell()
+        end = os.fstat(f.fileno()).st_size
+
+    if info is None or not info[0] or start > end:
+        return None
+    sample_rate, channels, bits_per_sample, total_samples = info
+    length = total_samples / sample_rate
+    return _TagRead(
+        info=_StreamInfo(
+            length=length,
+            sample_rate=sample_rate,
+            channels=channels,
+            bits_per_sample=bits_per_sample,
+            bitrate=int((end - start) * 8 / length) if length else 0,
+        ),
+        fields=fields or {},
+        keys=_VORBIS_KEYS,
+        has_artwork=has_artwork,
+    )
+
+
+_LEAN_READERS: dict[str, Callable[[Path], _TagRead | None]] = {
+    ".mp3": _read_mp3,
+    ".flac": _read_flac,
+}
+
+@functools.cache
+def _mutagen_types() -> dict[str, Callable[[Path], Any]]:
+    """
+    Containers whose extension reliably names the mutagen class, skipping the
+    probe of every supported format that `mutagen.File` does.
     """
-    audio = mutagen_file(path)
+    from mutagen.flac import FLAC
+    from mutagen.mp3 import MP3
+    from mutagen.mp4 import MP4
+    from mutagen.oggopus import OggOpus
+    from mutagen.oggvorbis import OggVorbis
+
+    return {
+        ".mp3": MP3,
+        ".flac": FLAC,
+        ".m4a": MP4,
+        ".m4b": MP4,
+        ".ogg": OggVorbis,
+        ".opus": OggOpus,
+    }
+
+
+def _read_with_mutagen(path: Path, suffix: str) -> _TagRead:
+    from mutagen import File as mutagen_file
+    from mutagen import MutagenError
+    from mutagen._vorbis import VComment
+    from mutagen.flac import FLAC
+    from mutagen.id3 import ID3
+
+    audio = None
+    kind = _mutagen_types().get(suffix)
+    if kind is not None:
+        try:
+            audio = kind(path)
+        except MutagenError:
+            # e.g. Ogg FLAC/Speex named .ogg; let mutagen probe.
+            audio = None
+    if audio is None:
+        audio = mutagen_file(path)
     if audio is None:
         raise ValueError("unsupported or unreadable audio file")
 
-    tags: dict[str, Any] | None = None
-    if hasattr(audio, "tags") and audio.tags is not None:
-        # mutagen tags often behave like dict
+    tags = getattr(audio, "tags", None)
+    if tags is None:
+        return _TagRead(
+            info=getattr(audio, "info", None),
+            fields={},
+            keys=_FALLBACK_KEYS,
+            has_artwork=isinstance(audio, FLAC) and bool(audio.pictures),
+        )
+
+    keys = _tag_keys_for(tags)
+    fields: Mapping[str, Any] = tags
+    if isinstance(tags, VComment):
+        # Vorbis comments are a list of pairs; collect the mapped keys in one pass
+        # rather than scanning the list once per lookup.
+        collected: dict[str, Any] = {}
+        for key, value in tags:
+            key = key.lower()
+            if key in _VORBIS_NAMES:
+                collected.setdefault(key, []).append(value)
+        fields = collected
+
+    if isinstance(audio, FLAC):
+        has_artwork = bool(audio.pictures)
+    elif isinstance(tags, ID3):
+        getall = cast("Callable[[str], list[Any]]", tags.getall)
+        has_artwork = bool(getall("APIC"))
+    else:
+        has_artwork = any(key in fields for key in keys.artwork)
+    return _TagRead(
+        info=getattr(audio, "info", None), fields=fields, keys=keys, has_artwork=has_artwork
+    )
+
+
+def _read_tags(path: Path) -> _TagRead:
+    from mutagen import MutagenError
+
+    suffix = path.suffix.lower()
+    reader = _LEAN_READERS.get(suffix)
+    if reader is not None:
         try:
-            tags = dict(audio.tags)
-        except Exception:
-            # Some tag containers may not be directly castable
-            tags = audio.tags  # type: ignore[assignment]
+            result = reader(path)
+        except (OSError, struct.error, ValueError, MutagenError):
+            result = None
+        if result is not None:
+            return result
+    return _read_with_mutagen(path, suffix)
+
+
+def _extract_metadata(path: Path) -> TrackMetadata:
+    """
+    Extract metadata using mutagen (or the lean MP3/FLAC readers above).
+
+    Important: This function is intentionally synchronous; scanning can run it in a thread
+    to keep the asyncio event loop responsive.
+    """
+    read = _read_tags(path)
+    fields = read.fields
+    keys = read.keys
 
     # Duration and audio quality info
     duration_ms: int | None = None
@@ -343,7 +880,7 @@ def _extract_metadata(path: Path) -> TrackMetadata:
     bitrate: int | None = None
     channels: int | None = None
 
-    info = getattr(audio, "info", None)
+    info = read.info
     if info is not None:
         # Duration
         length = getattr(info, "length", None)
@@ -370,44 +907,26 @@ def _extract_metadata(path: Path) -> TrackMetadata:
         if isinstance(ch, int) and ch > 0:
             channels = ch
 
-    # Title
-    # Keys: ID3=TIT2, Vorbis=title, MP4=©nam
-    title = _first_text(_tags_get(tags, ("TIT2", "title", "TITLE", "©nam"))) or path.stem
-
-    # Artist
-    # Keys: ID3=TPE1, Vorbis=artist, MP4=©ART
-    artist = _first_text(_tags_get(tags, ("TPE1", "artist", "ARTIST", "©ART")))
-
-    # Album
-    # Keys: ID3=TALB, Vorbis=album, MP4=©alb
-    album = _first_text(_tags_get(tags, ("TALB", "album", "ALBUM", "©alb")))
-
+    title = _first_text(_lookup(fields, keys.title)) or path.stem
+    artist = _first_text(_lookup(fields, keys.artist))
+    album = _first_text(_lookup(fields, keys.album))
     # Album artist (optional but useful; keep separate to avoid LMS role matrix)
-    # Keys: ID3=TPE2, Vorbis=albumartist, MP4=aART
-    album_artist = _first_text(
-        _tags_get(tags, ("TPE2", "albumartist", "ALBUMARTIST", "aART", "ALBUM ARTIST"))
-    )
+    album_artist = _first_text(_lookup(fields, keys.album_artist))
 
     # Contributors / Roles (LMS-like contributor_tracks, Phase 3)
     #
-    # Common tags:
-    # - Composer:   ID3=TCOM, Vorbis/FLAC=composer
-    # - Conductor: ID3=TPE3, Vorbis/FLAC=conductor
-    # - Band:      ID3=TPE2 (often "Band/Orchestra"), Vorbis/FLAC=band/orchestra
-    #
     # Note: We also include artist/album_artist as contributors for convenience and to match
     # LMS-ish browsing semantics later (role filters can include these roles too).
     contributors_pairs: list[tuple[str, str]] = []
 
-    for name in _parse_people_tag(_tags_get(tags, ("TCOM", "composer", "COMPOSER"))):
+    for name in _parse_people_tag(_lookup(fields, keys.composer)):
         contributors_pairs.append(("composer", name))
 
-    for name in _parse_people_tag(_tags_get(tags, ("TPE3", "conductor", "CONDUCTOR"))):
+    for name in _parse_people_tag(_lookup(fields, keys.conductor)):
         contributors_pairs.append(("conductor", name))
 
-    # Band/Orchestra: prefer explicit Vorbis-ish tags if present, fall back to TPE2 only if
-    # it doesn't just duplicate album_artist.
-    for name in _parse_people_tag(_tags_get(tags, ("band", "BAND", "orchestra", "ORCHESTRA"))):
+    # Band/Orchestra: only explicit (Vorbis-ish) tags; ID3 TPE2 is the album artist.
+    for name in _parse_people_tag(_lookup(fields, keys.band)):
         contributors_pairs.append(("band", name))
 
     if album_artist:
@@ -431,59 +950,20 @@ def _extract_metadata(path: Path) -> TrackMetadata:
         seen_pairs.add(key)
         contributors.append(key)
 
-    # Genres (split multi-value genre tags)
-    # Keys:
-    # - ID3: TCON
-    # - Vorbis/FLAC: genre
-    # - MP4: ©gen (not always present, but used by some taggers)
-    genres = _parse_genres(_tags_get(tags, ("TCON", "genre", "GENRE", "©gen")))
-
-    # Numbers
-    # Keys: ID3=TRCK, Vorbis=tracknumber, MP4=trkn
-    track_number = _parse_int_maybe(_tags_get(tags, ("TRCK", "tracknumber", "TRACKNUMBER", "trkn")))
-    # Keys: ID3=TPOS, Vorbis=discnumber, MP4=disk
-    disc_number = _parse_int_maybe(_tags_get(tags, ("TPOS", "discnumber", "DISCNUMBER", "disk")))
-
-    # Year/Date
-    # Keys: ID3=TDRC/TYER, Vorbis=date, MP4=©day
-    year = _parse_year_maybe(_tags_get(tags, ("TDRC", "TYER", "date", "DATE", "YEAR", "©day")))
-
-    # Compilation flag (LMS/iTunes-ish)
-    # Keys:
-    # - ID3: TCMP
-    # - Vorbis/FLAC: compilation
-    # - MP4: cpil
-    compilation = _parse_compilation_flag(
-        _tags_get(tags, ("TCMP", "compilation", "COMPILATION", "cpil"))
-    )
-
-    # Artwork detection
-    has_artwork = False
-    if isinstance(audio, MP4):
-        has_artwork = bool(tags and "covr" in tags)
-    elif isinstance(audio, FLAC):
-        has_artwork = len(audio.pictures) > 0
-    elif isinstance(audio, ID3):
-        has_artwork = len(audio.getall("APIC")) > 0
-    elif hasattr(audio, "tags") and isinstance(audio.tags, ID3):
-        has_artwork = len(audio.tags.getall("APIC")) > 0
-    elif tags and ("metadata_block_picture" in tags or "METADATA_BLOCK_PICTURE" in tags):
-        has_artwork = True
-
     return TrackMetadata(
         path=path,
         title=title,
         artist=_clean_str(artist),
         album=_clean_str(album),
         album_artist=_clean_str(album_artist),
-        genres=genres,
+        genres=_parse_genres(_lookup(fields, keys.genre)),
         contributors=tuple(contributors),
-        compilation=compilation,
-        track_number=track_number,
-        disc_number=disc_number,
-        year=year,
+        compilation=_parse_compilation_flag(_lookup(fields, keys.compilation)),
+        track_number=_parse_int_maybe(_lookup(fields, keys.track)),
+        disc_number=_parse_int_maybe(_lookup(fields, keys.disc)),
+        year=_parse_year_maybe(_lookup(fields, keys.year)),
         duration_ms=duration_ms,
-        has_artwork=has_artwork,
+        has_artwork=read.has_artwork,
         sample_rate=sample_rate,
         bit_depth=bit_depth,
         bitrate=bitrate,
@@ -491,13 +971,25 @@ def _extract_metadata(path: Path) -> TrackMetadata:
     )
 
 
-async def iter_audio_files(config: ScanConfig) -> AsyncIterator[Path]:
+# Directory mtimes this close to the walk are not trusted for pruning: an entry
+# added within the filesystem's timestamp granularity after we listed the
+# directory would not change the recorded mtime.
+_RACY_MTIME_NS = 2_000_000_000
+
+
+def walk_audio_files(config: ScanConfig) -> WalkResult:
     """
-    Asynchronously yields audio file paths under `config.root`.
+    Collect audio file paths under `config.root` (blocking; run it in a thread).
 
     Implementation notes:
-    - We collect file paths in a thread to avoid blocking the event loop on large trees.
-    - We keep it simple and predictable: extension-based filtering only.
+    - Iterative `os.scandir`: entry types come from the cached `d_type`, so
+      regular files cost no `stat` call; directories cost one (for their mtime).
+    - Extensions are matched on the raw entry name; no `Path` per entry.
+    - With `config.known_directories`, a directory whose mtime is unchanged has
+      had no entries added, removed or renamed, so it is not listed again; its
+      subdirectories (taken from the previous walk) are still visited, because
+      changes deeper down do not propagate mtimes upwards. Files edited in place
+      (e.g. tags rewritten) are not noticed this way; use a full scan for that.
     """
     root = config.root
     if not root.exists():
@@ -505,46 +997,155 @@ async def iter_audio_files(config: ScanConfig) -> AsyncIterator[Path]:
     if not root.is_dir():
         raise NotADirectoryError(root)
 
-    def _walk() -> list[Path]:
-        # Using rglob keeps it readable; performance is fine for MVP.
-        # If needed, we can optimize with os.scandir later.
-        paths: list[Path] = []
-        for p in root.rglob("*"):
-            try:
-                if not config.follow_symlinks and p.is_symlink():
-                    continue
-                if not p.is_file():
-                    continue
-                if p.suffix.lower() not in config.extensions:
-                    continue
-                paths.append(p)
-            except OSError:
-                # Ignore broken permissions/paths during walk; report at decode stage if needed.
+    extensions = config.extensions
+    follow = config.follow_symlinks
+    known = config.known_directories
+    children: dict[str, list[str]] = {}
+    if known:
+        for directory in known:
+            # os.path on plain strings: no Path object per known directory.
+            children.setdefault(os.path.dirname(directory), []).append(directory)  # noqa: PTH120
+
+    racy_after = time.time_ns() - _RACY_MTIME_NS
+    files: list[str] = []
+    directories: dict[str, int] = {}
+    visited: set[tuple[int, int]] = set()
+    pruned = 0
+    stack = [str(root)]
+    while stack:
+        directory = stack.pop()
+        try:
+            st = os.stat(directory)  # noqa: PTH116 - str paths keep the walk loop cheap
+        except OSError:
+            continue
+        if follow:
+            # Symlinked directories can form cycles.
+            if (st.st_dev, st.st_ino) in visited:
                 continue
-        return paths
+            visited.add((st.st_dev, st.st_ino))
+
+        mtime = st.st_mtime_ns
+        directories[directory] = mtime if mtime < racy_after else 0
+        if known is not None and mtime < racy_after and known.get(directory) == mtime:
+            pruned += 1
+            stack.extend(children.get(directory, ()))
+            continue
+
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=follow):
+                            stack.append(entry.path)
+                            continue
+                        name = entry.name
+                        dot = name.rfind(".")
+                        if dot <= 0 or name[dot:].lower() not in extensions:
+                            continue
+                        if entry.is_file(follow_symlinks=follow):
+                            files.append(entry.path)
+                    except OSError:
+                        continue
+        except OSError:
+            # Ignore broken permissions/paths during walk; report at decode stage if needed.
+            directories.pop(directory, None)
+            continue
 
-    paths = await asyncio.to_thread(_walk)
-    for p in paths:
-        yield p
+    return WalkResult(files=files, directories=directories, pruned=pruned)
 
 
-async def scan_music_folder(config: ScanConfig) -> ScanResult:
+async def iter_audio_files(config: ScanConfig) -> AsyncIterator[Path]:
     """
-    Scan a folder for audio files and extract metadata.
+    Asynchronously yields audio file paths under `config.root`.
 
-    This returns a pure in-memory result. Persisting to a DB is a separate responsibility
-    (keeps layers clean, testable, and avoids LMS-style tangles).
+    The walk runs in a thread (see `walk_audio_files`) to keep the event loop responsive.
+    """
+    walk = await asyncio.to_thread(walk_audio_files, config)
+    for p in walk.files:
+        yield Path(p)
 
-    Concurrency:
-    - filesystem walk: runs in a thread
-    - metadata extraction: bounded concurrency using threads via asyncio.to_thread
+
+def is_network_filesystem(path: Path) -> bool:
+    """Return True if `path` lives on a mount listed in NETWORK_FILESYSTEMS (Linux only)."""
+    try:
+        with Path("/proc/self/mounts").open(encoding="utf-8", errors="replace") as f:
+            mounts = [line.split()[1:3] for line in f if line.strip()]
+    except OSError:
+        return False
+
+    target = str(path.resolve())
+    best_len = -1
+    best_type = ""
+    for mount_point, fs_type in mounts:
+        mount_point = mount_point.replace("\\040", " ")
+        prefix = mount_point.rstrip("/") + "/"
+        if (target == mount_point or target.startswith(prefix)) and len(mount_point) > best_len:
+            best_len = len(mount_point)
+            best_type = fs_type
+    return best_type in NETWORK_FILESYSTEMS
+
+
+def _is_rotational(device: int) -> bool | None:
+    """Read sysfs `queue/rotational` for a device; None if unknown (non-Linux, overlay, ...)."""
+    # /sys/dev/block/M:m links to .../block/sda (whole disk) or .../block/sda/sda1
+    # (partition); the queue attributes live on the disk.
+    node = Path(f"/sys/dev/block/{os.major(device)}:{os.minor(device)}")
+    try:
+        node = node.resolve(strict=True)
+    except OSError:
+        return None
+    for disk in (node, node.parent):
+        try:
+            return (disk / "queue" / "rotational").read_text().strip() == "1"
+        except OSError:
+            continue
+    return None
+
+
+def device_budget(root: Path) -> DeviceBudget:
     """
-    semaphore = asyncio.Semaphore(max(1, config.max_concurrency))
+    Classify the device `root` lives on and pick its extraction concurrency.
+
+    Blocking (stat + a few small sysfs/procfs reads); call it from a thread.
+    """
+    device = root.stat().st_dev
+    if is_network_filesystem(root):
+        return DeviceBudget(device, "network", NETWORK_SCAN_CONCURRENCY)
+    rotational = _is_rotational(device)
+    if rotational is True:
+        return DeviceBudget(device, "rotational", ROTATIONAL_SCAN_CONCURRENCY)
+    if rotational is False:
+        return DeviceBudget(device, "ssd", SOLID_STATE_SCAN_CONCURRENCY)
+    return DeviceBudget(device, "unknown", DEFAULT_SCAN_CONCURRENCY)
+
+
+async def scan_paths(
+    paths: Iterable[Path],
+    *,
+    max_concurrency: int = DEFAULT_SCAN_CONCURRENCY,
+    semaphore: asyncio.Semaphore | None = None,
+    on_progress: Callable[[int, int], None] | None = None,
+) -> ScanResult:
+    """
+    Extract metadata for an explicit set of audio files.
+
+    This is the extraction half of `scan_music_folder`, for callers that already
+    know which files changed (e.g. the filesystem watcher) and must not walk a tree.
+
+    `semaphore` lets several scans share one I/O budget (roots on the same device);
+    otherwise one is created from `max_concurrency`. `on_progress(done, total)` is
+    called on the event loop after each file.
+    """
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    paths = list(paths)
+    done = 0
 
     tracks: list[TrackMetadata] = []
     issues: list[ScanIssue] = []
 
     async def _process(path: Path) -> None:
+        nonlocal done
         async with semaphore:
             try:
                 meta = await asyncio.to_thread(_extract_metadata, path)
@@ -552,13 +1153,14 @@ async def scan_music_folder(config: ScanConfig) -> ScanResult:
                 msg = f"{type(e).__name__}: {e}"
                 issues.append(ScanIssue(path=path, message=msg))
                 logger.debug("Scan issue for %s: %s", path, msg)
-                return
-            tracks.append(meta)
-
-    tasks: list[asyncio.Task[None]] = []
-    async for path in iter_audio_files(config):
-        tasks.append(asyncio.create_task(_process(path)))
-
+            else:
+                tracks.append(meta)
+            finally:
+                done += 1
+                if on_progress is not None:
+                    on_progress(done, len(paths))
+
+    tasks = [asyncio.create_task(_process(path)) for path in paths]
     if tasks:
         # gather will preserve exceptions—handled inside _process, so this shouldn't raise
         await asyncio.gather(*tasks)
@@ -567,3 +1169,31 @@ async def scan_music_folder(config: ScanConfig) -> ScanResult:
     tracks.sort(key=lambda t: str(t.path).lower())
 
     return ScanResult(tracks=tracks, issues=issues)
+
+
+async def scan_music_folder(
+    config: ScanConfig,
+    *,
+    semaphore: asyncio.Semaphore | None = None,
+    on_progress: Callable[[int, int], None] | None = None,
+) -> ScanResult:
+    """
+    Scan a folder for audio files and extract metadata.
+
+    This returns a pure in-memory result. Persisting to a DB is a separate responsibility
+    (keeps layers clean, testable, and avoids LMS-style tangles).
+
+    Concurrency:
+    - filesystem walk: runs in a thread
+    - metadata extraction: bounded concurrency using threads via asyncio.to_thread
+    """
+    walk = await asyncio.to_thread(walk_audio_files, config)
+    if walk.pruned:
+        logger.debug("Skipped %d unchanged directories under %s", walk.pruned, config.root)
+    result = await scan_paths(
+        [Path(p) for p in walk.files],
+        max_concurrency=config.max_concurrency,
+        semaphore=semaphore,
+        on_progress=on_progress,
+    )
+    return replace(result, directories=walk.directories)
@@ -0,0 +1,407 @@
+"""
+Filesystem watcher for incremental library updates.
+
+Instead of re-walking every music folder on `rescan`, the watcher reports
+*which directories changed* and lets `MusicLibrary.sync_directories` re-read
+only those.
+
+Design:
+- Linux inotify (via ctypes, no extra dependency) for local filesystems.
+- Polling fallback for network mounts (NFS/SMB don't deliver inotify events
+  for changes made by other hosts), non-Linux platforms, and roots where the
+  kernel watch limit is exhausted. Polling compares directory mtimes, so it
+  sees files being added, removed or renamed, but not tags rewritten in place.
+- Events are debounced per directory: a directory is reported once it has been
+  quiet for `debounce` seconds, so an album copied file-by-file is synced in
+  one go instead of once per track.
+- Each reported directory carries a `recursive` flag. It is set for directories
+  that appeared or disappeared as a whole (new album folder moved in, folder
+  deleted), where the subtree has to be reconciled, not just the direct files.
+
+Notes:
+- The change callback runs on the event loop, one batch at a time.
+- This module has no DB knowledge; see `MusicLibrary.start_watching`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import ctypes
+import ctypes.util
+import errno
+import logging
+import os
+import struct
+import sys
+from collections.abc import Awaitable, Callable, Iterable, Mapping, Sequence
+from pathlib import Path
+
+from resonance.core.scanner import DEFAULT_AUDIO_EXTENSIONS, is_network_filesystem
+
+logger = logging.getLogger(__name__)
+
+# Callback receiving `{directory: recursive}` for every directory due for a sync.
+ChangeCallback = Callable[[Mapping[Path, bool]], Awaitable[object]]
+
+DEFAULT_DEBOUNCE_SECONDS = 2.0
+DEFAULT_POLL_INTERVAL_SECONDS = 30.0
+
+# inotify(7) constants
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+
+_WATCH_MASK = (
+    IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+    | IN_ONLYDIR
+)
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+def _iter_directories(root: Path) -> Iterable[Path]:
+    """Yield `root` and every directory below it (symlinks are not followed)."""
+    for dirpath, _dirnames, _filenames in os.walk(root):
+        yield Path(dirpath)
+
+
+def _snapshot_directory_mtimes(root: Path) -> dict[Path, int]:
+    snapshot: dict[Path, int] = {}
+    for directory in _iter_directories(root):
+        try:
+            snapshot[directory] = directory.stat().st_mtime_ns
+        except OSError:
+            continue
+    return snapshot
+
+
+class _Inotify:
+    """Thin ctypes wrapper around one inotify instance."""
+
+    def __init__(self) -> None:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32)
+        self._rm_watch = libc.inotify_rm_watch
+        self._rm_watch.argtypes = (ctypes.c_int, ctypes.c_int)
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        self.fd: int = fd
+
+    def add_watch(self, path: Path, mask: int = _WATCH_MASK) -> int:
+        wd = self._add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err), str(path))
+        return int(wd)
+
+    def rm_watch(self, wd: int) -> None:
+        self._rm_watch(self.fd, wd)
+
+    def read_events(self) -> list[tuple[int, int, str]]:
+        """Drain pending events as `(wd, mask, name)` tuples."""
+        events: list[tuple[int, int, str]] = []
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return events
+            if not data:
+                return events
+            view = memoryview(data)
+            offset = 0
+            while offset + _EVENT_HEADER.size <= len(data):
+                wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(view, offset)
+                offset += _EVENT_HEADER.size
+                raw = bytes(view[offset : offset + length]).rstrip(b"\0")
+                offset += length
+                events.append((wd, mask, os.fsdecode(raw)))
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class LibraryWatcher:
+    """
+    Watches music folders and reports changed directories, debounced.
+
+    Usage:
+        watcher = LibraryWatcher(on_change)
+        await watcher.start([Path("/music")])
+        ...
+        await watcher.stop()
+    """
+
+    def __init__(
+        self,
+        on_change: ChangeCallback,
+        *,
+        debounce: float = DEFAULT_DEBOUNCE_SECONDS,
+        poll_interval: float = DEFAULT_POLL_INTERVAL_SECONDS,
+        extensions: frozenset[str] = DEFAULT_AUDIO_EXTENSIONS,
+        use_inotify: bool = True,
+    ) -> None:
+        self._on_change = on_change
+        self._debounce = max(0.0, debounce)
+        self._poll_interval = max(0.1, poll_interval)
+        self._extensions = extensions
+        self._use_inotify = use_inotify and sys.platform.startswith("linux")
+
+        self._roots: dict[Path, str] = {}  # root -> "inotify" | "polling"
+        self._inotify: _Inotify | None = None
+        self._wd_to_dir: dict[int, Path] = {}
+        self._dir_to_wd: dict[Path, int] = {}
+        self._poll_tasks: dict[Path, asyncio.Task[None]] = {}
+        self._watch_tasks: set[asyncio.Task[None]] = set()
+
+        # Debounce state: directory -> (recursive, deadline in loop time)
+        self._pending: dict[Path, tuple[bool, float]] = {}
+        self._flush_task: asyncio.Task[None] | None = None
+        self._wakeup = asyncio.Event()
+
+    @property
+    def roots(self) -> dict[Path, str]:
+        """Watched roots and the backend serving each ("inotify" or "polling")."""
+        return dict(self._roots)
+
+    @property
+    def running(self) -> bool:
+        return self._flush_task is not None
+
+    async def start(self, roots: Sequence[Path]) -> None:
+        if self._flush_task is not None:
+            return
+        self._flush_task = asyncio.create_task(self._flush_loop())
+        await self.set_roots(roots)
+
+    async def stop(self) -> None:
+        tasks = [*self._poll_tasks.values(), *self._watch_tasks]
+        if self._flush_task is not None:
+            tasks.append(self._flush_task)
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        self._poll_tasks.clear()
+        self._watch_tasks.clear()
+        self._flush_task = None
+        self._pending.clear()
+
+        if self._inotify is not None:
+            asyncio.get_running_loop().remove_reader(self._inotify.fd)
+            self._inotify.close()
+            self._inotify = None
+        self._wd_to_dir.clear()
+        self._dir_to_wd.clear()
+        self._roots.clear()
+
+    async def set_roots(self, roots: Sequence[Path]) -> None:
+        """Start watching new roots and stop watching roots no longer listed."""
+        wanted = {Path(r) for r in roots}
+        for root in [r for r in self._roots if r not in wanted]:
+            self._unwatch_root(root)
+        for root in sorted(wanted - self._roots.keys()):
+            await self._watch_root(root)
+
+    # ---- Backends ----
+
+    async def _watch_root(self, root: Path) -> None:
+        if not root.is_dir():
+            logger.warning("Not watching %s: not a directory", root)
+            return
+
+        if self._use_inotify and not await asyncio.to_thread(is_network_filesystem, root):
+            try:
+                await self._add_inotify_tree(root)
+            except OSError as e:
+                if e.errno == errno.ENOSPC:
+                    logger.warning(
+                        "inotify watch limit reached for %s; falling back to polling "
+                        "(raise fs.inotify.max_user_watches to avoid this)",
+                        root,
+                    )
+                else:
+                    logger.warning(
+                        "inotify unavailable for %s (%s); falling back to polling", root, e
+                    )
+                self._remove_inotify_tree(root)
+            else:
+                self._roots[root] = "inotify"
+                logger.info("Watching %s (inotify, %d directories)", root, len(self._dir_to_wd))
+                return
+
+        self._roots[root] = "polling"
+        self._poll_tasks[root] = asyncio.create_task(self._poll_loop(root))
+        logger.info("Watching %s (polling every %.0fs)", root, self._poll_interval)
+
+    def _unwatch_root(self, root: Path) -> None:
+        backend = self._roots.pop(root, None)
+        if backend == "inotify":
+            self._remove_inotify_tree(root)
+        task = self._poll_tasks.pop(root, None)
+        if task is not None:
+            task.cancel()
+
+    async def _add_inotify_tree(self, top: Path) -> None:
+        if self._inotify is None:
+            self._inotify = _Inotify()
+            asyncio.get_running_loop().add_reader(self._inotify.fd, self._on_inotify_readable)
+        inotify = self._inotify
+        existing = set(self._wd_to_dir)
+
+        def _add_all() -> list[tuple[int, Path]]:
+            added: list[tuple[int, Path]] = []
+            try:
+                for directory in _iter_directories(top):
+                    added.append((inotify.add_watch(directory), directory))
+            except OSError:
+                # Not registered yet, so _remove_inotify_tree would not find them.
+                for wd, _directory in added:
+                    if wd not in existing:
+                        inotify.rm_watch(wd)
+                raise
+            return added
+
+        for wd, directory in await asyncio.to_thread(_add_all):
+            self._wd_to_dir[wd] = directory
+            self._dir_to_wd[directory] = wd
+
+    def _remove_inotify_tree(self, top: Path) -> None:
+        for directory in [d for d in self._dir_to_wd if d == top or top in d.parents]:
+            wd = self._dir_to_wd.pop(directory)
+            self._wd_to_dir.pop(wd, None)
+            if self._inotify is not None:
+                self._inotify.rm_watch(wd)
+
+    def _on_inotify_readable(self) -> None:
+        if self._inotify is None:
+            return
+        for wd, mask, name in self._inotify.read_events():
+            if mask & IN_Q_OVERFLOW:
+                logger.warning("inotify queue overflow; resyncing watched roots")
+                for root, backend in self._roots.items():
+                    if backend == "inotify":
+                        self._mark(root, recursive=True)
+                continue
+
+            directory = self._wd_to_dir.get(wd)
+            if directory is None:
+                continue
+            if mask & IN_IGNORED:
+                self._wd_to_dir.pop(wd, None)
+                if self._dir_to_wd.get(directory) == wd:
+                    del self._dir_to_wd[directory]
+                continue
+            if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                if directory in self._roots:
+                    self._mark(directory, recursive=True)
+                continue
+
+            if mask & IN_ISDIR:
+                child = directory / name
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    # A whole folder appeared: watch it and reconcile its subtree,
+                    # which may already be populated (mv of a finished download).
+                    self._spawn(self._add_inotify_tree(child))
+                    self._mark(child, recursive=True)
+                elif mask & (IN_DELETE | IN_MOVED_FROM):
+                    # Watches follow the inode; drop them so a moved-away folder
+                    # is not reported under its old path.
+                    self._remove_inotify_tree(child)
+                    self._mark(child, recursive=True)
+                continue
+
+            # Files: creation is reported once the writer closes it (IN_CLOSE_WRITE).
+            if (
+                mask & (IN_CLOSE_WRITE | IN_MOVED_TO | IN_MOVED_FROM | IN_DELETE)
+                and Path(name).suffix.lower() in self._extensions
+            ):
+                self._mark(directory, recursive=False)
+
+    def _spawn(self, coro: Awaitable[None]) -> None:
+        async def _run() -> None:
+            try:
+                await coro
+            except OSError as e:
+                logger.warning("Failed to watch new directory: %s", e)
+
+        task = asyncio.create_task(_run())
+        self._watch_tasks.add(task)
+        task.add_done_callback(self._watch_tasks.discard)
+
+    async def _poll_loop(self, root: Path) -> None:
+        previous = await asyncio.to_thread(_snapshot_directory_mtimes, root)
+        while True:
+            await asyncio.sleep(self._poll_interval)
+            current = await asyncio.to_thread(_snapshot_directory_mtimes, root)
+            if not current:
+                # Root gone or unreadable (e.g. unmounted share): wait for it to
+                # come back instead of reporting every directory as deleted.
+                continue
+            for directory, mtime_ns in current.items():
+                if previous.get(directory) != mtime_ns:
+                    self._mark(directory, recursive=False)
+            for directory in previous.keys() - current.keys():
+                self._mark(directory, recursive=True)
+            previous = current
+
+    # ---- Debounce ----
+
+    def _mark(self, directory: Path, *, recursive: bool) -> None:
+        """Schedule `directory` for a sync once it has been quiet for `debounce` seconds."""
+        deadline = asyncio.get_running_loop().time() + self._debounce
+        was_recursive = self._pending.get(directory, (False, 0.0))[0]
+        self._pending[directory] = (recursive or was_recursive, deadline)
+        self._wakeup.set()
+
+    async def _flush_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            if not self._pending:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            now = loop.time()
+            due = {d: rec for d, (rec, deadline) in self._pending.items() if deadline <= now}
+            if not due:
+                next_deadline = min(deadline for _rec, deadline in self._pending.values())
+                self._wakeup.clear()
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=next_deadline - now)
+                continue
+
+            for directory in due:
+                del self._pending[directory]
+            batch = _collapse(due)
+            try:
+                await self._on_change(batch)
+            except Exception:
+                logger.exception("Library watcher sync failed for %d directories", len(batch))
+
+
+def _collapse(dirs: dict[Path, bool]) -> dict[Path, bool]:
+    """Drop directories already covered by a recursive ancestor in the same batch."""
+    recursive = [d for d, rec in dirs.items() if rec]
+    return {
+        d: rec for d, rec in dirs.items() if not any(r != d and r in d.parents for r in recursive)
+    }
@@ -3,16 +3,27 @@ Player client representation for Resonance.
 
 This module defines the PlayerClient class which represents a connected
 Squeezebox player (hardware or software like Squeezelite).
+
+Outbound frames:
+    Frames are written straight to the transport while the socket keeps up.
+    Once a `drain()` is in flight (full socket buffer, e.g. a player on bad
+    Wi-Fi), further frames wait in a bounded per-player queue that a writer
+    task flushes in one write per batch. A queued frame superseded by a newer
+    one of the same kind (volume `audg`, `strm t` status query) is replaced
+    instead of sent twice. Senders therefore never wait on another player's
+    socket, only on their own player's full queue.
 """
 
 import asyncio
 import logging
-import struct
 import time
+from collections import deque
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import TYPE_CHECKING
 
+from resonance.player.frame_trace import TX, frame_tracer
+
 if TYPE_CHECKING:
     from asyncio import StreamReader, StreamWriter
 
@@ -20,6 +31,18 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Frames queued per player while its socket is backed up before senders wait.
+OUTBOUND_QUEUE_FRAMES = 64
+
+
+def _coalesce_key(command: bytes, payload: bytes) -> bytes | None:
+    """Frames with the same key replace each other while still queued."""
+    if command == b"audg":
+        return command
+    if command == b"strm" and payload[:1] == b"t":
+        return b"strm-t"
+    return None
+
 
 class PlayerState(Enum):
     """Possible states of a player."""
@@ -70,7 +93,7 @@ class PlayerInfo:
     capabilities: dict[str, str] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class PlayerStatus:
     """Dynamic status of a player, updated via STAT messages.
 
@@ -145,6 +168,18 @@ class PlayerClient:
         # Sequence number for volume sync (LMS/SqueezePlay compatibility)
         self._seq_no: int | None = None
 
+        # Outbound frames waiting for a drain to finish (see module docstring).
+        # Entries are one-item [frame] cells so a superseded frame can be swapped in
+        # place through `_outbound_keys` (coalesce key -> cell).
+        self._outbound: deque[list[bytes]] = deque()
+        self._outbound_keys: dict[bytes, list[bytes]] = {}
+        self._outbound_ready = asyncio.Event()
+        self._outbound_space = asyncio.Event()
+        self._writer_task: asyncio.Task[None] | None = None
+        self._draining = False
+        self._closed = False
+        self.frames_coalesced = 0
+
         # Connection metadata
         peername = writer.get_extra_info("peername")
         self._remote_ip = peername[0] if peername else "unknown"
@@ -206,66 +241,99 @@ class PlayerClient:
         if len(command) != 4:
             raise ValueError(f"Command must be exactly 4 bytes, got {len(command)}")
 
-        # Debug: attempt to parse outgoing STRM header even when sent directly
-        # via PlayerClient (i.e., bypassing SlimprotoServer._send_message()).
-        if command == b"strm" and len(payload) >= 24 and logger.isEnabledFor(logging.DEBUG):
-            fixed = payload[:24]
-            try:
-                cmd_ch = fixed[0:1].decode("ascii", errors="replace")
-                autostart_ch = fixed[1:2].decode("ascii", errors="replace")
-                format_ch = fixed[2:3].decode("ascii", errors="replace")
-                pcm_sample_size_ch = fixed[3:4].decode("ascii", errors="replace")
-                pcm_sample_rate_ch = fixed[4:5].decode("ascii", errors="replace")
-                pcm_channels_ch = fixed[5:6].decode("ascii", errors="replace")
-                pcm_endian_ch = fixed[6:7].decode("ascii", errors="replace")
-            except Exception:
-                cmd_ch = "?"
-                autostart_ch = "?"
-                format_ch = "?"
-                pcm_sample_size_ch = "?"
-                pcm_sample_rate_ch = "?"
-                pcm_channels_ch = "?"
-                pcm_endian_ch = "?"
-            server_port = struct.unpack(">H", fixed[18:20])[0]
-            server_ip = struct.unpack(">I", fixed[20:24])[0]
-            logger.debug(
-                "PlayerClient TX strm parsed: command=%s autostart=%s format=%s pcm_sz=%s pcm_rate=%s pcm_ch=%s pcm_endian=%s server_port=%d server_ip=0x%08x",
-                cmd_ch,
-                autostart_ch,
-                format_ch,
-                pcm_sample_size_ch,
-                pcm_sample_rate_ch,
-                pcm_channels_ch,
-                pcm_endian_ch,
-                server_port,
-                server_ip,
-            )
-            if len(payload) > 24:
-                req_preview = payload[24 : 24 + 200]
-                logger.debug(
-                    "PlayerClient TX strm request_preview=%r",
-                    req_preview.decode("latin-1", errors="replace"),
-                )
+        if frame_tracer.enabled:
+            frame_tracer.record(self.id, TX, command.decode("ascii", "replace"), payload)
 
         # Message format: [2 bytes length (len+4)][4 bytes command][payload]
         message = (len(payload) + 4).to_bytes(2, "big") + command + payload
 
-        try:
-            self._writer.write(message)
-            await self._writer.drain()
+        if self._closed:
+            raise ConnectionError(f"Player {self.id} disconnected")
+
+        if not self._draining and not self._outbound:
+            # Socket keeps up: write now, let the writer task wait for the drain.
+            try:
+                self._writer.write(message)
+            except (ConnectionError, OSError) as e:
+                logger.warning("Failed to send to %s: %s", self.id, e)
+                await self.disconnect()
+                raise ConnectionError(f"Player {self.id} disconnected: {e}") from e
+            self._draining = True
+            self._wake_writer()
             logger.debug("Sent %s to %s (%d bytes)", command, self.id, len(payload))
+            return
+
+        key = _coalesce_key(command, payload)
+        queued = self._outbound_keys.get(key) if key is not None else None
+        if queued is not None:
+            queued[0] = message
+            self.frames_coalesced += 1
+            return
+
+        while len(self._outbound) >= OUTBOUND_QUEUE_FRAMES:
+            self._outbound_space.clear()
+            await self._outbound_space.wait()
+            if self._closed:
+                raise ConnectionError(f"Player {self.id} disconnected")
+
+        entry = [message]
+        self._outbound.append(entry)
+        if key is not None:
+            self._outbound_keys[key] = entry
+        self._wake_writer()
+        logger.debug("Queued %s to %s (%d pending)", command, self.id, len(self._outbound))
+
+    @property
+    def outbound_pending(self) -> int:
+        """Frames waiting for the player's socket to drain."""
+        return len(self._outbound)
+
+    def _wake_writer(self) -> None:
+        self._outbound_ready.set()
+        if self._writer_task is None or self._writer_task.done():
+            self._writer_task = asyncio.get_running_loop().create_task(self._write_loop())
+
+    async def _write_loop(self) -> None:
+        """Drain the socket and flush frames queued meanwhile, one write per batch."""
+        try:
+            while not self._closed:
+                if self._draining:
+                    await self._writer.drain()
+                    self._draining = False
+                if not self._outbound:
+                    self._outbound_ready.clear()
+                    await self._outbound_ready.wait()
+                    continue
+                batch = b"".join(entry[0] for entry in self._outbound)
+                self._outbound.clear()
+                self._outbound_keys.clear()
+                self._outbound_space.set()
+                self._writer.write(batch)
+                self._draining = True
         except (ConnectionError, OSError) as e:
             logger.warning("Failed to send to %s: %s", self.id, e)
+            self._draining = False
             await self.disconnect()
-            raise ConnectionError(f"Player {self.id} disconnected: {e}") from e
+
+    def _close_outbound(self) -> None:
+        """Drop queued frames, stop the writer task and release waiting senders."""
+        self._closed = True
+        self._outbound.clear()
+        self._outbound_keys.clear()
+        self._outbound_space.set()
+        task = self._writer_task
+        if task is not None and task is not asyncio.current_task():
+            task.cancel()
 
     async def disconnect(self) -> None:
         """Close the connection to this player."""
         if self.status.state == PlayerState.DISCONNECTED:
+            self._close_outbound()
             return
 
         logger.info("Disconnecting player %s", self.name)
         self.status.state = PlayerState.DISCONNECTED
+        self._close_outbound()
 
         try:
             self._writer.close()
@@ -425,6 +493,7 @@ class PlayerClient:
         server_ip: int,
         format_hint: str = "mp3",
         buffer_threshold_kb: int = 255,
+        remuxable: bool = False,
     ) -> None:
         """
         Start streaming a track to this player.
@@ -439,6 +508,8 @@ class PlayerClient:
             format_hint: Audio format hint ('mp3', 'flac', 'ogg', etc.).
             buffer_threshold_kb: Player buffer threshold (KB) required before starting playback.
                 Lower values start sooner (snappier track changes) but can increase underruns.
+            remuxable: The file's AAC track can be served as ADTS without decoding
+                (see `resonance.streaming.policy.resolve_stream_mode()`).
         """
         from resonance.protocol.commands import (
             AudioFormat,
@@ -462,7 +533,9 @@ class PlayerClient:
 
         from resonance.streaming.policy import strm_expected_format_hint
 
-        expected_hint = strm_expected_format_hint(format_hint, self.info.device_type)
+        expected_hint = strm_expected_format_hint(
+            format_hint, self.info.device_type, remuxable=remuxable
+        )
         hint_lower = expected_hint.lower()
 
         # If the server will transcode, expected_hint will be "flac" (current policy).
@@ -490,6 +563,7 @@ class PlayerClient:
                 "mp3": AudioFormat.MP3,
                 "flac": AudioFormat.FLAC,
                 "ogg": AudioFormat.OGG,
+                "aac": AudioFormat.AAC,
             }
             audio_format = format_map.get(hint_lower, AudioFormat.MP3)
             autostart = AutostartMode.AUTO
@@ -568,13 +642,17 @@ class PlayerClient:
         """
         from pathlib import Path
 
+        from resonance.streaming.policy import StreamMode, resolve_stream_mode
+
         # Extract format from file extension
         path = Path(track.path)
         format_hint = path.suffix.lstrip(".").lower() or "mp3"
+        mode = await resolve_stream_mode(path, self.info.device_type)
 
         await self.start_stream(
             track.path,
             server_port=server_port,
             server_ip=server_ip,
             format_hint=format_hint,
+            remuxable=mode is StreamMode.REMUX,
         )
@@ -0,0 +1,210 @@
+"""
+Sampling Slimproto frame tracer.
+
+Keeps the most recent frames exchanged with each player in a small ring
+buffer so protocol problems in the field can be inspected after the fact
+(`GET /api/debug/frames`) without DEBUG logging or stderr dumps.
+
+Design:
+- Disabled by default. Call sites guard with ``if frame_tracer.enabled:``,
+  so a disabled tracer costs one attribute lookup per frame.
+- Recording is cheap: a tuple with a timestamp, the tag, the payload length
+  and the first `HEAD_BYTES` of the payload goes into a bounded deque.
+  Hexdumps and strm/STAT decoding happen only when the buffer is dumped.
+- Sampling: the chatty once-per-second frames (STAT heartbeats and `strm t`
+  status queries) are recorded one in `sample_every`; everything else
+  (strm start/stop, audg, HELO, DSCO, ...) is always recorded.
+
+Notes:
+- Like `event_bus`, the tracer is a process-wide instance; enable it with
+  ``--trace-frames`` or at runtime via ``POST /api/debug/frames`` (admin
+  token required).
+- Rings outlive the connection on purpose: the frames leading up to a
+  disconnect are usually the interesting ones. At most `MAX_PLAYERS` rings
+  are kept; the least recently active player is dropped first.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any
+
+# Payload bytes kept per frame (covers the strm header and a full STAT).
+HEAD_BYTES = 64
+
+# Frames kept per player (at most MAX_CAPACITY).
+DEFAULT_CAPACITY = 256
+MAX_CAPACITY = 4096
+
+# Record one in N heartbeat frames (STAT STMt, strm t), N <= MAX_SAMPLE_EVERY.
+DEFAULT_SAMPLE_EVERY = 10
+MAX_SAMPLE_EVERY = 10_000
+
+# Players with a ring buffer.
+MAX_PLAYERS = 64
+
+TX = "tx"
+RX = "rx"
+
+# (time, direction, tag, payload length, payload head)
+_Frame = tuple[float, str, str, int, bytes]
+
+
+@dataclass(slots=True)
+class _Ring:
+    frames: deque[_Frame]
+    heartbeats: int = 0
+    skipped: int = 0
+
+
+def _is_heartbeat(direction: str, tag: str, head: bytes) -> bool:
+    if direction == RX:
+        return tag == "STAT" and head[:4] == b"STMt"
+    return tag == "strm" and head[:1] == b"t"
+
+
+def _describe_strm(head: bytes, length: int) -> dict[str, Any]:
+    # Field layout: see build_strm_frame. Local import: resonance.protocol
+    # imports the player client, which imports this module.
+    from resonance.protocol.commands import STRM_HEADER
+
+    if len(head) < STRM_HEADER.size:
+        return {}
+    fields = STRM_HEADER.unpack_from(head)
+    request = head[STRM_HEADER.size :].decode("latin-1", errors="replace")
+    return {
+        "command": chr(fields[0]),
+        "autostart": chr(fields[1]),
+        "format": chr(fields[2]),
+        "pcm": "".join(map(chr, fields[3:7])),
+        "flags": fields[11],
+        "server_port": fields[15],
+        "server_ip": f"0x{fields[16]:08x}",
+        "request": request + ("…" if length > len(head) else ""),
+    }
+
+
+def _describe_stat(head: bytes) -> dict[str, Any]:
+    # Imported here: resonance.protocol imports the player package.
+    from resonance.protocol.commands import decode_stat
+
+    try:
+        stat = decode_stat(head)
+    except ValueError:
+        return {}
+    return {
+        "event": stat.event,
+        "buffer_fullness": stat.buffer_fullness,
+        "output_buffer_fullness": stat.output_buffer_fullness,
+        "elapsed_ms": stat.elapsed_milliseconds,
+        "jiffies": stat.jiffies,
+    }
+
+
+def describe_frame(frame: _Frame) -> dict[str, Any]:
+    """Expand a recorded frame into a JSON-friendly dict."""
+    at, direction, tag, length, head = frame
+    entry: dict[str, Any] = {
+        "time": round(at, 6),
+        "dir": direction,
+        "cmd": tag,
+        "len": length,
+        "hex": head.hex(" "),
+    }
+    if length > len(head):
+        entry["truncated"] = length - len(head)
+    if tag == "strm" and direction == TX:
+        entry["strm"] = _describe_strm(head, length)
+    elif tag == "STAT" and direction == RX:
+        entry["stat"] = _describe_stat(head)
+    return entry
+
+
+@dataclass
+class FrameTracer:
+    """
+    Per-player ring buffers of recent Slimproto frames.
+
+    Usage:
+        if frame_tracer.enabled:
+            frame_tracer.record(player_id, TX, "strm", payload)
+    """
+
+    capacity: int = DEFAULT_CAPACITY
+    sample_every: int = DEFAULT_SAMPLE_EVERY
+    enabled: bool = False
+
+    _rings: OrderedDict[str, _Ring] = field(default_factory=OrderedDict, init=False, repr=False)
+
+    def enable(self, *, sample_every: int | None = None, capacity: int | None = None) -> None:
+        """Start recording (optionally changing sampling and ring size, clamped)."""
+        if sample_every is not None:
+            self.sample_every = min(max(1, sample_every), MAX_SAMPLE_EVERY)
+        if capacity is not None:
+            capacity = min(max(1, capacity), MAX_CAPACITY)
+            if capacity != self.capacity:
+                self.capacity = capacity
+                self._rings.clear()
+        self.enabled = True
+
+    def disable(self) -> None:
+        """Stop recording; already captured frames stay available."""
+        self.enabled = False
+
+    def clear(self) -> None:
+        """Drop all captured frames."""
+        self._rings.clear()
+
+    def record(self, player_id: str, direction: str, tag: str, payload: bytes) -> None:
+        """Record one frame. Callers check `enabled` first."""
+        ring = self._rings.get(player_id)
+        if ring is None:
+            ring = self._rings[player_id] = _Ring(deque(maxlen=self.capacity))
+            if len(self._rings) > MAX_PLAYERS:
+                self._rings.popitem(last=False)
+        else:
+            self._rings.move_to_end(player_id)
+
+        head = payload[:HEAD_BYTES]
+        if _is_heartbeat(direction, tag, head):
+            ring.heartbeats += 1
+            if self.sample_every > 1 and ring.heartbeats % self.sample_every != 1:
+                ring.skipped += 1
+                return
+        ring.frames.append((time.time(), direction, tag, len(payload), bytes(head)))
+
+    def dump(self, player_id: str | None = None, limit: int | None = None) -> dict[str, Any]:
+        """
+        Decoded snapshot of the ring buffers, oldest frame first.
+
+        Args:
+            player_id: Only this player (default: all players).
+            limit: Only the newest `limit` frames per player.
+        """
+        if player_id is not None:
+            ring = self._rings.get(player_id)
+            rings = {player_id: ring} if ring is not None else {}
+        else:
+            rings = dict(self._rings)
+
+        players: dict[str, Any] = {}
+        for pid, ring in rings.items():
+            frames = list(ring.frames)
+            if limit is not None:
+                frames = frames[-limit:] if limit > 0 else []
+            players[pid] = {
+                "heartbeats_skipped": ring.skipped,
+                "frames": [describe_frame(f) for f in frames],
+            }
+        return {
+            "enabled": self.enabled,
+            "sample_every": self.sample_every,
+            "capacity": self.capacity,
+            "players": players,
+        }
+
+
+# Process-wide tracer
+frame_tracer = FrameTracer()
@@ -3,11 +3,19 @@ Slimproto commands for Server → Player communication.
 
 This module implements the binary command frames that the server sends
 to Squeezebox players. The most important command is 'strm' which controls
-audio streaming.
+audio streaming. It also decodes the fixed-layout messages players send
+(HELO, STAT), which arrive once per second per player.
+
+Performance notes:
+- All layouts are precompiled `struct.Struct` objects; decoders use
+  `unpack_from` on the received buffer instead of slicing it field by field.
+- Constant frames (strm q/f/t, pause/unpause without a timestamp) are built
+  once and cached; bytes are immutable, so callers can share them.
 
 Reference: Slim/Player/Squeezebox.pm from the original LMS
 """
 
+import functools
 import struct
 from dataclasses import dataclass
 from enum import Enum
@@ -157,6 +165,12 @@ class StreamParams:
 
 STRM_FIXED_HEADER_SIZE = 24
 
+# Wire layouts (big-endian)
+STRM_HEADER = struct.Struct(">14BIHI")  # see build_strm_frame
+_AUDG = struct.Struct(">IIBBII")
+_AUDG_SEQ = struct.Struct(">IIBBIII")
+_AUDE = struct.Struct("BB")
+
 
 def build_strm_frame(params: StreamParams, request_string: str = "") -> bytes:
     """
@@ -193,33 +207,20 @@ def build_strm_frame(params: StreamParams, request_string: str = "") -> bytes:
     Returns:
         Complete strm frame bytes.
     """
-    # Pack the 24-byte fixed header
-    # Format string breakdown:
-    #   c c c c c c c = 7 single bytes (command through pcm_endianness)
-    #   B             = unsigned byte (buffer_threshold)
-    #   B             = unsigned byte (spdif)
-    #   B             = unsigned byte (transition_duration)
-    #   c             = single byte (transition_type)
-    #   B             = unsigned byte (flags)
-    #   B             = unsigned byte (output_threshold)
-    #   B             = unsigned byte (slave_streams)
-    #   I             = 4-byte unsigned int (replay_gain, big-endian)
-    #   H             = 2-byte unsigned short (server_port, big-endian)
-    #   I             = 4-byte unsigned int (server_ip, big-endian)
-
-    frame = struct.pack(
-        ">cccccccBBBcBBBIHI",
-        bytes([params.command.value]),
-        bytes([params.autostart.value]),
-        bytes([params.format.value]),
-        bytes([params.pcm_sample_size.value]),
-        bytes([params.pcm_sample_rate.value]),
-        bytes([params.pcm_channels.value]),
-        bytes([params.pcm_endianness.value]),
+    # Pack the 24-byte fixed header: 14 single bytes (command through
+    # slave_streams), then replay_gain (I), server_port (H), server_ip (I).
+    frame = STRM_HEADER.pack(
+        params.command.value,
+        params.autostart.value,
+        params.format.value,
+        params.pcm_sample_size.value,
+        params.pcm_sample_rate.value,
+        params.pcm_channels.value,
+        params.pcm_endianness.value,
         params.buffer_threshold_kb & 0xFF,
         params.spdif_mode.value,
         params.transition_duration & 0xFF,
-        bytes([params.transition_type.value]),
+        params.transition_type.value,
         params.flags & 0xFF,
         params.output_threshold & 0xFF,
         params.slave_streams & 0xFF,
@@ -228,9 +229,9 @@ def build_strm_frame(params: StreamParams, request_string: str = "") -> bytes:
         params.server_ip,
     )
 
-    assert len(frame) == STRM_FIXED_HEADER_SIZE, f"Header size mismatch: {len(frame)}"
-
     # Append the request string
+    if not request_string:
+        return frame
     return frame + request_string.encode("latin-1")
 
 
@@ -287,6 +288,7 @@ def build_stream_start(
     return build_strm_frame(params, request_string)
 
 
+@functools.lru_cache(maxsize=64)
 def build_stream_pause(interval_ms: int = 0) -> bytes:
     """
     Build a strm frame to pause playback.
@@ -306,6 +308,7 @@ def build_stream_pause(interval_ms: int = 0) -> bytes:
     return build_strm_frame(params)
 
 
+@functools.lru_cache(maxsize=64)
 def build_stream_unpause(interval: int = 0) -> bytes:
     """
     Build a strm frame to resume playback.
@@ -325,6 +328,7 @@ def build_stream_unpause(interval: int = 0) -> bytes:
     return build_strm_frame(params)
 
 
+@functools.cache
 def build_stream_stop() -> bytes:
     """
     Build a strm frame to stop playback.
@@ -340,6 +344,7 @@ def build_stream_stop() -> bytes:
     return build_strm_frame(params)
 
 
+@functools.cache
 def build_stream_flush() -> bytes:
     """
     Build a strm frame to flush the player's buffer.
@@ -355,6 +360,7 @@ def build_stream_flush() -> bytes:
     return build_strm_frame(params)
 
 
+@functools.lru_cache(maxsize=64)
 def build_stream_status(server_port: int = 9000, server_ip: int = 0) -> bytes:
     """
     Build a strm frame to request player status.
@@ -428,8 +434,20 @@ def build_audg_frame(
     left_fixed = (left_gain << 8) & 0xFFFFFFFF
     right_fixed = (right_gain << 8) & 0xFFFFFFFF
 
-    frame = struct.pack(
-        ">IIBBII",
+    # Append sequence number if provided (LMS compatibility)
+    # This allows the player to track which volume updates are current
+    if seq_no is not None:
+        return _AUDG_SEQ.pack(
+            0,  # old_left (deprecated)
+            0,  # old_right (deprecated)
+            1 if digital_volume else 0,
+            preamp,
+            left_fixed,
+            right_fixed,
+            seq_no,
+        )
+
+    return _AUDG.pack(
         0,  # old_left (deprecated)
         0,  # old_right (deprecated)
         1 if digital_volume else 0,
@@ -438,13 +456,6 @@ def build_audg_frame(
         right_fixed,
     )
 
-    # Append sequence number if provided (LMS compatibility)
-    # This allows the player to track which volume updates are current
-    if seq_no is not None:
-        frame += struct.pack(">I", seq_no)
-
-    return frame
-
 
 def build_volume_frame(volume: int, muted: bool = False, seq_no: int | None = None) -> bytes:
     """
@@ -488,7 +499,7 @@ def build_aude_frame(spdif_enable: bool = True, dac_enable: bool = True) -> byte
     Returns:
         Complete aude frame bytes (2 bytes).
     """
-    return struct.pack("BB", 1 if spdif_enable else 0, 1 if dac_enable else 0)
+    return _AUDE.pack(1 if spdif_enable else 0, 1 if dac_enable else 0)
 
 
 # ============================================================================
@@ -506,3 +517,109 @@ def build_display_clear() -> bytes:
     # grfe frame: offset (2 bytes) + transition (1) + param (1) + bitmap data
     # For now, just send empty frame to clear
     return struct.pack(">HBB", 0, 0, 0)
+
+
+# ============================================================================
+# Player → Server messages (HELO, STAT)
+# ============================================================================
+
+# Message header: 4-byte command tag + 4-byte payload length.
+MESSAGE_HEADER = struct.Struct(">4sI")
+
+# STAT payload, 53 bytes on current firmware; older players send fewer trailing fields.
+_STAT = struct.Struct(">4sBBBIIQHIIIIHIIH")
+STAT_MIN_SIZE = 36
+
+# HELO fixed fields: device id, revision, MAC; UUID follows on newer players.
+_HELO = struct.Struct(">BB6s")
+_HELO_UUID = struct.Struct(">16s")
+HELO_MIN_SIZE = 10
+
+# IR: time since startup (ms ticks), code format, bit count, code.
+IR_MESSAGE = struct.Struct(">IBB4s")
+
+_STAT_EVENTS: dict[bytes, str] = {}
+
+
+@dataclass(slots=True)
+class StatRecord:
+    """Decoded STAT message (see SlimprotoServer._handle_stat for the field layout)."""
+
+    event: str  # e.g. "STMt"
+    crlf: int
+    mas_initialized: int
+    mas_mode: int
+    buffer_size: int
+    buffer_fullness: int
+    bytes_received: int
+    signal_strength: int
+    jiffies: int
+    output_buffer_size: int
+    output_buffer_fullness: int
+    elapsed_seconds: int
+    voltage: int
+    elapsed_milliseconds: int
+    server_timestamp: int
+    error_code: int
+
+
+def decode_stat(data: bytes | memoryview) -> StatRecord:
+    """
+    Decode a STAT payload.
+
+    Fields missing from shorter (older firmware) messages decode as 0.
+
+    Raises:
+        ValueError: If the payload is shorter than STAT_MIN_SIZE.
+    """
+    if len(data) < STAT_MIN_SIZE:
+        raise ValueError(f"STAT too short: {len(data)} bytes")
+    if len(data) < _STAT.size:
+        data = bytes(data).ljust(_STAT.size, b"\0")
+    values = _STAT.unpack_from(data)
+    raw_event = values[0]
+    event = _STAT_EVENTS.get(raw_event)
+    if event is None:
+        event = raw_event.decode("ascii", errors="replace")
+        if len(_STAT_EVENTS) < 64:
+            _STAT_EVENTS[raw_event] = event
+    return StatRecord(event, *values[1:])
+
+
+@dataclass(frozen=True, slots=True)
+class HeloRecord:
+    """Decoded HELO message."""
+
+    device_id: int
+    revision: int
+    mac_address: str  # "aa:bb:cc:dd:ee:ff"
+    uuid: str  # hex, "" if the player did not send one
+    capabilities: str  # raw "Key=Value,..." string
+
+
+def decode_helo(data: bytes | memoryview) -> HeloRecord:
+    """
+    Decode a HELO payload.
+
+    Layout: [1] device id, [1] revision, [6] MAC, then either 12 bytes of
+    WLAN/counter fields (20-byte form) or a 16-byte UUID plus those fields
+    (36-byte form), followed by an optional capabilities string.
+
+    Raises:
+        ValueError: If the payload is shorter than HELO_MIN_SIZE.
+    """
+    if len(data) < HELO_MIN_SIZE:
+        raise ValueError(f"HELO too short: {len(data)} bytes")
+    device_id, revision, mac = _HELO.unpack_from(data)
+
+    uuid = ""
+    capabilities_offset = 20
+    if len(data) >= 36:
+        uuid = _HELO_UUID.unpack_from(data, 8)[0].hex()
+        capabilities_offset = 36
+
+    capabilities = ""
+    if len(data) > capabilities_offset:
+        capabilities = bytes(data[capabilities_offset:]).decode("utf-8", errors="ignore")
+
+    return HeloRecord(device_id, revision, mac.hex(":"), uuid, capabilities)
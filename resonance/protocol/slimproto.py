@@ -17,8 +17,6 @@ import asyncio
 import ipaddress
 import logging
 import socket
-import struct
-import time
 from collections.abc import Callable, Coroutine
 from typing import Any
 
@@ -30,24 +28,26 @@ from resonance.core.events import (
     event_bus,
 )
 from resonance.player.client import DeviceType, PlayerClient, PlayerState
+from resonance.player.frame_trace import RX, frame_tracer
 from resonance.player.registry import PlayerRegistry
 from resonance.protocol.commands import (
+    IR_MESSAGE,
+    MESSAGE_HEADER,
     AudioFormat,
     AutostartMode,
     StreamParams,
     build_stream_pause,
+    build_stream_status,
     build_stream_stop,
     build_stream_unpause,
     build_strm_frame,
     build_volume_frame,
+    decode_helo,
+    decode_stat,
 )
 
 logger = logging.getLogger(__name__)
 
-# When enabled, outgoing frames include a compact hexdump for easier debugging.
-OUTGOING_FRAME_DEBUG = True
-OUTGOING_FRAME_HEXDUMP_BYTES = 64
-
 # NOTE (SlimServer semantics):
 # - STMd = DECODE_READY (decoder has no more input data) -> NOT "track finished"
 # - STMu = UNDERRUN     (output buffer empty)            -> playerStopped / track finished
@@ -56,64 +56,6 @@ OUTGOING_FRAME_HEXDUMP_BYTES = 64
 # Track-finished is handled on STMu only.
 
 
-def _hexdump(data: bytes, limit: int = OUTGOING_FRAME_HEXDUMP_BYTES) -> str:
-    """Return a compact hex representation of the first N bytes."""
-    view = data[:limit]
-    hexpart = " ".join(f"{b:02x}" for b in view)
-    if len(data) > limit:
-        return f"{hexpart} … (+{len(data) - limit} bytes)"
-    return hexpart
-
-
-def _force_outgoing_frame_debug_log(
-    command: str,
-    client_id: str,
-    payload: bytes,
-) -> None:
-    """
-    Emit outgoing-frame diagnostics even if the logger is not set to DEBUG.
-
-    We print to stderr as a last resort because, during real-player debugging,
-    we must capture TX frames to understand protocol expectations.
-    """
-    if not OUTGOING_FRAME_DEBUG:
-        return
-
-    try:
-        prefix = "[TX]"
-        print(
-            f"{prefix} to={client_id} cmd={command} payload_len={len(payload)} payload_hex={_hexdump(payload)}",
-            file=__import__("sys").stderr,
-        )
-
-        if command == "strm" and len(payload) >= 24:
-            fixed = payload[:24]
-            try:
-                cmd_ch = fixed[0:1].decode("ascii", errors="replace")
-                autostart_ch = fixed[1:2].decode("ascii", errors="replace")
-                format_ch = fixed[2:3].decode("ascii", errors="replace")
-            except Exception:
-                cmd_ch = "?"
-                autostart_ch = "?"
-                format_ch = "?"
-            server_port = struct.unpack(">H", fixed[18:20])[0]
-            server_ip = struct.unpack(">I", fixed[20:24])[0]
-            print(
-                f"{prefix} strm parsed: command={cmd_ch} autostart={autostart_ch} format={format_ch} server_port={server_port} server_ip=0x{server_ip:08x}",
-                file=__import__("sys").stderr,
-            )
-
-            if len(payload) > 24:
-                req_preview = payload[24 : 24 + 200]
-                print(
-                    f"{prefix} strm request_preview={req_preview.decode('latin-1', errors='replace')!r}",
-                    file=__import__("sys").stderr,
-                )
-    except Exception:
-        # Never let diagnostics break protocol sending paths.
-        return
-
-
 # Default Slimproto port
 SLIMPROTO_PORT = 3483
 
@@ -474,6 +416,8 @@ class SlimprotoServer:
             raise ProtocolError(f"Expected HELO, got {command}")
 
         self._parse_helo(client, payload)
+        if frame_tracer.enabled:
+            frame_tracer.record(client.id, RX, command, payload)
 
         logger.info(
             "Player connected: %s (%s, rev %s)",
@@ -500,33 +444,19 @@ class SlimprotoServer:
             [2] Language code
             [*] Capabilities string (optional)
         """
-        if len(data) < 10:
-            raise ProtocolError(f"HELO too short: {len(data)} bytes")
-
-        # Parse fixed fields
-        device_id = data[0]
-        revision = data[1]
-
-        # MAC address (bytes 2-7)
-        mac_bytes = data[2:8]
-        mac_address = ":".join(f"{b:02x}" for b in mac_bytes)
-
-        # Check for UUID (36+ bytes means UUID is present)
-        uuid = ""
-        capabilities_offset = 20
+        try:
+            helo = decode_helo(data)
+        except ValueError as e:
+            raise ProtocolError(str(e)) from None
 
-        if len(data) >= 36:
-            # UUID is 16 bytes as hex string (32 chars when parsed)
-            uuid_bytes = data[8:24]
-            uuid = uuid_bytes.hex()
-            capabilities_offset = 36
+        device_id = helo.device_id
+        mac_address = helo.mac_address
 
         # Parse capabilities string if present
         capabilities: dict[str, str] = {}
-        if len(data) > capabilities_offset:
+        if helo.capabilities:
             try:
-                cap_string = data[capabilities_offset:].decode("utf-8", errors="ignore")
-                capabilities = self._parse_capabilities(cap_string)
+                capabilities = self._parse_capabilities(helo.capabilities)
             except Exception as e:
                 logger.debug("Failed to parse capabilities: %s", e)
 
@@ -534,8 +464,8 @@ class SlimprotoServer:
         client.id = mac_address
         client.info.mac_address = mac_address
         client.info.device_type = DeviceType.from_id(device_id)
-        client.info.firmware_version = str(revision)
-        client.info.uuid = uuid
+        client.info.firmware_version = str(helo.revision)
+        client.info.uuid = helo.uuid
         client.info.capabilities = capabilities
         client.info.model = DEVICE_IDS.get(device_id, f"unknown-{device_id}")
 
@@ -663,6 +593,8 @@ class SlimprotoServer:
                 break
 
             client.update_last_seen()
+            if frame_tracer.enabled:
+                frame_tracer.record(client.id, RX, command, payload)
 
             # Dispatch to handler
             handler = self._handlers.get(command)
@@ -696,8 +628,8 @@ class SlimprotoServer:
         # Read header: 4 bytes command + 4 bytes length
         header = await reader.readexactly(8)
 
-        command = header[:4].decode("ascii", errors="replace")
-        length = struct.unpack(">I", header[4:8])[0]
+        tag, length = MESSAGE_HEADER.unpack(header)
+        command = tag.decode("ascii", errors="replace")
 
         # Sanity check on length
         if length > 65536:  # 64KB max payload
@@ -718,35 +650,41 @@ class SlimprotoServer:
         Periodically check for clients that haven't sent heartbeats.
 
         Clients that haven't been heard from in CLIENT_TIMEOUT_SECONDS
-        are considered dead and disconnected.
+        are considered dead and disconnected. Players are handled
+        concurrently, so one player with a stuck socket cannot delay the
+        heartbeats or timeout checks of the others.
         """
+        # LMS sends 0/0 for 'strm t' (heartbeat/status query)
+        # See Slim/Player/Squeezebox.pm stream() method for command 't'
+        strm_status = build_stream_status(server_port=0, server_ip=0)
+
         while self._running:
             await asyncio.sleep(CLIENT_CHECK_INTERVAL_SECONDS)
 
             players = await self.player_registry.get_all()
-            for player in players:
-                if player.seconds_since_last_seen() > CLIENT_TIMEOUT_SECONDS:
-                    logger.warning(
-                        "Player %s timed out (no heartbeat for %.1f seconds)",
-                        player.id,
-                        player.seconds_since_last_seen(),
-                    )
-                    await player.disconnect()
-                    await self.player_registry.unregister(player.id)
-                else:
-                    # Send periodic heartbeat (strm t) to keep connection alive
-                    try:
-                        from resonance.protocol.commands import build_stream_status
-
-                        # LMS sends 0/0 for 'strm t' (heartbeat/status query)
-                        # See Slim/Player/Squeezebox.pm stream() method for command 't'
-                        strm_status = build_stream_status(
-                            server_port=0, server_ip=0
-                        )
-                        await self._send_message(player, "strm", strm_status)
-                        logger.debug("Sent heartbeat to %s", player.id)
-                    except Exception as e:
-                        logger.warning("Failed to send heartbeat to %s: %s", player.id, e)
+            await asyncio.gather(
+                *(self._heartbeat(player, strm_status) for player in players),
+                return_exceptions=True,
+            )
+
+    async def _heartbeat(self, player: PlayerClient, strm_status: bytes) -> None:
+        """Time out a silent player, or send it a periodic heartbeat (strm t)."""
+        if player.seconds_since_last_seen() > CLIENT_TIMEOUT_SECONDS:
+            logger.warning(
+                "Player %s timed out (no heartbeat for %.1f seconds)",
+                player.id,
+                player.seconds_since_last_seen(),
+            )
+            await player.disconnect()
+            await self.player_registry.unregister(player.id)
+            return
+
+        # Send periodic heartbeat (strm t) to keep connection alive
+        try:
+            await self._send_message(player, "strm", strm_status)
+            logger.debug("Sent heartbeat to %s", player.id)
+        except Exception as e:
+            logger.warning("Failed to send heartbeat to %s: %s", player.id, e)
 
     # -------------------------------------------------------------------------
     # Message Handlers
@@ -777,37 +715,23 @@ class SlimprotoServer:
             [4] Server timestamp
             [2] Error code
         """
-        if len(data) < 36:
+        try:
+            stat = decode_stat(data)
+        except ValueError:
             logger.warning("STAT too short from %s: %d bytes", client.id, len(data))
             return
 
-        # Parse event code (first 4 bytes)
-        event_code = data[:4].decode("ascii", errors="replace")
-
-        # Parse buffer fullness (bytes 11-15)
-        buffer_fullness = struct.unpack(">I", data[11:15])[0] if len(data) >= 15 else 0
-
-        # Parse bytes received (bytes 15-23)
-        # bytes_received is currently not used, but keep the computation around for debugging
-        # (parity with Slimproto status struct) without tripping "unused variable" diagnostics.
-        _bytes_received = struct.unpack(">Q", data[15:23])[0] if len(data) >= 23 else 0
-
-        # Parse signal strength (bytes 23-25)
-        signal_strength = struct.unpack(">H", data[23:25])[0] if len(data) >= 25 else 0
-
-        # Parse elapsed seconds (bytes 37-41)
-        # Format: [25-28] Jiffies, [29-32] Output buffer size, [33-36] Output buffer fullness, [37-40] Elapsed seconds
-        elapsed_seconds = struct.unpack(">I", data[37:41])[0] if len(data) >= 41 else 0
-
-        # Parse elapsed milliseconds (bytes 43-47, if present)
-        # Format: [41-42] Voltage (2 bytes), [43-46] Elapsed milliseconds
-        elapsed_ms = 0
-        if len(data) >= 47:
-            elapsed_ms = struct.unpack(">I", data[43:47])[0]
+        event_code = stat.event
+        buffer_fullness = stat.buffer_fullness
+        signal_strength = stat.signal_strength
+        elapsed_seconds = stat.elapsed_seconds
+        elapsed_ms = stat.elapsed_milliseconds
 
         # Update client status
-        client.status.buffer_fullness = buffer_fullness
-        client.status.signal_strength = signal_strength
+        status = client.status
+        status.buffer_fullness = buffer_fullness
+        status.output_buffer_fullness = stat.output_buffer_fullness
+        status.signal_strength = signal_strength
 
         # Always accept the raw elapsed from the player.
         # After a seek, the player reports elapsed relative to the NEW stream start (0, 1, 2...).
@@ -830,13 +754,13 @@ class SlimprotoServer:
             if has_nonzero_ms:
                 client.status.last_nonzero_elapsed_milliseconds = int(elapsed_ms)
                 client.status.last_nonzero_elapsed_seconds = float(elapsed_ms) / 1000.0
-                client.status.last_nonzero_elapsed_at = time.time()
+                client.status.last_nonzero_elapsed_at = status.last_seen
             elif has_nonzero_s:
                 client.status.last_nonzero_elapsed_seconds = float(elapsed_seconds)
                 client.status.last_nonzero_elapsed_milliseconds = int(
                     float(elapsed_seconds) * 1000.0
                 )
-                client.status.last_nonzero_elapsed_at = time.time()
+                client.status.last_nonzero_elapsed_at = status.last_seen
         except Exception:
             # Defensive: never let sticky-elapsed bookkeeping break STAT handling.
             pass
@@ -900,6 +824,14 @@ class SlimprotoServer:
                 pass
             return 0.0
 
+        # Heartbeats while playing drive next-track prefetch (gapless transitions).
+        if event_code == "STMt" and client.status.state == PlayerState.PLAYING:
+            server = getattr(self, "_resonance_server", None)
+            progress_fn = getattr(server, "on_playback_progress", None)
+            if callable(progress_fn):
+                elapsed = elapsed_ms / 1000.0 if elapsed_ms else float(elapsed_seconds or 0)
+                progress_fn(client.mac_address, elapsed + _get_start_offset())
+
         # SlimServer semantics:
         # - STMd = DECODE_READY (decoder has no more input data) -> NOT track finished
         # - STMu = UNDERRUN (output buffer empty)                -> track finished / playerStopped
@@ -990,8 +922,8 @@ class SlimprotoServer:
         if len(data) < 10:
             return
 
-        ir_time = struct.unpack(">I", data[:4])[0]
-        ir_code = data[6:10].hex()
+        ir_time, _format, _bits, code = IR_MESSAGE.unpack_from(data)
+        ir_code = code.hex()
 
         logger.debug("IR from %s: code=%s, time=%d", client.id, ir_code, ir_time)
 
@@ -1242,51 +1174,6 @@ class SlimprotoServer:
         if len(command) != 4:
             raise ValueError(f"Command must be 4 characters: {command}")
 
-        # Always emit a fallback diagnostic line (stderr) so we can see TX frames
-        # even when logging configuration doesn't show DEBUG output.
-        _force_outgoing_frame_debug_log(command, client.id, payload)
-
-        if OUTGOING_FRAME_DEBUG and logger.isEnabledFor(logging.DEBUG):
-            # We don't know the on-wire framing here (it depends on the player implementation),
-            # but we can still log command + payload information deterministically.
-            logger.debug(
-                "TX to %s cmd=%s payload_len=%d payload_hex=%s",
-                client.id,
-                command,
-                len(payload),
-                _hexdump(payload),
-            )
-
-            # Special-case: show likely strm header fields when present (first 24 bytes).
-            if command == "strm" and len(payload) >= 24:
-                fixed = payload[:24]
-                # Bytes 0..6 are ASCII-ish fields in many implementations.
-                try:
-                    cmd_ch = fixed[0:1].decode("ascii", errors="replace")
-                    autostart_ch = fixed[1:2].decode("ascii", errors="replace")
-                    format_ch = fixed[2:3].decode("ascii", errors="replace")
-                except Exception:
-                    cmd_ch = "?"
-                    autostart_ch = "?"
-                    format_ch = "?"
-                server_port = struct.unpack(">H", fixed[18:20])[0]
-                server_ip = struct.unpack(">I", fixed[20:24])[0]
-                logger.debug(
-                    "TX strm parsed: command=%s autostart=%s format=%s server_port=%d server_ip=0x%08x",
-                    cmd_ch,
-                    autostart_ch,
-                    format_ch,
-                    server_port,
-                    server_ip,
-                )
-
-                if len(payload) > 24:
-                    req_preview = payload[24 : 24 + 200]
-                    logger.debug(
-                        "TX strm request_preview=%r",
-                        req_preview.decode("latin-1", errors="replace"),
-                    )
-
         await client.send_message(command.encode("ascii"), payload)
 
     @property
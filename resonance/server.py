@@ -7,23 +7,32 @@ all server components and manages the application lifecycle.
 
 import asyncio
 import hashlib
+import importlib
 import logging
 import signal
 import time
 import uuid
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from resonance.core.artwork import ArtworkManager
+from resonance.core.db.maintenance import DbMaintenance, MaintenanceConfig
 from resonance.core.events import Event, PlayerTrackFinishedEvent, event_bus
 from resonance.core.library import MusicLibrary
 from resonance.core.library_db import LibraryDb
+from resonance.core.metrics import monitor_loop_lag
 from resonance.core.playlist import PlaylistManager
+from resonance.core.profiling import loop_watchdog
 from resonance.player.registry import PlayerRegistry
 from resonance.protocol.discovery import UDPDiscoveryServer
 from resonance.protocol.slimproto import SlimprotoServer
+from resonance.streaming.prefetch import PREFETCH_LEAD_SECONDS
+from resonance.streaming.scheduler import get_transcode_scheduler
 from resonance.streaming.seek_coordinator import init_seek_coordinator
 from resonance.streaming.server import StreamingServer
-from resonance.web.server import WebServer
+
+if TYPE_CHECKING:
+    from resonance.web.server import WebServer
 
 logger = logging.getLogger(__name__)
 
@@ -98,6 +107,9 @@ class ResonanceServer:
         web_port: int = 9000,
         music_root: Path | None = None,
         library_db_path: Path | None = None,
+        watch_library: bool = False,
+        admin_token: str | None = None,
+        db_maintenance: MaintenanceConfig | None = None,
     ) -> None:
         """
         Initialize the Resonance server.
@@ -108,10 +120,18 @@ class ResonanceServer:
             web_port: HTTP/JSON-RPC port (default 9000).
             music_root: Optional root directory for the local music library.
             library_db_path: Optional path to the library SQLite DB file.
+            watch_library: Keep the library in sync with the music folders via a
+                filesystem watcher instead of relying on manual rescans.
+            admin_token: Bearer token for the /api/admin/* diagnostics
+                (profiler, loop stalls); they are disabled without one.
+            db_maintenance: Library DB tuning and maintenance schedule
+                (defaults: `MaintenanceConfig()`).
         """
         self.host = host
         self.port = port
         self.web_port = web_port
+        self.watch_library = watch_library
+        self.admin_token = admin_token
 
         # Core components
         self.player_registry = PlayerRegistry()
@@ -139,7 +159,11 @@ class ResonanceServer:
 
         # Keep DB near the working directory by default; can be overridden.
         default_db_path = Path("resonance-library.sqlite3")
-        self.library_db = LibraryDb(db_path=str(library_db_path or default_db_path))
+        self.library_db = LibraryDb(
+            db_path=str(library_db_path or default_db_path), maintenance_config=db_maintenance
+        )
+        # ANALYZE/optimize, idle WAL checkpoints and vacuum (runs while started)
+        self.db_maintenance = DbMaintenance(self.library_db)
 
         # Core library (kept independent of any web/UI layer)
         self.music_library = MusicLibrary(db=self.library_db, music_root=music_root)
@@ -147,8 +171,8 @@ class ResonanceServer:
         # Artwork manager (handles cover art extraction and caching)
         self.artwork_manager = ArtworkManager(cache_dir=Path("cache/artwork"))
 
-        # Playlist manager (one playlist per player)
-        self.playlist_manager = PlaylistManager()
+        # Playlist manager (one playlist per player, persisted in the library DB)
+        self.playlist_manager = PlaylistManager(db=self.library_db)
 
         # Web server (HTTP/JSON-RPC on port 9000)
         self.web_server: WebServer | None = None
@@ -161,6 +185,12 @@ class ResonanceServer:
         # Key: player MAC, Value: event-loop time() until which track-finished should be ignored.
         self._suppress_track_finished_until: dict[str, float] = {}
 
+        # In-flight next-track prefetches, keyed by player MAC
+        self._prefetch_tasks: dict[str, asyncio.Task[None]] = {}
+
+        # Event-loop lag sampler feeding /metrics and the stall watchdog (runs while started)
+        self._loop_lag_task: asyncio.Task[None] | None = None
+
         # SeekCoordinator for latest-wins seek semantics (initialized on start)
         self.seek_coordinator = None
 
@@ -182,19 +212,39 @@ class ResonanceServer:
         )
 
     async def start(self) -> None:
-        """Start all server components."""
+        """
+        Start all server components.
+
+        Players come first: Slimproto and discovery are listening before the
+        web stack (FastAPI and the route modules, most of the import time) is
+        loaded, and that import runs off the event loop so early HELOs are
+        answered while it completes.
+        """
         logger.info("Starting Resonance server on %s:%d", self.host, self.port)
 
         self._running = True
         self._shutdown_event = asyncio.Event()
+        loop_watchdog.start()
+        self._loop_lag_task = asyncio.create_task(monitor_loop_lag(on_tick=loop_watchdog.beat))
 
         # Start core library DB (schema/migrations)
         await self.library_db.open()
         await self.library_db.ensure_schema()
+        self.db_maintenance.start()
 
         # Mark the facade initialized (DB-backed operations will be wired in next)
         await self.music_library.initialize()
 
+        # Restore per-player queues from the previous run
+        await self.playlist_manager.load()
+
+        # Subscribe to track finished events for automatic playlist advancement
+        async def _on_track_finished_event(event: Event) -> None:
+            if isinstance(event, PlayerTrackFinishedEvent):
+                await self._on_track_finished(event)
+
+        await event_bus.subscribe("player.track_finished", _on_track_finished_event)
+
         # Start Slimproto server
         await self.slimproto.start()
 
@@ -214,7 +264,8 @@ class ResonanceServer:
         self.seek_coordinator = init_seek_coordinator(self.streaming_server)
 
         # Start Web server (HTTP/JSON-RPC + Streaming)
-        self.web_server = WebServer(
+        web = await asyncio.to_thread(importlib.import_module, "resonance.web.server")
+        self.web_server = web.WebServer(
             player_registry=self.player_registry,
             music_library=self.music_library,
             playlist_manager=self.playlist_manager,
@@ -222,15 +273,13 @@ class ResonanceServer:
             artwork_manager=self.artwork_manager,
             slimproto=self.slimproto,
             server_uuid=self.server_uuid,
+            admin_token=self.admin_token,
         )
         await self.web_server.start(host=self.host, port=self.web_port)
 
-        # Subscribe to track finished events for automatic playlist advancement
-        async def _on_track_finished_event(event: Event) -> None:
-            if isinstance(event, PlayerTrackFinishedEvent):
-                await self._on_track_finished(event)
-
-        await event_bus.subscribe("player.track_finished", _on_track_finished_event)
+        # Optional: pick up new/changed files in the music folders as they appear
+        if self.watch_library:
+            await self.music_library.start_watching()
 
         logger.info("Resonance server started successfully")
         logger.info("Slimproto: port %d | Web/Streaming: port %d", self.port, self.web_port)
@@ -242,6 +291,10 @@ class ResonanceServer:
 
         logger.info("Stopping Resonance server...")
         self._running = False
+        if self._loop_lag_task is not None:
+            self._loop_lag_task.cancel()
+            self._loop_lag_task = None
+        loop_watchdog.stop()
 
         # Stop Web server first (clients get 503)
         if self.web_server:
@@ -250,8 +303,11 @@ class ResonanceServer:
         # Stop UDP Discovery server
         await self.discovery_server.stop()
 
-        # Stop Streaming server (clears queue)
+        # Stop Streaming server (clears queue and warm prefetch streams)
+        for task in list(self._prefetch_tasks.values()):
+            task.cancel()
         await self.streaming_server.stop()
+        await get_transcode_scheduler().close()
 
         # Stop Slimproto server
         await self.slimproto.stop()
@@ -259,7 +315,17 @@ class ResonanceServer:
         # Disconnect all players
         await self.player_registry.disconnect_all()
 
+        # Stop the library watcher before its DB goes away.
+        await self.music_library.stop_watching()
+
+        # Persist pending queue changes before the DB goes away.
+        try:
+            await self.playlist_manager.close()
+        except Exception:
+            logger.exception("Failed to persist playlists on shutdown")
+
         # Close library DB last, after all components are stopped.
+        await self.db_maintenance.stop()
         await self.library_db.close()
 
         if self._shutdown_event:
@@ -367,6 +433,7 @@ class ResonanceServer:
             return
 
         playlist = self.playlist_manager.get(player_id)
+        await playlist.hydrate_current()
         next_track = playlist.next()
 
         if next_track:
@@ -385,6 +452,61 @@ class ResonanceServer:
         else:
             logger.info("Playlist finished for player %s", player_id)
 
+    def on_playback_progress(self, player_mac: str, elapsed_seconds: float) -> None:
+        """
+        Start prefetching the next track when the current one is nearly done.
+
+        Called by the Slimproto STAT handler on every heartbeat (STMt) while
+        playing, so this must stay cheap: it only schedules work inside the
+        last PREFETCH_LEAD_SECONDS of a track.
+
+        Args:
+            player_mac: Player MAC address.
+            elapsed_seconds: Track position (start offset already applied).
+        """
+        if player_mac in self._prefetch_tasks or player_mac not in self.playlist_manager:
+            return
+
+        playlist = self.playlist_manager.get(player_mac)
+        current = playlist.current_track
+        duration_ms = getattr(current, "duration_ms", None)
+        if not duration_ms or duration_ms / 1000.0 - elapsed_seconds > PREFETCH_LEAD_SECONDS:
+            return
+
+        upcoming = playlist.peek_next()
+        if upcoming is None:
+            return
+        # Placeholders (no path yet) are hydrated by the task.
+        if upcoming.path and self.streaming_server.is_prefetched(player_mac, Path(upcoming.path)):
+            return
+
+        task = asyncio.get_running_loop().create_task(self._prefetch_next(player_mac))
+        self._prefetch_tasks[player_mac] = task
+        task.add_done_callback(lambda _: self._prefetch_tasks.pop(player_mac, None))
+
+    async def _prefetch_next(self, player_mac: str) -> None:
+        if player_mac not in self.playlist_manager:
+            return
+        playlist = self.playlist_manager.get(player_mac)
+        position = playlist.next_position()
+        if position is None:
+            return
+        # The upcoming entry may have been evicted to an id-only placeholder.
+        await playlist.hydrate(position, 1)
+        upcoming = playlist.peek_next()
+        if upcoming is None or not upcoming.path:
+            return
+        path = Path(upcoming.path)
+        if self.streaming_server.is_prefetched(player_mac, path):
+            return
+
+        player = await self.player_registry.get_by_mac(player_mac)
+        device_type = player.info.device_type if player is not None else None
+        try:
+            await self.streaming_server.prefetch(player_mac, path, device_type)
+        except Exception:
+            logger.exception("Prefetch failed for player %s: %s", player_mac, path.name)
+
     def suppress_track_finished_for_player(self, player_mac: str, seconds: float = 1.0) -> None:
         """
         Temporarily suppress STMu-based auto-advance for a player.
@@ -7,8 +7,16 @@ to Squeezebox players.
 Components:
     StreamingServer: Manages audio file queuing and streaming.
     SeekCoordinator: Coordinates seek operations with latest-wins semantics.
+    TranscodeScheduler: Concurrency budget and warm helpers for transcoders.
 """
 
+from resonance.streaming.scheduler import (
+    TranscodeBusyError,
+    TranscodePriority,
+    TranscodeScheduler,
+    get_transcode_scheduler,
+    set_transcode_scheduler,
+)
 from resonance.streaming.seek_coordinator import (
     SeekCoordinator,
     cleanup_processes,
@@ -27,4 +35,9 @@ __all__ = [
     "init_seek_coordinator",
     "terminate_subprocess_safely",
     "cleanup_processes",
+    "TranscodeScheduler",
+    "TranscodePriority",
+    "TranscodeBusyError",
+    "get_transcode_scheduler",
+    "set_transcode_scheduler",
 ]
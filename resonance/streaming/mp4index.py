@@ -0,0 +1,587 @@
+"""
+MP4 sample-table index for exact seeking in m4a/m4b files.
+
+Seeking in an MP4 container used to be left to the decoder (`faad -j`,
+`ffmpeg -ss`), which means parsing the container again on every seek and, for
+long audiobooks, several seconds before the first byte of audio. The sample
+table (`stbl`) already tells us exactly where every sample lives, so we parse
+it once per file and map a time straight to a sample and a byte offset.
+
+Design:
+- Only the first sound track is indexed (`hdlr` = `soun`), which is what
+  players play.
+- Tables are kept in their compact run-length form (`stts`, `stsc`) plus two
+  arrays (`stsz` sample sizes, `stco`/`co64` chunk offsets), so a 20-hour
+  audiobook costs a few MB, not a Python object per sample.
+- Indexes are cached per (path, size, mtime) in a small LRU; parsing happens
+  in a worker thread (`get_sample_index`).
+- For AAC tracks the index carries the ADTS parameters derived from the
+  AudioSpecificConfig, so samples can be framed as ADTS (`iter_adts`) and fed
+  to a decoder or player that does not understand MP4.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import logging
+import struct
+import sys
+import threading
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, BinaryIO
+
+if TYPE_CHECKING:
+    from collections.abc import Generator, Iterator
+    from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# File extensions that are MP4 containers.
+MP4_SUFFIXES: frozenset[str] = frozenset({".m4a", ".m4b", ".mp4", ".m4p", ".m4r", ".alac"})
+
+# Number of parsed indexes kept in memory.
+INDEX_CACHE_SIZE = 16
+
+# ADTS sampling_frequency_index values 0..12.
+ADTS_SAMPLE_RATES = (
+    96000,
+    88200,
+    64000,
+    48000,
+    44100,
+    32000,
+    24000,
+    22050,
+    16000,
+    12000,
+    11025,
+    8000,
+    7350,
+)
+
+# Largest payload that fits the 13-bit ADTS frame_length field (minus the header).
+_ADTS_MAX_PAYLOAD = (1 << 13) - 1 - 7
+
+_BOX_HEADER = struct.Struct(">I4s")
+_U32 = struct.Struct(">I")
+_U64 = struct.Struct(">Q")
+
+
+class Mp4IndexError(ValueError):
+    """Raised when a file is not an MP4 container we can index."""
+
+
+@dataclass(frozen=True, slots=True)
+class AdtsConfig:
+    """ADTS header parameters for an AAC track."""
+
+    profile: int  # audio object type - 1 (1 = AAC LC)
+    sample_rate_index: int
+    channel_config: int
+
+    def header(self, payload_size: int) -> bytes:
+        """Build the 7-byte ADTS header (no CRC) for one raw AAC frame."""
+        if payload_size > _ADTS_MAX_PAYLOAD:
+            raise Mp4IndexError(f"AAC frame too large for ADTS: {payload_size} bytes")
+        n = payload_size + 7
+        return bytes(
+            (
+                0xFF,
+                0xF1,
+                (self.profile << 6) | (self.sample_rate_index << 2) | (self.channel_config >> 2),
+                ((self.channel_config & 0x3) << 6) | (n >> 11),
+                (n >> 3) & 0xFF,
+                ((n & 0x7) << 5) | 0x1F,
+                0xFC,
+            )
+        )
+
+
+def parse_audio_specific_config(config: bytes) -> AdtsConfig | None:
+    """
+    Derive ADTS parameters from an MPEG-4 AudioSpecificConfig.
+
+    Returns None when the stream cannot be expressed as ADTS (object types
+    above AAC LTP, explicit sample rates, PCE channel configurations).
+    HE-AAC (SBR/PS) is signalled as its AAC core; decoders detect SBR
+    implicitly.
+    """
+    if len(config) < 2:
+        return None
+    bits = int.from_bytes(config, "big")
+    avail = len(config) * 8
+
+    def take(n: int) -> int:
+        nonlocal avail
+        avail -= n
+        if avail < 0:
+            raise Mp4IndexError("truncated AudioSpecificConfig")
+        return (bits >> avail) & ((1 << n) - 1)
+
+    try:
+        object_type = take(5)
+        if object_type == 31:
+            object_type = 32 + take(6)
+        rate_index = take(4)
+        if rate_index == 15:
+            return None
+        channel_config = take(4)
+        if object_type in (5, 29):
+            # SBR/PS: extension rate, then the underlying (core) object type.
+            if take(4) == 15:
+                take(24)
+            object_type = take(5)
+    except Mp4IndexError:
+        return None
+
+    if (
+        not 1 <= object_type <= 4
+        or rate_index >= len(ADTS_SAMPLE_RATES)
+        or not 1 <= channel_config <= 7
+    ):
+        return None
+    return AdtsConfig(
+        profile=object_type - 1, sample_rate_index=rate_index, channel_config=channel_config
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class Mp4SeekPoint:
+    """Exact position of a sample: index, file offset and presentation time."""
+
+    sample: int
+    offset: int
+    seconds: float
+
+
+@dataclass(frozen=True, slots=True)
+class Mp4SampleIndex:
+    """
+    Sample table of the first sound track of an MP4 file.
+
+    All sample numbers are 0-based. Times are in `timescale` units unless a
+    method says seconds.
+    """
+
+    codec: str  # sample entry type: "mp4a", "alac", ...
+    timescale: int
+    duration: int
+    sample_rate: int
+    channels: int
+    decoder_config: bytes  # AudioSpecificConfig (AAC) or magic cookie (ALAC)
+    adts: AdtsConfig | None
+    sample_count: int
+    # Constant sample size from `stsz`, or 0 when `sample_sizes` holds per-sample sizes.
+    sample_size: int
+    sample_sizes: array[int]
+    chunk_offsets: array[int]
+    # (first_sample, first_chunk, samples_per_chunk) per `stsc` run.
+    chunk_runs: tuple[tuple[int, int, int], ...]
+    # (first_sample, first_time, delta) per `stts` run.
+    time_runs: tuple[tuple[int, int, int], ...]
+    # Sorted 0-based sync samples from `stss`, or None when every sample is a sync sample.
+    sync_samples: array[int] | None = None
+
+    @property
+    def seconds(self) -> float:
+        return self.duration / self.timescale if self.timescale else 0.0
+
+    def size_of(self, sample: int) -> int:
+        return self.sample_size or self.sample_sizes[sample]
+
+    def sample_time(self, sample: int) -> int:
+        """Decode time of `sample` in timescale units."""
+        i = bisect.bisect_right(self.time_runs, sample, key=lambda run: run[0]) - 1
+        first_sample, first_time, delta = self.time_runs[max(i, 0)]
+        return first_time + (sample - first_sample) * delta
+
+    def sample_at(self, seconds: float) -> int:
+        """The sample playing at `seconds` (clamped to the track)."""
+        if self.sample_count == 0:
+            return 0
+        target = max(0, int(seconds * self.timescale))
+        i = max(bisect.bisect_right(self.time_runs, target, key=lambda run: run[1]) - 1, 0)
+        first_sample, first_time, delta = self.time_runs[i]
+        sample = first_sample + ((target - first_time) // delta if delta else 0)
+        next_first = self.time_runs[i + 1][0] if i + 1 < len(self.time_runs) else self.sample_count
+        return min(sample, next_first - 1, self.sample_count - 1)
+
+    def _chunk_of(self, sample: int) -> tuple[int, int, int]:
+        """(chunk index, first sample of that chunk, samples in it) for `sample`."""
+        i = bisect.bisect_right(self.chunk_runs, sample, key=lambda run: run[0]) - 1
+        first_sample, first_chunk, per_chunk = self.chunk_runs[max(i, 0)]
+        n = (sample - first_sample) // per_chunk
+        return first_chunk + n, first_sample + n * per_chunk, per_chunk
+
+    def sample_offset(self, sample: int) -> int:
+        """File offset of `sample`."""
+        chunk, chunk_first, _ = self._chunk_of(sample)
+        offset = self.chunk_offsets[chunk]
+        if self.sample_size:
+            return offset + (sample - chunk_first) * self.sample_size
+        return offset + sum(self.sample_sizes[chunk_first:sample])
+
+    def seek(self, seconds: float) -> Mp4SeekPoint:
+        """Map a time to the sample (and byte offset) decoding should start from."""
+        sample = self.sample_at(seconds)
+        if self.sync_samples is not None and len(self.sync_samples):
+            i = bisect.bisect_right(self.sync_samples, sample) - 1
+            sample = self.sync_samples[max(i, 0)]
+        return Mp4SeekPoint(
+            sample=sample,
+            offset=self.sample_offset(sample),
+            seconds=self.sample_time(sample) / self.timescale if self.timescale else 0.0,
+        )
+
+    def iter_runs(self, start: int = 0, end: int | None = None) -> Iterator[tuple[int, list[int]]]:
+        """
+        Yield (file offset, sample sizes) for contiguous runs of samples.
+
+        Each run is (part of) one chunk, so it can be read with a single read.
+        """
+        end = self.sample_count if end is None else min(end, self.sample_count)
+        sample = start
+        while sample < end:
+            _, chunk_first, per_chunk = self._chunk_of(sample)
+            chunk_last = min(chunk_first + per_chunk, end)
+            sizes = (
+                [self.sample_size] * (chunk_last - sample)
+                if self.sample_size
+                else self.sample_sizes[sample:chunk_last].tolist()
+            )
+            yield self.sample_offset(sample), sizes
+            sample = chunk_last
+
+
+# --- Parsing ------------------------------------------------------------------
+
+
+def _boxes(data: bytes | memoryview, start: int, end: int) -> Iterator[tuple[bytes, int, int]]:
+    """Yield (type, payload start, payload end) for the boxes in data[start:end]."""
+    pos = start
+    while pos + 8 <= end:
+        size, kind = _BOX_HEADER.unpack_from(data, pos)
+        header = 8
+        if size == 1:
+            (size,) = _U64.unpack_from(data, pos + 8)
+            header = 16
+        elif size == 0:
+            size = end - pos
+        if size < header or pos + size > end:
+            raise Mp4IndexError(f"corrupt {kind!r} box")
+        yield kind, pos + header, pos + size
+        pos += size
+
+
+def _child(data: bytes | memoryview, start: int, end: int, kind: bytes) -> tuple[int, int] | None:
+    for k, s, e in _boxes(data, start, end):
+        if k == kind:
+            return s, e
+    return None
+
+
+def _require(data: bytes | memoryview, start: int, end: int, *path: bytes) -> tuple[int, int]:
+    for kind in path:
+        found = _child(data, start, end, kind)
+        if found is None:
+            raise Mp4IndexError(f"missing {kind.decode('latin-1')} box")
+        start, end = found
+    return start, end
+
+
+def _read_moov(f: BinaryIO) -> bytes:
+    """Read the `moov` box payload by walking top-level box headers."""
+    f.seek(0, 2)
+    file_size = f.tell()
+    pos = 0
+    while pos + 8 <= file_size:
+        f.seek(pos)
+        header = f.read(16)
+        size, kind = _BOX_HEADER.unpack_from(header, 0)
+        header_size = 8
+        if size == 1:
+            if len(header) < 16:
+                raise Mp4IndexError(f"truncated {kind!r} box header")
+            (size,) = _U64.unpack_from(header, 8)
+            header_size = 16
+        elif size == 0:
+            size = file_size - pos
+        if size < header_size:
+            break
+        if kind == b"moov":
+            f.seek(pos + header_size)
+            return f.read(size - header_size)
+        pos += size
+    raise Mp4IndexError("no moov box")
+
+
+def _descriptor(data: bytes | memoryview, pos: int) -> tuple[int, int, int]:
+    """Parse an MPEG-4 descriptor header: (tag, payload start, payload end)."""
+    tag = data[pos]
+    pos += 1
+    length = 0
+    for _ in range(4):
+        b = data[pos]
+        pos += 1
+        length = (length << 7) | (b & 0x7F)
+        if not b & 0x80:
+            break
+    return tag, pos, pos + length
+
+
+def _esds_config(data: bytes | memoryview, start: int, end: int) -> bytes:
+    """Extract DecoderSpecificInfo (the AudioSpecificConfig) from an `esds` payload."""
+    pos = start + 4  # version/flags
+    tag, pos, es_end = _descriptor(data, pos)
+    if tag != 0x03:
+        raise Mp4IndexError("esds without ES_Descriptor")
+    flags = data[pos + 2]
+    pos += 3
+    if flags & 0x80:
+        pos += 2
+    if flags & 0x40:
+        pos += 1 + data[pos]
+    if flags & 0x20:
+        pos += 2
+    while pos < min(es_end, end):
+        tag, payload, payload_end = _descriptor(data, pos)
+        if tag == 0x04:
+            pos = payload + 13
+            continue
+        if tag == 0x05:
+            return bytes(data[payload:payload_end])
+        pos = payload_end
+    return b""
+
+
+def _be_array(typecode: str, data: bytes | memoryview, pos: int, count: int) -> array[int]:
+    """Read `count` big-endian unsigned integers into a native array."""
+    values = array(typecode)
+    values.frombytes(data[pos : pos + values.itemsize * count])
+    if sys.byteorder == "little":
+        values.byteswap()
+    return values
+
+
+def _parse_sound_track(data: memoryview, trak: tuple[int, int]) -> Mp4SampleIndex | None:
+    mdia = _require(data, *trak, b"mdia")
+    hdlr = _require(data, *mdia, b"hdlr")
+    if bytes(data[hdlr[0] + 8 : hdlr[0] + 12]) != b"soun":
+        return None
+
+    mdhd_start, _ = _require(data, *mdia, b"mdhd")
+    if data[mdhd_start] == 1:
+        timescale = _U32.unpack_from(data, mdhd_start + 20)[0]
+        duration = _U64.unpack_from(data, mdhd_start + 24)[0]
+    else:
+        timescale, duration = struct.unpack_from(">II", data, mdhd_start + 12)
+
+    stbl = _require(data, *mdia, b"minf", b"stbl")
+
+    # Sample description: codec, channels, rate and decoder config.
+    stsd_start, stsd_end = _require(data, *stbl, b"stsd")
+    entry = next(_boxes(data, stsd_start + 8, stsd_end), None)
+    if entry is None:
+        raise Mp4IndexError("empty stsd")
+    codec_raw, entry_start, entry_end = entry
+    codec = codec_raw.decode("latin-1")
+    version, _, _, channels, _, _, _, rate = struct.unpack_from(">HHIHHHHI", data, entry_start + 8)
+    children = entry_start + 28 + {1: 16, 2: 36}.get(version, 0)
+    decoder_config = b""
+    adts: AdtsConfig | None = None
+    if codec == "mp4a":
+        esds = _child(data, children, entry_end, b"esds")
+        if esds is not None:
+            decoder_config = _esds_config(data, *esds)
+            adts = parse_audio_specific_config(decoder_config)
+    elif codec == "alac":
+        cookie = _child(data, children, entry_end, b"alac")
+        if cookie is not None:
+            decoder_config = bytes(data[cookie[0] : cookie[1]])
+
+    # Time-to-sample runs.
+    stts_start, _ = _require(data, *stbl, b"stts")
+    (count,) = _U32.unpack_from(data, stts_start + 4)
+    time_runs: list[tuple[int, int, int]] = []
+    first_sample = first_time = 0
+    for i in range(count):
+        n, delta = struct.unpack_from(">II", data, stts_start + 8 + i * 8)
+        time_runs.append((first_sample, first_time, delta))
+        first_sample += n
+        first_time += n * delta
+
+    # Sample sizes.
+    stsz = _child(data, *stbl, b"stsz")
+    if stsz is not None:
+        sample_size, sample_count = struct.unpack_from(">II", data, stsz[0] + 4)
+        sizes = _be_array("I", data, stsz[0] + 12, sample_count) if not sample_size else array("I")
+    else:
+        stz2_start, _ = _require(data, *stbl, b"stz2")
+        field_size = data[stz2_start + 7]
+        (sample_count,) = _U32.unpack_from(data, stz2_start + 8)
+        sample_size = 0
+        pos = stz2_start + 12
+        if field_size == 16:
+            sizes = array("I", _be_array("H", data, pos, sample_count))
+        elif field_size == 8:
+            sizes = array("I", data[pos : pos + sample_count])
+        else:  # 4-bit fields, two per byte
+            packed = data[pos : pos + (sample_count + 1) // 2]
+            sizes = array("I", (b >> s & 0xF for b in packed for s in (4, 0)))[:sample_count]
+    if not sample_size and len(sizes) != sample_count:
+        raise Mp4IndexError("truncated stsz")
+
+    # Chunk offsets.
+    stco = _child(data, *stbl, b"stco")
+    if stco is not None:
+        (chunk_count,) = _U32.unpack_from(data, stco[0] + 4)
+        offsets = array("Q", _be_array("I", data, stco[0] + 8, chunk_count))
+    else:
+        co64_start, _ = _require(data, *stbl, b"co64")
+        (chunk_count,) = _U32.unpack_from(data, co64_start + 4)
+        offsets = _be_array("Q", data, co64_start + 8, chunk_count)
+    if len(offsets) != chunk_count:
+        raise Mp4IndexError("truncated chunk offset table")
+
+    # Sample-to-chunk runs (1-based chunks in the file).
+    stsc_start, _ = _require(data, *stbl, b"stsc")
+    (count,) = _U32.unpack_from(data, stsc_start + 4)
+    entries = [struct.unpack_from(">III", data, stsc_start + 8 + i * 12)[:2] for i in range(count)]
+    chunk_runs: list[tuple[int, int, int]] = []
+    first_sample = 0
+    for i, (first_chunk, per_chunk) in enumerate(entries):
+        next_chunk = entries[i + 1][0] if i + 1 < len(entries) else chunk_count + 1
+        if per_chunk == 0:
+            continue
+        chunk_runs.append((first_sample, first_chunk - 1, per_chunk))
+        first_sample += (next_chunk - first_chunk) * per_chunk
+    if not chunk_runs and sample_count:
+        raise Mp4IndexError("empty stsc")
+
+    # Sync samples (rare for audio; absent means all samples are sync samples).
+    sync: array[int] | None = None
+    stss = _child(data, *stbl, b"stss")
+    if stss is not None:
+        (count,) = _U32.unpack_from(data, stss[0] + 4)
+        sync = array("I", (s - 1 for s in _be_array("I", data, stss[0] + 8, count)))
+
+    return Mp4SampleIndex(
+        codec=codec,
+        timescale=timescale,
+        duration=duration,
+        sample_rate=rate >> 16,
+        channels=channels,
+        decoder_config=decoder_config,
+        adts=adts,
+        sample_count=sample_count,
+        sample_size=sample_size,
+        sample_sizes=sizes,
+        chunk_offsets=offsets,
+        chunk_runs=tuple(chunk_runs),
+        time_runs=tuple(time_runs),
+        sync_samples=sync,
+    )
+
+
+def build_sample_index(path: Path) -> Mp4SampleIndex:
+    """
+    Parse the sample table of the first sound track in `path`.
+
+    Raises:
+        Mp4IndexError: If the file is not an MP4 with a usable sound track.
+        OSError: If the file cannot be read.
+    """
+    with path.open("rb") as f:
+        moov = memoryview(_read_moov(f))
+    try:
+        for kind, start, end in _boxes(moov, 0, len(moov)):
+            if kind == b"trak":
+                index = _parse_sound_track(moov, (start, end))
+                if index is not None:
+                    return index
+    except Mp4IndexError:
+        raise
+    except (struct.error, IndexError, ValueError) as e:
+        raise Mp4IndexError(f"corrupt sample table: {e}") from e
+    raise Mp4IndexError("no sound track")
+
+
+_cache: OrderedDict[tuple[str, int, int], Mp4SampleIndex] = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def load_sample_index(path: Path) -> Mp4SampleIndex:
+    """Return the (cached) sample index for `path`; blocking."""
+    st = path.stat()
+    key = (str(path), st.st_size, st.st_mtime_ns)
+    with _cache_lock:
+        index = _cache.get(key)
+        if index is not None:
+            _cache.move_to_end(key)
+            return index
+    index = build_sample_index(path)
+    with _cache_lock:
+        _cache[key] = index
+        _cache.move_to_end(key)
+        while len(_cache) > INDEX_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return index
+
+
+async def get_sample_index(path: Path) -> Mp4SampleIndex | None:
+    """
+    Return the sample index for an MP4-family file, or None.
+
+    None means "not indexable" (not an MP4, corrupt table, unreadable file);
+    callers then fall back to decoder-side seeking.
+    """
+    if path.suffix.lower() not in MP4_SUFFIXES:
+        return None
+    try:
+        return await asyncio.to_thread(load_sample_index, path)
+    except (Mp4IndexError, OSError) as e:
+        logger.debug("No MP4 sample index for %s: %s", path.name, e)
+        return None
+
+
+def clear_sample_index_cache() -> None:
+    with _cache_lock:
+        _cache.clear()
+
+
+def iter_adts(
+    path: Path,
+    index: Mp4SampleIndex,
+    start_sample: int = 0,
+    end_sample: int | None = None,
+    *,
+    chunk_size: int = 65536,
+) -> Generator[bytes, None, None]:
+    """
+    Yield the AAC samples of `index` framed as an ADTS stream.
+
+    Blocking (file reads); batches frames into roughly `chunk_size` pieces.
+    """
+    adts = index.adts
+    if adts is None:
+        raise Mp4IndexError(f"{index.codec} track cannot be framed as ADTS")
+    out = bytearray()
+    with path.open("rb") as f:
+        for offset, sizes in index.iter_runs(start_sample, end_sample):
+            f.seek(offset)
+            data = f.read(sum(sizes))
+            pos = 0
+            for size in sizes:
+                out += adts.header(size)
+                out += data[pos : pos + size]
+                pos += size
+            if len(data) < pos:
+                raise Mp4IndexError("sample data beyond end of file")
+            if len(out) >= chunk_size:
+                yield bytes(out)
+                out.clear()
+    if out:
+        yield bytes(out)
@@ -15,18 +15,36 @@ Design goals:
 - Keep policy decisions small, explicit, and easy to reason about.
 - Prefer "safety first" behavior for unknown formats/devices.
 - Avoid importing heavy modules at import time (FastAPI, etc.).
+
+Stream modes:
+- DIRECT: the file is served as-is.
+- TRANSCODE: an external decoder/encoder pipeline (legacy.conf) produces MP3.
+- REMUX: AAC frames are copied out of the MP4 sample table as ADTS, no decoding.
+  Chosen per device tier (`remux_formats` in devices.toml) and only for files
+  whose track can actually be framed as ADTS (`remuxable`).
 """
 
 from __future__ import annotations
 
 from dataclasses import dataclass
+from enum import Enum
 from typing import TYPE_CHECKING, AbstractSet
 
 if TYPE_CHECKING:
     # Keep runtime imports minimal; accept both enum and string.
+    from pathlib import Path
+
     from resonance.player.client import DeviceType
 
 
+class StreamMode(Enum):
+    """How the HTTP route serves a file."""
+
+    DIRECT = "direct"
+    TRANSCODE = "transcode"
+    REMUX = "remux"
+
+
 @dataclass(frozen=True, slots=True)
 class StreamingPolicy:
     """
@@ -74,6 +92,11 @@ class StreamingPolicy:
     # targets MP3 here for fast start and broad player compatibility.
     TRANSCODE_TARGET_FORMAT: str = "mp3"
 
+    # MP4 containers that may carry AAC we can remux to ADTS, and what the
+    # player is told to expect in that case.
+    REMUX_FORMATS: AbstractSet[str] = frozenset({"m4a", "m4b", "mp4", "m4r"})
+    REMUX_TARGET_FORMAT: str = "aac"
+
 
 DEFAULT_POLICY = StreamingPolicy()
 
@@ -137,18 +160,93 @@ def needs_transcoding(
     return device_config.needs_transcoding(device_type or "unknown", fmt)
 
 
+def can_remux(
+    format_hint: str | None,
+    device_type: DeviceType | str | None,
+    *,
+    policy: StreamingPolicy = DEFAULT_POLICY,
+) -> bool:
+    """
+    Return True if the device tier accepts this container remuxed to ADTS.
+
+    This does not look at the file; see `resolve_stream_mode()`.
+    """
+    fmt = normalize_format(format_hint)
+    if fmt not in policy.REMUX_FORMATS:
+        return False
+
+    from resonance.config import get_device_config
+
+    return get_device_config().can_remux(device_type or "unknown", fmt)
+
+
+def stream_mode(
+    format_hint: str | None,
+    device_type: DeviceType | str | None,
+    *,
+    remuxable: bool = False,
+    policy: StreamingPolicy = DEFAULT_POLICY,
+) -> StreamMode:
+    """
+    Decide how a file is streamed.
+
+    Args:
+        format_hint: File extension or format name.
+        device_type: Player device type (None = unknown).
+        remuxable: The file's audio track can be framed as ADTS (AAC with an
+            ADTS-compatible AudioSpecificConfig). Callers that have not
+            inspected the file leave this False and never get REMUX.
+        policy: Policy constants.
+
+    REMUX only replaces TRANSCODE: a device that plays the container natively
+    keeps getting the file as-is.
+    """
+    if not needs_transcoding(format_hint, device_type, policy=policy):
+        return StreamMode.DIRECT
+    if remuxable and can_remux(format_hint, device_type, policy=policy):
+        return StreamMode.REMUX
+    return StreamMode.TRANSCODE
+
+
+async def resolve_stream_mode(
+    file_path: Path,
+    device_type: DeviceType | str | None,
+    *,
+    policy: StreamingPolicy = DEFAULT_POLICY,
+) -> StreamMode:
+    """
+    Decide how `file_path` is streamed to a device, inspecting the file if needed.
+
+    The MP4 sample table is only parsed when the device tier allows remuxing;
+    it is cached, so the `strm` decision and the HTTP route share one parse.
+    """
+    remuxable = False
+    if needs_transcoding(file_path.suffix, device_type, policy=policy) and can_remux(
+        file_path.suffix, device_type, policy=policy
+    ):
+        from resonance.streaming.mp4index import get_sample_index
+
+        index = await get_sample_index(file_path)
+        remuxable = index is not None and index.adts is not None
+    return stream_mode(file_path.suffix, device_type, remuxable=remuxable, policy=policy)
+
+
 def strm_expected_format_hint(
     source_format_hint: str | None,
     device_type: "DeviceType | str | None",
     *,
+    remuxable: bool = False,
     policy: StreamingPolicy = DEFAULT_POLICY,
 ) -> str:
     """
     Return the *format hint* that should be signaled in the Slimproto `strm` frame.
 
     If the HTTP route will transcode, the player must be told to expect the
-    transcoded output format (currently MP3).
+    transcoded output format (currently MP3); if it will remux, ADTS AAC.
     """
-    if needs_transcoding(source_format_hint, device_type, policy=policy):
+    mode = stream_mode(source_format_hint, device_type, remuxable=remuxable, policy=policy)
+    if mode is StreamMode.REMUX:
+        return policy.REMUX_TARGET_FORMAT
+    if mode is StreamMode.TRANSCODE:
         return policy.TRANSCODE_TARGET_FORMAT
     return normalize_format(source_format_hint) or "mp3"
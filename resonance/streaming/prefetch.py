@@ -0,0 +1,292 @@
+"""
+Next-track prefetch for gapless track changes.
+
+Without prefetching, a track change costs: STMu -> resolve next track -> start
+the transcoder (faad/lame start-up, container parsing) -> fill the player's
+buffer threshold. For transcoded formats that is an audible gap.
+
+Near the end of a track we therefore resolve the next playlist entry, start
+its stream exactly as the HTTP route would (transcode, remux or direct read)
+and keep the first part of the output in memory. When the player asks for
+`/stream.mp3` after the track change, the route hands out the warm buffer
+immediately and continues with the already running source.
+
+Design:
+- At most one warm stream per player; a different next track (playlist edit,
+  manual jump, seek) discards it.
+- The filler stops at `WARM_BUFFER_BYTES`; the source itself is left paused
+  (async generators only run when pulled), so a prefetched transcoder blocks
+  on a full pipe instead of burning CPU.
+- Only plain from-the-start requests are served warm; seeks and byte ranges
+  go through the normal route.
+- Prefetch transcodes run at PREFETCH priority: with no spare transcoder
+  capacity the warm stream fails fast and is dropped, and the track is
+  transcoded on demand when it starts.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+from collections import deque
+from typing import TYPE_CHECKING
+
+from resonance.streaming.policy import StreamMode, resolve_stream_mode
+from resonance.streaming.scheduler import TranscodePriority
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Callable
+    from pathlib import Path
+
+    from resonance.player.client import DeviceType
+
+logger = logging.getLogger(__name__)
+
+# Start prefetching when this many seconds of the current track remain.
+PREFETCH_LEAD_SECONDS = 15.0
+
+# Output kept in memory per warm stream (~1 minute of 128 kbit/s MP3).
+WARM_BUFFER_BYTES = 1024 * 1024
+
+# Read size for direct (non-transcoded) files.
+_READ_SIZE = 65536
+
+
+class WarmStream:
+    """
+    A started stream with its first bytes buffered in memory.
+
+    `stream()` yields the buffered chunks, waits for an in-flight fill to
+    finish and then continues pulling from the source.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        mode: StreamMode,
+        media_type: str,
+        headers: dict[str, str],
+        source: AsyncIterator[bytes],
+        *,
+        limit: int = WARM_BUFFER_BYTES,
+    ) -> None:
+        self.path = path
+        self.mode = mode
+        self.media_type = media_type
+        self.headers = headers
+        self._source = source
+        self._limit = limit
+        self._chunks: deque[bytes] = deque()
+        self._buffered = 0
+        self._exhausted = False
+        self._failed = False
+        self._taken = False
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._fill())
+
+    @property
+    def buffered(self) -> int:
+        """Bytes currently held in memory."""
+        return self._buffered
+
+    @property
+    def failed(self) -> bool:
+        """True if the source raised before anything was served."""
+        return self._failed
+
+    @property
+    def filled(self) -> bool:
+        """True once the buffer is full or the source ended."""
+        return self._task.done()
+
+    async def _fill(self) -> None:
+        try:
+            while not self._taken and self._buffered < self._limit:
+                try:
+                    chunk = await anext(self._source)
+                except StopAsyncIteration:
+                    self._exhausted = True
+                    return
+                self._chunks.append(chunk)
+                self._buffered += len(chunk)
+                self._wakeup.set()
+        except Exception as e:
+            self._exhausted = True
+            self._failed = True
+            logger.warning("Prefetch of %s failed: %s", self.path.name, e)
+        finally:
+            self._wakeup.set()
+
+    async def stream(self) -> AsyncIterator[bytes]:
+        """Yield the whole stream: buffered prefix first, then the live source."""
+        self._taken = True
+        while True:
+            while self._chunks:
+                chunk = self._chunks.popleft()
+                self._buffered -= len(chunk)
+                yield chunk
+            if self._task.done():
+                break
+            self._wakeup.clear()
+            await self._wakeup.wait()
+        if not self._exhausted:
+            async for chunk in self._source:
+                yield chunk
+
+    async def aclose(self) -> None:
+        """Stop filling and release the source (terminates a transcoder)."""
+        if not self._task.done():
+            self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError, Exception):
+            await self._task
+        aclose = getattr(self._source, "aclose", None)
+        if aclose is not None:
+            with contextlib.suppress(Exception):
+                await aclose()
+        self._chunks.clear()
+        self._buffered = 0
+
+
+async def _read_file(path: Path) -> AsyncIterator[bytes]:
+    with path.open("rb") as f:
+        while chunk := await asyncio.to_thread(f.read, _READ_SIZE):
+            yield chunk
+
+
+async def _remux_source(path: Path) -> AsyncIterator[bytes] | None:
+    from resonance.streaming.mp4index import get_sample_index, iter_adts
+
+    index = await get_sample_index(path)
+    if index is None or index.adts is None:
+        return None
+    frames = iter_adts(path, index)
+
+    async def source() -> AsyncIterator[bytes]:
+        while (chunk := await asyncio.to_thread(next, frames, None)) is not None:
+            yield chunk
+
+    return source()
+
+
+class StreamPrefetcher:
+    """
+    Per-player warm streams for the upcoming track.
+
+    Args:
+        content_type: Maps a file to its MIME type for direct streams.
+    """
+
+    def __init__(self, content_type: Callable[[Path], str]) -> None:
+        self._content_type = content_type
+        self._warm: dict[str, WarmStream] = {}
+        self._pending: set[str] = set()
+        self._closing: set[asyncio.Task[None]] = set()
+
+    def __len__(self) -> int:
+        return len(self._warm)
+
+    def is_prefetched(self, player_mac: str, path: Path) -> bool:
+        """True if a warm stream for `path` exists or is being started."""
+        warm = self._warm.get(player_mac)
+        return player_mac in self._pending or (warm is not None and warm.path == path)
+
+    async def prefetch(
+        self,
+        player_mac: str,
+        path: Path,
+        device_type: DeviceType | str | None,
+    ) -> WarmStream | None:
+        """
+        Start the stream for `path` and buffer its beginning.
+
+        Returns the warm stream, or None if the file cannot be prefetched
+        (missing file, no transcoding rule).
+        """
+        if self.is_prefetched(player_mac, path):
+            return self._warm.get(player_mac)
+        self.discard(player_mac)
+        self._pending.add(player_mac)
+        try:
+            warm = await self._start(player_mac, path, device_type)
+        finally:
+            self._pending.discard(player_mac)
+        if warm is not None:
+            self._warm[player_mac] = warm
+            logger.info(
+                "Prefetching next track for player %s: %s (%s)",
+                player_mac,
+                path.name,
+                warm.mode.value,
+            )
+        return warm
+
+    async def _start(
+        self,
+        player_mac: str,
+        path: Path,
+        device_type: DeviceType | str | None,
+    ) -> WarmStream | None:
+        try:
+            size = path.stat().st_size
+        except OSError:
+            return None
+
+        mode = await resolve_stream_mode(path, device_type)
+        if mode is StreamMode.REMUX:
+            source = await _remux_source(path)
+            if source is None:
+                return None
+            headers = {"Accept-Ranges": "none", "X-Content-Type-Options": "nosniff"}
+            return WarmStream(path, mode, "audio/aac", headers, source)
+
+        if mode is StreamMode.TRANSCODE:
+            from resonance.streaming.transcoder import get_transcode_config, transcode_stream
+
+            rule = get_transcode_config().find_rule(path.suffix.lower().lstrip("."))
+            if rule is None or rule.is_passthrough():
+                return None
+            headers = {"Accept-Ranges": "none", "X-Content-Type-Options": "nosniff"}
+            source = transcode_stream(
+                path, rule, player_mac=player_mac, priority=TranscodePriority.PREFETCH
+            )
+            return WarmStream(path, mode, "audio/mpeg", headers, source)
+
+        headers = {"Content-Length": str(size), "Accept-Ranges": "bytes"}
+        return WarmStream(
+            path,
+            mode,
+            self._content_type(path),
+            headers,
+            _read_file(path),
+            limit=min(WARM_BUFFER_BYTES // 4, size),
+        )
+
+    def take(self, player_mac: str, path: Path) -> WarmStream | None:
+        """Hand out the warm stream for `path`; other entries stay untouched."""
+        warm = self._warm.get(player_mac)
+        if warm is None or warm.path != path:
+            return None
+        if warm.failed:
+            self.discard(player_mac)
+            return None
+        del self._warm[player_mac]
+        return warm
+
+    def discard(self, player_mac: str, *, keep: Path | None = None) -> None:
+        """Drop the player's warm stream (unless it is for `keep`)."""
+        warm = self._warm.get(player_mac)
+        if warm is None or warm.path == keep:
+            return
+        del self._warm[player_mac]
+        task = asyncio.get_running_loop().create_task(warm.aclose())
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    async def close(self) -> None:
+        """Release every warm stream."""
+        warm, self._warm = list(self._warm.values()), {}
+        for stream in warm:
+            await stream.aclose()
+        if self._closing:
+            await asyncio.gather(*self._closing, return_exceptions=True)
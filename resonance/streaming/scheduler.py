@@ -0,0 +1,374 @@
+"""
+Transcode scheduler: concurrency budget, fairness and warm helper processes.
+
+Every transcoded stream or seek starts a decoder/encoder pipeline. Without a
+limit, several users scrubbing at once can fork dozens of faad/lame/ffmpeg
+processes and push the host into swap. All pipelines started by
+`transcode_stream` therefore run inside a scheduler slot.
+
+Design:
+- Global budget (`max_concurrent`, default: CPU count, at least 2). Callers
+  beyond the budget wait in a queue; a cancelled waiter (client disconnect,
+  newer seek) simply leaves the queue.
+- Per-player fairness: a player holds at most `per_player` slots, and a freed
+  slot goes to the waiting player with the fewest running pipelines (FIFO
+  among equals), so one scrubbing player cannot starve the others.
+- Playback beats prefetch: prefetch never waits and only uses spare capacity
+  above `prefetch_reserve`; when there is none it fails fast with
+  `TranscodeBusyError` and the next track is transcoded on demand instead.
+- Warm helpers: rules that read the source from stdin (capability ``I``) have
+  an argv that does not depend on the file, so a started pipeline can be
+  parked idle and handed to the next stream with the same command. Idle
+  helpers block on stdin and cost no CPU; the pool is small and LRU-bounded.
+
+Notes:
+- The scheduler is a process-wide singleton (`get_transcode_scheduler`),
+  like the seek coordinator; `stats()` feeds the status API and /metrics.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import os
+import subprocess
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import TYPE_CHECKING, Any
+
+from resonance.core.metrics import Counter, Gauge, Metric, metrics
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Callable
+
+logger = logging.getLogger(__name__)
+
+SPAWN_SECONDS = metrics.histogram(
+    "resonance_transcode_spawn_seconds",
+    "Time to start (or take a warm helper for) a transcode pipeline.",
+)
+
+# Slots one player may hold at once (playing stream, prefetch, a seek overlap).
+DEFAULT_PER_PLAYER = 3
+
+# Slots prefetch must leave free for playback.
+DEFAULT_PREFETCH_RESERVE = 1
+
+# Idle warm helper pipelines kept across all commands.
+DEFAULT_HELPER_POOL_SIZE = 2
+
+Pipeline = list[subprocess.Popen[bytes]]
+HelperKey = tuple[tuple[str, ...], ...]
+
+
+class TranscodePriority(IntEnum):
+    """Why a pipeline is started; lower values win."""
+
+    PLAYBACK = 0
+    PREFETCH = 1
+
+
+class TranscodeBusyError(RuntimeError):
+    """No capacity for a low-priority transcode right now."""
+
+
+@dataclass(slots=True)
+class _Waiter:
+    player: str
+    seq: int
+    future: asyncio.Future[None]
+
+
+@dataclass(slots=True)
+class _Latency:
+    """Running count/mean/max of a duration in seconds."""
+
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def as_dict(self) -> dict[str, float | int]:
+        mean = self.total / self.count if self.count else 0.0
+        return {
+            "count": self.count,
+            "mean_ms": round(mean * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+def _kill_pipeline(procs: Pipeline, *, reap: bool = False) -> None:
+    for p in procs:
+        for pipe in (p.stdin, p.stdout, p.stderr):
+            if pipe is not None:
+                with contextlib.suppress(Exception):
+                    pipe.close()
+    for p in reversed(procs):
+        if p.poll() is None:
+            with contextlib.suppress(Exception):
+                p.kill()
+    if reap:
+        for p in procs:
+            with contextlib.suppress(Exception):
+                p.wait(timeout=1.0)
+
+
+class HelperPool:
+    """
+    Idle, already started pipelines keyed by their exact argv.
+
+    Args:
+        size: Maximum number of idle pipelines kept (0 disables the pool).
+    """
+
+    def __init__(self, size: int = DEFAULT_HELPER_POOL_SIZE) -> None:
+        self.size = size
+        self._idle: OrderedDict[HelperKey, Pipeline] = OrderedDict()
+        self._spawning: set[HelperKey] = set()
+        self._tasks: set[asyncio.Task[None]] = set()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._idle)
+
+    def take(self, key: HelperKey) -> Pipeline | None:
+        """Return an idle pipeline for `key`, or None if none is ready."""
+        procs = self._idle.pop(key, None)
+        if procs is not None and any(p.poll() is not None for p in procs):
+            _kill_pipeline(procs)
+            procs = None
+        if procs is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return procs
+
+    def replenish(self, key: HelperKey, spawn: Callable[[], Pipeline]) -> None:
+        """Start a replacement helper for `key` in the background."""
+        if self.size <= 0 or key in self._idle or key in self._spawning:
+            return
+        self._spawning.add(key)
+        task = asyncio.get_running_loop().create_task(self._spawn(key, spawn))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _spawn(self, key: HelperKey, spawn: Callable[[], Pipeline]) -> None:
+        try:
+            procs = await asyncio.to_thread(spawn)
+        except Exception as e:
+            logger.debug("Warm transcode helper failed to start: %s", e)
+            return
+        finally:
+            self._spawning.discard(key)
+        self._idle[key] = procs
+        self._idle.move_to_end(key)
+        while len(self._idle) > self.size:
+            _, old = self._idle.popitem(last=False)
+            _kill_pipeline(old)
+
+    async def close(self) -> None:
+        """Stop background spawns and kill every idle helper."""
+        for task in list(self._tasks):
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        while self._idle:
+            _, procs = self._idle.popitem()
+            await asyncio.to_thread(_kill_pipeline, procs, reap=True)
+
+
+@dataclass
+class TranscodeScheduler:
+    """
+    Admission control for transcode pipelines.
+
+    Usage:
+        async with scheduler.slot(player_mac, TranscodePriority.PLAYBACK):
+            ...  # start and drain the pipeline
+    """
+
+    max_concurrent: int = field(default_factory=lambda: max(2, os.cpu_count() or 2))
+    per_player: int = DEFAULT_PER_PLAYER
+    prefetch_reserve: int = DEFAULT_PREFETCH_RESERVE
+    helpers: HelperPool = field(default_factory=HelperPool)
+
+    _active: dict[str, int] = field(default_factory=dict, init=False, repr=False)
+    _running: int = field(default=0, init=False, repr=False)
+    _waiters: list[_Waiter] = field(default_factory=list, init=False, repr=False)
+    _seq: int = field(default=0, init=False, repr=False)
+    _started: int = field(default=0, init=False, repr=False)
+    _rejected: int = field(default=0, init=False, repr=False)
+    _wait: _Latency = field(default_factory=_Latency, init=False, repr=False)
+    _spawn: _Latency = field(default_factory=_Latency, init=False, repr=False)
+
+    @property
+    def running(self) -> int:
+        """Pipelines currently holding a slot."""
+        return self._running
+
+    @property
+    def queued(self) -> int:
+        """Callers waiting for a slot."""
+        return len(self._waiters)
+
+    def _has_room(self, player: str, priority: TranscodePriority) -> bool:
+        if self._active.get(player, 0) >= self.per_player:
+            return False
+        limit = self.max_concurrent
+        if priority is TranscodePriority.PREFETCH:
+            limit -= self.prefetch_reserve
+        return self._running < limit
+
+    def _take(self, player: str) -> None:
+        self._running += 1
+        self._active[player] = self._active.get(player, 0) + 1
+        self._started += 1
+
+    def _release(self, player: str) -> None:
+        self._running -= 1
+        count = self._active.get(player, 0) - 1
+        if count > 0:
+            self._active[player] = count
+        else:
+            self._active.pop(player, None)
+        self._grant()
+
+    def _grant(self) -> None:
+        """Hand free slots to waiters, least-served player first."""
+        while self._waiters and self._running < self.max_concurrent:
+            eligible = [w for w in self._waiters if self._active.get(w.player, 0) < self.per_player]
+            if not eligible:
+                return
+            waiter = min(eligible, key=lambda w: (self._active.get(w.player, 0), w.seq))
+            self._waiters.remove(waiter)
+            self._take(waiter.player)
+            waiter.future.set_result(None)
+
+    @contextlib.asynccontextmanager
+    async def slot(
+        self,
+        player_mac: str | None,
+        priority: TranscodePriority = TranscodePriority.PLAYBACK,
+    ) -> AsyncIterator[None]:
+        """
+        Hold one pipeline slot for the duration of the block.
+
+        Raises:
+            TranscodeBusyError: For PREFETCH when no spare capacity is free.
+        """
+        player = player_mac or ""
+        started = time.perf_counter()
+        if not self._waiters and self._has_room(player, priority):
+            self._take(player)
+        elif priority is TranscodePriority.PREFETCH:
+            self._rejected += 1
+            raise TranscodeBusyError("No spare transcode capacity for prefetch")
+        else:
+            self._seq += 1
+            waiter = _Waiter(player, self._seq, asyncio.get_running_loop().create_future())
+            self._waiters.append(waiter)
+            self._grant()
+            logger.debug(
+                "Transcode for player %s queued (%d running, %d waiting)",
+                player_mac,
+                self._running,
+                len(self._waiters),
+            )
+            try:
+                await waiter.future
+            except asyncio.CancelledError:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                elif waiter.future.done() and not waiter.future.cancelled():
+                    # Granted just before the cancellation landed: give it back.
+                    self._release(player)
+                raise
+        self._wait.add(time.perf_counter() - started)
+        try:
+            yield
+        finally:
+            self._release(player)
+
+    def record_spawn(self, seconds: float) -> None:
+        """Record how long starting a pipeline took."""
+        self._spawn.add(seconds)
+        SPAWN_SECONDS.observe(seconds)
+
+    def stats(self) -> dict[str, Any]:
+        """Snapshot for the status API and metrics."""
+        return {
+            "max_concurrent": self.max_concurrent,
+            "running": self._running,
+            "queued": len(self._waiters),
+            "players": len(self._active),
+            "started_total": self._started,
+            "prefetch_rejected_total": self._rejected,
+            "wait": self._wait.as_dict(),
+            "spawn": self._spawn.as_dict(),
+            "helpers": {
+                "idle": len(self.helpers),
+                "hits": self.helpers.hits,
+                "misses": self.helpers.misses,
+            },
+        }
+
+    async def close(self) -> None:
+        """Release pooled helpers (running pipelines end with their streams)."""
+        await self.helpers.close()
+
+
+_scheduler: TranscodeScheduler | None = None
+
+
+def get_transcode_scheduler() -> TranscodeScheduler:
+    """Get the process-wide scheduler (created on first use)."""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = TranscodeScheduler()
+    return _scheduler
+
+
+def set_transcode_scheduler(scheduler: TranscodeScheduler | None) -> None:
+    """Replace the process-wide scheduler (tests, custom budgets)."""
+    global _scheduler
+    _scheduler = scheduler
+
+
+def _collect_metrics() -> list[Metric]:
+    """Scrape-time view of the current scheduler's `stats()` for /metrics."""
+    stats = get_transcode_scheduler().stats()
+    families: list[Metric] = []
+    for name, help, value in (
+        ("running", "Transcode pipelines holding a slot.", stats["running"]),
+        ("queued", "Transcode requests waiting for a slot.", stats["queued"]),
+        ("max_concurrent", "Transcode slot budget.", stats["max_concurrent"]),
+        ("helpers_idle", "Warm helper pipelines parked idle.", stats["helpers"]["idle"]),
+    ):
+        gauge = Gauge(f"resonance_transcode_{name}", help)
+        gauge.set(value)
+        families.append(gauge)
+    for name, help, value in (
+        ("started_total", "Transcode slots granted.", stats["started_total"]),
+        (
+            "prefetch_rejected_total",
+            "Prefetch transcodes refused for lack of capacity.",
+            stats["prefetch_rejected_total"],
+        ),
+        ("helper_hits_total", "Streams served by a warm helper.", stats["helpers"]["hits"]),
+        ("helper_misses_total", "Streams that spawned a pipeline.", stats["helpers"]["misses"]),
+    ):
+        counter = Counter(f"resonance_transcode_{name}", help)
+        counter.inc(value)
+        families.append(counter)
+    return families
+
+
+metrics.add_collector("transcode", _collect_metrics)
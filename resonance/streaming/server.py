@@ -22,12 +22,20 @@ NO LOCKS: Unlike earlier implementations, we do NOT use per-player locks
 to serialize streams. LMS doesn't use locks either - it simply closes the
 old stream and opens a new one. Locks caused blocking during rapid seeks
 because the new stream had to wait for the old transcoder to finish.
+
+PREFETCH:
+=========
+Near the end of a track the server starts the next track's stream early and
+keeps its beginning in memory (see streaming/prefetch.py). Queueing that same
+file keeps the warm stream; queueing anything else or seeking drops it.
 """
 
 import logging
 import mimetypes
 from pathlib import Path
-from typing import Callable
+from typing import Any, Callable
+
+from resonance.streaming.prefetch import StreamPrefetcher, WarmStream
 
 logger = logging.getLogger(__name__)
 
@@ -132,6 +140,9 @@ class StreamingServer:
         # Generation counter per player to detect stale streams
         self._stream_generation: dict[str, int] = {}
 
+        # Warm streams for the upcoming track, keyed by player MAC
+        self._prefetcher = StreamPrefetcher(self.get_content_type)
+
         # NOTE: We previously had per-player locks (_stream_locks) to serialize
         # transcoded streams. This was REMOVED because it caused blocking during
         # rapid seeks - the new stream had to wait for the old transcoder to finish.
@@ -210,6 +221,7 @@ class StreamingServer:
         self._stream_tokens[player_mac] = CancellationToken(gen)
 
         self._stream_queue[player_mac] = file_path
+        self._prefetcher.discard(player_mac, keep=file_path)
         # Clear any previous seek position
         self._seek_positions.pop(player_mac, None)
         self._byte_offsets.pop(player_mac, None)
@@ -247,6 +259,7 @@ class StreamingServer:
         self._stream_tokens[player_mac] = CancellationToken(gen)
 
         self._stream_queue[player_mac] = file_path
+        self._prefetcher.discard(player_mac)
         self._seek_positions[player_mac] = (start_seconds, end_seconds)
         self._byte_offsets.pop(player_mac, None)  # Clear byte offset when using time-based seek
 
@@ -333,6 +346,7 @@ class StreamingServer:
         self._stream_tokens[player_mac] = CancellationToken(gen)
 
         self._stream_queue[player_mac] = file_path
+        self._prefetcher.discard(player_mac)
         self._byte_offsets[player_mac] = byte_offset
         self._seek_positions.pop(player_mac, None)  # Clear time-based seek
 
@@ -398,6 +412,37 @@ class StreamingServer:
         """
         return self._stream_queue.get(player_mac)
 
+    async def prefetch(self, player_mac: str, file_path: Path, device_type: Any = None) -> bool:
+        """
+        Start streaming `file_path` ahead of time and buffer its beginning.
+
+        Called near the end of the current track with the next playlist entry.
+
+        Args:
+            player_mac: MAC address of the player.
+            file_path: The upcoming track.
+            device_type: Player device type (selects transcode/remux/direct).
+
+        Returns:
+            True if a warm stream for the file exists afterwards.
+        """
+        return await self._prefetcher.prefetch(player_mac, file_path, device_type) is not None
+
+    def is_prefetched(self, player_mac: str, file_path: Path) -> bool:
+        """Check whether a warm stream for `file_path` exists (or is starting)."""
+        return self._prefetcher.is_prefetched(player_mac, file_path)
+
+    def take_prefetched(self, player_mac: str, file_path: Path) -> WarmStream | None:
+        """
+        Hand the warm stream for `file_path` to the streaming route.
+
+        Only valid for requests from the start of the file (no seek, no byte
+        offset); returns None otherwise or if nothing was prefetched.
+        """
+        if player_mac in self._seek_positions or player_mac in self._byte_offsets:
+            return None
+        return self._prefetcher.take(player_mac, file_path)
+
     async def start(self) -> None:
         """
         Mark the streaming server as running.
@@ -423,6 +468,7 @@ class StreamingServer:
         for player_mac in list(self._stream_tokens.keys()):
             self.cancel_stream(player_mac)
 
+        await self._prefetcher.close()
         self._stream_queue.clear()
         self._seek_positions.clear()
         self._byte_offsets.clear()
@@ -25,12 +25,21 @@ Cancellation/Teardown (Windows-safe):
 Diagnostics:
     - We log subprocess stderr on early termination and on cancellation to diagnose
       cases where the pipeline yields only a small number of bytes and exits.
+
+Command templates:
+    - Each rule's command line is tokenized and its [binary] names resolved once, when
+      the config is loaded (`CommandTemplate`). Per stream only the $FILE$/$START$/$END$
+      slots are filled in, so starting a transcode does no shlex/regex/PATH work.
+    - Rule lookups are indexed by source format and memoized per (format, device).
+    - `reload_transcode_config()` builds a new config, which drops both caches
+      (e.g. after installing a missing binary).
 """
 
 from __future__ import annotations
 
 import asyncio
 import contextlib
+import functools
 import logging
 import queue
 import re
@@ -38,12 +47,21 @@ import shlex
 import shutil
 import subprocess
 import threading
-from collections.abc import AsyncGenerator
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import IO, TYPE_CHECKING
 
+from resonance.streaming.scheduler import (
+    TranscodePriority,
+    TranscodeScheduler,
+    get_transcode_scheduler,
+)
 from resonance.streaming.seek_coordinator import cleanup_processes
 
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator, Iterable
+
 logger = logging.getLogger(__name__)
 
 # Path to config and binaries
@@ -57,6 +75,141 @@ STREAM_BUFFER_SIZE = 65536
 # Keep this conservative; we only use it for diagnostics.
 _EARLY_TERMINATION_BYTES = 512 * 1024  # 512KB
 
+# Command line placeholders
+_FILE = "$FILE$"
+_START = "$START$"
+_END = "$END$"
+
+_BINARY_RE = re.compile(r"\[(\w+)\]")
+
+
+@dataclass(frozen=True, slots=True)
+class CommandStage:
+    """One pre-tokenized stage of a transcode pipeline."""
+
+    executable: str | None  # Resolved path (or plain command); None if [binary] is missing
+    binary: str | None  # Name from [binary] syntax, used for seek flags and errors
+    args: tuple[str, ...]  # Arguments after the executable, placeholders kept
+    has_slots: bool  # True if any argument contains a placeholder
+    start_flag: str
+    end_flag: str
+
+    def render(
+        self,
+        file_arg: str,
+        start_args: tuple[str, ...],
+        end_args: tuple[str, ...],
+    ) -> list[str]:
+        """Fill in the placeholder slots for one stream."""
+        if self.executable is None:
+            raise ValueError(f"Binary not found: {self.binary}")
+        if not self.has_slots:
+            return [self.executable, *self.args]
+
+        out = [self.executable]
+        for arg in self.args:
+            if "$" not in arg:
+                out.append(arg)
+            elif arg == _FILE:
+                out.append(file_arg)
+            elif arg == _START:
+                out.extend(start_args)
+            elif arg == _END:
+                out.extend(end_args)
+            else:
+                arg = (
+                    arg.replace(_FILE, file_arg)
+                    .replace(_START, " ".join(start_args))
+                    .replace(_END, " ".join(end_args))
+                )
+                if arg:
+                    out.append(arg)
+        return out
+
+
+@dataclass(frozen=True, slots=True)
+class CommandTemplate:
+    """A rule's command line compiled into pipeline stages."""
+
+    command: str
+    stages: tuple[CommandStage, ...]
+
+    def render(
+        self,
+        file_path: Path,
+        start_seconds: float | None = None,
+        end_seconds: float | None = None,
+        *,
+        from_stdin: bool = False,
+    ) -> list[list[str]]:
+        """Build the argument lists for one stream (see `build_command`)."""
+        file_arg = "-" if from_stdin else str(file_path)
+        start = None if from_stdin or not start_seconds or start_seconds <= 0 else start_seconds
+        end = None if from_stdin or not end_seconds or end_seconds <= 0 else end_seconds
+
+        result = []
+        for stage in self.stages:
+            start_args = (stage.start_flag, f"{start:.3f}") if start is not None else ()
+            end_args = (stage.end_flag, f"{end:.3f}") if end is not None else ()
+            result.append(stage.render(file_arg, start_args, end_args))
+        return result
+
+
+def compile_command(command: str) -> CommandTemplate:
+    """
+    Tokenize a rule command line and resolve its binaries.
+
+    Missing [binary] executables do not fail compilation; rendering the stage
+    raises ``ValueError`` instead, as `build_command` always did.
+
+    Args:
+        command: Command line template from legacy.conf.
+
+    Returns:
+        The compiled CommandTemplate.
+    """
+    stages: list[CommandStage] = []
+
+    # Split on pipe for pipeline commands
+    for part in command.split("|"):
+        # Use shlex to split arguments correctly (handles quotes).
+        # legacy.conf uses shell-like syntax.
+        args = shlex.split(part.strip())
+        if not args:
+            continue
+
+        # Check for [binary] syntax in the first argument
+        binary_match = _BINARY_RE.match(args[0])
+        binary = None
+        if binary_match:
+            binary = binary_match.group(1).lower()
+            binary_path = resolve_binary(binary)
+            executable = str(binary_path) if binary_path is not None else None
+        else:
+            # Plain command - use as is (system path resolution happens in subprocess)
+            executable = args[0]
+
+        # Choose seek flags based on binary.
+        # ffmpeg uses -ss (start) / -to (end); faad uses -j / -e.
+        if binary == "ffmpeg":
+            start_flag, end_flag = "-ss", "-to"
+        else:
+            start_flag, end_flag = "-j", "-e"
+
+        rest = tuple(arg for arg in args[1:] if arg)
+        stages.append(
+            CommandStage(
+                executable=executable,
+                binary=binary,
+                args=rest,
+                has_slots=any("$" in arg for arg in rest),
+                start_flag=start_flag,
+                end_flag=end_flag,
+            )
+        )
+
+    return CommandTemplate(command=command, stages=tuple(stages))
+
 
 @dataclass
 class TranscodeRule:
@@ -68,11 +221,20 @@ class TranscodeRule:
     device_id: str  # Device MAC pattern (* = any)
     command: str  # Command line template or "-" for passthrough
     capabilities: str = ""  # F, I, T flags
+    _template: CommandTemplate | None = field(default=None, init=False, repr=False, compare=False)
 
     def is_passthrough(self) -> bool:
         """Check if this rule is passthrough (no transcoding)."""
         return self.command.strip() == "-"
 
+    @property
+    def template(self) -> CommandTemplate:
+        """The compiled command line (compiled on first use)."""
+        template = self._template
+        if template is None or template.command != self.command:
+            template = self._template = compile_command(self.command)
+        return template
+
     def matches(
         self,
         source_format: str,
@@ -112,6 +274,27 @@ class TranscodeConfig:
     """Loaded transcoding configuration."""
 
     rules: list[TranscodeRule]
+    _by_source: dict[str, tuple[TranscodeRule, ...]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _lookups: dict[tuple[str, str | None, str | None, str | None], TranscodeRule | None] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        by_source: dict[str, list[TranscodeRule]] = {}
+        for rule in self.rules:
+            by_source.setdefault(rule.source_format.lower(), []).append(rule)
+            if not rule.is_passthrough():
+                for stage in rule.template.stages:
+                    if stage.executable is None:
+                        logger.debug(
+                            "Transcode rule %s -> %s needs missing binary: %s",
+                            rule.source_format,
+                            rule.dest_format,
+                            stage.binary,
+                        )
+        self._by_source = {fmt: tuple(rules) for fmt, rules in by_source.items()}
 
     def find_rule(
         self,
@@ -136,8 +319,14 @@ class TranscodeConfig:
             The first matching TranscodeRule, or None if no match.
         """
         source_format = source_format.lower().lstrip(".")
+        key = (source_format, dest_format, device_type, device_id)
+        try:
+            return self._lookups[key]
+        except KeyError:
+            pass
 
-        for rule in self.rules:
+        found = None
+        for rule in self._by_source.get(source_format, ()):
             if not rule.matches(source_format, device_type, device_id):
                 continue
 
@@ -145,9 +334,11 @@ class TranscodeConfig:
             if dest_format and rule.dest_format != dest_format.lower():
                 continue
 
-            return rule
+            found = rule
+            break
 
-        return None
+        self._lookups[key] = found
+        return found
 
     def needs_transcoding(
         self,
@@ -278,6 +469,8 @@ def build_command(
     file_path: Path,
     start_seconds: float | None = None,
     end_seconds: float | None = None,
+    *,
+    from_stdin: bool = False,
 ) -> list[list[str]]:
     """
     Build the command pipeline from a transcoding rule.
@@ -289,6 +482,9 @@ def build_command(
             Flag is binary-aware: ``-ss`` for ffmpeg, ``-j`` for faad.
         end_seconds: Optional seek end position in seconds.
             Flag is binary-aware: ``-to`` for ffmpeg, ``-e`` for faad.
+        from_stdin: Source audio is piped to the first stage (rule capability
+            ``I``): ``$FILE$`` becomes ``-`` and ``$START$``/``$END$`` are
+            dropped, because the caller already cut the stream.
 
     Returns:
         List of command lists (for piping). Each inner list is a command + args.
@@ -296,89 +492,7 @@ def build_command(
     Raises:
         ValueError: If a required binary is not found.
     """
-    command = rule.command
-
-    # Split on pipe for pipeline commands
-    pipe_parts = [p.strip() for p in command.split("|")]
-
-    result: list[list[str]] = []
-
-    for part in pipe_parts:
-        # Use shlex to split arguments correctly (handles quotes)
-        # Note: we use posix=False on Windows to better handle backslashes in paths
-        # if they were present, but here we are parsing the config command line.
-        # legacy.conf uses shell-like syntax.
-        args = shlex.split(part)
-
-        if not args:
-            continue
-
-        # Check for [binary] syntax in the first argument
-        binary_match = re.match(r"\[(\w+)\]", args[0])
-        segment_binary = None  # Track binary name for context-aware substitution
-        if binary_match:
-            segment_binary = binary_match.group(1).lower()
-            binary_path = resolve_binary(segment_binary)
-            if binary_path is None:
-                raise ValueError(f"Binary not found: {segment_binary}")
-
-            # Replace the [binary] placeholder with the full path
-            cmd_args = [str(binary_path)] + args[1:]
-        else:
-            # Plain command - use as is (system path resolution happens in subprocess)
-            cmd_args = args
-
-        # Choose seek flags based on binary.
-        # ffmpeg uses -ss (start) / -to (end); faad uses -j / -e.
-        if segment_binary == "ffmpeg":
-            start_flag, end_flag = "-ss", "-to"
-        else:
-            start_flag, end_flag = "-j", "-e"
-
-        # Perform placeholder substitution on arguments
-        final_args = []
-        for arg in cmd_args:
-            # Replace $FILE$
-            if "$FILE$" in arg:
-                arg = arg.replace("$FILE$", str(file_path))
-
-            # Replace $START$
-            if "$START$" in arg:
-                if start_seconds is not None and start_seconds > 0:
-                    # Expand to "<flag> <seconds>" (two args).
-                    # e.g. ffmpeg: "-ss 123.456", faad: "-j 123.456"
-                    replacement = f"{start_flag} {start_seconds:.3f}"
-                    if arg == "$START$":
-                        final_args.extend(replacement.split())
-                        continue
-                    else:
-                        arg = arg.replace("$START$", replacement)
-                else:
-                    # Remove the placeholder (no seeking requested)
-                    if arg == "$START$":
-                        continue
-                    arg = arg.replace("$START$", "")
-
-            # Replace $END$
-            if "$END$" in arg:
-                if end_seconds is not None and end_seconds > 0:
-                    replacement = f"{end_flag} {end_seconds:.3f}"
-                    if arg == "$END$":
-                        final_args.extend(replacement.split())
-                        continue
-                    else:
-                        arg = arg.replace("$END$", replacement)
-                else:
-                    if arg == "$END$":
-                        continue
-                    arg = arg.replace("$END$", "")
-
-            if arg:
-                final_args.append(arg)
-
-        result.append(final_args)
-
-    return result
+    return rule.template.render(file_path, start_seconds, end_seconds, from_stdin=from_stdin)
 
 
 def _read_stream_in_thread(
@@ -413,7 +527,37 @@ def _read_stream_in_thread(
             stream.close()
 
 
-def _terminate_popen_safely(proc: subprocess.Popen, timeout: float = 2.0) -> None:
+def _write_source_in_thread(source: Iterable[bytes], stdin: IO[bytes]) -> None:
+    """
+    Feed source audio into the first pipeline stage from a thread.
+
+    Broken pipes are expected when the pipeline is torn down for a seek.
+    """
+    try:
+        for data in source:
+            stdin.write(data)
+    except (BrokenPipeError, OSError, ValueError) as e:
+        logger.debug("Threaded stdin writer stopped (expected on teardown): %s", e)
+    finally:
+        with contextlib.suppress(Exception):
+            stdin.close()
+
+
+async def _pump_source(source: Iterable[bytes], stdin: asyncio.StreamWriter) -> None:
+    """Feed source audio into an asyncio subprocess; file reads run in a thread."""
+    chunks = iter(source)
+    try:
+        while (data := await asyncio.to_thread(next, chunks, None)) is not None:
+            stdin.write(data)
+            await stdin.drain()
+    except (BrokenPipeError, ConnectionResetError) as e:
+        logger.debug("Stdin pump stopped (expected on teardown): %s", e)
+    finally:
+        with contextlib.suppress(Exception):
+            stdin.close()
+
+
+def _terminate_popen_safely(proc: subprocess.Popen[bytes], timeout: float = 2.0) -> None:
     """
     Best-effort terminate/kill for subprocess.Popen processes.
 
@@ -437,7 +581,7 @@ def _terminate_popen_safely(proc: subprocess.Popen, timeout: float = 2.0) -> Non
         proc.wait(timeout=1.0)
 
 
-def _cleanup_popen_pipeline_sync(procs: list[subprocess.Popen]) -> None:
+def _cleanup_popen_pipeline_sync(procs: list[subprocess.Popen[bytes]]) -> None:
     """
     Clean up a Popen pipeline - SYNCHRONOUS and FAST.
 
@@ -475,7 +619,7 @@ def _cleanup_popen_pipeline_sync(procs: list[subprocess.Popen]) -> None:
 
 
 async def _log_popen_stderr(
-    procs: list[subprocess.Popen],
+    procs: list[subprocess.Popen[bytes]],
     *,
     cancelled: bool,
     bytes_yielded: int,
@@ -509,16 +653,58 @@ async def _log_popen_stderr(
             )
 
 
+def _spawn_popen_pipeline(commands: list[list[str]], *, stdin: bool) -> list[subprocess.Popen[bytes]]:
+    """
+    Start every stage with OS-level pipes between them.
+
+    Args:
+        commands: Argument lists from `build_command`.
+        stdin: Give the first stage a stdin pipe (source fed by the caller).
+
+    Returns:
+        The started processes, first stage first.
+    """
+    procs: list[subprocess.Popen[bytes]] = []
+    # A pipe request for the first stage, then the previous stage's stdout.
+    prev_stdout: int | IO[bytes] | None = subprocess.PIPE if stdin else None
+    try:
+        for i, cmd in enumerate(commands):
+            logger.debug("[TRANSCODE] Starting Popen stage %d: %s", i, " ".join(cmd))
+
+            proc = subprocess.Popen(
+                cmd,
+                stdin=prev_stdout,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                bufsize=0,
+            )
+            procs.append(proc)
+            logger.debug("[TRANSCODE] Popen stage %d started, pid=%s", i, proc.pid)
+
+            # The next stage consumes this stage's stdout
+            prev_stdout = proc.stdout
+    except BaseException:
+        _cleanup_popen_pipeline_sync(procs)
+        raise
+    return procs
+
+
 async def transcode_stream(
     file_path: Path,
     rule: TranscodeRule,
     start_seconds: float | None = None,
     end_seconds: float | None = None,
+    *,
+    source: Iterable[bytes] | None = None,
+    player_mac: str | None = None,
+    priority: TranscodePriority = TranscodePriority.PLAYBACK,
 ) -> AsyncGenerator[bytes, None]:
     """
     Stream transcoded audio data using the specified rule.
 
     This sets up a subprocess pipeline and yields chunks of transcoded data.
+    The pipeline runs inside a slot of the transcode scheduler, so starting it
+    may wait for capacity (see `resonance.streaming.scheduler`).
 
     Windows uses a Popen-based OS-pipe pipeline (to match LMS behavior and avoid
     premature EOF races). Other platforms use the asyncio pipeline.
@@ -528,6 +714,13 @@ async def transcode_stream(
         rule: TranscodeRule specifying how to transcode.
         start_seconds: Optional seek start position in seconds.
         end_seconds: Optional seek end position in seconds.
+        source: Optional blocking iterable of source bytes to pipe into the
+            first stage instead of letting it open the file (see
+            ``build_command(from_stdin=True)``). Used to start decoding at an
+            exact sample found in the MP4 sample table.
+        player_mac: Player the stream is for (per-player fairness).
+        priority: PLAYBACK waits for a slot; PREFETCH fails fast with
+            ``TranscodeBusyError`` when there is no spare capacity.
 
     Yields:
         Chunks of transcoded audio data.
@@ -538,11 +731,33 @@ async def transcode_stream(
         raise ValueError("Cannot transcode with passthrough rule")
 
     try:
-        commands = build_command(rule, file_path, start_seconds, end_seconds)
+        commands = build_command(
+            rule, file_path, start_seconds, end_seconds, from_stdin=source is not None
+        )
     except ValueError as e:
         logger.error("Failed to build transcode command: %s", e)
         raise
 
+    scheduler = get_transcode_scheduler()
+    async with (
+        scheduler.slot(player_mac, priority),
+        contextlib.aclosing(
+            _run_pipeline(file_path, rule, commands, start_seconds, source, scheduler)
+        ) as chunks,
+    ):
+        async for chunk in chunks:
+            yield chunk
+
+
+async def _run_pipeline(
+    file_path: Path,
+    rule: TranscodeRule,
+    commands: list[list[str]],
+    start_seconds: float | None,
+    source: Iterable[bytes] | None,
+    scheduler: TranscodeScheduler,
+) -> AsyncGenerator[bytes, None]:
+    """Start the pipeline for `commands` and yield its output."""
     if start_seconds:
         logger.info(
             "[TRANSCODE] Starting: %s -> %s using %d command(s), seeking to %.1fs",
@@ -559,38 +774,46 @@ async def transcode_stream(
             len(commands),
         )
 
-    if len(commands) > 1:
+    # Stdin-fed commands do not depend on the file: reuse a warm helper if one is parked.
+    pooled: list[subprocess.Popen[bytes]] | None = None
+    spawn_started = time.perf_counter()
+    if source is not None:
+        key = tuple(tuple(cmd) for cmd in commands)
+        pooled = scheduler.helpers.take(key)
+        scheduler.helpers.replenish(
+            key, functools.partial(_spawn_popen_pipeline, commands, stdin=True)
+        )
+
+    if len(commands) > 1 or pooled is not None:
         # Windows-safe Popen pipeline (also used generally for multi-stage pipelines)
-        procs: list[subprocess.Popen] = []
+        procs: list[subprocess.Popen[bytes]] = []
         out_q: queue.Queue[bytes | None] = queue.Queue(maxsize=32)
         reader_thread: threading.Thread | None = None
+        writer_thread: threading.Thread | None = None
         loop = asyncio.get_running_loop()
 
         bytes_yielded = 0
 
         try:
-            prev_stdout = None
-
-            for i, cmd in enumerate(commands):
-                logger.debug("[TRANSCODE] Starting Popen stage %d: %s", i, " ".join(cmd))
-
-                proc = subprocess.Popen(
-                    cmd,
-                    stdin=prev_stdout,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    bufsize=0,
-                )
-                procs.append(proc)
-                logger.debug("[TRANSCODE] Popen stage %d started, pid=%s", i, proc.pid)
-
-                # The next stage consumes this stage's stdout
-                prev_stdout = proc.stdout
+            if pooled is not None:
+                procs.extend(pooled)
+                logger.debug("[TRANSCODE] Using warm helper pipeline")
+            else:
+                procs.extend(_spawn_popen_pipeline(commands, stdin=source is not None))
+            scheduler.record_spawn(time.perf_counter() - spawn_started)
 
             final_stdout = procs[-1].stdout
             if final_stdout is None:
                 raise RuntimeError("No stdout from final transcode process (Popen)")
 
+            if source is not None:
+                writer_thread = threading.Thread(
+                    target=_write_source_in_thread,
+                    args=(source, procs[0].stdin),
+                    daemon=True,
+                )
+                writer_thread.start()
+
             logger.debug("[TRANSCODE] All Popen stages started, starting reader thread")
 
             # Start a blocking reader thread for the final stdout
@@ -658,6 +881,8 @@ async def transcode_stream(
                 reader_thread.join(timeout=0.1)
                 if reader_thread.is_alive():
                     logger.debug("[TRANSCODE] Reader thread still alive after join timeout")
+            if writer_thread is not None and writer_thread.is_alive():
+                writer_thread.join(timeout=0.1)
 
             logger.debug("[TRANSCODE] Pipeline cleanup complete")
 
@@ -673,11 +898,14 @@ async def transcode_stream(
 
             proc = await asyncio.create_subprocess_exec(
                 *cmd,
-                stdin=None,
+                stdin=asyncio.subprocess.PIPE if source is not None else None,
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE,
             )
             processes.append(proc)
+            scheduler.record_spawn(time.perf_counter() - spawn_started)
+            if source is not None and proc.stdin is not None:
+                pipe_tasks.append(asyncio.create_task(_pump_source(source, proc.stdin)))
 
         final_proc = processes[-1]
         if final_proc.stdout is None:
@@ -21,9 +21,15 @@ from dataclasses import dataclass, field
 from typing import Any
 
 from resonance.core.events import Event, event_bus
+from resonance.core.metrics import Gauge, Metric, metrics
 
 logger = logging.getLogger(__name__)
 
+DELIVERY_SECONDS = metrics.histogram(
+    "resonance_cometd_delivery_seconds",
+    "Time a Cometd event waited in its client queue before being handed out.",
+)
+
 
 @dataclass
 class CometdClient:
@@ -42,6 +48,8 @@ class CometdClient:
     pending_events: list[dict[str, Any]] = field(default_factory=list)
     created_at: float = field(default_factory=time.time)
     last_seen: float = field(default_factory=time.time)
+    # Enqueue times (monotonic) parallel to pending_events, for delivery latency.
+    _queued_at: list[float] = field(default_factory=list, init=False, repr=False)
 
     def touch(self) -> None:
         """Update last_seen timestamp."""
@@ -54,11 +62,17 @@ class CometdClient:
     def add_event(self, event: dict[str, Any]) -> None:
         """Add an event to the pending queue."""
         self.pending_events.append(event)
+        self._queued_at.append(time.monotonic())
 
     def get_and_clear_events(self) -> list[dict[str, Any]]:
         """Get all pending events and clear the queue."""
         events = self.pending_events
         self.pending_events = []
+        if self._queued_at:
+            now = time.monotonic()
+            for queued_at in self._queued_at:
+                DELIVERY_SECONDS.observe(now - queued_at)
+            self._queued_at = []
         return events
 
 
@@ -125,6 +139,19 @@ class CometdManager:
 
         return True
 
+    def _collect_metrics(self) -> list[Metric]:
+        """Scrape-time gauges for /metrics: sessions and queue depths."""
+        clients = Gauge("resonance_cometd_clients", "Cometd client sessions.")
+        queued = Gauge("resonance_cometd_queued_events", "Events waiting in all client queues.")
+        deepest = Gauge(
+            "resonance_cometd_queue_depth_max", "Events waiting in the longest client queue."
+        )
+        depths = [len(client.pending_events) for client in list(self._clients.values())]
+        clients.set(len(depths))
+        queued.set(sum(depths))
+        deepest.set(max(depths, default=0))
+        return [clients, queued, deepest]
+
     def _generate_client_id(self) -> str:
         """Generate a unique 8-character hex client ID."""
         return secrets.token_hex(4)
@@ -807,10 +834,12 @@ class CometdManager:
     async def start(self) -> None:
         """Start the Cometd manager and subscribe to events."""
         await event_bus.subscribe("player.*", self.handle_event)
+        metrics.add_collector("cometd", self._collect_metrics)
         logger.info("CometdManager started")
 
     async def stop(self) -> None:
         """Stop the Cometd manager and clean up."""
+        metrics.remove_collector("cometd", self._collect_metrics)
         async with self._lock:
             self._clients.clear()
             self._connect_waiters.clear()
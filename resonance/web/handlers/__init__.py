@@ -25,6 +25,7 @@ if TYPE_CHECKING:
     from resonance.player.registry import PlayerRegistry
     from resonance.protocol.slimproto import SlimprotoServer
     from resonance.streaming.server import StreamingServer
+    from resonance.web.response_cache import ResponseCache
 
 
 @dataclass
@@ -58,6 +59,9 @@ class CommandContext:
     artwork_manager: ArtworkManager | None = None
     """Artwork extraction and caching."""
 
+    response_cache: ResponseCache | None = None
+    """Cache for read-only library command results (keyed by library generation)."""
+
     server_host: str = "127.0.0.1"
     """Server hostname for generating URLs."""
 
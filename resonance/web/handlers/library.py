@@ -29,10 +29,12 @@ from resonance.web.jsonrpc_helpers import (
     parse_tagged_params,
     parse_tags_string,
 )
+from resonance.web.response_cache import cached_command
 
 logger = logging.getLogger(__name__)
 
 
+@cached_command
 async def cmd_artists(
     ctx: CommandContext,
     params: list[Any],
@@ -131,6 +133,7 @@ async def cmd_artists(
     return build_list_response(artists_loop, total_count, "artists_loop")
 
 
+@cached_command
 async def cmd_albums(
     ctx: CommandContext,
     params: list[Any],
@@ -270,6 +273,7 @@ async def cmd_albums(
     return build_list_response(albums_loop, total_count, "albums_loop")
 
 
+@cached_command
 async def cmd_titles(
     ctx: CommandContext,
     params: list[Any],
@@ -442,6 +446,7 @@ async def cmd_titles(
     return build_list_response(titles_loop, total_count, "titles_loop")
 
 
+@cached_command
 async def cmd_genres(
     ctx: CommandContext,
     params: list[Any],
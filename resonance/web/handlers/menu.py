@@ -14,6 +14,9 @@ import logging
 import time
 from typing import TYPE_CHECKING, Any
 
+from resonance.web.jsonrpc_helpers import text_key
+from resonance.web.response_cache import cached_command
+
 if TYPE_CHECKING:
     from resonance.web.handlers import CommandContext
 
@@ -381,6 +384,7 @@ def _build_main_menu(ctx: CommandContext) -> list[dict[str, Any]]:
     return menu
 
 
+@cached_command
 async def cmd_browselibrary(ctx: CommandContext, command: list[Any]) -> dict[str, Any]:
     """
     Handle the 'browselibrary' command for Jive menu navigation.
@@ -573,7 +577,7 @@ async def _browse_albums(
 
         # Add artist as second line
         if artist_name:
-            item["textkey"] = album_title[0].upper() if album_title else "?"
+            item["textkey"] = text_key(album_title) or "?"
             item["icon-id"] = album.get("artwork_track_id") or album_id
 
         # Add artwork URL if available
@@ -769,7 +773,7 @@ async def _browse_tracks(
 
         # Add artist as second line if available
         if artist_name:
-            item["textkey"] = track_title[0].upper() if track_title else "?"
+            item["textkey"] = text_key(track_title) or "?"
 
         items.append(item)
 
@@ -59,6 +59,7 @@ async def cmd_play(
             # Avoid top-level import to prevent circular imports
             from resonance.web.handlers.playlist import _start_track_stream
 
+            await playlist.hydrate_current()
             track = playlist.play(playlist.current_index)
             if track is not None:
                 logger.info(
@@ -365,6 +366,7 @@ async def cmd_button(
         if ctx.playlist_manager is not None:
             playlist = ctx.playlist_manager.get(ctx.player_id)
             if playlist is not None:
+                await playlist.hydrate_current()
                 next_track = playlist.next()
                 if next_track is not None:
                     from resonance.web.handlers.playlist import _start_track_stream
@@ -374,6 +376,7 @@ async def cmd_button(
         if ctx.playlist_manager is not None:
             playlist = ctx.playlist_manager.get(ctx.player_id)
             if playlist is not None:
+                await playlist.hydrate_current()
                 prev_track = playlist.previous()
                 if prev_track is not None:
                     from resonance.web.handlers.playlist import _start_track_stream
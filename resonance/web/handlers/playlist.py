@@ -30,6 +30,7 @@ events or old streams are still in flight.
 from __future__ import annotations
 
 import asyncio
+import functools
 import logging
 from pathlib import Path
 from typing import Any
@@ -40,7 +41,6 @@ from resonance.web.jsonrpc_helpers import (
     get_filter_int,
     parse_start_items,
     parse_tagged_params,
-    to_dict,
 )
 
 logger = logging.getLogger(__name__)
@@ -79,6 +79,10 @@ async def cmd_playlist(
     if handler is None:
         return {"error": f"Unknown playlist subcommand: {subcommand}"}
 
+    if subcommand in _WAIT_FOR_LOAD:
+        # Edits apply after the rest of a `loadtracks` selection, not in between.
+        await _wait_pending_load(ctx.player_id)
+
     return await handler(ctx, params)
 
 
@@ -108,11 +112,14 @@ async def _playlist_play(
     if len(params) >= 3:
         try:
             index = int(params[2])
+            await playlist.hydrate(index, 1)
             track = playlist.play(index)
         except (ValueError, TypeError):
             # Not an index, might be a track ID or path
+            await playlist.hydrate_current()
             track = playlist.current_track
     else:
+        await playlist.hydrate_current()
         track = playlist.current_track
 
     if track is None:
@@ -317,6 +324,7 @@ async def _playlist_index(
 
     # Handle relative indices (+1, -1)
     index_str = str(params[2])
+    await playlist.hydrate_current()
     if index_str == "+1":
         track = playlist.next()
         if track is not None and player is not None:
@@ -331,6 +339,7 @@ async def _playlist_index(
     # Absolute index
     try:
         index = int(index_str)
+        await playlist.hydrate(index, 1)
         track = playlist.play(index)
         if track is not None and player is not None:
             await _start_track_stream(ctx, player, track)
@@ -428,8 +437,8 @@ async def _playlist_tracks(
     server_url = f"http://{ctx.server_host}:{ctx.server_port}"
 
     tracks_loop = []
-    all_tracks = list(playlist.tracks)
-    paginated = all_tracks[start : start + items]
+    await playlist.hydrate(start, items)
+    paginated = playlist.tracks[start : start + items]
 
     for i, track in enumerate(paginated):
         tracks_loop.append(
@@ -445,7 +454,7 @@ async def _playlist_tracks(
         )
 
     return {
-        "count": len(all_tracks),
+        "count": len(playlist),
         "tracks_loop": tracks_loop,
     }
 
@@ -461,6 +470,9 @@ async def _playlist_loadtracks(
     - stop+clear current playlist/stream first
     - load tracks
     - then jump to index 0 to start playback (like LMS does via playlist jump)
+
+    The selection is not capped: the first track is resolved and started
+    immediately, the remaining ids are appended by a background task.
     """
     if ctx.player_id == "-":
         return {"error": "No player specified"}
@@ -475,6 +487,7 @@ async def _playlist_loadtracks(
         return {"error": "Playlist manager not available"}
 
     # Stop + clear (LMS-like): prevents buffered/stale audio and reduces races.
+    _cancel_pending_load(ctx.player_id)
     playlist = ctx.playlist_manager.get(ctx.player_id)
     playlist.clear()
 
@@ -497,41 +510,29 @@ async def _playlist_loadtracks(
 
     db = ctx.music_library._db
 
-    # Load tracks based on criteria
-    # Use "album" order (disc_no, track_no) for proper album playback order
     if track_id is not None:
         # Single track by ID
         row = await db.get_track_by_id(track_id)
         rows = [row] if row else []
+        selection = None
     elif album_id is not None:
-        rows = await db.list_tracks_by_album(album_id=album_id, offset=0, limit=1000, order_by="album")
+        # Disc/track order for proper album playback; served by idx_tracks_album_id_sort
+        selection = {"album_id": album_id, "order_by": "tracknum"}
+        rows = await db.list_tracks_by_album(
+            album_id=album_id, offset=0, limit=1, order_by="tracknum"
+        )
     elif artist_id is not None:
-        rows = await db.list_tracks_by_artist(artist_id=artist_id, offset=0, limit=1000, order_by="album")
+        selection = {"artist_id": artist_id, "order_by": "album"}
+        rows = await db.list_tracks_by_artist(artist_id=artist_id, offset=0, limit=1, order_by="album")
     elif genre_id is not None:
-        rows = await db.list_tracks_by_genre_id(genre_id=genre_id, offset=0, limit=1000, order_by="title")
+        selection = {"genre_id": genre_id, "order_by": "title"}
+        rows = await db.list_tracks_by_genre_id(genre_id=genre_id, offset=0, limit=1, order_by="title")
     else:
         return {"error": "No track criteria specified"}
 
-    # Convert rows to Track objects and add to playlist
-    from resonance.core.library import Track
-
-    for row in rows:
-        row_dict = to_dict(row)
-        track = Track(
-            id=row_dict.get("id"),
-            path=row_dict.get("path", ""),
-            title=row_dict.get("title", ""),
-            artist_id=row_dict.get("artist_id"),
-            album_id=row_dict.get("album_id"),
-            artist_name=row_dict.get("artist"),
-            album_title=row_dict.get("album"),
-            year=row_dict.get("year"),
-            duration_ms=row_dict.get("duration_ms"),
-            disc_no=row_dict.get("disc_no"),
-            track_no=row_dict.get("track_no"),
-            compilation=row_dict.get("compilation", 0),
-        )
-        playlist.add(track)
+    # Only the first track is resolved up front, so time-to-first-audio does
+    # not depend on the size of the selection.
+    playlist.extend(rows)
 
     # Start playback deterministically at the first track (LMS does this via playlist jump).
     if player is not None and len(playlist) > 0:
@@ -539,7 +540,84 @@ async def _playlist_loadtracks(
         if track0 is not None:
             await _start_track_stream(ctx, player, track0)
 
-    return {"count": len(playlist)}
+    count = len(playlist)
+    if selection is not None and rows:
+        task = asyncio.create_task(
+            _load_remaining_tracks(db, playlist, playlist.epoch, rows[0].id, selection)
+        )
+        _pending_loads[ctx.player_id] = task
+        task.add_done_callback(functools.partial(_forget_pending_load, ctx.player_id))
+        count = await _count_selection(db, selection)
+
+    return {"count": count}
+
+
+async def _count_selection(db: Any, selection: dict[str, Any]) -> int:
+    """Size of a `loadtracks` selection (the background task appends the rest)."""
+    if "album_id" in selection:
+        return int(await db.count_tracks_by_album(selection["album_id"]))
+    if "artist_id" in selection:
+        return int(await db.count_tracks_by_artist(selection["artist_id"]))
+    return int(await db.count_tracks_by_genre_id(selection["genre_id"]))
+
+
+# Background `loadtracks` tasks by player id (at most one per player).
+_pending_loads: dict[str, asyncio.Task[None]] = {}
+
+# Subcommands that edit the queue and so must not interleave with a pending load.
+_WAIT_FOR_LOAD = frozenset({"add", "insert", "delete", "move", "shuffle"})
+
+
+def _forget_pending_load(player_id: str, task: asyncio.Task[None]) -> None:
+    if _pending_loads.get(player_id) is task:
+        del _pending_loads[player_id]
+
+
+def _cancel_pending_load(player_id: str) -> None:
+    task = _pending_loads.pop(player_id, None)
+    if task is not None and not task.done():
+        task.cancel()
+
+
+async def _wait_pending_load(player_id: str) -> None:
+    task = _pending_loads.get(player_id)
+    if task is not None and not task.done():
+        # asyncio.wait: a cancelled caller does not cancel the load itself.
+        await asyncio.wait({task})
+
+
+async def _load_remaining_tracks(
+    db: Any,
+    playlist: Any,
+    epoch: int,
+    first_id: int,
+    selection: dict[str, Any],
+) -> None:
+    """
+    Append the rest of a `loadtracks` selection after playback has started.
+
+    Only ids are fetched (one uncapped SELECT); metadata is hydrated by the
+    playlist when a window is played or listed. If the playlist was cleared
+    meanwhile (new loadtracks, playlist clear), the result is dropped.
+    """
+    try:
+        track_ids = await db.list_track_ids(**selection)
+    except asyncio.CancelledError:
+        raise
+    except Exception:
+        logger.exception("loadtracks: failed to load selection for %s", playlist.player_id)
+        return
+
+    if playlist.epoch != epoch:
+        logger.debug("loadtracks: playlist %s changed, dropping selection", playlist.player_id)
+        return
+
+    if track_ids and track_ids[0] == first_id:
+        del track_ids[0]
+    else:
+        # Library changed between the two queries; keep the playing track once.
+        track_ids = [t for t in track_ids if t != first_id]
+    playlist.extend_ids(track_ids)
 
 
 async def _playlist_jump(
@@ -571,6 +649,7 @@ async def _playlist_jump(
 
     direction = str(params[2])
     track = None
+    await playlist.hydrate_current()
 
     if direction in ("+1", "1"):
         track = playlist.next()
@@ -649,43 +728,23 @@ async def _resolve_track(
     ctx: CommandContext,
     track_ref: Any,
     tagged_params: dict[str, str],
-) -> Any:
+) -> TrackRow | None:
     """
-    Resolve a track reference to a Track object.
+    Resolve a track reference to a Track (TrackRow) object.
 
     track_ref can be:
     - Integer track ID
     - String track ID
     - File path
     """
-    from resonance.core.library import Track
-
     db = ctx.music_library._db
 
-    # Try as track ID
-    def _row_to_track(row: TrackRow) -> Track:
-        """Convert a TrackRow dataclass to a Track object."""
-        return Track(
-            id=row.id,
-            path=row.path,
-            title=row.title or "",
-            artist_id=row.artist_id,
-            album_id=row.album_id,
-            artist_name=row.artist,
-            album_title=row.album,
-            year=row.year,
-            duration_ms=row.duration_ms,
-            disc_no=row.disc_no,
-            track_no=row.track_no,
-            compilation=row.compilation,
-        )
-
     # Try as track ID
     try:
         track_id = int(track_ref)
         row = await db.get_track_by_id(track_id)
         if row is not None:
-            return _row_to_track(row)
+            return row
     except (ValueError, TypeError):
         pass
 
@@ -696,6 +755,6 @@ async def _resolve_track(
 
     row = await db.get_track_by_path(track_ref_str)
     if row is not None:
-        return _row_to_track(row)
+        return row
 
     return None
@@ -28,6 +28,7 @@ import logging
 from pathlib import Path
 from typing import Any
 
+from resonance.streaming.mp4index import get_sample_index
 from resonance.streaming.seek_coordinator import get_seek_coordinator
 from resonance.web.handlers import CommandContext
 
@@ -122,6 +123,7 @@ async def cmd_time(
     if ctx.playlist_manager is not None:
         playlist = ctx.playlist_manager.get(ctx.player_id)
         if playlist is not None:
+            await playlist.hydrate_current()
             current_track = playlist.current_track
             if current_track is not None and current_track.duration_ms:
                 duration = current_track.duration_ms / 1000.0
@@ -225,6 +227,7 @@ async def _execute_seek_internal(
     if playlist is None:
         return
 
+    await playlist.hydrate_current()
     current_track = playlist.current_track
     if current_track is None:
         return
@@ -244,6 +247,13 @@ async def _execute_seek_internal(
         if current_track.duration_ms:
             duration = current_track.duration_ms / 1000.0
 
+        # Snap to the first sample at or before the target so the reported
+        # start offset matches where decoding actually begins. This also warms
+        # the sample-index cache for the stream request that follows.
+        index = await get_sample_index(file_path)
+        if index is not None:
+            target_seconds = index.seek(target_seconds).seconds
+
         ctx.streaming_server.queue_file_with_seek(
             ctx.player_id,
             file_path,
@@ -286,6 +286,7 @@ async def cmd_status(
             result["playlist repeat"] = playlist.repeat_mode.value
 
             # Get current track info
+            await playlist.hydrate_current()
             current = playlist.current_track
             if current is not None:
                 result["duration"] = (current.duration_ms or 0) / 1000.0
@@ -363,7 +364,8 @@ async def cmd_status(
                     start, items = parse_start_items(["status", params[1]] + list(params[2:]))
 
             # Get tracks for playlist_loop
-            tracks = list(playlist.tracks)[start : start + items]
+            await playlist.hydrate(start, items)
+            tracks = playlist.tracks[start : start + items]
 
             for i, track in enumerate(tracks):
                 track_id = getattr(track, "id", getattr(track, "track_id", None))
@@ -488,7 +490,7 @@ async def cmd_rescan(
 
     # Check if this is a progress query
     if "?" in params:
-        status = ctx.music_library.get_scan_status()
+        status = ctx.music_library.scan_status
         return {
             "rescan": 1 if status.is_running else 0,
             "progressname": status.current_folder,
@@ -496,8 +498,9 @@ async def cmd_rescan(
             "progresstotal": status.folders_total,
         }
 
-    # Start rescan
-    await ctx.music_library.start_scan()
+    # Start rescan: "rescan full" re-reads everything, plain "rescan" only
+    # looks at directories that changed since the last scan (LMS semantics).
+    await ctx.music_library.rescan(incremental="full" not in params)
 
     return {"rescan": 1}
 
@@ -511,8 +514,10 @@ async def cmd_wipecache(
 
     Clears the library cache and rescans.
     """
-    # Clear database
+    # Clear database (bumps the generation, so in-flight browse results are not cached)
     await ctx.music_library._db.clear_all()
+    if ctx.response_cache is not None:
+        ctx.response_cache.clear()
 
     # Start fresh scan
     await ctx.music_library.start_scan()
@@ -11,8 +11,10 @@ The facade pattern keeps this module thin - all command logic is in handlers/.
 from __future__ import annotations
 
 import logging
+import time
 from typing import TYPE_CHECKING, Any, Callable, Coroutine
 
+from resonance.core.metrics import metrics
 from resonance.web.handlers import CommandContext
 from resonance.web.handlers.library import (
     cmd_albums,
@@ -60,6 +62,7 @@ from resonance.web.jsonrpc_helpers import (
     ERROR_METHOD_NOT_FOUND,
     build_error_response,
 )
+from resonance.web.response_cache import ResponseCache
 
 if TYPE_CHECKING:
     from resonance.core.artwork import ArtworkManager
@@ -71,6 +74,17 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+COMMAND_SECONDS = metrics.histogram(
+    "resonance_jsonrpc_command_seconds",
+    "JSON-RPC/Cometd command handler latency.",
+    ("command",),
+)
+COMMAND_ERRORS = metrics.counter(
+    "resonance_jsonrpc_command_errors_total",
+    "JSON-RPC/Cometd commands whose handler raised.",
+    ("command",),
+)
+
 # Type alias for command handlers
 CommandHandler = Callable[[CommandContext, list[Any]], Coroutine[Any, Any, dict[str, Any]]]
 
@@ -146,6 +160,7 @@ class JsonRpcHandler:
         self.server_host = server_host
         self.server_port = server_port
         self.server_uuid = server_uuid
+        self.response_cache = ResponseCache()
 
     async def handle_request(
         self,
@@ -242,18 +257,24 @@ class JsonRpcHandler:
             streaming_server=self.streaming_server,
             slimproto=self.slimproto,
             artwork_manager=self.artwork_manager,
+            response_cache=self.response_cache,
             server_host=self.server_host,
             server_port=self.server_port,
             server_uuid=self.server_uuid,
         )
 
-        # Execute handler
+        # Execute handler (only known commands are labelled, so cardinality stays bounded)
+        labels = (command_name,)
+        started = time.perf_counter()
         try:
             result = await handler(ctx, command)
             return result
         except Exception as e:
+            COMMAND_ERRORS.inc(labels=labels)
             logger.exception("Handler error for %s: %s", command_name, e)
             return {"error": str(e)}
+        finally:
+            COMMAND_SECONDS.observe(time.perf_counter() - started, labels)
 
     async def __call__(
         self,
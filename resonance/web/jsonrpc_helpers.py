@@ -5,14 +5,24 @@ This module provides utilities for JSON-RPC command processing:
 - Query parameter parsing (start, itemsPerResponse, tags, filters)
 - Loop item building (converting DB results to LMS-format response items)
 - Sort mapping (LMS sort parameters to SQL ORDER BY)
+
+Loop item builders read fields straight from the row (dict, `sqlite3.Row`/
+`aiosqlite.Row`, or slotted dataclass) through a per-type getter, and only
+evaluate the fields selected by the requested `tags:` set. The selection is
+compiled once per tag set into a tuple of small projection steps.
 """
 
 from __future__ import annotations
 
+import functools
 import logging
-from dataclasses import asdict, is_dataclass
+import sqlite3
+from collections.abc import Callable, Mapping
+from dataclasses import fields, is_dataclass
 from typing import Any
 
+from resonance.core.db.models import sort_key
+
 logger = logging.getLogger(__name__)
 
 
@@ -20,6 +30,9 @@ def to_dict(row: Any) -> dict[str, Any]:
     """
     Convert a row (dict or dataclass) to a dictionary.
 
+    Dataclasses are converted shallowly (no recursive deep copy), which is all
+    our flat DB row types need.
+
     Args:
         row: Either a dict or a dataclass instance
 
@@ -29,7 +42,9 @@ def to_dict(row: Any) -> dict[str, Any]:
     if isinstance(row, dict):
         return row
     if is_dataclass(row) and not isinstance(row, type):
-        return asdict(row)
+        return {f.name: getattr(row, f.name) for f in fields(row)}
+    if isinstance(row, sqlite3.Row):
+        return dict(zip(row.keys(), row, strict=True))
     # Try to convert via __dict__ as fallback
     if hasattr(row, "__dict__"):
         return dict(row.__dict__)
@@ -270,6 +285,80 @@ ROLE_TAG_MAP: dict[str, str] = {
 }
 
 
+# -----------------------------------------------------------------------------
+# Row access
+# -----------------------------------------------------------------------------
+
+RowGetter = Callable[[Any, str, Any], Any]
+
+
+def _get_from_mapping(row: Any, key: str, default: Any = None) -> Any:
+    return row.get(key, default)
+
+
+def _get_from_sqlite_row(row: Any, key: str, default: Any = None) -> Any:
+    try:
+        return row[key]
+    except (IndexError, KeyError):
+        return default
+
+
+def _get_from_attrs(row: Any, key: str, default: Any = None) -> Any:
+    return getattr(row, key, default)
+
+
+def _get_via_dict(row: Any, key: str, default: Any = None) -> Any:
+    return to_dict(row).get(key, default)
+
+
+_ROW_GETTERS: dict[type, RowGetter] = {}
+
+
+def row_getter(row: Any) -> RowGetter:
+    """
+    Return a `get(row, key, default)` accessor for the row's type.
+
+    The accessor mirrors `dict.get` semantics without materializing a dict.
+    It is resolved once per row type and then reused.
+    """
+    row_type = type(row)
+    getter = _ROW_GETTERS.get(row_type)
+    if getter is None:
+        if isinstance(row, Mapping):
+            getter = _get_from_mapping
+        elif isinstance(row, sqlite3.Row):
+            getter = _get_from_sqlite_row
+        elif is_dataclass(row) or hasattr(row, "__dict__") or hasattr(row_type, "__slots__"):
+            getter = _get_from_attrs
+        else:
+            getter = _get_via_dict
+        _ROW_GETTERS[row_type] = getter
+    return getter
+
+
+def _tags_key(tags: set[str] | frozenset[str] | None, include_all: bool) -> frozenset[str] | None:
+    """Normalize a tags selection into a hashable plan key (None = all fields)."""
+    if include_all or tags is None:
+        return None
+    if isinstance(tags, frozenset):
+        return tags
+    return frozenset(tags)
+
+
+def _wants(tags: frozenset[str] | None, *chars: str) -> bool:
+    return tags is None or any(c in tags for c in chars)
+
+
+def text_key(name: str | None) -> str | None:
+    """Jump-index letter for `name`; from its sort key, like the list order."""
+    key = sort_key(name)
+    return key[0].upper() if key else None
+
+
+# Projection steps write into `item`; signature: (get, row, item, server_url).
+ProjectionStep = Callable[[RowGetter, Any, dict[str, Any], str], None]
+
+
 def build_artist_item(
     row: Any,
     tags: set[str] | None = None,
@@ -279,40 +368,93 @@ def build_artist_item(
     Build an artist loop item from a database row.
 
     Args:
-        row: Database result row (dict or dataclass)
+        row: Database result row (dict, sqlite row, or dataclass)
         tags: Set of tag characters to include (None = all)
         include_all: If True, include all fields regardless of tags
 
     Returns:
         LMS-format artist item
     """
-    row_dict = to_dict(row)
+    get = row_getter(row)
     item: dict[str, Any] = {}
 
     # Always include id
-    item["id"] = row_dict.get("id")
+    item["id"] = get(row, "id", None)
 
     # Name is always included as "artist"
-    item["artist"] = row_dict.get("name", row_dict.get("artist", ""))
-
-    if include_all or tags is None or "s" in tags:
-        # 's' is the standard tag for artists
-        pass  # id already included
+    name = get(row, "name", get(row, "artist", ""))
+    item["artist"] = name
 
     if include_all or tags is None:
-        if row_dict.get("album_count") is not None:
-            item["albums"] = row_dict["album_count"]
-        if row_dict.get("track_count") is not None:
-            item["track_count"] = row_dict["track_count"]
+        album_count = get(row, "album_count", None)
+        if album_count is not None:
+            item["albums"] = album_count
+        track_count = get(row, "track_count", None)
+        if track_count is not None:
+            item["track_count"] = track_count
 
     # Generate textkey (first letter for indexing)
-    name = row_dict.get("name", row_dict.get("artist", ""))
-    if name:
-        item["textkey"] = name[0].upper()
+    textkey = text_key(name)
+    if textkey:
+        item["textkey"] = textkey
 
     return item
 
 
+# -----------------------------------------------------------------------------
+# Album projection
+# -----------------------------------------------------------------------------
+
+
+def _album_artist(get: RowGetter, row: Any, item: dict[str, Any], _server_url: str) -> None:
+    # DB queries return 'artist' in some dict results, 'artist_name' in others
+    artist = get(row, "artist_name", get(row, "artist", None))
+    if artist:
+        item["artist"] = artist
+
+
+def _album_year(get: RowGetter, row: Any, item: dict[str, Any], _server_url: str) -> None:
+    year = get(row, "year", None)
+    if year:
+        item["year"] = year
+
+
+def _album_artist_id(get: RowGetter, row: Any, item: dict[str, Any], _server_url: str) -> None:
+    artist_id = get(row, "artist_id", None)
+    if artist_id:
+        item["artist_id"] = artist_id
+
+
+def _album_track_count(get: RowGetter, row: Any, item: dict[str, Any], _server_url: str) -> None:
+    track_count = get(row, "track_count", None)
+    if track_count is not None:
+        item["tracks"] = track_count
+
+
+def _album_artwork(_get: RowGetter, _row: Any, item: dict[str, Any], server_url: str) -> None:
+    album_id = item["id"]
+    if album_id and server_url:
+        item["artwork_track_id"] = album_id
+        item["artwork_url"] = f"{server_url}/artwork/{album_id}"
+
+
+@functools.lru_cache(maxsize=256)
+def _album_plan(tags: frozenset[str] | None) -> tuple[ProjectionStep, ...]:
+    """Compile the album projection for a tags selection."""
+    steps: list[ProjectionStep] = []
+    if _wants(tags, "a"):
+        steps.append(_album_artist)
+    if _wants(tags, "y"):
+        steps.append(_album_year)
+    if _wants(tags, "S"):
+        steps.append(_album_artist_id)
+    if tags is None:
+        steps.append(_album_track_count)
+    if _wants(tags, "j", "J"):
+        steps.append(_album_artwork)
+    return tuple(steps)
+
+
 def build_album_item(
     row: Any,
     tags: set[str] | None = None,
@@ -323,7 +465,7 @@ def build_album_item(
     Build an album loop item from a database row.
 
     Args:
-        row: Database result row (dict or dataclass)
+        row: Database result row (dict, sqlite row, or dataclass)
         tags: Set of tag characters to include (None = all)
         include_all: If True, include all fields regardless of tags
         server_url: Base URL for artwork
@@ -331,48 +473,177 @@ def build_album_item(
     Returns:
         LMS-format album item
     """
-    row_dict = to_dict(row)
-    item: dict[str, Any] = {}
+    get = row_getter(row)
 
     # Always include id and album title
     # DB queries return 'name' for album title in some cases, 'title' in others
-    item["id"] = row_dict.get("id")
-    item["album"] = row_dict.get("title", row_dict.get("name", row_dict.get("album", "")))
+    item: dict[str, Any] = {
+        "id": get(row, "id", None),
+        "album": get(row, "title", get(row, "name", get(row, "album", ""))),
+    }
 
-    if include_all or tags is None or "a" in tags:
-        # DB queries return 'artist' in some dict results, 'artist_name' in others
-        artist = row_dict.get("artist_name", row_dict.get("artist"))
-        if artist:
-            item["artist"] = artist
+    for step in _album_plan(_tags_key(tags, include_all)):
+        step(get, row, item, server_url)
 
-    if include_all or tags is None or "y" in tags:
-        year = row_dict.get("year")
-        if year:
-            item["year"] = year
+    # Generate textkey
+    textkey = text_key(get(row, "title", get(row, "album", "")))
+    if textkey:
+        item["textkey"] = textkey
 
-    if include_all or tags is None or "S" in tags:
-        artist_id = row_dict.get("artist_id")
-        if artist_id:
-            item["artist_id"] = artist_id
+    return item
 
-    if include_all or tags is None:
-        track_count = row_dict.get("track_count")
-        if track_count is not None:
-            item["tracks"] = track_count
 
-    # Artwork
-    if include_all or tags is None or "j" in tags or "J" in tags:
-        album_id = row_dict.get("id")
-        if album_id and server_url:
-            item["artwork_track_id"] = album_id
-            item["artwork_url"] = f"{server_url}/artwork/{album_id}"
+# -----------------------------------------------------------------------------
+# Track projection
+# -----------------------------------------------------------------------------
+
+# File extension -> LMS content type
+TRACK_TYPE_MAP: dict[str, str] = {
+    "mp3": "mp3",
+    "flac": "flc",
+    "ogg": "ogg",
+    "m4a": "aac",
+    "m4b": "aac",
+    "wav": "wav",
+    "aiff": "aif",
+    "aif": "aif",
+    "opus": "ops",
+}
 
-    # Generate textkey
-    title = row_dict.get("title", row_dict.get("album", ""))
-    if title:
-        item["textkey"] = title[0].upper()
 
-    return item
+def _track_artist(get: RowGetter, row: Any, item: dict[str, Any], _server_url: str) -> None:
+    artist = get(row, "artist_name", get(row, "artist", None))
+    if artist:
+        item["artist"] = artist
+
+
+def _track_album(get: RowGetter, row: Any, item: dict[str, Any], _server_url: str) -> None:
+    album = get(row, "album_title", get(row, "album", None))
+    if album:
+        item["album"] = album
+
+
+def _track_year(get: RowGetter, row: Any, item: dict[str, Any], _server_url: str) -> None:
+    year = get(row, "year", None)
+    if year:
+        item["year"] = year
+
+
+def _track_duration(get: RowGetter, row: Any, item: dict[str, Any], _server_url: str) -> None:
+    duration_ms = get(row, "duration_ms", None)
+    if duration_ms is not None:
+        item["duration"] = duration_ms / 1000.0  # Convert to seconds
+
+
+def _track_tracknum(get: RowGetter, row: Any, item: dict[str, Any], _server_url: str) -> None:
+    track_no = get(row, "track_no", None)
+    if track_no is not None:
+        item["tracknum"] = track_no
+
+
+def _track_disc(get: RowGetter, row: Any, item: dict[str, Any], _server_url: str) -> None:
+    disc_no = get(row, "disc_no", None)
+    if disc_no is not None:
+        item["disc"] = disc_no
+
+
+def _track_artist_id(get: RowGetter, row: Any, item: dict[str, Any], _server_url: str) -> None:
+    artist_id = get(row, "artist_id", None)
+    if artist_id is not None:
+        item["artist_id"] = artist_id
+
+
+def _track_album_id(get: RowGetter, row: Any, item: dict[str, Any], _server_url: str) -> None:
+    album_id = get(row, "album_id", None)
+    if album_id is not None:
+        item["album_id"] = album_id
+
+
+def _track_url(get: RowGetter, row: Any, item: dict[str, Any], _server_url: str) -> None:
+    # URL is ALWAYS included when available (needed for playback)
+    # Note: 'u' tag controls inclusion, but url is critical for playback
+    path = get(row, "path", None)
+    if path:
+        item["url"] = path  # Use actual path for LMS compat
+
+
+def _track_type(get: RowGetter, row: Any, item: dict[str, Any], _server_url: str) -> None:
+    path = get(row, "path", "")
+    if path:
+        # Determine format from file extension
+        ext = path.rsplit(".", 1)[-1].lower() if "." in path else ""
+        item["type"] = TRACK_TYPE_MAP.get(ext, ext)
+
+
+def _track_bitrate(get: RowGetter, row: Any, item: dict[str, Any], _server_url: str) -> None:
+    bitrate = get(row, "bitrate", None)
+    if bitrate:
+        item["bitrate"] = bitrate
+
+
+def _track_samplerate(get: RowGetter, row: Any, item: dict[str, Any], _server_url: str) -> None:
+    sample_rate = get(row, "sample_rate", None)
+    if sample_rate:
+        item["samplerate"] = sample_rate
+
+
+def _track_samplesize(get: RowGetter, row: Any, item: dict[str, Any], _server_url: str) -> None:
+    bit_depth = get(row, "bit_depth", None)
+    if bit_depth:
+        item["samplesize"] = bit_depth
+
+
+def _track_channels(get: RowGetter, row: Any, item: dict[str, Any], _server_url: str) -> None:
+    channels = get(row, "channels", None)
+    if channels:
+        item["channels"] = channels
+
+
+def _track_artwork(get: RowGetter, row: Any, item: dict[str, Any], server_url: str) -> None:
+    album_id = get(row, "album_id", None)
+    if album_id and server_url:
+        item["coverart"] = 1
+        item["artwork_track_id"] = item["id"]
+        item["artwork_url"] = f"{server_url}/artwork/{album_id}"
+
+
+@functools.lru_cache(maxsize=256)
+def _track_plan(tags: frozenset[str] | None) -> tuple[ProjectionStep, ...]:
+    """
+    Compile the track projection for a tags selection.
+
+    Step order matches the key order clients have always received.
+    """
+    steps: list[ProjectionStep] = []
+    if _wants(tags, "a"):
+        steps.append(_track_artist)
+    if _wants(tags, "l"):
+        steps.append(_track_album)
+    if _wants(tags, "y"):
+        steps.append(_track_year)
+    if _wants(tags, "d"):
+        steps.append(_track_duration)
+    if _wants(tags, "n"):
+        steps.append(_track_tracknum)
+    if _wants(tags, "i"):
+        steps.append(_track_disc)
+    if _wants(tags, "s"):
+        steps.append(_track_artist_id)
+    if _wants(tags, "e"):
+        steps.append(_track_album_id)
+    steps.append(_track_url)
+    if _wants(tags, "o"):
+        steps.append(_track_type)
+    if _wants(tags, "r"):
+        steps.append(_track_bitrate)
+    if _wants(tags, "T"):
+        steps.append(_track_samplerate)
+    if _wants(tags, "I"):
+        steps.append(_track_samplesize)
+    steps.append(_track_channels)
+    if _wants(tags, "j", "J", "K"):
+        steps.append(_track_artwork)
+    return tuple(steps)
 
 
 def build_track_item(
@@ -385,7 +656,7 @@ def build_track_item(
     Build a track/title loop item from a database row.
 
     Args:
-        row: Database result row (dict or dataclass)
+        row: Database result row (dict, sqlite row, or dataclass)
         tags: Set of tag characters to include (None = all)
         include_all: If True, include all fields regardless of tags
         server_url: Base URL for streaming and artwork
@@ -393,110 +664,19 @@ def build_track_item(
     Returns:
         LMS-format track item
     """
-    row_dict = to_dict(row)
-    item: dict[str, Any] = {}
+    get = row_getter(row)
 
     # Always include id and title
-    item["id"] = row_dict.get("id")
-    item["title"] = row_dict.get("title", "")
-
-    if include_all or tags is None or "a" in tags:
-        artist = row_dict.get("artist_name", row_dict.get("artist"))
-        if artist:
-            item["artist"] = artist
-
-    if include_all or tags is None or "l" in tags:
-        album = row_dict.get("album_title", row_dict.get("album"))
-        if album:
-            item["album"] = album
-
-    if include_all or tags is None or "y" in tags:
-        year = row_dict.get("year")
-        if year:
-            item["year"] = year
-
-    if include_all or tags is None or "d" in tags:
-        duration_ms = row_dict.get("duration_ms")
-        if duration_ms is not None:
-            item["duration"] = duration_ms / 1000.0  # Convert to seconds
-
-    if include_all or tags is None or "n" in tags:
-        track_no = row_dict.get("track_no")
-        if track_no is not None:
-            item["tracknum"] = track_no
-
-    if include_all or tags is None or "i" in tags:
-        disc_no = row_dict.get("disc_no")
-        if disc_no is not None:
-            item["disc"] = disc_no
-
-    if include_all or tags is None or "s" in tags:
-        artist_id = row_dict.get("artist_id")
-        if artist_id is not None:
-            item["artist_id"] = artist_id
-
-    if include_all or tags is None or "e" in tags:
-        album_id = row_dict.get("album_id")
-        if album_id is not None:
-            item["album_id"] = album_id
-
-    # URL is ALWAYS included when available (needed for playback)
-    # Note: 'u' tag controls inclusion, but url is critical for playback
-    path = row_dict.get("path")
-    if path:
-        item["url"] = path  # Use actual path for LMS compat
-
-    # Audio quality metadata
-    if include_all or tags is None or "o" in tags:
-        path = row_dict.get("path", "")
-        if path:
-            # Determine format from file extension
-            ext = path.rsplit(".", 1)[-1].lower() if "." in path else ""
-            format_map = {
-                "mp3": "mp3",
-                "flac": "flc",
-                "ogg": "ogg",
-                "m4a": "aac",
-                "m4b": "aac",
-                "wav": "wav",
-                "aiff": "aif",
-                "aif": "aif",
-                "opus": "ops",
-            }
-            item["type"] = format_map.get(ext, ext)
-
-    if include_all or tags is None or "r" in tags:
-        bitrate = row_dict.get("bitrate")
-        if bitrate:
-            item["bitrate"] = bitrate
-
-    if include_all or tags is None or "T" in tags:
-        sample_rate = row_dict.get("sample_rate")
-        if sample_rate:
-            item["samplerate"] = sample_rate
-
-    if include_all or tags is None or "I" in tags:
-        bit_depth = row_dict.get("bit_depth")
-        if bit_depth:
-            item["samplesize"] = bit_depth
-
-    # Channels
-    channels = row_dict.get("channels")
-    if channels:
-        item["channels"] = channels
+    title = get(row, "title", "")
+    item: dict[str, Any] = {"id": get(row, "id", None), "title": title}
 
-    # Artwork
-    if include_all or tags is None or "j" in tags or "J" in tags or "K" in tags:
-        album_id = row_dict.get("album_id")
-        if album_id and server_url:
-            item["coverart"] = 1
-            item["artwork_track_id"] = row_dict.get("id")
-            item["artwork_url"] = f"{server_url}/artwork/{album_id}"
+    for step in _track_plan(_tags_key(tags, include_all)):
+        step(get, row, item, server_url)
 
     # Generate textkey
-    title = row_dict.get("title", "")
-    if title:
-        item["textkey"] = title[0].upper()
+    textkey = text_key(title)
+    if textkey:
+        item["textkey"] = textkey
 
     return item
 
@@ -510,26 +690,26 @@ def build_genre_item(
     Build a genre loop item from a database row.
 
     Args:
-        row: Database result row (dict or dataclass)
+        row: Database result row (dict, sqlite row, or dataclass)
         tags: Set of tag characters to include (None = all)
         include_all: If True, include all fields regardless of tags
 
     Returns:
         LMS-format genre item
     """
-    row_dict = to_dict(row)
+    get = row_getter(row)
     item: dict[str, Any] = {}
 
     # Always include id
-    item["id"] = row_dict.get("id")
+    item["id"] = get(row, "id", None)
 
     # Genre name is included unless tags gating excludes it
     # tags:i means only id, so we check if tags is set and doesn't include genre indicators
     if include_all or tags is None or "g" in tags:
-        item["genre"] = row_dict.get("name", row_dict.get("genre", ""))
+        item["genre"] = get(row, "name", get(row, "genre", ""))
 
     if include_all or tags is None:
-        track_count = row_dict.get("track_count")
+        track_count = get(row, "track_count", None)
         if track_count is not None:
             item["tracks"] = track_count
 
@@ -545,22 +725,22 @@ def build_role_item(
     Build a role loop item from a database row.
 
     Args:
-        row: Database result row (dict or dataclass)
+        row: Database result row (dict, sqlite row, or dataclass)
         tags: Set of tag characters to include (None = all)
         include_all: If True, include all fields regardless of tags
 
     Returns:
         LMS-format role item
     """
-    row_dict = to_dict(row)
+    get = row_getter(row)
     item: dict[str, Any] = {}
 
     # Always include id as role_id for LMS compatibility
-    item["role_id"] = row_dict.get("id")
+    item["role_id"] = get(row, "id", None)
 
     # Include role_name if tags include 't' (text/title) or no tags specified
     if include_all or tags is None or "t" in tags:
-        item["role_name"] = row_dict.get("name", row_dict.get("role", ""))
+        item["role_name"] = get(row, "name", get(row, "role", ""))
 
     return item
 
@@ -0,0 +1,135 @@
+"""
+Response cache for read-only library commands.
+
+Browse commands (`artists`, `albums`, `titles`, `genres`, and the Jive
+`browselibrary` wrappers) only change when the library content changes.
+Several controllers opening the same menu would otherwise hit SQLite and
+rebuild identical loop items every time.
+
+Design:
+- Bounded LRU of fully built command results.
+- Keys are (command, normalized params, server_url, library generation).
+  `LibraryDb.generation` is bumped on every content write, so entries from an
+  older generation are simply never looked up again and age out of the LRU.
+- Cached results are shared between callers and must be treated as read-only.
+"""
+
+from __future__ import annotations
+
+import functools
+import logging
+from collections import OrderedDict
+from collections.abc import Callable, Coroutine, Hashable
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from resonance.web.handlers import CommandContext
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 512
+
+CommandHandler = Callable[["CommandContext", list[Any]], Coroutine[Any, Any, dict[str, Any]]]
+
+
+class ResponseCache:
+    """Bounded LRU of built command results."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        if max_entries <= 0:
+            raise ValueError("max_entries must be > 0")
+        self._max_entries = max_entries
+        self._entries: OrderedDict[Hashable, dict[str, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> dict[str, Any] | None:
+        """Return the cached result for `key` (and mark it recently used)."""
+        result = self._entries.get(key)
+        if result is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return result
+
+    def put(self, key: Hashable, result: dict[str, Any]) -> None:
+        """Store a result, evicting the least recently used entry if full."""
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all entries (e.g. on `wipecache`)."""
+        self._entries.clear()
+
+
+def normalize_command(command: list[Any]) -> tuple[Hashable, ...]:
+    """
+    Normalize a command array into a hashable, order-independent key.
+
+    - Positional arguments keep their order (command name, start, items, ...).
+    - Tagged `key:value` arguments are sorted, so filter order does not matter.
+    - The `tags:` value is reduced to its sorted character set.
+    - Dict arguments (Jive sometimes sends params as objects) are flattened
+      into tagged pairs.
+    """
+    positional: list[Hashable] = []
+    tagged: dict[str, str] = {}
+
+    for arg in command:
+        if isinstance(arg, dict):
+            for k, v in arg.items():
+                tagged[str(k)] = str(v)
+        elif isinstance(arg, str) and ":" in arg:
+            k, v = arg.split(":", 1)
+            tagged[k] = v
+        else:
+            positional.append(str(arg))
+
+    if "tags" in tagged:
+        tagged["tags"] = "".join(sorted(set(tagged["tags"])))
+
+    return (tuple(positional), tuple(sorted(tagged.items())))
+
+
+def cached_command(handler: CommandHandler) -> CommandHandler:
+    """
+    Serve a read-only library command from `ctx.response_cache` when possible.
+
+    The library generation is captured before the handler runs. If it changes
+    while the handler awaits the DB (e.g. a scan is upserting), the result is
+    returned but not cached.
+    """
+
+    @functools.wraps(handler)
+    async def wrapper(ctx: CommandContext, params: list[Any]) -> dict[str, Any]:
+        cache = ctx.response_cache
+        if cache is None:
+            return await handler(ctx, params)
+
+        generation = ctx.music_library.generation
+        key = (
+            handler.__name__,
+            normalize_command(params),
+            f"{ctx.server_host}:{ctx.server_port}",
+            generation,
+        )
+
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+        result = await handler(ctx, params)
+        if "error" not in result and ctx.music_library.generation == generation:
+            cache.put(key, result)
+        return result
+
+    return wrapper
+
+
+__all__ = ["DEFAULT_MAX_ENTRIES", "ResponseCache", "cached_command", "normalize_command"]
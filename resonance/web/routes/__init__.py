@@ -2,18 +2,22 @@
 Web Routes Package.
 
 This package contains FastAPI route modules:
+- admin: Token-protected diagnostics (/api/admin/*)
 - api: REST API endpoints (/api/*)
 - streaming: Audio streaming (/stream.mp3)
 - cometd: Bayeux long-polling (/cometd)
 - artwork: Album artwork (/artwork/*)
+- auth: Admin Bearer-token check shared by admin and debug routes
 """
 
+from resonance.web.routes.admin import register_admin_routes
 from resonance.web.routes.api import register_api_routes
 from resonance.web.routes.artwork import register_artwork_routes
 from resonance.web.routes.cometd import register_cometd_routes
 from resonance.web.routes.streaming import register_streaming_routes
 
 __all__ = [
+    "register_admin_routes",
     "register_api_routes",
     "register_artwork_routes",
     "register_cometd_routes",
@@ -0,0 +1,154 @@
+"""
+Admin Routes for Resonance.
+
+Diagnostics that expose stacks and source locations of the live process, so
+they require ``Authorization: Bearer <token>`` (``--admin-token``):
+- /api/admin/stalls: Event-loop stalls caught by the watchdog, with stacks
+- /api/admin/profile: Time-boxed sampling profile (collapsed stacks)
+- /api/admin/sql: SQL tracing (top statements, slow-query log with plans)
+
+Without a configured token these endpoints answer 403.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import PlainTextResponse
+
+from resonance.core.db.tracing import DEFAULT_TOP_N, sql_tracer
+from resonance.core.profiling import (
+    DEFAULT_SAMPLE_INTERVAL,
+    ProfilerBusyError,
+    loop_watchdog,
+    sample_profile,
+)
+from resonance.web.routes.auth import require_admin, set_admin_token
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(tags=["admin"])
+
+
+def register_admin_routes(app, admin_token: str | None = None) -> None:
+    """
+    Register admin routes with the FastAPI app.
+
+    Args:
+        app: FastAPI application instance
+        admin_token: Bearer token required by every admin endpoint
+    """
+    set_admin_token(admin_token)
+    app.include_router(router)
+
+
+@router.get("/api/admin/stalls")
+async def get_stalls(request: Request, limit: int | None = None) -> dict[str, Any]:
+    """Recorded event-loop stalls, newest first.
+
+    Query params:
+        limit: Only the newest N stalls
+    """
+    require_admin(request)
+    return {
+        "watching": loop_watchdog.running,
+        "threshold_ms": loop_watchdog.threshold * 1000,
+        "stalls": loop_watchdog.stalls(limit),
+    }
+
+
+@router.get("/api/admin/profile", response_model=None)
+async def profile(
+    request: Request,
+    seconds: float = 5.0,
+    interval_ms: float = DEFAULT_SAMPLE_INTERVAL * 1000,
+    threads: str = "loop",
+    format: str = "collapsed",
+) -> PlainTextResponse | dict[str, Any]:
+    """Sample the live process and return flamegraph-ready stacks.
+
+    Query params:
+        seconds: Profile length (at most 60)
+        interval_ms: Sampling interval
+        threads: "loop" (event-loop thread only) or "all"
+        format: "collapsed" (flamegraph.pl / speedscope) or "json"
+    """
+    require_admin(request)
+    if threads not in ("loop", "all") or format not in ("collapsed", "json"):
+        raise HTTPException(status_code=400, detail="threads=loop|all, format=collapsed|json")
+
+    try:
+        result = await sample_profile(
+            seconds, interval=interval_ms / 1000, all_threads=threads == "all"
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e)) from e
+
+    logger.info("Profiled %s thread(s) for %.1fs (%d samples)", threads, seconds, result.samples)
+    if format == "json":
+        return {
+            "seconds": result.seconds,
+            "interval_ms": result.interval * 1000,
+            "samples": result.samples,
+            "stacks": dict(result.stacks.most_common()),
+        }
+    return PlainTextResponse(result.collapsed())
+
+
+@router.get("/api/admin/sql")
+async def get_sql_trace(
+    request: Request, n: int = DEFAULT_TOP_N, by: str = "total", limit: int | None = None
+) -> dict[str, Any]:
+    """Top statements and the slow-query log (newest first).
+
+    Query params:
+        n: Number of top statements
+        by: Ranking: "total", "max", "mean", "calls" or "rows"
+        limit: Only the newest N slow-log entries
+    """
+    require_admin(request)
+    try:
+        top = sql_tracer.top(n, by)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    return {
+        "enabled": sql_tracer.enabled,
+        "slow_ms": sql_tracer.slow_ms,
+        "top": top,
+        "slow": sql_tracer.slow_log(limit),
+    }
+
+
+@router.post("/api/admin/sql")
+async def configure_sql_trace(request: Request) -> dict[str, Any]:
+    """Enable, disable or clear SQL tracing.
+
+    Request body: {"enabled": true, "slow_ms": 50, "clear": false}
+    """
+    require_admin(request)
+    try:
+        body = await request.json()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail="Body must be a JSON object") from e
+    if not isinstance(body, dict):
+        raise HTTPException(status_code=400, detail="Body must be a JSON object")
+    slow_ms = body.get("slow_ms")
+    if slow_ms is not None and (
+        not isinstance(slow_ms, int | float) or isinstance(slow_ms, bool) or slow_ms < 0
+    ):
+        raise HTTPException(status_code=400, detail="slow_ms must be a non-negative number")
+
+    if body.get("clear"):
+        sql_tracer.clear()
+    if body.get("enabled") is True:
+        sql_tracer.enable(slow_ms=slow_ms)
+    elif body.get("enabled") is False:
+        sql_tracer.log_summary()
+        sql_tracer.disable()
+    elif slow_ms is not None:
+        sql_tracer.slow_ms = slow_ms
+    return {"enabled": sql_tracer.enabled, "slow_ms": sql_tracer.slow_ms}
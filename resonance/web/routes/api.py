@@ -6,6 +6,8 @@ Provides REST endpoints for the web UI and external integrations:
 - /api/players: Player management
 - /api/library/*: Library browsing and search
 - /api/artwork/*: Album artwork
+- /api/debug/frames: Recent Slimproto frames per player (frame tracer;
+  requires the admin token)
 """
 
 from __future__ import annotations
@@ -15,7 +17,10 @@ from typing import TYPE_CHECKING, Any
 
 from fastapi import APIRouter, HTTPException, Request
 
+from resonance.player.frame_trace import frame_tracer
+from resonance.streaming.scheduler import get_transcode_scheduler
 from resonance.web.jsonrpc_helpers import to_dict
+from resonance.web.routes.auth import require_admin
 
 if TYPE_CHECKING:
     from resonance.core.artwork import ArtworkManager
@@ -74,6 +79,7 @@ async def server_status() -> dict[str, Any]:
         "players_connected": len(players),
         "library_initialized": _music_library.initialized,
         "playlist_manager_available": _playlist_manager is not None,
+        "transcoding": get_transcode_scheduler().stats(),
     }
 
 
@@ -189,6 +195,7 @@ async def get_player_status(player_id: str) -> dict[str, Any]:
     if _playlist_manager is not None:
         playlist = _playlist_manager.get(player_id)
         if playlist is not None:
+            await playlist.hydrate_current()
             current = playlist.current_track
             if current is not None:
                 duration_sec = (current.duration_ms or 0) / 1000.0
@@ -257,6 +264,53 @@ async def debug_playlist(player_id: str) -> dict[str, Any]:
     }
 
 
+@router.get("/api/debug/frames")
+async def debug_frames(
+    request: Request, player: str | None = None, limit: int | None = None
+) -> dict[str, Any]:
+    """Dump the frame tracer's ring buffers, oldest frame first (admin token required).
+
+    Query params:
+        player: Only this player's frames (MAC address)
+        limit: Only the newest N frames per player
+    """
+    require_admin(request)
+    return frame_tracer.dump(player, limit)
+
+
+@router.post("/api/debug/frames")
+async def configure_frame_trace(request: Request) -> dict[str, Any]:
+    """Enable, disable or clear the frame tracer (admin token required).
+
+    Request body: {"enabled": true, "sample_every": 10, "capacity": 256, "clear": false}
+    Out-of-range sample_every/capacity values are clamped by the tracer.
+    """
+    require_admin(request)
+    try:
+        body = await request.json()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail="Body must be a JSON object") from e
+    if not isinstance(body, dict):
+        raise HTTPException(status_code=400, detail="Body must be a JSON object")
+    sample_every = body.get("sample_every")
+    capacity = body.get("capacity")
+    for value in (sample_every, capacity):
+        if value is not None and (not isinstance(value, int) or isinstance(value, bool)):
+            raise HTTPException(status_code=400, detail="sample_every/capacity must be integers")
+
+    if body.get("clear"):
+        frame_tracer.clear()
+    if body.get("enabled") is True:
+        frame_tracer.enable(sample_every=sample_every, capacity=capacity)
+    elif body.get("enabled") is False:
+        frame_tracer.disable()
+    return {
+        "enabled": frame_tracer.enabled,
+        "sample_every": frame_tracer.sample_every,
+        "capacity": frame_tracer.capacity,
+    }
+
+
 # =============================================================================
 # Library Endpoints
 # =============================================================================
@@ -619,18 +673,34 @@ async def get_scan_status() -> dict[str, Any]:
         "folders_done": status.folders_done,
         "tracks_found": status.tracks_found,
         "errors": status.errors,
+        "roots": [
+            {
+                "path": r.path,
+                "state": r.state,
+                "progress": r.progress,
+                "device": r.device,
+                "device_kind": r.device_kind,
+                "max_concurrency": r.max_concurrency,
+                "files_total": r.files_total,
+                "files_done": r.files_done,
+                "tracks_found": r.tracks_found,
+                "errors": r.errors,
+            }
+            for r in status.roots
+        ],
     }
 
 
 @router.post("/api/library/scan")
-async def trigger_scan() -> dict[str, Any]:
+async def trigger_scan(incremental: bool = False) -> dict[str, Any]:
     """Trigger a background library scan.
 
     This scans all configured music folders and updates the database.
     The scan runs in the background - use GET /library/scan to check status.
+    With `?incremental=true`, directories unchanged since the last scan are skipped.
     """
     if _music_library is None:
         raise HTTPException(status_code=503, detail="Library not initialized")
 
-    await _music_library.start_scan()
+    await _music_library.start_scan(incremental=incremental)
     return {"status": "scan_started"}
@@ -12,6 +12,7 @@ Provides endpoints for serving album artwork:
 from __future__ import annotations
 
 import hashlib
+import importlib.util
 import io
 import logging
 import re
@@ -20,12 +21,6 @@ from typing import TYPE_CHECKING, Any
 
 from fastapi import APIRouter, HTTPException, Request, Response
 
-try:
-    from PIL import Image
-    PIL_AVAILABLE = True
-except ImportError:
-    PIL_AVAILABLE = False
-
 from resonance.web.jsonrpc_helpers import to_dict
 
 if TYPE_CHECKING:
@@ -34,6 +29,9 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Pillow is imported on the first resize, not at startup.
+PIL_AVAILABLE = importlib.util.find_spec("PIL") is not None
+
 router = APIRouter(tags=["artwork"])
 
 # References set during route registration
@@ -283,6 +281,8 @@ def _resize_image(image_data: bytes, width: int | None, height: int | None, mode
         # Return original if PIL not available
         return image_data, "image/jpeg"
 
+    from PIL import Image
+
     try:
         img = Image.open(io.BytesIO(image_data))
 
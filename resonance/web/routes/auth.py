@@ -0,0 +1,48 @@
+"""
+Admin Authentication for Resonance Routes.
+
+Shared by every route that exposes or reconfigures diagnostics of the live
+process (/api/admin/*, /api/debug/frames):
+- set_admin_token: Configure the Bearer token (None disables those endpoints)
+- require_admin: Reject a request without ``Authorization: Bearer <token>``
+"""
+
+from __future__ import annotations
+
+import secrets
+from typing import TYPE_CHECKING
+
+from fastapi import HTTPException
+
+if TYPE_CHECKING:
+    from fastapi import Request
+
+# Bearer token set during route registration (None: admin endpoints disabled)
+_admin_token: str | None = None
+
+
+def set_admin_token(admin_token: str | None) -> None:
+    """Set the Bearer token required by `require_admin` (empty/None disables)."""
+    global _admin_token
+    _admin_token = admin_token or None
+
+
+def require_admin(request: Request) -> None:
+    """
+    Check the request's admin Bearer token.
+
+    Raises:
+        HTTPException: 403 when no token is configured, 401 when the request
+            does not carry it
+    """
+    if _admin_token is None:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled")
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not secrets.compare_digest(
+        token.strip().encode(), _admin_token.encode()
+    ):
+        raise HTTPException(
+            status_code=401,
+            detail="Invalid admin token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
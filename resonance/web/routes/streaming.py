@@ -14,19 +14,31 @@ import asyncio
 import logging
 import time
 from pathlib import Path
-from typing import TYPE_CHECKING, AsyncIterator
+from typing import TYPE_CHECKING, TypeVar
 
 from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import StreamingResponse
 
-from resonance.streaming.policy import needs_transcoding
-from resonance.streaming.transcoder import get_transcode_config, transcode_stream
+from resonance.core.metrics import Gauge, Metric, metrics
+from resonance.streaming.mp4index import get_sample_index, iter_adts
+from resonance.streaming.policy import StreamMode, resolve_stream_mode
 
 if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Iterable
+
+    from fastapi.responses import Response
+    from starlette.responses import Content
+
+    from resonance.player.client import DeviceType
+    from resonance.player.registry import PlayerRegistry
+    from resonance.streaming.prefetch import WarmStream
     from resonance.streaming.server import StreamingServer
+    from resonance.streaming.transcoder import TranscodeRule
 
 logger = logging.getLogger(__name__)
 
+_R = TypeVar("_R", bound="Response")
+
 router = APIRouter(tags=["streaming"])
 
 # If a transcoded stream ends extremely quickly, that can indicate a broken pipeline/teardown
@@ -39,13 +51,91 @@ router = APIRouter(tags=["streaming"])
 _SUSPICIOUS_TRANSCODE_EOF_BYTES = 2 * 1024 * 1024  # 2MB
 _SUSPICIOUS_TRANSCODE_EOF_SECONDS = 1.0            # 1s
 
+STREAM_TTFB_SECONDS = metrics.histogram(
+    "resonance_stream_ttfb_seconds",
+    "Time from a /stream.mp3 request to its first audio byte.",
+    ("mode",),
+)
+STREAM_BYTES = metrics.counter(
+    "resonance_stream_bytes_total",
+    "Audio bytes sent per player (use rate() for bytes/s).",
+    ("player",),
+)
+
+
+class _StreamMeter:
+    """Live counters of one /stream.mp3 response."""
+
+    __slots__ = ("bytes", "mode", "player", "started")
+
+    def __init__(self, player: str, mode: str) -> None:
+        self.player = player
+        self.mode = mode
+        self.started: float | None = None
+        self.bytes = 0
+
+
+_active_streams: set[_StreamMeter] = set()
+
+
+def _collect_stream_metrics() -> list[Metric]:
+    active = Gauge("resonance_streams_active", "Open /stream.mp3 responses.", ("mode",))
+    rate = Gauge(
+        "resonance_stream_bytes_per_second",
+        "Average send rate of each player's open stream since its first byte.",
+        ("player",),
+    )
+    now = time.perf_counter()
+    for meter in list(_active_streams):
+        active.inc(labels=(meter.mode,))
+        if meter.started is not None and now > meter.started:
+            rate.set(meter.bytes / (now - meter.started), (meter.player,))
+    return [active, rate]
+
+
+metrics.add_collector("streams", _collect_stream_metrics)
+
+
+def _metered(response: _R, player_mac: str, mode: str, requested_at: float) -> _R:
+    """Wrap a stream response's body to record TTFB, bytes and active streams."""
+    if not isinstance(response, StreamingResponse):
+        return response  # error responses are not streams
+    body = response.body_iterator
+
+    async def meter() -> AsyncIterator[Content]:
+        stream = _StreamMeter(player_mac, mode)
+        labels = (player_mac,)
+        _active_streams.add(stream)
+        try:
+            async for chunk in body:
+                if stream.started is None:
+                    stream.started = time.perf_counter()
+                    STREAM_TTFB_SECONDS.observe(stream.started - requested_at, (mode,))
+                stream.bytes += len(chunk)
+                STREAM_BYTES.inc(len(chunk), labels)
+                yield chunk
+        finally:
+            _active_streams.discard(stream)
+            aclose = getattr(body, "aclose", None)
+            if aclose is not None:
+                await aclose()
+
+    response.body_iterator = meter()
+    return response
+
+
 # Reference to StreamingServer, set during route registration
 _streaming_server: StreamingServer | None = None
 
+# Player registry for device-tier decisions (optional; unknown devices are
+# treated conservatively)
+_player_registry: PlayerRegistry | None = None
+
 
 def register_streaming_routes(
     app,
     streaming_server: StreamingServer | None = None,
+    player_registry: PlayerRegistry | None = None,
 ) -> None:
     """
     Register streaming routes with the FastAPI app.
@@ -53,16 +143,31 @@ def register_streaming_routes(
     Args:
         app: FastAPI application instance
         streaming_server: StreamingServer for file resolution (optional, falls back to app.state)
+        player_registry: PlayerRegistry for per-device stream modes (optional,
+            falls back to app.state)
     """
-    global _streaming_server
+    global _streaming_server, _player_registry
     # Use provided streaming_server or fall back to app.state
     if streaming_server is not None:
         _streaming_server = streaming_server
     elif hasattr(app, "state") and hasattr(app.state, "streaming_server"):
         _streaming_server = app.state.streaming_server
+    if player_registry is None and hasattr(app, "state"):
+        player_registry = getattr(app.state, "player_registry", None)
+    _player_registry = player_registry
     app.include_router(router)
 
 
+async def _device_type_for(player_mac: str) -> DeviceType | None:
+    """Device type of a connected player, or None if unknown."""
+    if _player_registry is None:
+        return None
+    player = await _player_registry.get_by_mac(player_mac)
+    if player is None:
+        return None
+    return player.info.device_type
+
+
 @router.get("/stream.mp3")
 async def stream_audio(
     request: Request,
@@ -76,7 +181,8 @@ async def stream_audio(
     the player's current playlist.
 
     Decision logic (shared policy):
-    - Uses `resonance.streaming.policy.needs_transcoding()` as the single source of truth.
+    - Uses `resonance.streaming.policy.resolve_stream_mode()` as the single source of
+      truth, the same call `PlayerClient.start_track()` uses for the `strm` format.
 
     Args:
         request: The FastAPI request.
@@ -89,6 +195,7 @@ async def stream_audio(
     Raises:
         HTTPException: 404 if no file is available for the player.
     """
+    requested_at = time.perf_counter()
     if _streaming_server is None:
         raise HTTPException(status_code=503, detail="Streaming server not initialized")
 
@@ -104,16 +211,148 @@ async def stream_audio(
         raise HTTPException(status_code=404, detail=f"File not found: {file_path}")
 
     file_size = file_path.stat().st_size
-    suffix = file_path.suffix.lower()
 
     # Get Range header from request
     range_header = request.headers.get("range")
 
-    # Check if we need to transcode
-    if needs_transcoding(suffix, device_type=None):
-        return await _stream_with_transcoding(request, player, file_path)
+    # Gapless track change: the stream was started before the track boundary.
+    if range_header is None:
+        warm = _streaming_server.take_prefetched(player, file_path)
+        if warm is not None:
+            return _metered(_stream_warm(request, player, warm), player, "prefetched", requested_at)
+
+    mode = await resolve_stream_mode(file_path, await _device_type_for(player))
+    if mode is StreamMode.REMUX:
+        response = await _stream_remuxed(request, player, file_path)
+    elif mode is StreamMode.TRANSCODE:
+        response = await _stream_with_transcoding(request, player, file_path)
     else:
-        return await _stream_direct(request, player, file_path, file_size, range_header)
+        response = await _stream_direct(request, player, file_path, file_size, range_header)
+    return _metered(response, player, mode.value, requested_at)
+
+
+async def _seek_source(
+    file_path: Path,
+    rule: TranscodeRule,
+    start_seconds: float | None,
+    end_seconds: float | None,
+) -> Iterable[bytes] | None:
+    """
+    ADTS source cut at the seek position, for rules that can read stdin.
+
+    With the MP4 sample table we know the exact sample (and byte offset) to
+    start from, so the decoder never has to parse and skip through the
+    container itself. Returns None to fall back to decoder-side seeking
+    (ALAC, unindexable files, rules without the ``I`` capability).
+    """
+    if not start_seconds or "I" not in rule.capabilities:
+        return None
+    index = await get_sample_index(file_path)
+    if index is None or index.adts is None:
+        return None
+    start = index.seek(start_seconds).sample
+    end = None
+    if end_seconds is not None and end_seconds < index.seconds:
+        end = index.sample_at(end_seconds) + 1
+    logger.debug("[STREAM] %s: seeking via sample table to sample %d", file_path.name, start)
+    return iter_adts(file_path, index, start, end)
+
+
+def _stream_warm(request: Request, player_mac: str, warm: WarmStream) -> StreamingResponse:
+    """Serve a prefetched stream: buffered bytes first, then its live source."""
+    if _streaming_server is None:
+        raise HTTPException(status_code=503, detail="Streaming server not initialized")
+    cancel_token = _streaming_server.get_cancellation_token(player_mac)
+
+    async def generate() -> AsyncIterator[bytes]:
+        try:
+            async for chunk in warm.stream():
+                if await request.is_disconnected():
+                    logger.info("Stream client disconnected for player %s (prefetched)", player_mac)
+                    return
+                if cancel_token and cancel_token.cancelled:
+                    logger.info("[STREAM] Stream cancelled for player %s (prefetched)", player_mac)
+                    return
+                yield chunk
+        except Exception as e:
+            logger.exception("Prefetched stream error for %s: %s", warm.path, e)
+        finally:
+            await warm.aclose()
+
+    logger.info(
+        "[STREAM] player=%s serving prefetched %s (%s, %d bytes buffered)",
+        player_mac,
+        warm.path.name,
+        warm.mode.value,
+        warm.buffered,
+    )
+    return StreamingResponse(generate(), media_type=warm.media_type, headers=warm.headers)
+
+
+async def _stream_remuxed(
+    request: Request,
+    player_mac: str,
+    file_path: Path,
+) -> StreamingResponse:
+    """
+    Stream the AAC track of an MP4 file as ADTS, without decoding.
+
+    Frames are copied straight from the sample table, so the cost per listener
+    is a file read and a 7-byte header per frame instead of a decoder and an
+    encoder process. Seeks start at the exact sample from the index.
+    """
+    if _streaming_server is None:
+        raise HTTPException(status_code=503, detail="Streaming server not initialized")
+
+    index = await get_sample_index(file_path)
+    if index is None or index.adts is None:
+        # resolve_stream_mode() only picks REMUX for indexable AAC files; the file
+        # must have changed underneath us.
+        raise HTTPException(status_code=409, detail="File can no longer be remuxed")
+
+    seek_pos = _streaming_server.get_seek_position(player_mac)
+    start_sample = 0
+    end_sample = None
+    if seek_pos is not None:
+        start_seconds, end_seconds = seek_pos
+        start_sample = index.seek(start_seconds).sample
+        if end_seconds is not None and end_seconds < index.seconds:
+            end_sample = index.sample_at(end_seconds) + 1
+        _streaming_server.clear_seek_position(player_mac)
+
+    cancel_token = _streaming_server.get_cancellation_token(player_mac)
+    frames = iter_adts(file_path, index, start_sample, end_sample)
+
+    async def generate() -> AsyncIterator[bytes]:
+        try:
+            while (chunk := await asyncio.to_thread(next, frames, None)) is not None:
+                if await request.is_disconnected():
+                    logger.info("Stream client disconnected for player %s (remux)", player_mac)
+                    return
+                if cancel_token and cancel_token.cancelled:
+                    logger.info("[STREAM] Stream cancelled for player %s (remux)", player_mac)
+                    return
+                yield chunk
+        except Exception as e:
+            logger.exception("Remux error for %s: %s", file_path, e)
+        finally:
+            # Releases the file handle now rather than at garbage collection.
+            await asyncio.to_thread(frames.close)
+
+    logger.info(
+        "[STREAM] player=%s remuxing %s to ADTS from sample %d",
+        player_mac,
+        file_path.name,
+        start_sample,
+    )
+    return StreamingResponse(
+        generate(),
+        media_type="audio/aac",
+        headers={
+            "Accept-Ranges": "none",  # Seeks go through the sample index, not byte ranges
+            "X-Content-Type-Options": "nosniff",
+        },
+    )
 
 
 async def _stream_with_transcoding(
@@ -133,6 +372,8 @@ async def _stream_with_transcoding(
     if _streaming_server is None:
         raise HTTPException(status_code=503, detail="Streaming server not initialized")
 
+    from resonance.streaming.transcoder import get_transcode_config, transcode_stream
+
     # Get file extension and find transcoding rule
     suffix = file_path.suffix.lower().lstrip(".")
     config = get_transcode_config()
@@ -144,6 +385,7 @@ async def _stream_with_transcoding(
     seek_pos = _streaming_server.get_seek_position(player_mac)
     start_seconds = seek_pos[0] if seek_pos else None
     end_seconds = seek_pos[1] if seek_pos else None
+    source = await _seek_source(file_path, rule, start_seconds, end_seconds)
 
     # Capture generation for logging (this token is replaced on each queue)
     cancel_token = _streaming_server.get_cancellation_token(player_mac)
@@ -178,6 +420,8 @@ async def _stream_with_transcoding(
                 rule=rule,
                 start_seconds=start_seconds,
                 end_seconds=end_seconds,
+                source=source,
+                player_mac=player_mac,
             ):
                 # Abort quickly if the client went away.
                 #
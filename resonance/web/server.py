@@ -10,6 +10,8 @@ The WebServer integrates:
 - Streaming endpoint for audio playback
 - Cometd endpoint for real-time updates
 - Artwork endpoint for album covers
+- /metrics in Prometheus text format (see resonance.core.metrics)
+- Token-protected admin diagnostics (/api/admin/*)
 """
 
 from __future__ import annotations
@@ -20,11 +22,13 @@ from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any
 
 import uvicorn
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 
+from resonance.core.metrics import metrics
 from resonance.web.cometd import CometdManager
 from resonance.web.jsonrpc import JsonRpcHandler
+from resonance.web.routes.admin import register_admin_routes
 from resonance.web.routes.api import register_api_routes
 from resonance.web.routes.artwork import register_artwork_routes
 from resonance.web.routes.cometd import register_cometd_routes
@@ -40,6 +44,8 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
 
 @dataclass
 class JsonRpcRequest:
@@ -88,6 +94,7 @@ class WebServer:
         artwork_manager: ArtworkManager | None = None,
         slimproto: SlimprotoServer | None = None,
         server_uuid: str = "resonance",
+        admin_token: str | None = None,
     ) -> None:
         """
         Initialize the WebServer.
@@ -100,6 +107,7 @@ class WebServer:
             artwork_manager: Optional artwork extraction/caching
             slimproto: Optional Slimproto server for player control
             server_uuid: Server UUID for identification (full UUID v4, 36 chars with dashes)
+            admin_token: Bearer token for /api/admin/* (disabled when None)
         """
         self.player_registry = player_registry
         self.music_library = music_library
@@ -107,6 +115,7 @@ class WebServer:
         self.streaming_server = streaming_server
         self.artwork_manager = artwork_manager
         self.slimproto = slimproto
+        self.admin_token = admin_token
 
         # Create FastAPI app
         self.app = FastAPI(
@@ -155,6 +164,11 @@ class WebServer:
             """Health check endpoint."""
             return {"status": "ok", "server": "resonance"}
 
+        @self.app.get("/metrics", include_in_schema=False)
+        async def metrics_endpoint() -> Response:
+            """Counters and latency histograms in Prometheus text format."""
+            return Response(metrics.expose(), media_type=PROMETHEUS_CONTENT_TYPE)
+
         # JSON-RPC endpoints
         @self.app.post("/jsonrpc.js", tags=["jsonrpc"])
         async def jsonrpc_endpoint(request: dict[str, Any]) -> dict[str, Any]:
@@ -177,9 +191,14 @@ class WebServer:
             playlist_manager=self.playlist_manager,
         )
 
+        # Register admin routes (profiler, loop stalls)
+        register_admin_routes(self.app, admin_token=self.admin_token)
+
         # Register streaming routes
         if self.streaming_server is not None:
-            register_streaming_routes(self.app, self.streaming_server)
+            register_streaming_routes(
+                self.app, self.streaming_server, player_registry=self.player_registry
+            )
 
         # Register artwork routes
         if self.artwork_manager is not None:
@@ -0,0 +1,282 @@
+"""
+Synthetic audio files for scanner and streaming tests.
+
+The files are structurally valid containers (headers, tag blocks, sample
+tables) with silent or zero-filled payloads, so they are tiny to generate but
+exercise the same parsing paths as real albums: ID3v2 with APIC, FLAC with a
+PICTURE block, Ogg Vorbis comments and MP4/M4A with an `ilst` and `covr`.
+"""
+
+from __future__ import annotations
+
+import base64
+import struct
+from collections.abc import Sequence
+from pathlib import Path
+
+from mutagen.flac import FLAC, Picture
+from mutagen.id3 import (
+    APIC,
+    COMM,
+    ID3,
+    TALB,
+    TCMP,
+    TCOM,
+    TCON,
+    TDRC,
+    TIT2,
+    TPE1,
+    TPE2,
+    TPE3,
+    TPOS,
+    TRCK,
+)
+from mutagen.mp4 import MP4, MP4Cover
+from mutagen.oggvorbis import OggVorbis
+
+# Typical embedded front cover size for a ripped album.
+ARTWORK_BYTES = 512 * 1024
+
+TAGS: dict[str, str] = {
+    "title": "Song",
+    "artist": "Artist",
+    "album": "Album",
+    "albumartist": "Album Artist",
+    "composer": "Composer A; Composer B",
+    "conductor": "Conductor",
+    "genre": "Rock; Pop",
+    "tracknumber": "3/12",
+    "discnumber": "1/2",
+    "date": "1999-02-03",
+    "compilation": "1",
+    "comment": "x" * 200,
+}
+
+
+def artwork(size: int = ARTWORK_BYTES) -> bytes:
+    return b"\xff\xd8\xff\xe0" + b"\0" * (size - 4)
+
+
+def write_mp3(path: Path, *, art: bytes | None = None, frames: int = 200) -> None:
+    """MPEG-1 Layer III, 128 kbit/s, 44.1 kHz, with an ID3v2.4 tag."""
+    frame = b"\xff\xfb\x90\x00" + b"\0" * 413
+    path.write_bytes(frame * frames)
+    tags = ID3()
+    tags.add(TIT2(encoding=3, text=TAGS["title"]))
+    tags.add(TPE1(encoding=3, text=TAGS["artist"]))
+    tags.add(TALB(encoding=3, text=TAGS["album"]))
+    tags.add(TPE2(encoding=3, text=TAGS["albumartist"]))
+    tags.add(TCOM(encoding=3, text=TAGS["composer"]))
+    tags.add(TPE3(encoding=3, text=TAGS["conductor"]))
+    tags.add(TCON(encoding=3, text=TAGS["genre"]))
+    tags.add(TRCK(encoding=3, text=TAGS["tracknumber"]))
+    tags.add(TPOS(encoding=3, text=TAGS["discnumber"]))
+    tags.add(TDRC(encoding=3, text=TAGS["date"]))
+    tags.add(TCMP(encoding=3, text=TAGS["compilation"]))
+    tags.add(COMM(encoding=3, lang="eng", desc="", text=TAGS["comment"]))
+    if art is not None:
+        tags.add(APIC(encoding=3, mime="image/jpeg", type=3, desc="", data=art))
+    tags.save(path)
+
+
+def write_flac(path: Path, *, art: bytes | None = None, seconds: int = 180) -> None:
+    """FLAC stream header with Vorbis comments and an optional PICTURE block."""
+    rate, channels, bits = 44100, 2, 16
+    packed = (rate << 44) | ((channels - 1) << 41) | ((bits - 1) << 36) | (rate * seconds)
+    streaminfo = struct.pack(">HH", 4096, 4096) + b"\0" * 6 + packed.to_bytes(8, "big") + b"\0" * 16
+    path.write_bytes(b"fLaC\x80" + len(streaminfo).to_bytes(3, "big") + streaminfo + b"\0" * 4096)
+    audio = FLAC(path)
+    for key, value in TAGS.items():
+        audio[key] = value
+    if art is not None:
+        picture = Picture()
+        picture.type = 3
+        picture.mime = "image/jpeg"
+        picture.data = art
+        audio.add_picture(picture)
+    audio.save()
+
+
+def _ogg_page(
+    packets: Sequence[bytes], *, sequence: int, position: int, first: bool = False
+) -> bytes:
+    from mutagen.ogg import OggPage
+
+    page = OggPage()
+    page.serial = 0x5EED
+    page.sequence = sequence
+    page.position = position
+    page.first = first
+    page.packets = list(packets)
+    return page.write()
+
+
+def write_ogg_vorbis(path: Path, *, art: bytes | None = None, seconds: int = 180) -> None:
+    """Ogg Vorbis identification/comment headers and a final granule position."""
+    rate, channels = 44100, 2
+    ident = b"\x01vorbis" + struct.pack("<IBIiii", 0, channels, rate, 0, 128000, 0) + b"\xb8\x01"
+    comment = b"\x03vorbis" + b"\x09\0\0\0resonance" + b"\0\0\0\0\x01"
+    setup = b"\x05vorbis" + b"\0" * 32
+    path.write_bytes(
+        _ogg_page([ident], sequence=0, position=0, first=True)
+        + _ogg_page([comment, setup], sequence=1, position=0)
+        + _ogg_page([b"\0" * 4096], sequence=2, position=rate * seconds)
+    )
+    audio = OggVorbis(path)
+    for key, value in TAGS.items():
+        audio[key] = value
+    if art is not None:
+        picture = Picture()
+        picture.type = 3
+        picture.mime = "image/jpeg"
+        picture.data = art
+        audio["metadata_block_picture"] = base64.b64encode(picture.write()).decode("ascii")
+    audio.save()
+
+
+def _box(kind: bytes, *children: bytes) -> bytes:
+    payload = b"".join(children)
+    return struct.pack(">I4s", 8 + len(payload), kind) + payload
+
+
+def _full_box(kind: bytes, version: int, flags: int, *children: bytes) -> bytes:
+    return _box(kind, struct.pack(">I", (version << 24) | flags), *children)
+
+
+def _descriptor(tag: int, payload: bytes) -> bytes:
+    return bytes([tag, len(payload)]) + payload
+
+
+# AAC-LC, 44.1 kHz, stereo.
+AUDIO_SPECIFIC_CONFIG = bytes([0x12, 0x10])
+
+
+def build_m4a(
+    sample_sizes: Sequence[int],
+    *,
+    samples_per_chunk: int = 10,
+    timescale: int = 44100,
+    sample_delta: int = 1024,
+    fill: int | None = None,
+) -> bytes:
+    """
+    Build an AAC-in-MP4 file with a real sample table (`stts/stsc/stsz/stco`).
+
+    Sample payloads are filled with the sample index (mod 256) unless `fill`
+    is given, so tests can tell which sample a byte range came from.
+    """
+    count = len(sample_sizes)
+    duration = count * sample_delta
+
+    esds = _full_box(
+        b"esds",
+        0,
+        0,
+        _descriptor(
+            0x03,
+            struct.pack(">HB", 1, 0)
+            + _descriptor(
+                0x04,
+                struct.pack(">BBBHII", 0x40, 0x15, 0, 0, 128000, 128000)
+                + _descriptor(0x05, AUDIO_SPECIFIC_CONFIG),
+            )
+            + _descriptor(0x06, b"\x02"),
+        ),
+    )
+    mp4a = _box(
+        b"mp4a",
+        b"\0" * 6 + struct.pack(">H", 1) + b"\0" * 8,
+        struct.pack(">HHHHI", 2, 16, 0, 0, 44100 << 16),
+        esds,
+    )
+    stsd = _full_box(b"stsd", 0, 0, struct.pack(">I", 1), mp4a)
+    stts = _full_box(b"stts", 0, 0, struct.pack(">III", 1, count, sample_delta))
+    stsc = _full_box(b"stsc", 0, 0, struct.pack(">IIII", 1, 1, samples_per_chunk, 1))
+    stsz = _full_box(
+        b"stsz", 0, 0, struct.pack(">II", 0, count), struct.pack(f">{count}I", *sample_sizes)
+    )
+
+    chunks: list[list[int]] = [
+        list(range(i, min(i + samples_per_chunk, count)))
+        for i in range(0, count, samples_per_chunk)
+    ]
+
+    def _moov(chunk_offsets: Sequence[int]) -> bytes:
+        stco = _full_box(
+            b"stco",
+            0,
+            0,
+            struct.pack(">I", len(chunk_offsets)),
+            struct.pack(f">{len(chunk_offsets)}I", *chunk_offsets),
+        )
+        stbl = _box(b"stbl", stsd, stts, stsc, stsz, stco)
+        minf = _box(b"minf", _full_box(b"smhd", 0, 0, b"\0" * 4), stbl)
+        hdlr = _full_box(b"hdlr", 0, 0, b"\0" * 4, b"soun", b"\0" * 12, b"\0")
+        mdhd = _full_box(
+            b"mdhd", 0, 0, struct.pack(">IIIIHH", 0, 0, timescale, duration, 0x55C4, 0)
+        )
+        mdia = _box(b"mdia", mdhd, hdlr, minf)
+        tkhd = _full_box(b"tkhd", 0, 7, struct.pack(">IIIII", 0, 0, 1, 0, duration), b"\0" * 60)
+        mvhd = _full_box(
+            b"mvhd",
+            0,
+            0,
+            struct.pack(">IIII", 0, 0, timescale, duration),
+            b"\0" * 76,
+            struct.pack(">I", 2),
+        )
+        return _box(b"moov", mvhd, _box(b"trak", tkhd, mdia))
+
+    ftyp = _box(b"ftyp", b"M4A ", struct.pack(">I", 0), b"M4A mp42isom")
+    placeholder = _moov([0] * len(chunks))
+    offset = len(ftyp) + len(placeholder) + 8
+    payload = bytearray()
+    chunk_offsets: list[int] = []
+    for chunk in chunks:
+        chunk_offsets.append(offset + len(payload))
+        for index in chunk:
+            payload += bytes([index % 256 if fill is None else fill]) * sample_sizes[index]
+    return ftyp + _moov(chunk_offsets) + _box(b"mdat", bytes(payload))
+
+
+def write_m4a(path: Path, *, art: bytes | None = None, samples: int = 200) -> None:
+    """AAC-in-MP4 with an iTunes-style `ilst`."""
+    path.write_bytes(build_m4a([300] * samples))
+    audio = MP4(path)
+    audio["\xa9nam"] = TAGS["title"]
+    audio["\xa9ART"] = TAGS["artist"]
+    audio["\xa9alb"] = TAGS["album"]
+    audio["aART"] = TAGS["albumartist"]
+    audio["\xa9wrt"] = TAGS["composer"]
+    audio["\xa9gen"] = TAGS["genre"]
+    audio["trkn"] = [(3, 12)]
+    audio["disk"] = [(1, 2)]
+    audio["\xa9day"] = TAGS["date"]
+    audio["cpil"] = True
+    audio["\xa9cmt"] = TAGS["comment"]
+    if art is not None:
+        audio["covr"] = [MP4Cover(art, imageformat=MP4Cover.FORMAT_JPEG)]
+    audio.save()
+
+
+WRITERS = {
+    ".mp3": write_mp3,
+    ".flac": write_flac,
+    ".ogg": write_ogg_vorbis,
+    ".m4a": write_m4a,
+}
+
+
+def build_corpus(root: Path, *, per_format: int = 4, art: bytes | None = None) -> list[Path]:
+    """Write `per_format` tagged files of every container into `root`."""
+    if art is None:
+        art = artwork()
+    root.mkdir(parents=True, exist_ok=True)
+    paths: list[Path] = []
+    for suffix, writer in WRITERS.items():
+        for i in range(per_format):
+            path = root / f"{i:02d}{suffix}"
+            # Alternate files without artwork to cover both detection branches.
+            writer(path, art=art if i % 2 == 0 else None)
+            paths.append(path)
+    return paths
@@ -0,0 +1,765 @@
+"""
+Multi-player load generator and Slimproto/Cometd benchmark.
+
+Starts a full ResonanceServer in-process (in its own thread and event loop)
+on a synthetic library, then drives it with N virtual squeezelite-like
+Slimproto players and M Jive-like Cometd clients over real sockets.
+
+Virtual players:
+- HELO, then a STAT STMt every `stat_interval` seconds and in reply to `strm t`.
+- `strm s`: fetch the stream over HTTP, report STMs on the first byte and
+  STMu once the received audio has "played" (bytes / 16 kB/s), so the server
+  advances through the playlist like it would for real players.
+- Every `command_interval` seconds a controller sends `mixer volume` over
+  JSON-RPC; command latency is measured until the `audg` frame arrives.
+
+Virtual Cometd clients:
+- Handshake, streaming `/meta/connect`, `/slim/subscribe` to `serverstatus`
+  and to one player's `status`.
+- Every `command_interval` seconds a `/slim/request status`; latency is
+  measured until the result arrives on the streaming connection.
+
+Reported: server event-loop lag, p50/p99 latencies, stream time-to-first-byte,
+server CPU per player and server-side memory per client (tracemalloc,
+limited to allocations made by `resonance` code while clients connect).
+
+Usage:
+    python -m tests.loadgen --players 50 --cometd 20 --duration 30
+    python -m tests.loadgen --save bench/loadgen-0.2.0.json --baseline bench/loadgen-0.1.0.json
+
+With ``--baseline`` the run exits non-zero when a metric regressed by more
+than ``--tolerance`` against an earlier release's saved report.
+
+Notes:
+- Client and server share one process (and the GIL); absolute numbers are
+  for comparing releases on the same machine, not for capacity planning.
+- The run changes into a scratch directory because the server keeps its
+  UUID and artwork cache relative to the working directory.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import random
+import socket
+import struct
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+import resonance
+from resonance.core.library_db import UpsertTrack
+from resonance.server import ResonanceServer
+from tests.audio_corpus import write_mp3
+
+logger = logging.getLogger("loadgen")
+
+# Synthetic tracks are 128 kbit/s MP3.
+AUDIO_BYTES_PER_SECOND = 16_000
+MP3_FRAMES_PER_SECOND = 44_100 / 1152
+
+_STAT = struct.Struct(">4sBBBIIQHIIIIHIIH")
+_STRM_HEADER = struct.Struct(">cc16xHI")
+
+# Lower is better for all of these; (relative tolerance applies, absolute floor).
+REGRESSION_METRICS: dict[str, float] = {
+    "loop_lag_ms.p99": 5.0,
+    "slimproto.command_ms.p99": 5.0,
+    "slimproto.stream_ttfb_ms.p99": 5.0,
+    "cometd.request_ms.p99": 5.0,
+    "cpu.per_player_pct": 0.05,
+    "memory.per_client_kb": 4.0,
+}
+
+
+@dataclass
+class LoadConfig:
+    """What to run against the server."""
+
+    players: int = 10
+    cometd: int = 5
+    duration: float = 20.0
+    tracks: int = 6
+    track_seconds: float = 10.0
+    stat_interval: float = 1.0
+    command_interval: float = 2.0
+    ramp: float = 2.0
+    seed: int = 1
+
+
+def _percentiles(values: list[float]) -> dict[str, float]:
+    if not values:
+        return {"count": 0, "p50": 0.0, "p99": 0.0, "max": 0.0}
+    ordered = sorted(values)
+
+    def rank(q: float) -> float:
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    return {
+        "count": len(ordered),
+        "p50": round(rank(0.50), 3),
+        "p99": round(rank(0.99), 3),
+        "max": round(ordered[-1], 3),
+    }
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@dataclass
+class _Stats:
+    measuring: bool = False
+    command_ms: list[float] = field(default_factory=list)
+    ttfb_ms: list[float] = field(default_factory=list)
+    request_ms: list[float] = field(default_factory=list)
+    players_connected: int = 0
+    cometd_connected: int = 0
+    stat_sent: int = 0
+    frames_received: int = 0
+    streams: int = 0
+    stream_bytes: int = 0
+    cometd_events: int = 0
+    errors: int = 0
+
+    def add(self, samples: list[float], seconds: float) -> None:
+        if self.measuring:
+            samples.append(seconds * 1000.0)
+
+
+# =============================================================================
+# Server under test
+# =============================================================================
+
+
+class ServerThread:
+    """ResonanceServer on its own event loop, plus lag and CPU sampling there."""
+
+    LAG_INTERVAL = 0.05
+
+    def __init__(self, workdir: Path, tracks: int, track_seconds: float) -> None:
+        self.workdir = workdir
+        self.tracks = tracks
+        self.track_seconds = track_seconds
+        self.slimproto_port = _free_port()
+        self.web_port = _free_port()
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self.lag_ms: list[float] = []
+        self.album_id: int | None = None
+        self._measuring = False
+        self._cpu = 0.0
+        self._ready = threading.Event()
+        self._stop: asyncio.Event | None = None
+        self._error: BaseException | None = None
+        self._thread = threading.Thread(target=self._main, name="resonance-server", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+        self._ready.wait(timeout=60)
+        if self._error is not None:
+            raise RuntimeError("Server failed to start") from self._error
+
+    def stop(self) -> None:
+        if self.loop is not None and self._stop is not None:
+            self.loop.call_soon_threadsafe(self._stop.set)
+        self._thread.join(timeout=30)
+
+    def set_measuring(self, measuring: bool) -> None:
+        """Start/stop the measurement window (thread-safe)."""
+        assert self.loop is not None
+        self.loop.call_soon_threadsafe(self._set_measuring, measuring)
+
+    def _set_measuring(self, measuring: bool) -> None:
+        if measuring:
+            self._cpu = time.thread_time()
+        else:
+            self._cpu = time.thread_time() - self._cpu
+        self._measuring = measuring
+
+    @property
+    def cpu_seconds(self) -> float:
+        """Server thread CPU time spent inside the last measurement window."""
+        return self._cpu
+
+    def _main(self) -> None:
+        try:
+            asyncio.run(self._serve())
+        except BaseException as e:  # reported to the starting thread
+            self._error = e
+            self._ready.set()
+
+    async def _serve(self) -> None:
+        self.loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        server = ResonanceServer(
+            host="127.0.0.1",
+            port=self.slimproto_port,
+            web_port=self.web_port,
+            library_db_path=self.workdir / "library.sqlite3",
+        )
+        await server.start()
+        self.album_id = await self._seed_library(server)
+        await self._wait_for_http()
+        sampler = asyncio.create_task(self._sample_lag())
+        self._ready.set()
+        try:
+            await self._stop.wait()
+        finally:
+            sampler.cancel()
+            await server.stop()
+            # uvicorn shuts down in its own task; let it close its sockets.
+            await asyncio.sleep(0.2)
+
+    async def _seed_library(self, server: ResonanceServer) -> int:
+        music = self.workdir / "music"
+        music.mkdir(exist_ok=True)
+        frames = int(self.track_seconds * MP3_FRAMES_PER_SECOND)
+        records = []
+        for n in range(1, self.tracks + 1):
+            path = music / f"{n:02d}.mp3"
+            write_mp3(path, frames=frames)
+            records.append(
+                UpsertTrack(
+                    path=str(path),
+                    title=f"Track {n}",
+                    artist="Load Artist",
+                    album="Load Album",
+                    track_no=n,
+                    duration_ms=int(self.track_seconds * 1000),
+                    file_size=path.stat().st_size,
+                    mtime_ns=path.stat().st_mtime_ns,
+                )
+            )
+        await server.library_db.upsert_tracks(records)
+        await server.library_db.commit()
+        row = await server.library_db.get_track_by_path(records[0].path)
+        assert row is not None and row.album_id is not None
+        return row.album_id
+
+    async def _wait_for_http(self) -> None:
+        for _ in range(200):
+            with contextlib.suppress(OSError):
+                _, writer = await asyncio.open_connection("127.0.0.1", self.web_port)
+                writer.close()
+                await writer.wait_closed()
+                return
+            await asyncio.sleep(0.02)
+        raise RuntimeError("Web server did not start")
+
+    async def _sample_lag(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.LAG_INTERVAL)
+            if self._measuring:
+                self.lag_ms.append((loop.time() - started - self.LAG_INTERVAL) * 1000.0)
+
+
+# =============================================================================
+# Virtual clients
+# =============================================================================
+
+
+class VirtualPlayer:
+    """A squeezelite-like Slimproto client."""
+
+    def __init__(self, index: int, port: int, stats: _Stats, config: LoadConfig) -> None:
+        self.mac = f"02:00:00:00:{index >> 8 & 0xFF:02x}:{index & 0xFF:02x}"
+        self.port = port
+        self.stats = stats
+        self.config = config
+        self.volume_sent: dict[int, float] = {}
+        self._writer: asyncio.StreamWriter | None = None
+        self._playing_since: float | None = None
+        self._stream_task: asyncio.Task[None] | None = None
+
+    async def run(self) -> None:
+        reader, self._writer = await asyncio.open_connection("127.0.0.1", self.port)
+        self._send("HELO", self._helo())
+        self.stats.players_connected += 1
+        stat_task = asyncio.create_task(self._stat_loop())
+        try:
+            while True:
+                length = int.from_bytes(await reader.readexactly(2), "big")
+                frame = await reader.readexactly(length)
+                self.stats.frames_received += 1
+                self._on_frame(frame[:4], frame[4:])
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            stat_task.cancel()
+            if self._stream_task is not None:
+                self._stream_task.cancel()
+            self._writer.close()
+
+    def _helo(self) -> bytes:
+        caps = b"Model=squeezelite,ModelName=SqueezeLite,MaxSampleRate=48000,mp3"
+        mac = bytes.fromhex(self.mac.replace(":", ""))
+        return bytes([12, 1]) + mac + bytes(16) + bytes(2) + bytes(8) + b"en" + caps
+
+    def _send(self, command: str, payload: bytes) -> None:
+        assert self._writer is not None
+        self._writer.write(command.encode() + len(payload).to_bytes(4, "big") + payload)
+
+    def _send_stat(self, event: bytes) -> None:
+        elapsed_ms = 0
+        if self._playing_since is not None:
+            elapsed_ms = int((time.monotonic() - self._playing_since) * 1000)
+        payload = _STAT.pack(
+            event,
+            0,
+            0,
+            0,
+            2 << 20,
+            1 << 20,
+            0,
+            90,
+            0,
+            0,
+            0,
+            elapsed_ms // 1000,
+            0,
+            elapsed_ms,
+            0,
+            0,
+        )
+        self._send("STAT", payload)
+        self.stats.stat_sent += 1
+
+    async def _stat_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.config.stat_interval)
+            self._send_stat(b"STMt")
+
+    def _on_frame(self, command: bytes, payload: bytes) -> None:
+        if command == b"audg":
+            # Gain fields follow the two deprecated u32s; match the oldest pending volume.
+            if self.volume_sent:
+                volume, sent = next(iter(self.volume_sent.items()))
+                del self.volume_sent[volume]
+                self.stats.add(self.stats.command_ms, time.monotonic() - sent)
+        elif command == b"strm" and len(payload) >= _STRM_HEADER.size:
+            kind, _autostart, port, ip = _STRM_HEADER.unpack_from(payload)
+            if kind == b"t":
+                self._send_stat(b"STMt")
+            elif kind in (b"q", b"f"):
+                if self._stream_task is not None:
+                    self._stream_task.cancel()
+                self._playing_since = None
+            elif kind == b"s":
+                if self._stream_task is not None:
+                    self._stream_task.cancel()
+                request = payload[_STRM_HEADER.size :]
+                host = socket.inet_ntoa(ip.to_bytes(4, "big")) if ip else "127.0.0.1"
+                self._stream_task = asyncio.create_task(self._fetch(host, port, request))
+
+    async def _fetch(self, host: str, port: int, request: bytes) -> None:
+        started = time.monotonic()
+        received = 0
+        try:
+            reader, writer = await asyncio.open_connection(host, port)
+            writer.write(request)
+            await reader.readuntil(b"\r\n\r\n")
+            first = True
+            while chunk := await reader.read(65536):
+                if first:
+                    self.stats.add(self.stats.ttfb_ms, time.monotonic() - started)
+                    self._playing_since = time.monotonic()
+                    self._send_stat(b"STMs")
+                    first = False
+                received += len(chunk)
+            writer.close()
+            self.stats.streams += 1
+            self.stats.stream_bytes += received
+            self._send_stat(b"STMd")
+            # Let the buffered audio "play out", then report the underrun.
+            assert self._playing_since is not None
+            remaining = received / AUDIO_BYTES_PER_SECOND - (time.monotonic() - self._playing_since)
+            await asyncio.sleep(max(0.0, remaining))
+            self._playing_since = None
+            self._send_stat(b"STMu")
+        except (OSError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            self.stats.errors += 1
+
+
+class VirtualJive:
+    """A Jive/SqueezePlay-like Cometd client on a streaming connection."""
+
+    def __init__(self, http: httpx.AsyncClient, player_mac: str, stats: _Stats) -> None:
+        self.http = http
+        self.player_mac = player_mac
+        self.stats = stats
+        self.client_id = ""
+        self._seq = 0
+        self._pending: dict[str, float] = {}
+        self._connected = asyncio.Event()
+
+    async def _post(self, messages: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        response = await self.http.post("/cometd", json=messages)
+        response.raise_for_status()
+        return response.json()
+
+    async def run(self) -> None:
+        (reply,) = await self._post([{"channel": "/meta/handshake", "version": "1.0"}])
+        self.client_id = reply["clientId"]
+        stream = asyncio.create_task(self._stream())
+        try:
+            await asyncio.wait_for(self._connected.wait(), timeout=10)
+            self.stats.cometd_connected += 1
+            cid = self.client_id
+            await self._post(
+                [
+                    {
+                        "channel": "/slim/subscribe",
+                        "clientId": cid,
+                        "data": {
+                            "response": f"/{cid}/slim/serverstatus",
+                            "request": ["", ["serverstatus", 0, 50, "subscribe:60"]],
+                        },
+                    },
+                    {
+                        "channel": "/slim/subscribe",
+                        "clientId": cid,
+                        "data": {
+                            "response": f"/{cid}/slim/playerstatus/{self.player_mac}",
+                            "request": [self.player_mac, ["status", "-", 1, "subscribe:30"]],
+                        },
+                    },
+                ]
+            )
+            await stream
+        finally:
+            stream.cancel()
+
+    async def request_status(self) -> None:
+        """Send one `/slim/request status`; latency is recorded when the result arrives."""
+        self._seq += 1
+        msg_id = str(self._seq)
+        self._pending[msg_id] = time.monotonic()
+        await self._post(
+            [
+                {
+                    "channel": "/slim/request",
+                    "clientId": self.client_id,
+                    "id": msg_id,
+                    "data": {
+                        "response": f"/{self.client_id}/slim/request",
+                        "request": [self.player_mac, ["status", "-", 1, "tags:acdlKN"]],
+                    },
+                }
+            ]
+        )
+
+    async def _stream(self) -> None:
+        connect = [
+            {
+                "channel": "/meta/connect",
+                "clientId": self.client_id,
+                "connectionType": "streaming",
+            }
+        ]
+        async with self.http.stream("POST", "/cometd", json=connect, timeout=None) as response:
+            async for line in response.aiter_lines():
+                if not line.strip():
+                    continue
+                for event in json.loads(line):
+                    self._on_event(event)
+
+    def _on_event(self, event: dict[str, Any]) -> None:
+        channel = event.get("channel", "")
+        if channel == "/meta/connect":
+            self._connected.set()
+            return
+        self.stats.cometd_events += 1
+        sent = self._pending.pop(str(event.get("id")), None)
+        if sent is not None and channel.endswith("/slim/request"):
+            self.stats.add(self.stats.request_ms, time.monotonic() - sent)
+
+
+# =============================================================================
+# Runner
+# =============================================================================
+
+
+async def _controller(
+    http: httpx.AsyncClient,
+    players: list[VirtualPlayer],
+    jives: list[VirtualJive],
+    stats: _Stats,
+    config: LoadConfig,
+) -> None:
+    """Periodic user commands: volume changes for players, status requests for Jive."""
+    rng = random.Random(config.seed)
+
+    async def volume(player: VirtualPlayer) -> None:
+        value = rng.randrange(1, 100)
+        player.volume_sent[value] = time.monotonic()
+        body = {
+            "id": 1,
+            "method": "slim.request",
+            "params": [player.mac, ["mixer", "volume", value]],
+        }
+        try:
+            (await http.post("/jsonrpc.js", json=body)).raise_for_status()
+        except httpx.HTTPError:
+            stats.errors += 1
+
+    async def status(jive: VirtualJive) -> None:
+        try:
+            await jive.request_status()
+        except httpx.HTTPError:
+            stats.errors += 1
+
+    while True:
+        started = time.monotonic()
+        await asyncio.gather(
+            *(volume(p) for p in players),
+            *(status(j) for j in jives if j.client_id),
+        )
+        await asyncio.sleep(max(0.0, config.command_interval - (time.monotonic() - started)))
+
+
+async def _drive(server: ServerThread, config: LoadConfig) -> dict[str, Any]:
+    stats = _Stats()
+    limits = httpx.Limits(max_connections=config.cometd * 2 + 50)
+    base_url = f"http://127.0.0.1:{server.web_port}"
+
+    async with (
+        httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as http,
+        httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as streams,
+    ):
+        tracemalloc.start()
+        rss_before = _rss_kb()
+        players = [
+            VirtualPlayer(i, server.slimproto_port, stats, config) for i in range(config.players)
+        ]
+        tasks: list[asyncio.Task[None]] = []
+        for player in players:
+            tasks.append(asyncio.create_task(player.run()))
+            await asyncio.sleep(config.ramp / max(1, config.players + config.cometd))
+        jives = [
+            VirtualJive(streams, players[i % len(players)].mac if players else "-", stats)
+            for i in range(config.cometd)
+        ]
+        for jive in jives:
+            tasks.append(asyncio.create_task(jive.run()))
+            await asyncio.sleep(config.ramp / max(1, config.players + config.cometd))
+        await asyncio.sleep(1.0)
+
+        server_bytes = _traced_bytes(tracemalloc.take_snapshot())
+        tracemalloc.stop()
+        rss_after = _rss_kb()
+
+        for player in players:
+            for command in (
+                ["playlist", "loadtracks", f"album_id:{server.album_id}"],
+                ["playlist", "repeat", 2],
+            ):
+                body = {"id": 1, "method": "slim.request", "params": [player.mac, command]}
+                (await http.post("/jsonrpc.js", json=body)).raise_for_status()
+
+        controller = asyncio.create_task(_controller(http, players, jives, stats, config))
+        stats.measuring = True
+        server.set_measuring(True)
+        started_cpu = time.process_time()
+        started = time.monotonic()
+        await asyncio.sleep(config.duration)
+        wall = time.monotonic() - started
+        process_cpu = time.process_time() - started_cpu
+        server.set_measuring(False)
+        stats.measuring = False
+
+        controller.cancel()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(controller, *tasks, return_exceptions=True)
+        await asyncio.sleep(0.1)  # let set_measuring(False) land on the server loop
+
+    clients = max(1, config.players + config.cometd)
+    server_cpu = server.cpu_seconds
+    return {
+        "version": resonance.__version__,
+        "python": sys.version.split()[0],
+        "config": asdict(config),
+        "duration_s": round(wall, 3),
+        "loop_lag_ms": _percentiles(server.lag_ms),
+        "slimproto": {
+            "players": config.players,
+            "connected": stats.players_connected,
+            "stat_sent": stats.stat_sent,
+            "frames_received": stats.frames_received,
+            "streams": stats.streams,
+            "stream_mb": round(stats.stream_bytes / 1e6, 3),
+            "stream_ttfb_ms": _percentiles(stats.ttfb_ms),
+            "command_ms": _percentiles(stats.command_ms),
+        },
+        "cometd": {
+            "clients": config.cometd,
+            "connected": stats.cometd_connected,
+            "events": stats.cometd_events,
+            "request_ms": _percentiles(stats.request_ms),
+        },
+        "cpu": {
+            "server_s": round(server_cpu, 3),
+            "process_s": round(process_cpu, 3),
+            "server_pct": round(100 * server_cpu / wall, 2),
+            "per_player_pct": round(100 * server_cpu / wall / max(1, config.players), 3),
+        },
+        "memory": {
+            "server_traced_kb": round(server_bytes / 1024, 1),
+            "per_client_kb": round(server_bytes / 1024 / clients, 2),
+            "rss_delta_kb": rss_after - rss_before,
+        },
+        "errors": stats.errors,
+    }
+
+
+def _traced_bytes(snapshot: tracemalloc.Snapshot) -> int:
+    """Bytes currently held by allocations made in resonance code."""
+    package = str(Path(resonance.__file__).parent)
+    snapshot = snapshot.filter_traces([tracemalloc.Filter(True, f"{package}/*")])
+    return sum(stat.size for stat in snapshot.statistics("filename"))
+
+
+def _rss_kb() -> int:
+    """Resident set size in KiB; 0 on platforms without the `resource` module."""
+    if sys.platform == "win32":
+        return 0
+    import resource  # Unix only
+
+    with contextlib.suppress(OSError, ValueError):
+        pages = int(Path("/proc/self/statm").read_text().split()[1])
+        return pages * resource.getpagesize() // 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def run_load(config: LoadConfig, workdir: Path | None = None) -> dict[str, Any]:
+    """
+    Run one benchmark and return the report.
+
+    Args:
+        config: Client counts, duration and cadence.
+        workdir: Scratch directory for the DB, synthetic library and caches
+            (default: a temporary directory).
+    """
+    with contextlib.ExitStack() as stack:
+        if workdir is None:
+            workdir = Path(stack.enter_context(tempfile.TemporaryDirectory(prefix="loadgen-")))
+        stack.enter_context(contextlib.chdir(workdir))
+        server = ServerThread(workdir, config.tracks, config.track_seconds)
+        server.start()
+        try:
+            return asyncio.run(_drive(server, config))
+        finally:
+            server.stop()
+
+
+def _lookup(report: dict[str, Any], dotted: str) -> float | None:
+    value: Any = report
+    for key in dotted.split("."):
+        if not isinstance(value, dict) or key not in value:
+            return None
+        value = value[key]
+    return float(value)
+
+
+def compare(report: dict[str, Any], baseline: dict[str, Any], tolerance: float = 0.25) -> list[str]:
+    """
+    Metrics that got worse than `baseline` by more than `tolerance`.
+
+    Small absolute differences (see REGRESSION_METRICS) are ignored as noise.
+    """
+    regressions = []
+    for metric, floor in REGRESSION_METRICS.items():
+        new, old = _lookup(report, metric), _lookup(baseline, metric)
+        if new is None or old is None:
+            continue
+        if new > old * (1 + tolerance) and new - old > floor:
+            regressions.append(
+                f"{metric}: {old:g} -> {new:g} (baseline {baseline.get('version', '?')})"
+            )
+    return regressions
+
+
+def format_report(report: dict[str, Any]) -> str:
+    """Human-readable summary."""
+    slim, cometd = report["slimproto"], report["cometd"]
+    lag, cpu, mem = report["loop_lag_ms"], report["cpu"], report["memory"]
+    lines = [
+        f"resonance {report['version']}  {slim['connected']}/{slim['players']} players, "
+        f"{cometd['connected']}/{cometd['clients']} cometd, {report['duration_s']}s",
+        f"  loop lag     p50 {lag['p50']:8.2f} ms   p99 {lag['p99']:8.2f} ms   max {lag['max']:8.2f} ms",
+    ]
+    for name, stats in (
+        ("volume cmd", slim["command_ms"]),
+        ("stream ttfb", slim["stream_ttfb_ms"]),
+        ("cometd req", cometd["request_ms"]),
+    ):
+        lines.append(
+            f"  {name:<12} p50 {stats['p50']:8.2f} ms   p99 {stats['p99']:8.2f} ms   n={stats['count']}"
+        )
+    lines += [
+        f"  cpu          server {cpu['server_pct']:.1f}%   per player {cpu['per_player_pct']:.3f}%",
+        f"  memory       {mem['per_client_kb']:.1f} KiB/client (server side), "
+        f"rss +{mem['rss_delta_kb']} KiB",
+        f"  traffic      {slim['streams']} streams, {slim['stream_mb']} MB, "
+        f"{slim['stat_sent']} STAT, {cometd['events']} cometd events, {report['errors']} errors",
+    ]
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m tests.loadgen", description=__doc__.split("\n")[1]
+    )
+    defaults = LoadConfig()
+    parser.add_argument("--players", type=int, default=defaults.players)
+    parser.add_argument("--cometd", type=int, default=defaults.cometd)
+    parser.add_argument("--duration", type=float, default=defaults.duration)
+    parser.add_argument("--tracks", type=int, default=defaults.tracks)
+    parser.add_argument("--track-seconds", type=float, default=defaults.track_seconds)
+    parser.add_argument("--command-interval", type=float, default=defaults.command_interval)
+    parser.add_argument("--save", type=Path, help="Write the JSON report here")
+    parser.add_argument("--baseline", type=Path, help="Compare against a saved report")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--json", action="store_true", help="Print the full JSON report")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    config = LoadConfig(
+        players=args.players,
+        cometd=args.cometd,
+        duration=args.duration,
+        tracks=args.tracks,
+        track_seconds=args.track_seconds,
+        command_interval=args.command_interval,
+    )
+    report = run_load(config)
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+
+    if args.save:
+        args.save.parent.mkdir(parents=True, exist_ok=True)
+        args.save.write_text(json.dumps(report, indent=2) + "\n")
+    if args.baseline:
+        regressions = compare(report, json.loads(args.baseline.read_text()), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,954 @@
+"""
+Replay captured Squeezebox sessions against a local server.
+
+Reads the pcapng captures of real Radio/Boom sessions (``tests/*.pcapng``,
+``docs/*.pcapng``), extracts the client-to-server Slimproto and HTTP/Cometd
+streams and replays them over real sockets against a ResonanceServer started
+on a synthetic library (see tests/loadgen.py), either at recorded timing or
+accelerated.
+
+Extraction:
+- Minimal pcapng reader (Ethernet/VLAN, IPv4, TCP); no scapy/tshark needed.
+- Per-direction TCP reassembly that drops retransmitted bytes.
+- Slimproto sessions must start with HELO, HTTP sessions with a request
+  line; connections already open when the capture started are skipped.
+- The recorded server replies are kept as the expected side: HTTP status and
+  Cometd response channels per request, and the order in which Slimproto
+  server commands first appeared (heartbeat ``strm t`` excluded, it follows
+  the server's timer). Artwork and other plain HTTP responses depend on the
+  library and are only timed.
+
+Replay:
+- All client sends of one capture are put on a single timeline, so the
+  interleaving of Slimproto and Cometd traffic is kept. ``speed`` scales the
+  recorded gaps, ``max_gap`` caps each of them (idle time is compressed).
+- Cometd clientIds are rewritten to the ones the live server hands out; a
+  request waits for the handshake that produced its recorded clientId.
+- ``copies`` replays the capture N times concurrently; copies after the first
+  get a locally administered player MAC (02:00:00:…) in HELO and in HTTP
+  bodies and paths.
+- Audio fetches (``/stream.mp3``) are not replayed; the live server drives
+  its own streams from the recorded STAT events.
+
+Reported: request→response latency per kind (measured on loopback, i.e.
+server side) next to the latency in the recording, HELO→first server frame,
+server event-loop lag, and every ordering mismatch against the recording.
+
+Usage:
+    python -m tests.pcap_replay                          # all captures, recorded timing
+    python -m tests.pcap_replay tests/ws.pcapng --speed 10 --max-gap 0.05
+    python -m tests.pcap_replay --copies 20 --max-gap 0.1 --json
+
+Exits non-zero when a response came back in a different order or shape than
+recorded, or a session failed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import bisect
+import contextlib
+import json
+import logging
+import struct
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import resonance
+from tests.loadgen import ServerThread, _percentiles
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+logger = logging.getLogger("pcap_replay")
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_CAPTURES = (*sorted(ROOT.glob("tests/*.pcapng")), *sorted(ROOT.glob("docs/*.pcapng")))
+
+SLIMPROTO_PORT = 3483
+HTTP_PORT = 9000
+
+# pcapng block types and link types we understand.
+_SHB = 0x0A0D0D0A
+_IDB = 0x00000001
+_EPB = 0x00000006
+_BYTE_ORDER_MAGIC = 0x1A2B3C4D
+_LINKTYPE_ETHERNET = 1
+_LINKTYPE_RAW = 101
+_ETHERTYPE_IPV4 = 0x0800
+_ETHERTYPE_VLAN = 0x8100
+_IPPROTO_TCP = 6
+_TCP_SYN = 0x02
+
+_SLIM_CLIENT_HEADER = struct.Struct(">4sI")  # command, length
+_SLIM_SERVER_HEADER = struct.Struct(">H4s")  # length (incl. command), command
+
+_SKIPPED_TARGETS = ("/stream.mp3",)
+# Heartbeats follow the server's timer, not the client's traffic.
+_TIMER_COMMANDS = frozenset({"strm/t"})
+
+
+# =============================================================================
+# pcapng / TCP
+# =============================================================================
+
+
+@dataclass(slots=True)
+class Packet:
+    """One TCP segment."""
+
+    ts: float
+    src: tuple[str, int]
+    dst: tuple[str, int]
+    seq: int
+    flags: int
+    payload: bytes
+
+
+def _ts_resolution(options: bytes, endian: str) -> float:
+    """Seconds per timestamp unit from an IDB's if_tsresol option (default µs)."""
+    offset = 0
+    while offset + 4 <= len(options):
+        code, length = struct.unpack_from(endian + "HH", options, offset)
+        if code == 0:
+            break
+        if code == 9 and length >= 1:
+            value = options[offset + 4]
+            return 2.0 ** -(value & 0x7F) if value & 0x80 else 10.0**-value
+        offset += 4 + (length + 3) // 4 * 4
+    return 1e-6
+
+
+def _tcp_packet(ts: float, frame: bytes, linktype: int) -> Packet | None:
+    if linktype == _LINKTYPE_ETHERNET:
+        if len(frame) < 14:
+            return None
+        ethertype = int.from_bytes(frame[12:14], "big")
+        ip = frame[14:]
+        if ethertype == _ETHERTYPE_VLAN and len(frame) >= 18:
+            ethertype = int.from_bytes(frame[16:18], "big")
+            ip = frame[18:]
+        if ethertype != _ETHERTYPE_IPV4:
+            return None
+    elif linktype == _LINKTYPE_RAW:
+        ip = frame
+    else:
+        return None
+
+    if len(ip) < 20 or ip[0] >> 4 != 4 or ip[9] != _IPPROTO_TCP:
+        return None
+    header = (ip[0] & 0x0F) * 4
+    # Offloaded captures record a total length of 0.
+    total = int.from_bytes(ip[2:4], "big") or len(ip)
+    tcp = ip[header:total]
+    if len(tcp) < 20:
+        return None
+    sport, dport, seq = struct.unpack_from(">HHI", tcp)
+    data_offset = (tcp[12] >> 4) * 4
+    return Packet(
+        ts=ts,
+        src=(".".join(map(str, ip[12:16])), sport),
+        dst=(".".join(map(str, ip[16:20])), dport),
+        seq=seq,
+        flags=tcp[13],
+        payload=bytes(tcp[data_offset:]),
+    )
+
+
+def read_packets(path: Path) -> Iterator[Packet]:
+    """TCP segments of a pcapng file, in capture order."""
+    data = path.read_bytes()
+    endian = "<"
+    interfaces: list[tuple[int, float]] = []  # (linktype, ts resolution)
+    offset = 0
+    while offset + 12 <= len(data):
+        block_type = struct.unpack_from(endian + "I", data, offset)[0]
+        if block_type == _SHB:
+            magic = data[offset + 8 : offset + 12]
+            endian = "<" if int.from_bytes(magic, "little") == _BYTE_ORDER_MAGIC else ">"
+            interfaces = []
+        length = struct.unpack_from(endian + "I", data, offset + 4)[0]
+        if length < 12:
+            raise ValueError(f"{path}: corrupt block at offset {offset}")
+        body = data[offset + 8 : offset + length - 4]
+        offset += length
+
+        if block_type == _IDB:
+            linktype = struct.unpack_from(endian + "H", body)[0]
+            interfaces.append((linktype, _ts_resolution(body[8:], endian)))
+        elif block_type == _EPB:
+            iface, ts_high, ts_low, captured, _ = struct.unpack_from(endian + "5I", body)
+            linktype, resolution = interfaces[iface]
+            ts = ((ts_high << 32) | ts_low) * resolution
+            packet = _tcp_packet(ts, body[20 : 20 + captured], linktype)
+            if packet is not None:
+                yield packet
+
+
+class _Stream:
+    """One direction of a TCP connection, reassembled by sequence number."""
+
+    def __init__(self) -> None:
+        self.chunks: list[tuple[float, bytes]] = []
+        self._offsets: list[int] = []
+        self._size = 0
+        self._next: int | None = None
+
+    def add(self, packet: Packet) -> None:
+        if packet.flags & _TCP_SYN:
+            self._next = (packet.seq + 1) & 0xFFFFFFFF
+            return
+        if not packet.payload:
+            return
+        payload = packet.payload
+        if self._next is not None:
+            # Signed distance, so wrap-around and old retransmissions both work.
+            ahead = ((packet.seq - self._next + 0x80000000) & 0xFFFFFFFF) - 0x80000000
+            if ahead + len(payload) <= 0:
+                return
+            if ahead < 0:
+                payload = payload[-ahead:]
+        self._next = (packet.seq + len(packet.payload)) & 0xFFFFFFFF
+        self._offsets.append(self._size)
+        self.chunks.append((packet.ts, payload))
+        self._size += len(payload)
+
+    @property
+    def data(self) -> bytes:
+        return b"".join(chunk for _, chunk in self.chunks)
+
+    def ts_at(self, offset: int) -> float:
+        """Capture time of the segment carrying byte `offset`."""
+        index = max(0, bisect.bisect_right(self._offsets, offset) - 1)
+        return self.chunks[index][0]
+
+
+@dataclass
+class _Connection:
+    server_port: int
+    opened: bool = False
+    start: float = 0.0
+    end: float = 0.0
+    client: _Stream = field(default_factory=_Stream)
+    server: _Stream = field(default_factory=_Stream)
+
+
+def _connections(path: Path, server_ports: set[int]) -> list[_Connection]:
+    active: dict[tuple[tuple[str, int], tuple[str, int]], _Connection] = {}
+    connections: list[_Connection] = []
+    for packet in read_packets(path):
+        if packet.dst[1] in server_ports:
+            key, to_server = (packet.src, packet.dst), True
+        elif packet.src[1] in server_ports:
+            key, to_server = (packet.dst, packet.src), False
+        else:
+            continue
+        conn = active.get(key)
+        syn = to_server and bool(packet.flags & _TCP_SYN)
+        # A SYN after data on the same address pair is a new connection (port reuse).
+        if conn is None or (syn and conn.client.chunks):
+            conn = active[key] = _Connection(key[1][1], start=packet.ts)
+            connections.append(conn)
+        if syn:
+            conn.opened = True
+        conn.end = packet.ts
+        (conn.client if to_server else conn.server).add(packet)
+    return connections
+
+
+# =============================================================================
+# Sessions
+# =============================================================================
+
+
+@dataclass(slots=True)
+class SlimMessage:
+    """One client-to-server Slimproto message."""
+
+    ts: float
+    command: str
+    payload: bytes
+
+
+@dataclass
+class SlimprotoSession:
+    """A player connection: what it sent and what the server answered."""
+
+    start: float
+    end: float
+    messages: list[SlimMessage]
+    server_commands: list[tuple[float, str]]
+
+    @property
+    def mac(self) -> str:
+        helo = self.messages[0].payload
+        return ":".join(f"{b:02x}" for b in helo[2:8])
+
+
+@dataclass
+class HttpExchange:
+    """One HTTP request and the recorded response."""
+
+    ts: float
+    method: str
+    target: str
+    headers: list[tuple[str, str]]
+    body: bytes
+    status: int | None = None
+    channels: tuple[str, ...] | None = None
+    response: Any = None
+    recorded_ms: float | None = None
+
+    @property
+    def kind(self) -> str:
+        if self.target.startswith("/cometd"):
+            return "connect" if self.streaming else "cometd"
+        if self.target.startswith("/jsonrpc.js"):
+            return "jsonrpc"
+        return "http"
+
+    @property
+    def streaming(self) -> bool:
+        """A Cometd streaming /meta/connect: the response never completes."""
+        return b'"/meta/connect"' in self.body.replace(b"\\/", b"/") and b'"streaming"' in (
+            self.body
+        )
+
+
+@dataclass
+class HttpSession:
+    """A keep-alive HTTP connection (Cometd, JSON-RPC, artwork)."""
+
+    start: float
+    end: float
+    exchanges: list[HttpExchange]
+
+
+@dataclass
+class Capture:
+    """Sessions extracted from one pcapng file."""
+
+    path: Path
+    slimproto: list[SlimprotoSession]
+    http: list[HttpSession]
+    skipped: int = 0
+
+    @property
+    def macs(self) -> list[str]:
+        return list(dict.fromkeys(session.mac for session in self.slimproto))
+
+    @property
+    def client_ids(self) -> list[str]:
+        """clientIds handed out by handshakes inside the capture."""
+        ids = []
+        for session in self.http:
+            for exchange in session.exchanges:
+                if exchange.channels and "/meta/handshake" in exchange.channels:
+                    ids.append(str(exchange.response[0].get("clientId", "")))
+        return [i for i in ids if i]
+
+
+def _slim_session(conn: _Connection) -> SlimprotoSession | None:
+    data = conn.client.data
+    messages = []
+    offset = 0
+    while offset + _SLIM_CLIENT_HEADER.size <= len(data):
+        command, length = _SLIM_CLIENT_HEADER.unpack_from(data, offset)
+        end = offset + _SLIM_CLIENT_HEADER.size + length
+        if end > len(data):
+            break
+        messages.append(
+            SlimMessage(
+                ts=conn.client.ts_at(offset),
+                command=command.decode("ascii", "replace"),
+                payload=data[offset + _SLIM_CLIENT_HEADER.size : end],
+            )
+        )
+        offset = end
+    if not messages or messages[0].command != "HELO" or len(messages[0].payload) < 8:
+        return None
+
+    server_commands = []
+    data = conn.server.data
+    offset = 0
+    while offset + _SLIM_SERVER_HEADER.size <= len(data):
+        length, command = _SLIM_SERVER_HEADER.unpack_from(data, offset)
+        end = offset + 2 + length
+        if end > len(data):
+            break
+        server_commands.append((conn.server.ts_at(offset), _server_command(data[offset + 2 : end])))
+        offset = end
+    return SlimprotoSession(conn.start, conn.end, messages, server_commands)
+
+
+def _server_command(frame: bytes) -> str:
+    """Frame name for ordering checks; `strm` includes its sub-command (strm/s)."""
+    command = frame[:4].decode("ascii", "replace")
+    if command == "strm" and len(frame) > 4:
+        return f"strm/{chr(frame[4])}"
+    return command
+
+
+@dataclass(slots=True)
+class _HttpMessage:
+    offset: int
+    start_line: str
+    headers: list[tuple[str, str]]
+    body: bytes
+    body_offset: int
+
+
+def _http_messages(data: bytes) -> Iterator[_HttpMessage]:
+    """
+    Parse consecutive HTTP/1.1 messages.
+
+    For chunked bodies only the first chunk is kept (Cometd streaming sends
+    one JSON batch per chunk); a truncated message ends the iteration.
+    """
+    offset = 0
+    while True:
+        head_end = data.find(b"\r\n\r\n", offset)
+        if head_end < 0:
+            return
+        lines = data[offset:head_end].decode("latin-1").split("\r\n")
+        headers = []
+        for line in lines[1:]:
+            name, _, value = line.partition(":")
+            headers.append((name.strip(), value.strip()))
+        fields = {name.lower(): value for name, value in headers}
+        body_start = head_end + 4
+
+        if fields.get("transfer-encoding", "").lower() == "chunked":
+            size_end = data.find(b"\r\n", body_start)
+            if size_end < 0:
+                return
+            size = int(data[body_start:size_end].split(b";")[0] or b"0", 16)
+            body = data[size_end + 2 : size_end + 2 + size]
+            body_offset = size_end + 2
+            # Skip to the terminating zero-size chunk, if it was captured.
+            cursor = body_start
+            while True:
+                size_end = data.find(b"\r\n", cursor)
+                if size_end < 0:
+                    yield _HttpMessage(offset, lines[0], headers, body, body_offset)
+                    return
+                size = int(data[cursor:size_end].split(b";")[0] or b"0", 16)
+                cursor = size_end + 2 + size + 2
+                if size == 0:
+                    break
+            end = cursor
+        else:
+            end = body_start + int(fields.get("content-length", "0"))
+            if end > len(data):
+                return
+            body, body_offset = data[body_start:end], body_start
+
+        yield _HttpMessage(offset, lines[0], headers, body, body_offset)
+        offset = end
+
+
+def _json(body: bytes) -> Any:
+    try:
+        return json.loads(body)
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+def _channels(messages: Any) -> tuple[str, ...] | None:
+    """Bayeux channels of a response batch, in order (None if not a batch)."""
+    if not isinstance(messages, list):
+        return None
+    return tuple(str(m.get("channel", "")) for m in messages if isinstance(m, dict))
+
+
+def _http_session(conn: _Connection) -> HttpSession | None:
+    requests = list(_http_messages(conn.client.data))
+    if not requests or " HTTP/" not in requests[0].start_line:
+        return None
+    responses = list(_http_messages(conn.server.data))
+    exchanges = []
+    for index, request in enumerate(requests):
+        method, target, _ = request.start_line.split(" ", 2)
+        exchange = HttpExchange(
+            ts=conn.client.ts_at(request.offset),
+            method=method,
+            target=target,
+            headers=request.headers,
+            body=request.body,
+        )
+        if index < len(responses):
+            response = responses[index]
+            exchange.status = int(response.start_line.split(" ", 2)[1])
+            exchange.response = _json(response.body)
+            exchange.channels = _channels(exchange.response)
+            exchange.recorded_ms = (conn.server.ts_at(response.body_offset) - exchange.ts) * 1000
+        exchanges.append(exchange)
+    return HttpSession(conn.start, conn.end, exchanges)
+
+
+def load_capture(
+    path: Path, slimproto_port: int = SLIMPROTO_PORT, http_port: int = HTTP_PORT
+) -> Capture:
+    """Extract the replayable sessions of one capture."""
+    capture = Capture(path, [], [])
+    for conn in _connections(path, {slimproto_port, http_port}):
+        if not conn.client.chunks:
+            continue
+        session: SlimprotoSession | HttpSession | None
+        if conn.server_port == slimproto_port:
+            session = _slim_session(conn) if conn.opened else None
+            if session is not None:
+                capture.slimproto.append(session)
+        else:
+            session = _http_session(conn) if conn.opened else None
+            if session is not None:
+                capture.http.append(session)
+        if session is None:
+            capture.skipped += 1
+    return capture
+
+
+# =============================================================================
+# Replay
+# =============================================================================
+
+
+@dataclass
+class ReplayConfig:
+    """How to replay the captures."""
+
+    speed: float = 1.0
+    max_gap: float | None = None
+    copies: int = 1
+    timeout: float = 10.0
+
+
+class _Timeline:
+    """Maps capture timestamps to replay offsets: gaps scaled by 1/speed, capped at max_gap."""
+
+    def __init__(self, timestamps: list[float], speed: float, max_gap: float | None) -> None:
+        if speed <= 0:
+            raise ValueError("speed must be positive")
+        self._ts = sorted(set(timestamps))
+        self._offsets = []
+        offset = 0.0
+        previous = self._ts[0] if self._ts else 0.0
+        for ts in self._ts:
+            gap = (ts - previous) / speed
+            offset += gap if max_gap is None else min(gap, max_gap)
+            self._offsets.append(offset)
+            previous = ts
+
+    def offset(self, ts: float) -> float:
+        index = min(bisect.bisect_left(self._ts, ts), len(self._ts) - 1)
+        return self._offsets[index] if self._ts else 0.0
+
+
+@dataclass
+class _Results:
+    latency_ms: dict[str, list[float]] = field(default_factory=dict)
+    recorded_ms: dict[str, list[float]] = field(default_factory=dict)
+    checked: int = 0
+    mismatches: list[str] = field(default_factory=list)
+    frames_sent: int = 0
+    frames_received: int = 0
+    requests: int = 0
+    skipped_requests: int = 0
+    cometd_events: int = 0
+    errors: int = 0
+
+    def add(self, bucket: dict[str, list[float]], kind: str, ms: float) -> None:
+        bucket.setdefault(kind, []).append(ms)
+
+
+def _first_seen(commands: list[str]) -> list[str]:
+    return list(dict.fromkeys(commands))
+
+
+class _CaptureReplay:
+    """One copy of one capture, replayed against the server."""
+
+    def __init__(
+        self,
+        capture: Capture,
+        copy: int,
+        server: ServerThread,
+        config: ReplayConfig,
+        timeline: _Timeline,
+        started: float,
+        results: _Results,
+    ) -> None:
+        self.capture = capture
+        self.name = capture.path.name if copy == 0 else f"{capture.path.name}#{copy}"
+        self.server = server
+        self.config = config
+        self.timeline = timeline
+        self.started = started
+        self.results = results
+        self.mac_map = {
+            mac: f"02:00:00:{copy >> 8 & 0xFF:02x}:{copy & 0xFF:02x}:{index:02x}"
+            for index, mac in enumerate(capture.macs)
+            if copy
+        }
+        loop = asyncio.get_running_loop()
+        self.client_ids: dict[str, asyncio.Future[str]] = {
+            cid: loop.create_future() for cid in capture.client_ids
+        }
+
+    async def run(self) -> None:
+        await asyncio.gather(
+            *(self._slimproto(i, s) for i, s in enumerate(self.capture.slimproto)),
+            *(self._http(i, s) for i, s in enumerate(self.capture.http)),
+        )
+
+    async def _at(self, ts: float) -> None:
+        loop = asyncio.get_running_loop()
+        await asyncio.sleep(max(0.0, self.started + self.timeline.offset(ts) - loop.time()))
+
+    def _rewrite(self, data: bytes) -> bytes:
+        for old, new in self.mac_map.items():
+            for encoded_old, encoded_new in (
+                (old, new),
+                (old.upper(), new),
+                (old.replace(":", "%3A"), new.replace(":", "%3A")),
+                (old.replace(":", "%3a"), new.replace(":", "%3a")),
+            ):
+                data = data.replace(encoded_old.encode(), encoded_new.encode())
+        for old, future in self.client_ids.items():
+            if future.done():
+                data = data.replace(old.encode(), future.result().encode())
+        return data
+
+    async def _await_client_ids(self, body: bytes) -> None:
+        """Hold a request until the handshake behind its recorded clientId is replayed."""
+        for old, future in self.client_ids.items():
+            if old.encode() in body and not future.done():
+                try:
+                    await asyncio.wait_for(asyncio.shield(future), self.config.timeout)
+                except TimeoutError:
+                    future.set_result(old)
+
+    # -- Slimproto -------------------------------------------------------------
+
+    async def _slimproto(self, index: int, session: SlimprotoSession) -> None:
+        results = self.results
+        received: list[str] = []
+        helo_sent: float | None = None
+
+        async def read(reader: asyncio.StreamReader) -> None:
+            with contextlib.suppress(asyncio.IncompleteReadError, ConnectionError):
+                while True:
+                    length = int.from_bytes(await reader.readexactly(2), "big")
+                    frame = await reader.readexactly(length)
+                    if not received and helo_sent is not None:
+                        results.add(
+                            results.latency_ms, "helo", (time.monotonic() - helo_sent) * 1000
+                        )
+                    received.append(_server_command(frame))
+                    results.frames_received += 1
+
+        await self._at(session.start)
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", self.server.slimproto_port)
+        except OSError as e:
+            logger.warning("%s slimproto#%d: %s", self.name, index, e)
+            results.errors += 1
+            return
+        reader_task = asyncio.create_task(read(reader))
+        try:
+            for message in session.messages:
+                await self._at(message.ts)
+                payload = message.payload
+                if message.command == "HELO":
+                    mac = self.mac_map.get(session.mac)
+                    if mac is not None:
+                        payload = payload[:2] + bytes.fromhex(mac.replace(":", "")) + payload[8:]
+                    helo_sent = time.monotonic()
+                writer.write(
+                    _SLIM_CLIENT_HEADER.pack(message.command.encode(), len(payload)) + payload
+                )
+                results.frames_sent += 1
+            await writer.drain()
+            await self._at(session.end)
+        except ConnectionError as e:
+            logger.warning("%s slimproto#%d: %s", self.name, index, e)
+            results.errors += 1
+        finally:
+            reader_task.cancel()
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+        if session.server_commands:
+            recorded = [command for _, command in session.server_commands]
+            results.add(
+                results.recorded_ms,
+                "helo",
+                (session.server_commands[0][0] - session.messages[0].ts) * 1000,
+            )
+            self._check_slimproto(index, _first_seen(recorded), _first_seen(received))
+
+    def _check_slimproto(self, index: int, expected: list[str], got: list[str]) -> None:
+        """Commands seen in both runs must have first appeared in the same order."""
+        common = (set(expected) & set(got)) - _TIMER_COMMANDS
+        expected = [command for command in expected if command in common]
+        got = [command for command in got if command in common]
+        self.results.checked += 1
+        if expected != got:
+            self.results.mismatches.append(
+                f"{self.name} slimproto#{index}: server commands {expected}, got {got}"
+            )
+
+    # -- HTTP ------------------------------------------------------------------
+
+    async def _http(self, index: int, session: HttpSession) -> None:
+        results = self.results
+        reader: asyncio.StreamReader | None = None
+        writer: asyncio.StreamWriter | None = None
+        drain: asyncio.Task[None] | None = None
+        try:
+            for number, exchange in enumerate(session.exchanges):
+                if exchange.target.startswith(_SKIPPED_TARGETS):
+                    results.skipped_requests += 1
+                    continue
+                await self._at(exchange.ts)
+                await self._await_client_ids(exchange.body)
+                body = self._rewrite(exchange.body)
+                target = self._rewrite(exchange.target.encode()).decode()
+                if writer is None or reader is None or reader.at_eof():
+                    reader, writer = await asyncio.open_connection(
+                        "127.0.0.1", self.server.web_port
+                    )
+                writer.write(self._request(exchange, target, body))
+                sent = time.monotonic()
+                status, response = await asyncio.wait_for(
+                    self._response(reader, exchange.streaming), self.config.timeout
+                )
+                results.requests += 1
+                results.add(results.latency_ms, exchange.kind, (time.monotonic() - sent) * 1000)
+                if exchange.recorded_ms is not None:
+                    results.add(results.recorded_ms, exchange.kind, exchange.recorded_ms)
+                self._on_response(f"http#{index}.{number}", exchange, status, _json(response))
+                if exchange.streaming:
+                    # The connection now only carries pushed events.
+                    drain = asyncio.create_task(self._drain(reader))
+                    break
+            await self._at(session.end)
+        except (OSError, asyncio.IncompleteReadError, TimeoutError, ValueError) as e:
+            logger.warning("%s http#%d: %r", self.name, index, e)
+            results.errors += 1
+        finally:
+            if drain is not None:
+                drain.cancel()
+            if writer is not None:
+                writer.close()
+                with contextlib.suppress(ConnectionError):
+                    await writer.wait_closed()
+            # Never leave other sessions waiting on a handshake that did not happen here.
+            for exchange in session.exchanges:
+                if exchange.channels and "/meta/handshake" in exchange.channels:
+                    old = str(exchange.response[0].get("clientId", ""))
+                    future = self.client_ids.get(old)
+                    if future is not None and not future.done():
+                        future.set_result(old)
+
+    def _request(self, exchange: HttpExchange, target: str, body: bytes) -> bytes:
+        lines = [f"{exchange.method} {target} HTTP/1.1"]
+        for name, value in exchange.headers:
+            if name.lower() == "host":
+                value = f"127.0.0.1:{self.server.web_port}"
+            elif name.lower() == "content-length":
+                value = str(len(body))
+            lines.append(f"{name}: {value}")
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body
+
+    async def _response(self, reader: asyncio.StreamReader, streaming: bool) -> tuple[int, bytes]:
+        """Read one response; for chunked bodies return the first chunk."""
+        head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+        status = int(head[0].split(" ", 2)[1])
+        fields = {}
+        for line in head[1:]:
+            name, _, value = line.partition(":")
+            fields[name.strip().lower()] = value.strip()
+        if fields.get("transfer-encoding", "").lower() != "chunked":
+            return status, await reader.readexactly(int(fields.get("content-length", "0")))
+        body = await self._chunk(reader)
+        if not streaming:
+            while await self._chunk(reader):
+                pass
+        return status, body
+
+    @staticmethod
+    async def _chunk(reader: asyncio.StreamReader) -> bytes:
+        size = int((await reader.readuntil(b"\r\n")).split(b";")[0], 16)
+        chunk = await reader.readexactly(size + 2)
+        return chunk[:-2]
+
+    async def _drain(self, reader: asyncio.StreamReader) -> None:
+        with contextlib.suppress(asyncio.IncompleteReadError, ConnectionError, ValueError):
+            while await self._chunk(reader):
+                self.results.cometd_events += 1
+
+    def _on_response(self, where: str, exchange: HttpExchange, status: int, response: Any) -> None:
+        if exchange.channels and "/meta/handshake" in exchange.channels:
+            old = str(exchange.response[0].get("clientId", ""))
+            future = self.client_ids.get(old)
+            if future is not None and not future.done():
+                new = response[0].get("clientId") if isinstance(response, list) else None
+                future.set_result(str(new or old))
+
+        if exchange.status is None or exchange.kind == "http":
+            return  # response not in the capture, or depends on the library (artwork)
+        self.results.checked += 1
+        expected = (exchange.status, exchange.channels)
+        got = (status, _channels(response))
+        if expected != got:
+            self.results.mismatches.append(
+                f"{self.name} {where} {exchange.method} {exchange.target}: "
+                f"expected {expected}, got {got}"
+            )
+
+
+async def _drive(
+    server: ServerThread, captures: list[Capture], config: ReplayConfig
+) -> dict[str, Any]:
+    results = _Results()
+    server.set_measuring(True)
+    started = time.monotonic()
+    loop = asyncio.get_running_loop()
+    for capture in captures:
+        timestamps = [
+            *(m.ts for s in capture.slimproto for m in s.messages),
+            *(s.end for s in capture.slimproto),
+            *(e.ts for s in capture.http for e in s.exchanges),
+            *(s.end for s in capture.http),
+        ]
+        if not timestamps:
+            continue
+        timeline = _Timeline(timestamps, config.speed, config.max_gap)
+        start = loop.time() + 0.05
+        await asyncio.gather(
+            *(
+                _CaptureReplay(capture, copy, server, config, timeline, start, results).run()
+                for copy in range(config.copies)
+            )
+        )
+    wall = time.monotonic() - started
+    server.set_measuring(False)
+    await asyncio.sleep(0.1)  # let set_measuring(False) land on the server loop
+
+    return {
+        "version": resonance.__version__,
+        "python": sys.version.split()[0],
+        "config": asdict(config),
+        "captures": [capture.path.name for capture in captures],
+        "duration_s": round(wall, 3),
+        "sessions": {
+            "slimproto": sum(len(c.slimproto) for c in captures) * config.copies,
+            "http": sum(len(c.http) for c in captures) * config.copies,
+            "skipped": sum(c.skipped for c in captures) * config.copies,
+        },
+        "traffic": {
+            "frames_sent": results.frames_sent,
+            "frames_received": results.frames_received,
+            "requests": results.requests,
+            "skipped_requests": results.skipped_requests,
+            "cometd_events": results.cometd_events,
+        },
+        "latency_ms": {kind: _percentiles(v) for kind, v in sorted(results.latency_ms.items())},
+        "recorded_ms": {kind: _percentiles(v) for kind, v in sorted(results.recorded_ms.items())},
+        "loop_lag_ms": _percentiles(server.lag_ms),
+        "ordering": {"checked": results.checked, "mismatches": results.mismatches},
+        "errors": results.errors,
+    }
+
+
+def run_replay(
+    paths: list[Path], config: ReplayConfig, workdir: Path | None = None
+) -> dict[str, Any]:
+    """
+    Replay captures against a fresh server and return the report.
+
+    Args:
+        paths: pcapng files, replayed one after another.
+        config: Timing and number of concurrent copies.
+        workdir: Scratch directory for the DB, synthetic library and caches
+            (default: a temporary directory).
+    """
+    captures = [load_capture(Path(path).resolve()) for path in paths]
+    with contextlib.ExitStack() as stack:
+        if workdir is None:
+            workdir = Path(stack.enter_context(tempfile.TemporaryDirectory(prefix="replay-")))
+        stack.enter_context(contextlib.chdir(workdir))
+        server = ServerThread(workdir, tracks=3, track_seconds=5)
+        server.start()
+        try:
+            return asyncio.run(_drive(server, captures, config))
+        finally:
+            server.stop()
+
+
+def format_report(report: dict[str, Any]) -> str:
+    """Human-readable summary."""
+    sessions, traffic, ordering = report["sessions"], report["traffic"], report["ordering"]
+    lag = report["loop_lag_ms"]
+    lines = [
+        f"resonance {report['version']}  {len(report['captures'])} captures, "
+        f"{sessions['slimproto']} slimproto + {sessions['http']} http sessions "
+        f"({sessions['skipped']} skipped), {report['duration_s']}s",
+        f"  loop lag     p50 {lag['p50']:8.2f} ms   p99 {lag['p99']:8.2f} ms   max {lag['max']:8.2f} ms",
+    ]
+    for kind, stats in report["latency_ms"].items():
+        recorded = report["recorded_ms"].get(kind)
+        was = (
+            f"   (recorded p50 {recorded['p50']:.2f} ms)" if recorded and recorded["count"] else ""
+        )
+        lines.append(
+            f"  {kind:<12} p50 {stats['p50']:8.2f} ms   p99 {stats['p99']:8.2f} ms   "
+            f"n={stats['count']}{was}"
+        )
+    lines += [
+        f"  traffic      {traffic['frames_sent']} frames sent, {traffic['frames_received']} "
+        f"received, {traffic['requests']} requests ({traffic['skipped_requests']} skipped), "
+        f"{traffic['cometd_events']} cometd events",
+        f"  ordering     {ordering['checked']} checked, {len(ordering['mismatches'])} mismatches, "
+        f"{report['errors']} errors",
+    ]
+    lines += [f"  MISMATCH {line}" for line in ordering["mismatches"]]
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m tests.pcap_replay", description=__doc__.split("\n")[1]
+    )
+    defaults = ReplayConfig()
+    parser.add_argument("captures", nargs="*", type=Path, default=list(DEFAULT_CAPTURES))
+    parser.add_argument("--speed", type=float, default=defaults.speed)
+    parser.add_argument("--max-gap", type=float, default=defaults.max_gap)
+    parser.add_argument("--copies", type=int, default=defaults.copies)
+    parser.add_argument("--timeout", type=float, default=defaults.timeout)
+    parser.add_argument("--save", type=Path, help="Write the JSON report here")
+    parser.add_argument("--json", action="store_true", help="Print the full JSON report")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    config = ReplayConfig(
+        speed=args.speed, max_gap=args.max_gap, copies=args.copies, timeout=args.timeout
+    )
+    report = run_replay(args.captures, config)
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+
+    if args.save:
+        args.save.parent.mkdir(parents=True, exist_ok=True)
+        args.save.write_text(json.dumps(report, indent=2) + "\n")
+    return 1 if report["ordering"]["mismatches"] or report["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,7 +5,9 @@ Tests the binary command frame builders for strm, audg, and other
 commands that the server sends to players.
 """
 
+import os
 import struct
+import time
 
 import pytest
 
@@ -30,6 +32,8 @@ from resonance.protocol.commands import (
     build_stream_unpause,
     build_strm_frame,
     build_volume_frame,
+    decode_helo,
+    decode_stat,
 )
 
 
@@ -451,3 +455,120 @@ class TestEnumValues:
         assert TransitionType.FADE_OUT.value == ord("3")
         assert TransitionType.FADE_IN_OUT.value == ord("4")
         assert TransitionType.CROSSFADE_IMMEDIATE.value == ord("5")
+
+
+def _stat_payload(event: bytes = b"STMt", **overrides: int) -> bytes:
+    fields = {
+        "crlf": 0,
+        "mas_initialized": 0,
+        "mas_mode": 0,
+        "buffer_size": 3_145_728,
+        "buffer_fullness": 123_456,
+        "bytes_received": 2**40 + 7,
+        "signal_strength": 88,
+        "jiffies": 987_654,
+        "output_buffer_size": 3_528_000,
+        "output_buffer_fullness": 700_000,
+        "elapsed_seconds": 42,
+        "voltage": 0,
+        "elapsed_milliseconds": 42_250,
+        "server_timestamp": 1234,
+        "error_code": 0,
+    }
+    fields.update(overrides)
+    return struct.pack(">4sBBBIIQHIIIIHIIH", event, *fields.values())
+
+
+class TestDecodeStat:
+    """Tests for decode_stat()."""
+
+    def test_full_payload(self) -> None:
+        stat = decode_stat(_stat_payload())
+        assert stat.event == "STMt"
+        assert stat.buffer_fullness == 123_456
+        assert stat.bytes_received == 2**40 + 7
+        assert stat.signal_strength == 88
+        assert stat.output_buffer_fullness == 700_000
+        assert stat.elapsed_seconds == 42
+        assert stat.elapsed_milliseconds == 42_250
+        assert stat.server_timestamp == 1234
+
+    def test_accepts_memoryview(self) -> None:
+        data = _stat_payload(b"STMs")
+        assert decode_stat(memoryview(data)) == decode_stat(data)
+
+    def test_short_payload_zero_fills_missing_fields(self) -> None:
+        stat = decode_stat(_stat_payload()[:41])
+        assert stat.elapsed_seconds == 42
+        assert stat.elapsed_milliseconds == 0
+        assert stat.error_code == 0
+
+    def test_too_short_raises(self) -> None:
+        with pytest.raises(ValueError):
+            decode_stat(_stat_payload()[:35])
+
+
+class TestDecodeHelo:
+    """Tests for decode_helo()."""
+
+    def test_with_uuid_and_capabilities(self) -> None:
+        data = (
+            bytes([12, 140])
+            + bytes.fromhex("0004201a2b3c")
+            + bytes(range(16))
+            + bytes(12)
+            + b"Model=squeezelite,Name=Kitchen"
+        )
+        helo = decode_helo(data)
+        assert (helo.device_id, helo.revision) == (12, 140)
+        assert helo.mac_address == "00:04:20:1a:2b:3c"
+        assert helo.uuid == bytes(range(16)).hex()
+        assert helo.capabilities == "Model=squeezelite,Name=Kitchen"
+
+    def test_short_form_without_uuid(self) -> None:
+        helo = decode_helo(bytes([4, 1]) + bytes.fromhex("aabbccddeeff") + bytes(12))
+        assert helo.mac_address == "aa:bb:cc:dd:ee:ff"
+        assert helo.uuid == ""
+        assert helo.capabilities == ""
+
+    def test_too_short_raises(self) -> None:
+        with pytest.raises(ValueError):
+            decode_helo(b"\x04\x01abc")
+
+
+class TestCachedFrames:
+    """Constant frames are built once and shared."""
+
+    def test_same_object_returned(self) -> None:
+        assert build_stream_status() is build_stream_status()
+        assert build_stream_stop() is build_stream_stop()
+        assert build_stream_flush() is build_stream_flush()
+        assert build_stream_pause() is build_stream_pause()
+
+    def test_cached_frame_matches_generic_builder(self) -> None:
+        params = StreamParams(
+            command=StreamCommand.STATUS,
+            autostart=AutostartMode.OFF,
+            format=AudioFormat.MP3,
+            server_port=9000,
+        )
+        assert build_stream_status() == build_strm_frame(params)
+
+
+@pytest.mark.skipif(
+    not os.environ.get("RESONANCE_BENCHMARKS"),
+    reason="timing benchmark; set RESONANCE_BENCHMARKS=1 to run",
+)
+class TestDecodeBenchmark:
+    """Micro-benchmark: STAT decoding runs once per second per player."""
+
+    def test_stat_decode_is_microseconds(self) -> None:
+        data = memoryview(_stat_payload())
+        n = 20_000
+        best = float("inf")
+        for _ in range(3):
+            started = time.perf_counter()
+            for _ in range(n):
+                decode_stat(data)
+            best = min(best, (time.perf_counter() - started) / n)
+        assert best < 20e-6, f"{best * 1e6:.2f} us per STAT"
@@ -9,7 +9,11 @@ These tests verify:
 
 from __future__ import annotations
 
+import asyncio
+import os
 import tempfile
+import time
+import wave
 from pathlib import Path
 
 import pytest
@@ -25,13 +29,17 @@ from resonance.core.library import (
 )
 from resonance.core.library_db import LibraryDb, TrackRow, UpsertTrack
 from resonance.core.scanner import (
+    NETWORK_SCAN_CONCURRENCY,
+    DeviceBudget,
     ScanConfig,
     TrackMetadata,
     _extract_metadata,
     _first_text,
     _parse_int_maybe,
     _parse_year_maybe,
+    device_budget,
     scan_music_folder,
+    walk_audio_files,
 )
 
 # =============================================================================
@@ -159,6 +167,78 @@ class TestLibraryDb:
         assert rows[1].artist == "Beta"
         assert rows[2].artist == "Zebra"
 
+    async def test_sort_keys_ignore_case_and_leading_articles(self, db: LibraryDb) -> None:
+        """Test that browse ordering uses the normalized sort keys."""
+        await db.upsert_tracks(
+            [
+                UpsertTrack(path="/1.mp3", title="the Wall", artist="The Zombies"),
+                UpsertTrack(path="/2.mp3", title="Angie", artist="abba"),
+                UpsertTrack(path="/3.mp3", title="Money", artist="Beatles"),
+            ]
+        )
+
+        rows = await db.list_tracks(order_by="title")
+        assert [r.title for r in rows] == ["Angie", "Money", "the Wall"]
+
+        artists = await db.list_artists_with_album_counts(order_by="artist")
+        assert [a["name"] for a in artists] == ["abba", "Beatles", "The Zombies"]
+
+    async def test_browse_queries_avoid_temp_btree_sorts(self, db: LibraryDb) -> None:
+        """Test that indexed browse orders are served without a temp B-tree sort."""
+        await db.upsert_tracks(
+            [
+                UpsertTrack(
+                    path=f"/{i}.flac",
+                    title=f"Song {i}",
+                    artist=f"Artist {i % 4}",
+                    album=f"Album {i % 6}",
+                    year=2000 + i % 3,
+                    track_no=i,
+                    compilation=bool(i % 2),
+                    genres=("Rock",),
+                    contributors=(("composer", f"Composer {i % 3}"),),
+                )
+                for i in range(40)
+            ]
+        )
+        await db.commit()
+
+        conn = db._require_conn()
+        statements: list[str] = []
+        await conn.set_trace_callback(statements.append)
+        for order_by in ("title", "tracknum", "album", "artist", "year"):
+            await db.list_tracks(order_by=order_by)
+        for order_by in ("album", "artist", "year"):
+            await db.list_albums_with_track_counts(order_by=order_by)
+        await db.list_artists_with_album_counts(order_by="artist")
+        await db.list_genres()
+        await db.list_roles()
+        await db.list_tracks_by_album(1)
+        await db.list_tracks_by_artist(1)
+        await db.list_tracks_by_genre_id(1)
+        await db.list_tracks_by_genre_and_year(1, 2001)
+        await db.list_albums_by_genre_id(1)
+        await db.list_albums_with_track_counts_by_role_id(1)
+        await db.list_artists_by_genre_id(1)
+        await db.list_artists_with_album_counts_by_year(2001)
+        await db.list_artists_with_album_counts_by_role_id(1)
+        for selection in (
+            {"album_id": 1, "order_by": "tracknum"},
+            {"artist_id": 1, "order_by": "album"},
+            {"genre_id": 1, "order_by": "title"},
+        ):
+            await db.list_track_ids(**selection)
+        await conn.set_trace_callback(None)
+
+        queries = [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+        assert queries
+        for sql in queries:
+            cursor = await conn.execute("EXPLAIN QUERY PLAN " + sql)
+            plan = [str(r[3]) for r in await cursor.fetchall()]
+            # count(DISTINCT) in per-row count subqueries is the only accepted temp B-tree.
+            temp = [p for p in plan if "TEMP B-TREE" in p and "count(DISTINCT)" not in p]
+            assert not temp, f"{temp} in:\n{sql}"
+
     async def test_list_tracks_pagination(self, db: LibraryDb) -> None:
         """Test pagination in list_tracks."""
         await db.upsert_tracks(
@@ -238,6 +318,68 @@ class TestLibraryDb:
         deleted = await db.delete_track_by_path("/not_there.mp3")
         assert deleted is False
 
+    async def test_generation_bumps_on_content_writes(self, db: LibraryDb) -> None:
+        """Upserts and deletes advance the library generation; reads do not."""
+        start = db.generation
+
+        await db.upsert_tracks([UpsertTrack(path="/music/gen.mp3", title="Gen")])
+        after_upsert = db.generation
+        assert after_upsert > start
+
+        await db.list_tracks(limit=10, offset=0)
+        assert db.generation == after_upsert
+
+        assert await db.delete_track_by_path("/music/gen.mp3")
+        assert db.generation > after_upsert
+
+        # Deleting nothing does not invalidate caches.
+        after_delete = db.generation
+        assert not await db.delete_track_by_path("/music/missing.mp3")
+        assert db.generation == after_delete
+
+    async def test_track_rows_are_mapped_directly(self, db: LibraryDb) -> None:
+        """Track queries return TrackRow objects straight from the cursor."""
+        await db.upsert_tracks(
+            [
+                UpsertTrack(path="/music/r1.flac", title="R1", artist="A", album="X", sample_rate=48000),
+                UpsertTrack(path="/music/r2.flac", title="R2", artist="A", album="X"),
+            ]
+        )
+
+        rows = await db.list_tracks(limit=10, offset=0, order_by="title")
+
+        assert [type(r) for r in rows] == [TrackRow, TrackRow]
+        assert [r.title for r in rows] == ["R1", "R2"]
+        assert rows[0].sample_rate == 48000
+        assert rows[0].artist_name == "A"
+        assert rows[0].album_title == "X"
+        assert rows[0].track_id == rows[0].id
+
+    def test_track_row_factory_fills_columns_missing_on_old_schemas(self) -> None:
+        """A v1-style `tracks` layout maps with defaults for later columns."""
+        from resonance.core.db.queries_tracks import track_row_factory
+
+        v1_columns = (
+            "id", "path", "title", "artist", "album", "album_artist",
+            "track_no", "disc_no", "year", "duration_ms", "file_size", "mtime_ns",
+        )  # fmt: skip
+        factory = track_row_factory(v1_columns)
+
+        row = factory(None, (1, "/a.mp3", "A", None, None, None, 1, None, None, 1000, 10, 5))
+
+        assert row.path == "/a.mp3"
+        assert row.has_artwork == 0
+        assert row.compilation == 0
+        assert row.album_id is None
+        assert row.channels is None
+        assert track_row_factory(v1_columns) is factory
+
+    def test_track_row_factory_rejects_foreign_result_sets(self) -> None:
+        from resonance.core.db.queries_tracks import track_row_factory
+
+        with pytest.raises(ValueError):
+            track_row_factory(("id", "name"))
+
     async def test_normalize_text_strips_whitespace(self, db: LibraryDb) -> None:
         """Test that text fields are normalized."""
         await db.upsert_track(
@@ -301,6 +443,59 @@ class TestScannerHelpers:
         assert _parse_year_maybe(None) is None
 
 
+def _age_tree(root: Path, seconds: int = 60) -> None:
+    """Backdate directory mtimes so the walker trusts them for pruning."""
+    past = time.time_ns() - seconds * 1_000_000_000
+    for directory in [root, *[p for p in root.rglob("*") if p.is_dir()]]:
+        os.utime(directory, ns=(past, past))
+
+
+class TestWalkAudioFiles:
+    """Tests for the scandir-based directory walker."""
+
+    def test_filters_extensions_and_symlinks(self, tmp_path: Path) -> None:
+        (tmp_path / "Album").mkdir()
+        for name in ("01.FLAC", "02.mp3", "cover.jpg", ".flac", "notes"):
+            (tmp_path / "Album" / name).write_bytes(b"")
+        (tmp_path / "link.mp3").symlink_to(tmp_path / "Album" / "02.mp3")
+
+        walk = walk_audio_files(ScanConfig(root=tmp_path))
+        assert sorted(Path(p).name for p in walk.files) == ["01.FLAC", "02.mp3"]
+        assert set(walk.directories) == {str(tmp_path), str(tmp_path / "Album")}
+
+        walk = walk_audio_files(ScanConfig(root=tmp_path, follow_symlinks=True))
+        assert sorted(Path(p).name for p in walk.files) == ["01.FLAC", "02.mp3", "link.mp3"]
+
+    def test_unchanged_directories_are_pruned(self, tmp_path: Path) -> None:
+        for album in ("A", "B"):
+            (tmp_path / "Artist" / album).mkdir(parents=True)
+            (tmp_path / "Artist" / album / "01.mp3").write_bytes(b"")
+        _age_tree(tmp_path)
+        first = walk_audio_files(ScanConfig(root=tmp_path))
+        assert len(first.files) == 2
+
+        # Nothing changed: every directory is skipped, nothing is listed.
+        again = walk_audio_files(ScanConfig(root=tmp_path, known_directories=first.directories))
+        assert again.files == []
+        assert again.pruned == 4
+        assert again.directories == first.directories
+
+        # A new file deep down is found although its ancestors are unchanged.
+        (tmp_path / "Artist" / "B" / "02.mp3").write_bytes(b"")
+        walk = walk_audio_files(ScanConfig(root=tmp_path, known_directories=first.directories))
+        assert sorted(Path(p).name for p in walk.files) == ["01.mp3", "02.mp3"]
+        assert walk.pruned == 3
+
+    def test_recently_modified_directories_are_not_trusted(self, tmp_path: Path) -> None:
+        (tmp_path / "01.mp3").write_bytes(b"")
+        first = walk_audio_files(ScanConfig(root=tmp_path))
+        # Modified just now: recorded as 0 so the next walk lists it again.
+        assert first.directories == {str(tmp_path): 0}
+        again = walk_audio_files(ScanConfig(root=tmp_path, known_directories=first.directories))
+        assert again.pruned == 0
+        assert len(again.files) == 1
+
+
 # =============================================================================
 # MusicLibrary Facade Tests
 # =============================================================================
@@ -395,6 +590,108 @@ class TestMusicLibrary:
         with pytest.raises(MusicLibraryError, match="No scan roots"):
             await library.scan()
 
+    async def test_scan_runs_devices_concurrently_and_roots_per_device_serially(
+        self, library: MusicLibrary, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that roots are grouped by device: devices overlap, roots on one device don't."""
+        devices = {"/disk-a/1": 1, "/disk-a/2": 1, "/disk-b": 2, "/nfs": 3}
+        monkeypatch.setattr(
+            "resonance.core.library.device_budget",
+            lambda root: DeviceBudget(devices[str(root)], "ssd", 4),
+        )
+        active: dict[int, int] = {}
+        max_active_per_device: dict[int, int] = {}
+        max_active_total = 0
+
+        async def fake_scan_root(root, semaphore, root_status, refresh, **kwargs) -> None:
+            nonlocal max_active_total
+            dev = root_status.device
+            active[dev] = active.get(dev, 0) + 1
+            max_active_per_device[dev] = max(max_active_per_device.get(dev, 0), active[dev])
+            max_active_total = max(max_active_total, sum(active.values()))
+            await asyncio.sleep(0.05)
+            active[dev] -= 1
+            root_status.files_total = root_status.tracks_found = 1
+
+        monkeypatch.setattr(library, "_scan_root", fake_scan_root)
+
+        result = await library.scan(roots=[Path(p) for p in devices])
+
+        assert result.scanned_files == 4
+        assert max_active_total == 3
+        assert max_active_per_device == {1: 1, 2: 1, 3: 1}
+
+    async def test_background_scan_reports_per_root_progress(
+        self, library: MusicLibrary, tmp_path: Path
+    ) -> None:
+        """Test that ScanStatus exposes aggregate and per-root progress."""
+        for name in ("a", "b"):
+            (tmp_path / name).mkdir()
+            for i in range(2):
+                with wave.open(str(tmp_path / name / f"{i}.wav"), "wb") as w:
+                    w.setnchannels(1)
+                    w.setsampwidth(2)
+                    w.setframerate(8000)
+                    w.writeframes(b"\0\0" * 80)
+        (tmp_path / "gone").mkdir()
+        await library.set_music_folders([tmp_path / "a", tmp_path / "b", tmp_path / "gone"])
+        (tmp_path / "gone").rmdir()
+
+        assert await library.start_scan()
+        await library._scan_task
+
+        status = library.scan_status
+        assert not status.is_running
+        assert status.progress == 1.0
+        assert status.folders_done == status.folders_total == 3
+        assert [r.state for r in status.roots] == ["done", "done", "failed"]
+        assert [r.tracks_found for r in status.roots] == [2, 2, 0]
+        assert status.tracks_found == 4
+        assert status.errors == 1
+        assert status.last_result is not None
+        assert status.last_result.updated_tracks == 4
+
+    async def test_incremental_scan_skips_unchanged_directories(
+        self, library: MusicLibrary, tmp_path: Path
+    ) -> None:
+        """Test that an incremental scan only re-reads directories that changed."""
+        for album in ("A", "B"):
+            (tmp_path / album).mkdir()
+            with wave.open(str(tmp_path / album / "01.wav"), "wb") as w:
+                w.setnchannels(1)
+                w.setsampwidth(2)
+                w.setframerate(8000)
+                w.writeframes(b"\0\0" * 80)
+        _age_tree(tmp_path)
+
+        first = await library.scan(roots=[tmp_path])
+        assert first.scanned_files == 2
+
+        again = await library.scan(roots=[tmp_path], incremental=True)
+        assert again.scanned_files == 0
+
+        with wave.open(str(tmp_path / "B" / "02.wav"), "wb") as w:
+            w.setnchannels(1)
+            w.setsampwidth(2)
+            w.setframerate(8000)
+            w.writeframes(b"\0\0" * 80)
+        changed = await library.scan(roots=[tmp_path], incremental=True)
+        assert changed.scanned_files == 2  # only B is listed and read
+        assert await library._db.count_tracks() == 3
+
+        full = await library.scan(roots=[tmp_path])
+        assert full.scanned_files == 3
+
+    def test_device_budget_classifies_network_mounts(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that network filesystems get the deep-queue budget."""
+        monkeypatch.setattr("resonance.core.scanner.is_network_filesystem", lambda root: True)
+        budget = device_budget(tmp_path)
+        assert budget.kind == "network"
+        assert budget.max_concurrency == NETWORK_SCAN_CONCURRENCY
+        assert budget.device == tmp_path.stat().st_dev
+
 
 # =============================================================================
 # Integration Test: Scan + Query
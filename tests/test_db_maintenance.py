@@ -0,0 +1,183 @@
+"""
+Tests for library DB maintenance (resonance.core.db.maintenance).
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+from resonance.core.db.maintenance import (
+    CHECKPOINT_PAGES,
+    MAINTENANCE_SECONDS,
+    VACUUM_PAGES,
+    DbMaintenance,
+    MaintenanceConfig,
+)
+from resonance.core.db.models import UpsertTrack
+from resonance.core.library import MusicLibrary
+from resonance.core.library_db import LibraryDb
+from resonance.core.metrics import metrics
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+async def _pragma(db: LibraryDb, name: str) -> int:
+    cursor = await db._require_conn().execute(f"PRAGMA {name};")
+    return (await cursor.fetchone())[0]
+
+
+async def _fill(db: LibraryDb, count: int) -> None:
+    await db.upsert_tracks(
+        UpsertTrack(path=f"/music/{n:05}.flac", title=f"Song {n} " + "x" * 200)
+        for n in range(count)
+    )
+    await db.commit()
+
+
+class TestPragmas:
+    async def test_cache_and_mmap_sizes(self, tmp_path: Path) -> None:
+        db = LibraryDb(tmp_path / "lib.db", MaintenanceConfig(cache_size_kib=8192, mmap_size=0))
+        await db.open()
+        assert await _pragma(db, "cache_size") == -8192
+        assert await _pragma(db, "mmap_size") == 0
+        assert await _pragma(db, "auto_vacuum") == 0
+        await db.close()
+
+    async def test_existing_db_is_vacuumed_into_incremental_mode(self, tmp_path: Path) -> None:
+        path = tmp_path / "lib.db"
+        db = LibraryDb(path)
+        await db.open()
+        await db.ensure_schema()
+        await db.close()
+
+        db = LibraryDb(path, MaintenanceConfig(incremental_vacuum=True))
+        await db.open()
+        assert db.needs_vacuum
+        maintenance = DbMaintenance(db)
+        await maintenance.tick(now=0.0)
+        await maintenance.tick(now=1000.0)  # idle
+        assert not db.needs_vacuum
+        assert await _pragma(db, "auto_vacuum") == 2  # INCREMENTAL
+        await db.close()
+
+
+class TestAnalyze:
+    async def test_scan_refreshes_statistics(self, tmp_path: Path) -> None:
+        db = LibraryDb(":memory:")
+        await db.open()
+        library = MusicLibrary(db=db, music_root=tmp_path)
+        await library.initialize()
+        before = _refreshes()
+
+        await library.scan()
+
+        assert _refreshes() == before + 1
+        await db.close()
+
+    async def test_analyze_only_when_the_track_count_moves(self) -> None:
+        db = LibraryDb(":memory:")
+        await db.open()
+        await db.ensure_schema()
+        await _fill(db, 100)
+        analyzed = MAINTENANCE_SECONDS.count(("analyze",))
+        optimized = MAINTENANCE_SECONDS.count(("optimize",))
+
+        await db.after_scan()  # no statistics yet
+        assert MAINTENANCE_SECONDS.count(("analyze",)) == analyzed + 1
+        cursor = await db._require_conn().execute(
+            "SELECT COUNT(*) FROM sqlite_schema WHERE name = 'sqlite_stat1';"
+        )
+        assert (await cursor.fetchone())[0] == 1
+
+        await _fill(db, 110)  # +10%: statistics are still good enough
+        await db.after_scan()
+        assert MAINTENANCE_SECONDS.count(("analyze",)) == analyzed + 1
+        assert MAINTENANCE_SECONDS.count(("optimize",)) == optimized + 1
+
+        await _fill(db, 200)
+        await db.after_scan()
+        assert MAINTENANCE_SECONDS.count(("analyze",)) == analyzed + 2
+        await db.close()
+
+
+def _refreshes() -> int:
+    return MAINTENANCE_SECONDS.count(("analyze",)) + MAINTENANCE_SECONDS.count(("optimize",))
+
+
+class TestScheduler:
+    async def test_checkpoints_only_when_idle(self, tmp_path: Path) -> None:
+        db = LibraryDb(tmp_path / "lib.db")
+        await db.open()
+        await db.ensure_schema()
+        maintenance = DbMaintenance(db)
+        wal = tmp_path / "lib.db-wal"
+
+        await _fill(db, 50)
+        await maintenance.tick(now=1000.0)
+        assert wal.stat().st_size > 0
+
+        before = MAINTENANCE_SECONDS.count(("checkpoint",))
+        await maintenance.tick(now=1000.0 + db.maintenance_config.checkpoint_idle_seconds)
+        assert MAINTENANCE_SECONDS.count(("checkpoint",)) == before + 1
+        assert CHECKPOINT_PAGES.value() > 0
+        assert wal.stat().st_size == 0
+
+        # Nothing written since: no second checkpoint.
+        await maintenance.tick(now=2000.0)
+        assert MAINTENANCE_SECONDS.count(("checkpoint",)) == before + 1
+        await db.close()
+
+    async def test_tick_waits_for_the_write_lock(self, tmp_path: Path) -> None:
+        db = LibraryDb(tmp_path / "lib.db")
+        await db.open()
+        await db.ensure_schema()
+        maintenance = DbMaintenance(db)
+        await _fill(db, 10)
+        await maintenance.tick(now=1000.0)
+
+        before = MAINTENANCE_SECONDS.count(("checkpoint",))
+        async with db.write_lock:
+            tick = asyncio.create_task(maintenance.tick(now=2000.0))
+            await asyncio.sleep(0.05)
+            assert not tick.done()
+            assert MAINTENANCE_SECONDS.count(("checkpoint",)) == before
+        await tick
+        assert MAINTENANCE_SECONDS.count(("checkpoint",)) == before + 1
+        await db.close()
+
+    async def test_incremental_vacuum_after_large_delete(self, tmp_path: Path) -> None:
+        config = MaintenanceConfig(incremental_vacuum=True, vacuum_min_free_pages=1)
+        db = LibraryDb(tmp_path / "lib.db", config)
+        await db.open()
+        await db.ensure_schema()
+        await _fill(db, 500)
+        assert await db.delete_tracks_by_paths([f"/music/{n:05}.flac" for n in range(500)])
+        await db.commit()
+        assert await db.freelist_count() > 0
+
+        maintenance = DbMaintenance(db)
+        freed_before = VACUUM_PAGES.value()
+        await maintenance.tick(now=0.0)
+        await maintenance.tick(now=1000.0)
+
+        assert await db.freelist_count() == 0
+        assert VACUUM_PAGES.value() > freed_before
+        await db.close()
+
+    async def test_file_size_metrics_while_running(self, tmp_path: Path) -> None:
+        db = LibraryDb(tmp_path / "lib.db")
+        await db.open()
+        await db.ensure_schema()
+        maintenance = DbMaintenance(db)
+
+        maintenance.start()
+        text = metrics.expose()
+        assert "resonance_db_wal_bytes " in text
+        assert "resonance_db_file_bytes " in text
+
+        await maintenance.stop()
+        assert "resonance_db_wal_bytes" not in metrics.expose()
+        assert MAINTENANCE_SECONDS.count(("optimize",)) > 0
+        await db.close()
@@ -0,0 +1,181 @@
+"""
+Tests for the sampling Slimproto frame tracer.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import struct
+from collections.abc import Iterator
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from resonance.player.client import PlayerClient
+from resonance.player.frame_trace import (
+    DEFAULT_CAPACITY,
+    MAX_CAPACITY,
+    RX,
+    TX,
+    FrameTracer,
+    frame_tracer,
+)
+from resonance.protocol.commands import build_stream_start, build_stream_status
+from resonance.web.routes import auth
+from resonance.web.routes.api import router
+
+PLAYER = "aa:bb:cc:dd:ee:ff"
+
+
+def _stat(event: bytes = b"STMt", elapsed_ms: int = 0) -> bytes:
+    return struct.pack(
+        ">4sBBBIIQHIIIIHIIH", event, 0, 0, 0, 0, 1000, 0, 0, 0, 0, 0, 0, 0, elapsed_ms, 0, 0
+    )
+
+
+@pytest.fixture
+def tracer() -> Iterator[FrameTracer]:
+    """The process-wide tracer, enabled for one test and reset afterwards."""
+    frame_tracer.enable(sample_every=1)
+    yield frame_tracer
+    frame_tracer.disable()
+    frame_tracer.clear()
+    frame_tracer.sample_every = FrameTracer.sample_every
+
+
+class TestRecording:
+    def test_heartbeats_are_sampled(self) -> None:
+        tracer = FrameTracer(sample_every=5, enabled=True)
+        for i in range(10):
+            tracer.record(PLAYER, RX, "STAT", _stat(elapsed_ms=i))
+        tracer.record(PLAYER, RX, "STAT", _stat(b"STMs"))
+        tracer.record(PLAYER, TX, "audg", b"\x00" * 18)
+
+        dump = tracer.dump()["players"][PLAYER]
+        stats = [f["stat"] for f in dump["frames"] if f["cmd"] == "STAT"]
+        assert [s["elapsed_ms"] for s in stats if s["event"] == "STMt"] == [0, 5]
+        assert stats[-1]["event"] == "STMs"
+        assert dump["frames"][-1]["cmd"] == "audg"
+        assert dump["heartbeats_skipped"] == 8
+
+    def test_ring_keeps_newest_frames(self) -> None:
+        tracer = FrameTracer(capacity=3, enabled=True)
+        for i in range(5):
+            tracer.record(PLAYER, TX, "aude", bytes([i, i]))
+
+        frames = tracer.dump(PLAYER)["players"][PLAYER]["frames"]
+        assert [f["hex"] for f in frames] == ["02 02", "03 03", "04 04"]
+        assert len(tracer.dump(PLAYER, limit=1)["players"][PLAYER]["frames"]) == 1
+
+    def test_large_payload_keeps_only_head(self) -> None:
+        tracer = FrameTracer(enabled=True)
+        tracer.record(PLAYER, RX, "RESP", b"x" * 1000)
+
+        frame = tracer.dump()["players"][PLAYER]["frames"][0]
+        assert frame["len"] == 1000
+        assert frame["truncated"] == 1000 - 64
+
+    def test_strm_is_decoded_at_dump_time(self) -> None:
+        tracer = FrameTracer(enabled=True)
+        tracer.record(PLAYER, TX, "strm", build_stream_start(PLAYER, server_port=9000))
+
+        strm = tracer.dump()["players"][PLAYER]["frames"][0]["strm"]
+        assert (strm["command"], strm["autostart"], strm["format"]) == ("s", "1", "m")
+        assert strm["server_port"] == 9000
+        assert strm["request"].startswith("GET /stream.mp3?player=")
+
+
+class TestPlayerClientIntegration:
+    @staticmethod
+    def _client() -> PlayerClient:
+        writer = MagicMock(spec=asyncio.StreamWriter)
+        writer.get_extra_info = MagicMock(return_value=("192.168.1.100", 54321))
+        writer.drain = AsyncMock()
+        writer.wait_closed = AsyncMock()
+        client = PlayerClient(AsyncMock(spec=asyncio.StreamReader), writer)
+        client.id = PLAYER
+        return client
+
+    async def test_disabled_tracer_records_nothing(self) -> None:
+        client = self._client()
+        await client.send_message(b"strm", build_stream_status())
+        assert PLAYER not in frame_tracer.dump()["players"]
+        await client.disconnect()
+
+    async def test_sent_frames_are_recorded(self, tracer: FrameTracer) -> None:
+        client = self._client()
+        await client.send_message(b"strm", build_stream_status())
+
+        frames = tracer.dump(PLAYER)["players"][PLAYER]["frames"]
+        assert [(f["dir"], f["cmd"], f["strm"]["command"]) for f in frames] == [("tx", "strm", "t")]
+        await client.disconnect()
+
+
+class TestDebugEndpoint:
+    @staticmethod
+    def _client() -> httpx.AsyncClient:
+        app = FastAPI()
+        app.include_router(router)
+        return httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app),
+            base_url="http://test",
+            headers={"Authorization": "Bearer s3cret"},
+        )
+
+    @pytest.fixture(autouse=True)
+    def _admin_token(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(auth, "_admin_token", "s3cret")
+
+    async def test_configure_and_dump(self, tracer: FrameTracer) -> None:
+        tracer.disable()
+
+        async with self._client() as client:
+            response = await client.post("/api/debug/frames", json={"enabled": True})
+            assert response.json()["enabled"] is True
+
+            tracer.record(PLAYER, RX, "STAT", _stat(b"STMs", elapsed_ms=1500))
+            response = await client.get(f"/api/debug/frames?player={PLAYER}")
+            frames = response.json()["players"][PLAYER]["frames"]
+            assert frames[0]["stat"]["elapsed_ms"] == 1500
+
+            response = await client.post("/api/debug/frames", json={"sample_every": "x"})
+            assert response.status_code == 400
+
+            response = await client.post(
+                "/api/debug/frames", json={"enabled": False, "clear": True}
+            )
+            assert response.json()["enabled"] is False
+            assert (await client.get("/api/debug/frames")).json()["players"] == {}
+
+    async def test_reconfiguring_requires_the_admin_token(self, tracer: FrameTracer) -> None:
+        async with self._client() as client:
+            response = await client.post(
+                "/api/debug/frames", json={"enabled": False}, headers={"Authorization": ""}
+            )
+        assert response.status_code == 401
+        assert tracer.enabled
+
+    async def test_dumping_requires_the_admin_token(self) -> None:
+        async with self._client() as client:
+            response = await client.get("/api/debug/frames", headers={"Authorization": ""})
+        assert response.status_code == 401
+
+    async def test_rejects_non_object_bodies(self, tracer: FrameTracer) -> None:
+        async with self._client() as client:
+            assert (await client.post("/api/debug/frames", json=[1])).status_code == 400
+            response = await client.post("/api/debug/frames", content=b"{")
+            assert response.status_code == 400
+            response = await client.post("/api/debug/frames", json={"capacity": True})
+            assert response.status_code == 400
+
+    async def test_sizes_are_clamped(self, tracer: FrameTracer) -> None:
+        async with self._client() as client:
+            response = await client.post(
+                "/api/debug/frames",
+                json={"enabled": True, "capacity": 10**9, "sample_every": -5},
+            )
+        assert response.json()["capacity"] == MAX_CAPACITY
+        assert response.json()["sample_every"] == 1
+        tracer.enable(capacity=DEFAULT_CAPACITY)
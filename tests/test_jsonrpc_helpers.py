@@ -0,0 +1,197 @@
+"""
+Tests for JSON-RPC loop item builders.
+
+The builders read fields directly from dicts, sqlite rows and dataclasses
+through a per-tags projection. These tests pin that every row shape yields
+the same item, and include a micro-benchmark against the old
+`dataclasses.asdict` path.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import time
+from dataclasses import asdict
+
+import pytest
+
+from resonance.core.db.models import AlbumRow, TrackRow
+from resonance.web.jsonrpc_helpers import (
+    build_album_item,
+    build_artist_item,
+    build_genre_item,
+    build_track_item,
+    parse_tags_string,
+    row_getter,
+    to_dict,
+)
+
+SERVER_URL = "http://127.0.0.1:9000"
+
+TAG_SETS = [None, "", "a", "al", "adlty", "aelsjJK", "oTIr", "cdegilnorstyKJ"]
+
+
+def _track_row(i: int = 1) -> TrackRow:
+    return TrackRow(
+        id=i,
+        path=f"/music/Artist/Album/{i:02d} Song.flac",
+        title=f"Song {i}",
+        artist="Artist",
+        album="Album",
+        album_artist="Artist",
+        track_no=i,
+        disc_no=1,
+        year=2020,
+        duration_ms=183_500,
+        file_size=1234,
+        mtime_ns=0,
+        has_artwork=1,
+        artist_id=7,
+        album_id=3,
+        sample_rate=44100,
+        bit_depth=16,
+        bitrate=900,
+        channels=2,
+    )
+
+
+def _sqlite_row(values: dict) -> sqlite3.Row:
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    cols = ", ".join(f":{k} AS {k}" for k in values)
+    return conn.execute(f"SELECT {cols}", values).fetchone()
+
+
+class TestTrackItem:
+    @pytest.mark.parametrize("tags", TAG_SETS)
+    def test_dataclass_dict_and_sqlite_row_agree(self, tags: str | None) -> None:
+        row = _track_row()
+        tag_set = parse_tags_string(tags) if tags is not None else None
+
+        from_dataclass = build_track_item(row, tag_set, server_url=SERVER_URL)
+        from_dict = build_track_item(asdict(row), tag_set, server_url=SERVER_URL)
+        from_sqlite = build_track_item(_sqlite_row(asdict(row)), tag_set, server_url=SERVER_URL)
+
+        assert from_dataclass == from_dict == from_sqlite
+        assert list(from_dataclass) == list(from_dict) == list(from_sqlite)
+
+    def test_full_item_shape(self) -> None:
+        item = build_track_item(_track_row(), None, server_url=SERVER_URL)
+
+        assert item == {
+            "id": 1,
+            "title": "Song 1",
+            "artist": "Artist",
+            "album": "Album",
+            "year": 2020,
+            "duration": 183.5,
+            "tracknum": 1,
+            "disc": 1,
+            "artist_id": 7,
+            "album_id": 3,
+            "url": "/music/Artist/Album/01 Song.flac",
+            "type": "flc",
+            "bitrate": 900,
+            "samplerate": 44100,
+            "samplesize": 16,
+            "channels": 2,
+            "coverart": 1,
+            "artwork_track_id": 1,
+            "artwork_url": f"{SERVER_URL}/artwork/3",
+            "textkey": "S",
+        }
+
+    def test_tags_gate_optional_fields(self) -> None:
+        item = build_track_item(_track_row(), {"a"}, server_url=SERVER_URL)
+
+        assert item == {
+            "id": 1,
+            "title": "Song 1",
+            "artist": "Artist",
+            "url": "/music/Artist/Album/01 Song.flac",
+            "channels": 2,
+            "textkey": "S",
+        }
+
+    def test_dict_aliases_and_explicit_none(self) -> None:
+        # 'artist'/'album' aliases are used when the *_name/*_title keys are absent
+        item = build_track_item({"id": 1, "title": "x", "artist": "A", "album": "B"}, {"a", "l"})
+        assert item["artist"] == "A"
+        assert item["album"] == "B"
+
+        # dict.get semantics: a present key holding None does not fall back
+        item = build_track_item({"id": 1, "title": "x", "artist_name": None, "artist": "A"}, {"a"})
+        assert "artist" not in item
+
+
+class TestOtherItems:
+    def test_album_item_matches_across_row_shapes(self) -> None:
+        row = AlbumRow(id=3, title="Album", title_sort=None, artist_id=7, artist_name="Artist", year=2020)
+        for tags in (None, {"a", "y", "S", "j"}, {"l"}):
+            assert build_album_item(row, tags, server_url=SERVER_URL) == build_album_item(
+                asdict(row), tags, server_url=SERVER_URL
+            )
+
+    def test_artist_and_genre_items_from_sqlite_rows(self) -> None:
+        artist = _sqlite_row({"id": 1, "name": "Beta", "album_count": 2, "track_count": 9})
+        assert build_artist_item(artist) == {
+            "id": 1,
+            "artist": "Beta",
+            "albums": 2,
+            "track_count": 9,
+            "textkey": "B",
+        }
+
+        genre = _sqlite_row({"id": 4, "name": "Jazz", "track_count": 12})
+        assert build_genre_item(genre) == {"id": 4, "genre": "Jazz", "tracks": 12}
+
+    def test_textkey_follows_the_sort_order(self) -> None:
+        assert build_artist_item({"id": 1, "name": "The Zombies"})["textkey"] == "Z"
+        album = build_album_item({"id": 2, "title": "the Wall"}, None, server_url=SERVER_URL)
+        assert album["textkey"] == "W"
+        track = build_track_item({"id": 3, "title": "Los Angeles"}, None, server_url=SERVER_URL)
+        assert track["textkey"] == "A"
+        assert build_artist_item({"id": 4, "name": "Theatre"})["textkey"] == "T"
+        assert "textkey" not in build_artist_item({"id": 5, "name": "  "})
+
+    def test_to_dict_is_shallow_for_dataclasses(self) -> None:
+        row = _track_row()
+        assert to_dict(row) == asdict(row)
+        assert to_dict(_sqlite_row({"id": 1, "name": "x"})) == {"id": 1, "name": "x"}
+
+    def test_row_getter_is_resolved_per_type(self) -> None:
+        assert row_getter(_track_row(1)) is row_getter(_track_row(2))
+        assert row_getter({}) is not row_getter(_track_row())
+
+
+@pytest.mark.skipif(
+    not os.environ.get("RESONANCE_BENCHMARKS"),
+    reason="timing benchmark; set RESONANCE_BENCHMARKS=1 to run",
+)
+def test_benchmark_projection_vs_asdict() -> None:
+    """Micro-benchmark: direct projection vs. the former `asdict` + dict path."""
+    rows = [_track_row(i) for i in range(1, 1001)]
+    tags = parse_tags_string("aCdejJKlstuxyo")
+
+    def legacy() -> None:
+        for row in rows:
+            build_track_item(asdict(row), tags, server_url=SERVER_URL)
+
+    def projected() -> None:
+        for row in rows:
+            build_track_item(row, tags, server_url=SERVER_URL)
+
+    def best_of(fn, runs: int = 5) -> float:
+        best = float("inf")
+        for _ in range(runs):
+            t0 = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - t0)
+        return best
+
+    legacy_s = best_of(legacy)
+    projected_s = best_of(projected)
+
+    # Loose bound so the test stays stable on noisy CI machines.
+    assert projected_s < legacy_s
@@ -0,0 +1,69 @@
+"""
+Smoke test for the load generator (tests/loadgen.py) and its regression check.
+"""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from tests.loadgen import compare
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+class TestLoadgenRun:
+    def test_short_run_reports_all_metrics(self, tmp_path: Path) -> None:
+        # Own process: the server uses process-wide singletons (event bus, scheduler).
+        saved = tmp_path / "report.json"
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "tests.loadgen",
+                "--players=3",
+                "--cometd=2",
+                "--duration=3",
+                "--track-seconds=2",
+                "--command-interval=0.5",
+                f"--save={saved}",
+            ],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            timeout=120,
+        )
+        assert result.returncode == 0, result.stderr
+        assert "loop lag" in result.stdout
+
+        report = json.loads(saved.read_text())
+        assert report["slimproto"]["connected"] == 3
+        assert report["cometd"]["connected"] == 2
+        assert report["slimproto"]["streams"] >= 3
+        assert report["slimproto"]["command_ms"]["count"] > 0
+        assert report["cometd"]["request_ms"]["count"] > 0
+        assert report["loop_lag_ms"]["count"] > 0
+        assert report["memory"]["per_client_kb"] > 0
+        assert report["errors"] == 0
+
+
+class TestCompare:
+    @staticmethod
+    def _report(p99: float, cpu: float) -> dict:
+        return {
+            "version": "0.1.0",
+            "slimproto": {"command_ms": {"p99": p99}},
+            "cpu": {"per_player_pct": cpu},
+        }
+
+    def test_flags_relative_regressions_above_noise_floor(self) -> None:
+        baseline = self._report(p99=20.0, cpu=0.5)
+        assert compare(self._report(p99=24.0, cpu=0.5), baseline) == []
+        regressions = compare(self._report(p99=40.0, cpu=0.5), baseline)
+        assert regressions == ["slimproto.command_ms.p99: 20 -> 40 (baseline 0.1.0)"]
+
+    def test_small_absolute_changes_are_noise(self) -> None:
+        # +100% but only 2 ms: below the floor.
+        assert compare(self._report(p99=4.0, cpu=0.5), self._report(p99=2.0, cpu=0.5)) == []
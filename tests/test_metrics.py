@@ -0,0 +1,164 @@
+"""
+Tests for the in-process metrics registry and the /metrics endpoint.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+from fastapi.responses import StreamingResponse
+from httpx import ASGITransport, AsyncClient
+
+from resonance.core.db import queries_tracks as _queries_tracks
+from resonance.core.library import MusicLibrary
+from resonance.core.library_db import QUERY_SECONDS, LibraryDb
+from resonance.core.metrics import Gauge, MetricsRegistry
+from resonance.player.registry import PlayerRegistry
+from resonance.web.cometd import DELIVERY_SECONDS, CometdClient
+from resonance.web.jsonrpc import COMMAND_SECONDS
+from resonance.web.routes import streaming
+from resonance.web.server import WebServer
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+
+class TestExposition:
+    def test_counter_gauge_and_labels(self) -> None:
+        registry = MetricsRegistry()
+        counter = registry.counter("x_total", "Things.", ("kind",))
+        counter.inc(labels=("a",))
+        counter.inc(2, labels=('b"q',))
+        registry.gauge("depth", "Depth.").set(1.5)
+
+        text = registry.expose()
+        assert "# TYPE x_total counter" in text
+        assert 'x_total{kind="a"} 1\n' in text
+        assert 'x_total{kind="b\\"q"} 2\n' in text
+        assert "# TYPE depth gauge\ndepth 1.5\n" in text
+
+    def test_histogram_buckets_are_cumulative(self) -> None:
+        registry = MetricsRegistry()
+        histogram = registry.histogram("lat_seconds", "Latency.", buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 0.5, 3.0):
+            histogram.observe(value)
+
+        lines = registry.expose().splitlines()
+        assert 'lat_seconds_bucket{le="0.1"} 1' in lines
+        assert 'lat_seconds_bucket{le="1"} 3' in lines
+        assert 'lat_seconds_bucket{le="+Inf"} 4' in lines
+        assert "lat_seconds_sum 4.05" in lines
+        assert "lat_seconds_count 4" in lines
+
+    def test_get_or_create(self) -> None:
+        registry = MetricsRegistry()
+        assert registry.counter("a_total", "A.") is registry.counter("a_total", "A.")
+        with pytest.raises(ValueError):
+            registry.histogram("a_total", "A.")
+
+    def test_collectors(self) -> None:
+        registry = MetricsRegistry()
+
+        def live() -> list[Gauge]:
+            gauge = Gauge("live", "Live value.")
+            gauge.set(7)
+            return [gauge]
+
+        def broken() -> list[Gauge]:
+            raise RuntimeError("boom")
+
+        registry.add_collector("live", live)
+        registry.add_collector("broken", broken)
+        assert "live 7" in registry.expose()
+
+        registry.remove_collector("live", broken)  # not the registered one: kept
+        assert "live 7" in registry.expose()
+        registry.remove_collector("live")
+        assert "live" not in registry.expose()
+
+
+class TestInstrumentation:
+    async def test_db_queries_are_timed_per_function(self) -> None:
+        db = LibraryDb(":memory:")
+        await db.open()
+        await db.ensure_schema()
+        labels = ("queries_tracks.count_tracks",)
+        before = QUERY_SECONDS.count(labels)
+        assert await db.count_tracks() == 0
+        assert QUERY_SECONDS.count(labels) == before + 1
+        await db.close()
+
+    async def test_patched_query_functions_are_used(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        db = LibraryDb(":memory:")
+        await db.open()
+        await db.ensure_schema()
+        assert await db.count_tracks() == 0
+
+        async def count_tracks(_conn: object) -> int:
+            return 42
+
+        monkeypatch.setattr(_queries_tracks, "count_tracks", count_tracks)
+        labels = ("queries_tracks.count_tracks",)
+        before = QUERY_SECONDS.count(labels)
+        assert await db.count_tracks() == 42
+        assert QUERY_SECONDS.count(labels) == before + 1
+        await db.close()
+
+    def test_cometd_delivery_latency(self) -> None:
+        client = CometdClient(client_id="abcd1234")
+        before = DELIVERY_SECONDS.count()
+        client.add_event({"channel": "/a"})
+        client.add_event({"channel": "/b"})
+        assert len(client.get_and_clear_events()) == 2
+        assert DELIVERY_SECONDS.count() == before + 2
+        assert client.get_and_clear_events() == []
+
+    async def test_stream_meter(self) -> None:
+        player = "aa:bb:cc:00:00:46"
+        seen_active: list[bool] = []
+
+        async def body() -> AsyncIterator[bytes]:
+            yield b"x" * 100
+            seen_active.append(any(m.player == player for m in streaming._active_streams))
+            yield b"y" * 50
+
+        ttfb_before = streaming.STREAM_TTFB_SECONDS.count(("direct",))
+        response = streaming._metered(StreamingResponse(body()), player, "direct", 0.0)
+        chunks = [chunk async for chunk in response.body_iterator]
+
+        assert b"".join(chunks) == b"x" * 100 + b"y" * 50
+        assert seen_active == [True]
+        assert streaming.STREAM_BYTES.value((player,)) == 150
+        assert streaming.STREAM_TTFB_SECONDS.count(("direct",)) == ttfb_before + 1
+        assert not any(m.player == player for m in streaming._active_streams)
+
+
+class TestEndpoint:
+    async def test_metrics_endpoint(self) -> None:
+        db = LibraryDb(":memory:")
+        await db.open()
+        await db.ensure_schema()
+        library = MusicLibrary(db=db, music_root=None)
+        await library.initialize()
+        server = WebServer(player_registry=PlayerRegistry(), music_library=library)
+
+        async with AsyncClient(
+            transport=ASGITransport(app=server.app), base_url="http://test"
+        ) as client:
+            before = COMMAND_SECONDS.count(("serverstatus",))
+            body = {"id": 1, "method": "slim.request", "params": ["-", ["serverstatus", 0, 10]]}
+            assert (await client.post("/jsonrpc.js", json=body)).status_code == 200
+            assert COMMAND_SECONDS.count(("serverstatus",)) == before + 1
+
+            response = await client.get("/metrics")
+            assert response.status_code == 200
+            assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+            text = response.text
+            assert 'resonance_jsonrpc_command_seconds_count{command="serverstatus"}' in text
+            assert "# TYPE resonance_db_query_seconds histogram" in text
+            assert "resonance_transcode_running 0" in text
+            assert "# TYPE resonance_streams_active gauge" in text
+        await db.close()
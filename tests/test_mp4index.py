@@ -0,0 +1,195 @@
+"""
+Tests for the MP4 sample-table index (exact seeking in m4a/m4b files).
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from resonance.streaming import mp4index
+from resonance.streaming.mp4index import (
+    AdtsConfig,
+    Mp4IndexError,
+    build_sample_index,
+    get_sample_index,
+    iter_adts,
+    parse_audio_specific_config,
+)
+from resonance.streaming.transcoder import TranscodeRule
+from resonance.web.routes.streaming import _seek_source
+from tests.audio_corpus import build_m4a
+
+SIZES = [100 + i % 7 for i in range(95)]
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache() -> None:
+    mp4index.clear_sample_index_cache()
+
+
+@pytest.fixture
+def m4a(tmp_path: Path) -> Path:
+    path = tmp_path / "book.m4b"
+    path.write_bytes(build_m4a(SIZES, samples_per_chunk=10))
+    return path
+
+
+def _split_adts(stream: bytes) -> list[bytes]:
+    frames = []
+    pos = 0
+    while pos < len(stream):
+        assert stream[pos : pos + 2] == b"\xff\xf1"
+        length = ((stream[pos + 3] & 0x3) << 11) | (stream[pos + 4] << 3) | (stream[pos + 5] >> 5)
+        frames.append(stream[pos + 7 : pos + length])
+        pos += length
+    return frames
+
+
+class TestSampleIndex:
+    def test_parses_track_parameters(self, m4a: Path) -> None:
+        index = build_sample_index(m4a)
+        assert (index.codec, index.timescale, index.sample_rate, index.channels) == (
+            "mp4a",
+            44100,
+            44100,
+            2,
+        )
+        assert index.sample_count == len(SIZES)
+        assert index.duration == len(SIZES) * 1024
+        assert index.adts == AdtsConfig(profile=1, sample_rate_index=4, channel_config=2)
+
+    def test_every_sample_offset_points_at_its_payload(self, m4a: Path) -> None:
+        index = build_sample_index(m4a)
+        data = m4a.read_bytes()
+        for sample, size in enumerate(SIZES):
+            offset = index.sample_offset(sample)
+            assert data[offset : offset + size] == bytes([sample]) * size, sample
+
+    def test_seek_maps_time_to_exact_sample(self, m4a: Path) -> None:
+        index = build_sample_index(m4a)
+        point = index.seek(33.5 * 1024 / 44100)
+        assert point.sample == 33
+        assert point.seconds == pytest.approx(33 * 1024 / 44100)
+        assert point.offset == index.sample_offset(33)
+        assert index.seek(-1).sample == 0
+        assert index.seek(10_000).sample == len(SIZES) - 1
+
+    def test_seek_backs_up_to_sync_sample(self, m4a: Path) -> None:
+        from array import array
+
+        index = build_sample_index(m4a)
+        object.__setattr__(index, "sync_samples", array("I", [0, 20, 40]))
+        assert index.seek(35 * 1024 / 44100).sample == 20
+
+    def test_iter_adts_frames_the_requested_samples(self, m4a: Path) -> None:
+        index = build_sample_index(m4a)
+        frames = _split_adts(b"".join(iter_adts(m4a, index, 7, 42, chunk_size=256)))
+        assert frames == [bytes([s]) * SIZES[s] for s in range(7, 42)]
+
+    def test_not_an_mp4(self, tmp_path: Path) -> None:
+        path = tmp_path / "noise.m4a"
+        path.write_bytes(b"\0\0\0\x10junkjunkjunk")
+        with pytest.raises(Mp4IndexError):
+            build_sample_index(path)
+
+    def test_truncated_64bit_box_header(self, tmp_path: Path) -> None:
+        path = tmp_path / "cut.m4a"
+        path.write_bytes(b"\0\0\0\x01mdat\0\0")
+        with pytest.raises(Mp4IndexError):
+            build_sample_index(path)
+
+
+class TestAudioSpecificConfig:
+    @pytest.mark.parametrize(
+        ("config", "expected"),
+        [
+            (bytes([0x12, 0x10]), AdtsConfig(1, 4, 2)),  # AAC-LC 44.1k stereo
+            (bytes([0x11, 0x88]), AdtsConfig(1, 3, 1)),  # AAC-LC 48k mono
+            (bytes([0x2B, 0x92, 0x08, 0x00]), AdtsConfig(1, 7, 2)),  # HE-AAC, 22.05k core
+            (bytes([0x17, 0x80, 0x56, 0x22, 0x00]), None),  # explicit sample rate
+            (bytes([0x12, 0x00]), None),  # channel config 0 (PCE)
+            (b"\x12", None),
+        ],
+    )
+    def test_adts_parameters(self, config: bytes, expected: AdtsConfig | None) -> None:
+        assert parse_audio_specific_config(config) == expected
+
+    def test_header_encodes_frame_length(self) -> None:
+        header = AdtsConfig(1, 4, 2).header(371)
+        # 371 + 7 = 378 bytes: 0x2F, 0x5F carry the 13-bit frame length.
+        assert header == bytes.fromhex("fff150802f5ffc")
+        with pytest.raises(Mp4IndexError):
+            AdtsConfig(1, 4, 2).header(9000)
+
+
+class TestSampleIndexCache:
+    async def test_cached_until_file_changes(self, m4a: Path) -> None:
+        first = await get_sample_index(m4a)
+        assert first is not None
+        assert await get_sample_index(m4a) is first
+
+        m4a.write_bytes(build_m4a(SIZES[:50]))
+        st = m4a.stat()
+        os.utime(m4a, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        changed = await get_sample_index(m4a)
+        assert changed is not None and changed.sample_count == 50
+
+    async def test_unindexable_files_return_none(self, tmp_path: Path) -> None:
+        assert await get_sample_index(tmp_path / "song.flac") is None
+        assert await get_sample_index(tmp_path / "missing.m4a") is None
+
+
+class TestSeekSource:
+    async def test_uses_sample_table_for_stdin_rules(self, m4a: Path) -> None:
+        rule = TranscodeRule("m4b", "mp3", "*", "*", "[faad] $FILE$", capabilities="FTI")
+        source = await _seek_source(m4a, rule, 10 * 1024 / 44100, 20 * 1024 / 44100)
+        assert source is not None
+        assert _split_adts(b"".join(source)) == [bytes([s]) * SIZES[s] for s in range(10, 21)]
+
+    async def test_falls_back_to_decoder_seek(self, m4a: Path) -> None:
+        no_stdin = TranscodeRule("m4b", "mp3", "*", "*", "[faad] $FILE$", capabilities="FT")
+        with_stdin = TranscodeRule("m4b", "mp3", "*", "*", "[faad] $FILE$", capabilities="FTI")
+        assert await _seek_source(m4a, no_stdin, 1.0, None) is None
+        assert await _seek_source(m4a, with_stdin, None, None) is None
+
+
+class TestMp4Benchmarks:
+    def test_long_audiobook_seek_is_near_instant(self, tmp_path: Path) -> None:
+        # ~2 hours of 44.1 kHz AAC (1024 samples per frame).
+        count = 2 * 3600 * 44100 // 1024
+        path = tmp_path / "long.m4b"
+        path.write_bytes(build_m4a([8] * count, samples_per_chunk=20, fill=0))
+
+        started = time.perf_counter()
+        index = mp4index.load_sample_index(path)
+        parse = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for minute in range(0, 120, 3):
+            point = index.seek(minute * 60.0)
+            assert abs(point.seconds - minute * 60.0) < 1024 / 44100
+        seek = (time.perf_counter() - started) / 40
+
+        assert parse < 0.5, parse
+        assert seek < 0.001, seek
+        assert mp4index.load_sample_index(path) is index
+
+    def test_remux_cpu_is_a_tiny_fraction_of_realtime(self, tmp_path: Path) -> None:
+        # 30 minutes of 128 kbit/s AAC: ~372-byte frames, 43 per second.
+        count = 30 * 60 * 44100 // 1024
+        path = tmp_path / "chapter.m4b"
+        path.write_bytes(build_m4a([372] * count, samples_per_chunk=22, fill=0))
+        index = mp4index.load_sample_index(path)
+
+        started = time.process_time()
+        total = sum(len(chunk) for chunk in iter_adts(path, index))
+        cpu = time.process_time() - started
+
+        assert total == count * (372 + 7)
+        # A decode + MP3 encode runs at a few percent of a core per stream;
+        # remuxing must stay far below 0.5% of realtime.
+        assert cpu < 0.005 * 30 * 60, cpu
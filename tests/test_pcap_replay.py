@@ -0,0 +1,95 @@
+"""
+Tests for the pcap replay harness (tests/pcap_replay.py).
+"""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from tests.pcap_replay import Packet, _Stream, _Timeline, load_capture
+
+ROOT = Path(__file__).resolve().parent.parent
+RADIO_MAC = "00:04:20:26:84:ae"
+
+
+class TestExtraction:
+    def test_slimproto_and_cometd_sessions(self) -> None:
+        capture = load_capture(ROOT / "tests" / "ws2.pcapng")
+
+        assert capture.macs == [RADIO_MAC]
+        assert [len(s.messages) for s in capture.slimproto] == [5, 9]
+        first = capture.slimproto[0]
+        assert [m.command for m in first.messages] == ["HELO"] + ["STAT"] * 4
+        assert [c for _, c in first.server_commands][:3] == ["vers", "setd", "strm/t"]
+
+        handshake, connect, subscribe = (e for s in capture.http for e in s.exchanges)
+        assert handshake.channels == ("/meta/handshake",)
+        assert capture.client_ids == ["25e894ff"]
+        # Streaming connect: the first chunk of the never-ending response is kept.
+        assert connect.streaming and connect.kind == "connect"
+        assert connect.channels == ("/meta/connect", "/meta/subscribe")
+        assert subscribe.kind == "cometd" and subscribe.recorded_ms is not None
+
+    def test_connections_open_before_the_capture_are_skipped(self) -> None:
+        capture = load_capture(ROOT / "docs" / "ws29.pcapng")
+
+        assert capture.skipped == 1  # Slimproto connection captured mid-stream
+        assert [s.messages[0].command for s in capture.slimproto] == ["HELO"]
+        kinds = [e.kind for s in capture.http for e in s.exchanges]
+        assert kinds.count("http") == 1  # artwork
+        assert kinds.count("connect") == 1
+
+    def test_reassembly_drops_retransmissions(self) -> None:
+        stream = _Stream()
+        for seq, flags, payload in (
+            (100, 0x02, b""),
+            (101, 0x18, b"abc"),
+            (101, 0x18, b"abc"),
+            (103, 0x18, b"cde"),
+        ):
+            stream.add(Packet(float(seq), ("a", 1), ("b", 2), seq, flags, payload))
+
+        assert stream.data == b"abcde"
+        assert stream.ts_at(4) == 103.0
+
+
+class TestTimeline:
+    def test_speed_and_max_gap(self) -> None:
+        timeline = _Timeline([10.0, 11.0, 21.0], speed=2.0, max_gap=1.0)
+        assert [timeline.offset(ts) for ts in (10.0, 11.0, 21.0)] == [0.0, 0.5, 1.5]
+        assert _Timeline([10.0, 11.0, 21.0], speed=1.0, max_gap=None).offset(21.0) == 11.0
+
+
+class TestReplay:
+    def test_accelerated_replay_matches_recording(self, tmp_path: Path) -> None:
+        # Own process: the server uses process-wide singletons (event bus, scheduler).
+        saved = tmp_path / "report.json"
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "tests.pcap_replay",
+                "tests/ws4pcapng.pcapng",
+                "docs/ws29.pcapng",
+                "--max-gap=0.01",
+                "--copies=2",
+                f"--save={saved}",
+            ],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            timeout=120,
+        )
+        assert result.returncode == 0, result.stdout + result.stderr
+
+        report = json.loads(saved.read_text())
+        assert report["errors"] == 0
+        assert report["ordering"]["mismatches"] == []
+        assert report["ordering"]["checked"] > 20
+        assert report["latency_ms"]["helo"]["count"] == 4
+        assert report["latency_ms"]["cometd"]["count"] > 20
+        assert report["recorded_ms"]["cometd"]["count"] > 20
+        assert report["traffic"]["cometd_events"] > 0
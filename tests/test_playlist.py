@@ -515,3 +515,234 @@ class TestPlaylistManager:
 
         assert len(playlist1) == 2
         assert len(playlist2) == 1
+
+
+def _library_track(track_id: int) -> PlaylistTrack:
+    return PlaylistTrack(
+        track_id=TrackId(track_id),
+        path=f"/music/{track_id:03d}.flac",
+        title=f"Song {track_id}",
+    )
+
+
+class TestPlaylistStorage:
+    """Tests for the id-array storage, shuffle permutation and lazy hydration."""
+
+    def test_ids_are_packed_int64(self) -> None:
+        """Entries should be stored as 8-byte ids, not track objects."""
+        playlist = Playlist(player_id="test")
+        playlist.extend(_library_track(i) for i in range(1, 101))
+
+        assert playlist._ids.itemsize == 8
+        assert len(playlist._ids) == 100
+        assert playlist.track_ids[:3] == [1, 2, 3]
+
+    def test_path_entries_get_negative_ids(self) -> None:
+        """Path-only entries should not collide with library ids."""
+        playlist = Playlist(player_id="test")
+        playlist.add(_library_track(1))
+        playlist.add_path("/music/loose.mp3")
+
+        assert playlist.track_ids[0] == 1
+        assert playlist.track_ids[1] < 0
+        assert playlist.tracks[1].path == "/music/loose.mp3"
+
+    def test_shuffle_permutation_round_trip(self) -> None:
+        """Shuffle should keep the current track and map back on disable."""
+        playlist = Playlist(player_id="test")
+        playlist.extend(_library_track(i) for i in range(1, 51))
+        playlist.play(17)
+
+        playlist.set_shuffle(ShuffleMode.ON)
+        assert playlist.current_index == 0
+        assert playlist.current_track.track_id == 18
+        assert sorted(playlist.track_ids) == list(range(1, 51))
+
+        playlist.next()
+        playing = playlist.current_track.track_id
+
+        playlist.set_shuffle(ShuffleMode.OFF)
+        assert playlist.track_ids == list(range(1, 51))
+        assert playlist.current_track.track_id == playing
+        assert playlist.current_index == playing - 1
+
+    def test_remove_while_shuffled_reindexes_order(self) -> None:
+        """Removing an entry should keep the permutation consistent."""
+        playlist = Playlist(player_id="test")
+        playlist.extend(_library_track(i) for i in range(1, 11))
+        playlist.set_shuffle(ShuffleMode.ON)
+
+        removed = playlist.remove(3)
+
+        assert len(playlist) == 9
+        assert removed.track_id not in playlist.track_ids
+        assert sorted(playlist.track_ids) == sorted(set(range(1, 11)) - {removed.track_id})
+
+        playlist.set_shuffle(ShuffleMode.OFF)
+        assert playlist.track_ids == sorted(set(range(1, 11)) - {removed.track_id})
+
+    def test_move_keeps_current_track(self) -> None:
+        """Moving entries should keep the current index pointing at the same track."""
+        playlist = Playlist(player_id="test")
+        playlist.extend(_library_track(i) for i in range(1, 6))
+        playlist.play(1)
+
+        assert playlist.move(0, 4)
+        assert playlist.track_ids == [2, 3, 4, 5, 1]
+        assert playlist.current_track.track_id == 2
+
+    async def test_lazy_hydration_with_bounded_cache(self) -> None:
+        """Evicted metadata should be reloaded through the track loader."""
+        loaded: list[list[int]] = []
+
+        async def loader(ids):
+            loaded.append(list(ids))
+            return [_library_track(i) for i in ids]
+
+        playlist = Playlist(player_id="test", track_loader=loader, metadata_cache_size=8)
+        playlist.extend(_library_track(i) for i in range(1, 101))
+
+        assert len(playlist._meta) <= 8
+        # Current, neighbours and the ends stay pinned for synchronous navigation.
+        assert playlist.current_track.title == "Song 1"
+        assert playlist.tracks[-1].title == "Song 100"
+
+        await playlist.hydrate(40, 5)
+        assert loaded[-1] == [41, 42, 43, 44, 45]
+        assert [t.title for t in playlist.tracks[40:45]] == [f"Song {i}" for i in range(41, 46)]
+
+    async def test_window_larger_than_cache_is_served_whole(self) -> None:
+        """A hydrated window must not be evicted down to the cache size before it is read."""
+
+        async def loader(ids):
+            return [_library_track(i) for i in ids]
+
+        playlist = Playlist(player_id="test", track_loader=loader, metadata_cache_size=8)
+        playlist.extend_ids(range(1, 1001))
+
+        await playlist.hydrate(0, 1000)
+
+        assert all(track.path for track in playlist.tracks[0:1000])
+
+    async def test_tracks_missing_from_library_are_dropped(self) -> None:
+        """Ids the loader no longer knows should leave the queue, not stay placeholders."""
+
+        async def loader(ids):
+            return [_library_track(i) for i in ids if i % 2]
+
+        playlist = Playlist(player_id="test", track_loader=loader)
+        playlist.extend_ids(range(1, 11))
+        playlist.play(5)  # track 6 (deleted)
+
+        await playlist.hydrate()
+
+        assert playlist.track_ids == [1, 3, 5, 7, 9]
+        assert playlist.current_track.track_id == 7
+
+    def test_state_round_trip(self) -> None:
+        """to_state/from_state should restore ids, order and modes."""
+        playlist = Playlist(player_id="aa:bb")
+        playlist.extend(_library_track(i) for i in range(1, 21))
+        playlist.add_path("/music/loose.mp3")
+        playlist.play(5)
+        playlist.set_shuffle(ShuffleMode.ON)
+        playlist.set_repeat(RepeatMode.ALL)
+
+        restored = Playlist.from_state(playlist.to_state())
+
+        assert restored.track_ids == playlist.track_ids
+        assert restored.current_index == playlist.current_index
+        assert restored.shuffle_mode == ShuffleMode.ON
+        assert restored.repeat_mode == RepeatMode.ALL
+        assert restored.tracks[restored.track_ids.index(min(restored.track_ids))].path == "/music/loose.mp3"
+
+
+class TestPlaylistPersistence:
+    """Tests for write-behind persistence through LibraryDb."""
+
+    @pytest.fixture
+    async def db(self):
+        from resonance.core.library_db import LibraryDb
+
+        db = LibraryDb(":memory:")
+        await db.open()
+        await db.ensure_schema()
+        yield db
+        await db.close()
+
+    async def test_flush_and_load(self, db) -> None:
+        """Queues should survive a manager restart and hydrate from the DB."""
+        from resonance.core.db.models import UpsertTrack
+
+        ids = [
+            await db.upsert_track(UpsertTrack(path=f"/music/{i}.flac", title=f"Song {i}"))
+            for i in range(1, 6)
+        ]
+        rows = await db.get_tracks_by_ids(ids)
+
+        manager = PlaylistManager(db=db, write_delay=60)
+        playlist = manager.get("aa:bb")
+        playlist.extend(rows)
+        playlist.play(2)
+        await manager.close()
+
+        restored = PlaylistManager(db=db)
+        assert await restored.load() == 1
+        queue = restored.get("aa:bb")
+        assert queue.track_ids == ids
+        assert queue.current_index == 2
+        assert queue.current_track.title == "Song 3"
+
+    async def test_change_during_flush_is_written(self, db, monkeypatch) -> None:
+        """A mutation made while a write-behind flush is saving must be flushed too."""
+        import asyncio
+
+        manager = PlaylistManager(db=db, write_delay=0)
+        playlist = manager.get("aa:bb")
+        save = db.save_player_playlists
+
+        async def slow_save(states, deleted=()):
+            await asyncio.sleep(0.05)
+            await save(states, deleted=deleted)
+
+        monkeypatch.setattr(db, "save_player_playlists", slow_save)
+        playlist.add_path("/music/one.mp3")
+        await asyncio.sleep(0.01)  # first flush is now saving
+        playlist.add_path("/music/two.mp3")
+        await asyncio.sleep(0.2)
+
+        [state] = await db.load_player_playlists()
+        assert len(Playlist.from_state(state)) == 2
+        await manager.close()
+
+    async def test_flush_does_not_commit_a_write_batch_in_progress(self, db) -> None:
+        """A queue flush must wait for a scan batch instead of committing half of it."""
+        from resonance.core.db.models import UpsertTrack
+
+        def rows():
+            for i in range(50):
+                yield UpsertTrack(path=f"/music/{i}.flac", title=f"Song {i}")
+            raise ValueError("unreadable tags")
+
+        manager = PlaylistManager(db=db, write_delay=0)
+        manager.get("aa:bb").add_path("/music/one.mp3")  # flush is due at once
+
+        async with db.write_lock:  # as MusicLibrary holds it around a batch
+            with pytest.raises(ValueError):
+                await db.upsert_tracks(rows())
+            await db.commit()
+        await manager.close()
+
+        assert await db.count_tracks() == 0
+        assert len(await db.load_player_playlists()) == 1
+
+    async def test_remove_deletes_persisted_state(self, db) -> None:
+        """Removing a playlist should delete its persisted row."""
+        manager = PlaylistManager(db=db, write_delay=60)
+        manager.get("aa:bb").add_path("/music/song.mp3")
+        await manager.flush()
+
+        manager.remove("aa:bb")
+        await manager.close()
+
+        assert await db.load_player_playlists() == []
@@ -0,0 +1,229 @@
+"""
+Tests for next-track prefetch (gapless track changes).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import time
+from collections.abc import AsyncIterator
+from pathlib import Path
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from resonance.core.playlist import Playlist, PlaylistManager, PlaylistTrack, RepeatMode
+from resonance.server import ResonanceServer
+from resonance.streaming import transcoder
+from resonance.streaming.policy import StreamMode
+from resonance.streaming.prefetch import WarmStream
+from resonance.streaming.server import StreamingServer
+from resonance.streaming.transcoder import TranscodeConfig, TranscodeRule
+from resonance.web.routes.streaming import register_streaming_routes
+
+PLAYER = "aa:bb:cc:dd:ee:ff"
+
+
+async def _collect(stream: AsyncIterator[bytes]) -> bytes:
+    return b"".join([chunk async for chunk in stream])
+
+
+class TestWarmStream:
+    async def test_buffers_up_to_limit_then_pauses_source(self) -> None:
+        pulled = 0
+
+        async def source() -> AsyncIterator[bytes]:
+            nonlocal pulled
+            for i in range(10):
+                pulled += 1
+                yield bytes([i]) * 100
+
+        warm = WarmStream(Path("x.mp3"), StreamMode.DIRECT, "audio/mpeg", {}, source(), limit=300)
+        await asyncio.sleep(0.01)
+
+        assert warm.filled and warm.buffered == 300
+        assert pulled == 3
+        assert await _collect(warm.stream()) == b"".join(bytes([i]) * 100 for i in range(10))
+
+    async def test_serves_while_still_filling(self) -> None:
+        async def source() -> AsyncIterator[bytes]:
+            for i in range(5):
+                await asyncio.sleep(0.01)
+                yield bytes([i])
+
+        warm = WarmStream(Path("x.mp3"), StreamMode.DIRECT, "audio/mpeg", {}, source())
+        assert await _collect(warm.stream()) == bytes(range(5))
+
+    async def test_failed_source_is_not_handed_out(self, tmp_path: Path) -> None:
+        async def source() -> AsyncIterator[bytes]:
+            raise RuntimeError("decoder missing")
+            yield b""  # pragma: no cover
+
+        server = StreamingServer()
+        warm = WarmStream(tmp_path / "a.mp3", StreamMode.DIRECT, "audio/mpeg", {}, source())
+        server._prefetcher._warm[PLAYER] = warm
+        await asyncio.sleep(0)
+
+        assert warm.failed
+        assert server.take_prefetched(PLAYER, tmp_path / "a.mp3") is None
+
+
+class TestStreamingServerPrefetch:
+    @pytest.fixture
+    def track(self, tmp_path: Path) -> Path:
+        path = tmp_path / "next.mp3"
+        path.write_bytes(b"NEXT" * 50_000)
+        return path
+
+    async def test_queueing_the_prefetched_file_keeps_it_warm(self, track: Path) -> None:
+        server = StreamingServer()
+        assert await server.prefetch(PLAYER, track)
+        assert server.is_prefetched(PLAYER, track)
+
+        server.queue_file(PLAYER, track)
+        warm = server.take_prefetched(PLAYER, track)
+
+        assert warm is not None and warm.mode is StreamMode.DIRECT
+        assert warm.headers["Content-Length"] == str(track.stat().st_size)
+        assert await _collect(warm.stream()) == track.read_bytes()
+
+    async def test_other_track_or_seek_discards(self, track: Path, tmp_path: Path) -> None:
+        server = StreamingServer()
+        await server.prefetch(PLAYER, track)
+        server.queue_file(PLAYER, tmp_path / "other.mp3")
+        assert not server.is_prefetched(PLAYER, track)
+
+        await server.prefetch(PLAYER, track)
+        server.queue_file_with_byte_offset(PLAYER, track, byte_offset=1000)
+        assert server.take_prefetched(PLAYER, track) is None
+        await server.stop()
+
+    async def test_route_serves_prefetched_stream(self, track: Path) -> None:
+        server = StreamingServer()
+        app = FastAPI()
+        register_streaming_routes(app, server)
+
+        await server.prefetch(PLAYER, track)
+        server.queue_file(PLAYER, track)
+
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            response = await client.get(f"/stream.mp3?player={PLAYER}")
+
+        assert response.status_code == 200
+        assert response.content == track.read_bytes()
+        assert not server.is_prefetched(PLAYER, track)
+
+
+class TestGaplessTranscode:
+    async def test_prefetched_transcode_has_no_startup_delay(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        # A "transcoder" with a noticeable start-up cost, like faad + lame.
+        rule = TranscodeRule("m4a", "mp3", "*", "*", 'sh -c "sleep 0.3 && cat $FILE$"')
+        config = TranscodeConfig(rules=[rule])
+        monkeypatch.setattr(transcoder, "get_transcode_config", lambda: config)
+
+        path = tmp_path / "next.m4a"
+        path.write_bytes(b"A" * 100_000)
+        server = StreamingServer()
+
+        started = time.perf_counter()
+        async with contextlib.aclosing(transcoder.transcode_stream(path, rule)) as cold_stream:
+            await anext(cold_stream)
+        cold = time.perf_counter() - started
+
+        await server.prefetch(PLAYER, path, None)
+        await asyncio.sleep(0.5)  # the rest of the current track plays meanwhile
+        warm = server.take_prefetched(PLAYER, path)
+        assert warm is not None and warm.mode is StreamMode.TRANSCODE
+
+        started = time.perf_counter()
+        stream = warm.stream()
+        first = await anext(stream)
+        ttfb = time.perf_counter() - started
+        rest = await _collect(stream)
+        await warm.aclose()
+
+        assert first + rest == path.read_bytes()
+        assert cold >= 0.3
+        assert ttfb < 0.05, ttfb
+
+
+class TestProgressTrigger:
+    def _server(self, tmp_path: Path, *, duration_ms: int) -> ResonanceServer:
+        server = ResonanceServer.__new__(ResonanceServer)
+        server.streaming_server = StreamingServer()
+        server.playlist_manager = PlaylistManager()
+        server.player_registry = SimpleNamespace(get_by_mac=_no_player)
+        server._prefetch_tasks = {}
+
+        playlist = server.playlist_manager.get(PLAYER)
+        for name in ("one.mp3", "two.mp3"):
+            (tmp_path / name).write_bytes(b"x" * 1000)
+            playlist.add(
+                PlaylistTrack(track_id=None, path=str(tmp_path / name), duration_ms=duration_ms)
+            )
+        return server
+
+    async def test_prefetches_next_track_near_the_end(self, tmp_path: Path) -> None:
+        server = self._server(tmp_path, duration_ms=200_000)
+
+        server.on_playback_progress(PLAYER, 100.0)
+        assert not server._prefetch_tasks
+
+        server.on_playback_progress(PLAYER, 190.0)
+        await asyncio.gather(*server._prefetch_tasks.values())
+        assert server.streaming_server.is_prefetched(PLAYER, tmp_path / "two.mp3")
+
+    async def test_hydrates_an_evicted_next_track(self, tmp_path: Path) -> None:
+        server = self._server(tmp_path, duration_ms=200_000)
+
+        async def loader(ids: list[int]) -> list[PlaylistTrack]:
+            return [
+                PlaylistTrack(track_id=i, path=str(tmp_path / f"{i}.mp3"), duration_ms=200_000)
+                for i in ids
+            ]
+
+        (tmp_path / "2.mp3").write_bytes(b"x" * 1000)
+        playlist = Playlist(player_id=PLAYER, track_loader=loader)
+        playlist.extend_ids([1, 2])
+        await playlist.hydrate(0, 1)
+        server.playlist_manager._playlists[PLAYER] = playlist
+        assert playlist.peek_next().path == ""
+
+        server.on_playback_progress(PLAYER, 190.0)
+        await asyncio.gather(*server._prefetch_tasks.values())
+        assert server.streaming_server.is_prefetched(PLAYER, tmp_path / "2.mp3")
+
+    async def test_nothing_to_prefetch_at_playlist_end(self, tmp_path: Path) -> None:
+        server = self._server(tmp_path, duration_ms=200_000)
+        server.playlist_manager.get(PLAYER).play(1)
+
+        server.on_playback_progress(PLAYER, 195.0)
+        assert not server._prefetch_tasks
+
+
+async def _no_player(_mac: str) -> None:
+    return None
+
+
+class TestPeekNext:
+    def test_peek_matches_next_without_moving(self) -> None:
+        playlist = Playlist(player_id=PLAYER)
+        for name in ("a.mp3", "b.mp3"):
+            playlist.add(PlaylistTrack(track_id=None, path=name))
+
+        assert playlist.peek_next().path == "b.mp3"
+        assert playlist.current_index == 0
+        playlist.next()
+        assert playlist.peek_next() is None
+
+        playlist.set_repeat(RepeatMode.ALL)
+        assert playlist.peek_next().path == "a.mp3"
+        playlist.set_repeat(RepeatMode.ONE)
+        assert playlist.peek_next().path == "b.mp3"
@@ -0,0 +1,121 @@
+"""
+Tests for the event-loop stall watchdog, the sampling profiler and the
+token-protected admin endpoints.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from resonance.core.metrics import monitor_loop_lag
+from resonance.core.profiling import (
+    MIN_SAMPLE_INTERVAL,
+    LoopWatchdog,
+    ProfilerBusyError,
+    sample_profile,
+)
+from resonance.web.routes import admin
+
+
+def _block_the_loop(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+class TestLoopWatchdog:
+    async def test_records_stall_with_blocking_stack(self) -> None:
+        watchdog = LoopWatchdog(threshold=0.05)
+        watchdog.start(interval=0.02)
+        ticker = asyncio.create_task(monitor_loop_lag(0.02, on_tick=watchdog.beat))
+        try:
+            await asyncio.sleep(0.1)
+            assert watchdog.stalls() == []
+
+            _block_the_loop(0.3)
+            await asyncio.sleep(0.1)
+        finally:
+            ticker.cancel()
+            watchdog.stop()
+
+        [stall] = watchdog.stalls()
+        assert stall["resolved"]
+        assert stall["duration"] >= 0.25
+        assert any("_block_the_loop" in line for line in stall["stack"])
+        assert stall["task"] is not None
+
+
+class TestSampleProfile:
+    async def test_samples_the_busy_loop(self) -> None:
+        task = asyncio.create_task(sample_profile(0.2, interval=0.002))
+        await asyncio.sleep(0.01)  # let the sampler thread start
+        _block_the_loop(0.15)
+        profile = await task
+
+        assert profile.samples > 10
+        hot = sum(n for stack, n in profile.stacks.items() if "_block_the_loop" in stack)
+        assert hot > profile.samples // 4
+        line = profile.collapsed().splitlines()[0]
+        stack, count = line.rsplit(" ", 1)
+        assert ";" in stack and int(count) > 0
+
+    async def test_rejects_bad_arguments_and_concurrent_runs(self) -> None:
+        with pytest.raises(ValueError):
+            await sample_profile(0)
+        with pytest.raises(ValueError):
+            await sample_profile(1000)
+
+        assert (await sample_profile(0.01, interval=1e-6)).interval == MIN_SAMPLE_INTERVAL
+
+        first = asyncio.create_task(sample_profile(0.1))
+        await asyncio.sleep(0)
+        with pytest.raises(ProfilerBusyError):
+            await sample_profile(0.1)
+        await first
+
+
+class TestAdminRoutes:
+    @staticmethod
+    def _client(token: str | None) -> AsyncClient:
+        app = FastAPI()
+        admin.register_admin_routes(app, admin_token=token)
+        return AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+
+    async def test_disabled_without_token(self) -> None:
+        async with self._client(None) as client:
+            response = await client.get("/api/admin/stalls")
+        assert response.status_code == 403
+
+    async def test_requires_bearer_token(self) -> None:
+        async with self._client("s3cret") as client:
+            assert (await client.get("/api/admin/stalls")).status_code == 401
+            wrong = {"Authorization": "Bearer nope"}
+            assert (await client.get("/api/admin/profile", headers=wrong)).status_code == 401
+
+            auth = {"Authorization": "Bearer s3cret"}
+            stalls = await client.get("/api/admin/stalls", headers=auth)
+            assert stalls.status_code == 200
+            assert "stalls" in stalls.json()
+
+    async def test_profile_endpoint(self) -> None:
+        auth = {"Authorization": "Bearer s3cret"}
+        async with self._client("s3cret") as client:
+            response = await client.get(
+                "/api/admin/profile", params={"seconds": 0.1, "interval_ms": 2}, headers=auth
+            )
+            assert response.status_code == 200
+            assert response.headers["content-type"].startswith("text/plain")
+            assert response.text.strip()
+
+            as_json = await client.get(
+                "/api/admin/profile",
+                params={"seconds": 0.1, "threads": "all", "format": "json"},
+                headers=auth,
+            )
+            assert as_json.json()["samples"] > 0
+
+            bad = await client.get("/api/admin/profile", params={"seconds": 999}, headers=auth)
+            assert bad.status_code == 400
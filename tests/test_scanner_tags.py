@@ -0,0 +1,149 @@
+"""
+Tests for the scanner's tag reading.
+
+The lean MP3/FLAC readers must produce exactly what the mutagen path produces,
+and the benchmark at the bottom keeps them honest about being cheaper. It is a
+wall-clock measurement, so it only runs with RESONANCE_BENCHMARKS=1.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+import tracemalloc
+from pathlib import Path
+
+import pytest
+from mutagen.id3 import ID3, TCON, TIT2, TPE1, TRCK, MakeID3v1
+
+from resonance.core import scanner
+from resonance.core.scanner import _extract_metadata
+from tests.audio_corpus import build_corpus, write_flac, write_mp3
+
+
+@pytest.fixture(scope="module")
+def corpus(tmp_path_factory: pytest.TempPathFactory) -> list[Path]:
+    return build_corpus(tmp_path_factory.mktemp("corpus"), per_format=4)
+
+
+def _extract_with_mutagen(monkeypatch: pytest.MonkeyPatch, path: Path) -> scanner.TrackMetadata:
+    with monkeypatch.context() as m:
+        m.setattr(scanner, "_LEAN_READERS", {})
+        return _extract_metadata(path)
+
+
+class TestTagReading:
+    def test_every_format_yields_the_same_fields(self, corpus: list[Path]) -> None:
+        for path in corpus:
+            meta = _extract_metadata(path)
+            assert meta.title == "Song", path
+            assert meta.artist == "Artist"
+            assert meta.album == "Album"
+            assert meta.album_artist == "Album Artist"
+            assert meta.genres == ("Rock", "Pop")
+            assert meta.track_number == 3
+            assert meta.disc_number == 1
+            assert meta.year == 1999
+            assert meta.compilation is True
+            assert meta.has_artwork is (path.name.startswith(("00", "02"))), path
+            assert meta.duration_ms and meta.sample_rate == 44100 and meta.channels == 2
+
+    def test_lean_readers_match_mutagen(
+        self, corpus: list[Path], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        for path in corpus:
+            if path.suffix in scanner._LEAN_READERS:
+                assert scanner._LEAN_READERS[path.suffix](path) is not None, path
+            assert _extract_metadata(path) == _extract_with_mutagen(monkeypatch, path), path
+
+    def test_id3v23_and_id3v1_fallback_values(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        v23 = tmp_path / "v23.mp3"
+        write_mp3(v23)
+        tags = ID3(v23)
+        tags.add(TCON(encoding=1, text=["(17)", "Jazz"]))
+        tags.add(TPE1(encoding=1, text=["Ünïcode", "Second"]))
+        tags.save(v23, v2_version=3)
+
+        v1 = tmp_path / "v1.mp3"
+        v1.write_bytes((b"\xff\xfb\x90\x00" + b"\0" * 413) * 50)
+        old = ID3()
+        old.add(TIT2(encoding=0, text="From v1"))
+        old.add(TRCK(encoding=0, text="7"))
+        old.add(TCON(encoding=0, text="Rock"))
+        with v1.open("ab") as f:
+            f.write(MakeID3v1(old))
+
+        for path in (v23, v1):
+            assert scanner._read_mp3(path) is not None
+            assert _extract_metadata(path) == _extract_with_mutagen(monkeypatch, path)
+
+        assert _extract_metadata(v23).genres == ("Rock",)
+        # v2.3 has no multi-value text frames; mutagen joins them with "/".
+        assert _extract_metadata(v23).artist == "Ünïcode/Second"
+        meta = _extract_metadata(v1)
+        assert (meta.title, meta.track_number, meta.genres) == ("From v1", 7, ("Rock",))
+
+    def test_unusual_layouts_defer_to_mutagen(self, tmp_path: Path) -> None:
+        path = tmp_path / "unsync.mp3"
+        write_mp3(path)
+        data = bytearray(path.read_bytes())
+        data[5] |= 0x80  # tag-level unsynchronisation flag
+        path.write_bytes(bytes(data))
+        assert scanner._read_mp3(path) is None
+
+        flac = tmp_path / "id3.flac"
+        write_flac(flac)
+        flac.write_bytes(b"ID3\x04\x00\x00\x00\x00\x00\x00" + flac.read_bytes())
+        assert scanner._read_flac(flac) is None
+        assert _extract_metadata(flac).title == "Song"
+
+    def test_vorbis_album_artist_spellings(self, tmp_path: Path) -> None:
+        from mutagen.flac import FLAC
+
+        path = tmp_path / "spaced.flac"
+        write_flac(path)
+        audio = FLAC(path)
+        del audio["albumartist"]
+        audio["ALBUM ARTIST"] = "Spaced"
+        audio.save()
+        assert _extract_metadata(path).album_artist == "Spaced"
+
+
+def _measure(paths: list[Path], extract) -> tuple[float, int]:
+    """Best-of-5 seconds per pass and the traced allocation peak of one pass."""
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        for path in paths:
+            extract(path)
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        for path in paths:
+            extract(path)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+@pytest.mark.skipif(
+    not os.environ.get("RESONANCE_BENCHMARKS"),
+    reason="timing benchmark; set RESONANCE_BENCHMARKS=1 to run",
+)
+class TestTagReadingBenchmark:
+    def test_lean_readers_halve_cpu_and_memory(
+        self, corpus: list[Path], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        paths = [p for p in corpus if p.suffix in scanner._LEAN_READERS] * 5
+        for path in paths:  # warm the page cache and imports
+            _extract_metadata(path)
+
+        lean_time, lean_peak = _measure(paths, _extract_metadata)
+        monkeypatch.setattr(scanner, "_LEAN_READERS", {})
+        full_time, full_peak = _measure(paths, _extract_metadata)
+
+        assert lean_time * 2 <= full_time, (lean_time, full_time)
+        assert lean_peak * 2 <= full_peak, (lean_peak, full_peak)
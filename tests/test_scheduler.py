@@ -0,0 +1,211 @@
+"""
+Tests for the transcode scheduler (budget, fairness, prefetch priority, warm helpers).
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+import pytest
+
+from resonance.streaming.prefetch import StreamPrefetcher
+from resonance.streaming.scheduler import (
+    HelperPool,
+    TranscodeBusyError,
+    TranscodePriority,
+    TranscodeScheduler,
+    set_transcode_scheduler,
+)
+from resonance.streaming.transcoder import TranscodeRule, transcode_stream
+
+
+@pytest.fixture
+async def scheduler() -> AsyncIterator[TranscodeScheduler]:
+    scheduler = TranscodeScheduler(max_concurrent=2, per_player=2)
+    set_transcode_scheduler(scheduler)
+    yield scheduler
+    await scheduler.close()
+    set_transcode_scheduler(None)
+
+
+async def _hold(
+    scheduler: TranscodeScheduler,
+    player: str,
+    release: asyncio.Event,
+    order: list[str] | None = None,
+) -> None:
+    async with scheduler.slot(player):
+        if order is not None:
+            order.append(player)
+        await release.wait()
+
+
+async def _settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class TestBudget:
+    async def test_waits_beyond_global_budget(self, scheduler: TranscodeScheduler) -> None:
+        release = asyncio.Event()
+        tasks = [asyncio.create_task(_hold(scheduler, f"p{i}", release)) for i in range(3)]
+        await _settle()
+        assert (scheduler.running, scheduler.queued) == (2, 1)
+
+        release.set()
+        await asyncio.gather(*tasks)
+        stats = scheduler.stats()
+        assert (stats["running"], stats["queued"], stats["started_total"]) == (0, 0, 3)
+
+    async def test_cancelled_waiter_leaves_queue(self, scheduler: TranscodeScheduler) -> None:
+        release = asyncio.Event()
+        holders = [asyncio.create_task(_hold(scheduler, f"p{i}", release)) for i in range(2)]
+        waiter = asyncio.create_task(_hold(scheduler, "late", release))
+        await _settle()
+
+        waiter.cancel()
+        await _settle()
+        assert scheduler.queued == 0
+
+        release.set()
+        await asyncio.gather(*holders)
+        assert scheduler.running == 0
+
+    async def test_freed_slot_goes_to_least_served_player(
+        self, scheduler: TranscodeScheduler
+    ) -> None:
+        scheduler.max_concurrent = scheduler.per_player = 3
+        release_a, release_b = asyncio.Event(), asyncio.Event()
+        order: list[str] = []
+
+        held = [
+            asyncio.create_task(_hold(scheduler, "a", release_a)),
+            asyncio.create_task(_hold(scheduler, "a", release_a)),
+            asyncio.create_task(_hold(scheduler, "c", release_b)),
+        ]
+        await _settle()
+        scrub = asyncio.create_task(_hold(scheduler, "a", release_a, order))
+        await _settle()
+        other = asyncio.create_task(_hold(scheduler, "b", release_b, order))
+        await _settle()
+        assert scheduler.queued == 2
+
+        # "a" queued first, but already runs two pipelines; "b" runs none.
+        release_b.set()
+        await _settle()
+        assert order[0] == "b"
+
+        release_a.set()
+        await asyncio.gather(*held, scrub, other)
+        assert order == ["b", "a"]
+
+    async def test_per_player_limit(self, scheduler: TranscodeScheduler) -> None:
+        scheduler.max_concurrent = 4
+        release = asyncio.Event()
+        tasks = [asyncio.create_task(_hold(scheduler, "a", release)) for _ in range(3)]
+        await _settle()
+        assert (scheduler.running, scheduler.queued) == (2, 1)
+
+        release.set()
+        await asyncio.gather(*tasks)
+
+
+class TestPrefetchPriority:
+    async def test_prefetch_only_uses_spare_capacity(self, scheduler: TranscodeScheduler) -> None:
+        async with scheduler.slot("a", TranscodePriority.PREFETCH):
+            assert scheduler.running == 1
+            # One slot left, but it is reserved for playback.
+            with pytest.raises(TranscodeBusyError):
+                async with scheduler.slot("b", TranscodePriority.PREFETCH):
+                    pass
+            async with scheduler.slot("b"):
+                assert scheduler.running == 2
+        assert scheduler.stats()["prefetch_rejected_total"] == 1
+
+    async def test_busy_prefetch_is_dropped(
+        self, scheduler: TranscodeScheduler, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        from resonance.streaming import transcoder
+        from resonance.streaming.transcoder import TranscodeConfig
+
+        rule = TranscodeRule("m4a", "mp3", "*", "*", "cat $FILE$")
+        monkeypatch.setattr(transcoder, "get_transcode_config", lambda: TranscodeConfig([rule]))
+        path = tmp_path / "next.m4a"
+        path.write_bytes(b"x" * 1000)
+
+        prefetcher = StreamPrefetcher(lambda _: "audio/mpeg")
+        async with scheduler.slot("other"):
+            warm = await prefetcher.prefetch("a", path, None)
+            assert warm is not None
+            await _settle()
+            assert warm.failed
+            assert prefetcher.take("a", path) is None
+        await prefetcher.close()
+
+
+class TestWarmHelpers:
+    async def test_stdin_pipeline_reuses_parked_helper(self, scheduler: TranscodeScheduler) -> None:
+        rule = TranscodeRule("m4a", "aac", "*", "*", "cat $FILE$ | cat", capabilities="I")
+
+        async def run(data: bytes) -> bytes:
+            out = b""
+            async for chunk in transcode_stream(Path("/x.m4a"), rule, 1.0, source=[data]):
+                out += chunk
+            return out
+
+        assert await run(b"first") == b"first"
+        for _ in range(200):
+            if len(scheduler.helpers):
+                break
+            await asyncio.sleep(0.01)
+        assert len(scheduler.helpers) == 1
+
+        assert await run(b"second") == b"second"
+        stats = scheduler.stats()
+        assert stats["helpers"]["hits"] == 1
+        assert stats["helpers"]["misses"] == 1
+        assert stats["spawn"]["count"] == 2
+
+    async def test_pool_is_bounded_and_closed(self) -> None:
+        pool = HelperPool(size=1)
+        spawned = []
+
+        def spawn() -> list:
+            import subprocess
+
+            procs = [subprocess.Popen(["cat"], stdin=subprocess.PIPE, stdout=subprocess.PIPE)]
+            spawned.extend(procs)
+            return procs
+
+        pool.replenish((("cat", "1"),), spawn)
+        await asyncio.gather(*pool._tasks)
+        pool.replenish((("cat", "2"),), spawn)
+        await asyncio.gather(*pool._tasks)
+
+        assert len(pool) == 1
+        assert pool.take((("cat", "1"),)) is None
+        await pool.close()
+        assert len(pool) == 0
+        for proc in spawned:
+            assert proc.wait(timeout=2) is not None
+
+    async def test_concurrent_streams_respect_budget(self, scheduler: TranscodeScheduler) -> None:
+        rule = TranscodeRule("m4a", "aac", "*", "*", 'sh -c "sleep 0.05; cat $FILE$"')
+        peak = 0
+
+        async def run(i: int, path: Path) -> bytes:
+            nonlocal peak
+            out = b""
+            async for chunk in transcode_stream(path, rule, player_mac=f"p{i}"):
+                peak = max(peak, scheduler.running)
+                out += chunk
+            return out
+
+        path = Path(__file__).parent / "audio_corpus.py"
+        results = await asyncio.gather(*(run(i, path) for i in range(6)))
+
+        assert all(r == path.read_bytes() for r in results)
+        assert peak == 2
+        assert scheduler.stats()["wait"]["max_ms"] > 0
@@ -611,3 +611,118 @@ class TestPlayerRegistryIntegration:
         )
 
         assert result is False
+
+
+class TestOutboundQueue:
+    """Per-player writer task: no sender waits on a slow socket."""
+
+    @staticmethod
+    def _slow_writer(release: asyncio.Event) -> MagicMock:
+        writer = MagicMock(spec=asyncio.StreamWriter)
+        writer.get_extra_info = MagicMock(return_value=("192.168.1.100", 54321))
+        writer.write = MagicMock()
+        writer.close = MagicMock()
+        writer.wait_closed = AsyncMock()
+
+        async def drain() -> None:
+            await release.wait()
+
+        writer.drain = drain
+        return writer
+
+    @staticmethod
+    def _frames(writer: MagicMock) -> list[bytes]:
+        """Split every write into its [len][cmd][payload] frames."""
+        frames = []
+        for call in writer.write.call_args_list:
+            data = call.args[0]
+            while data:
+                length = int.from_bytes(data[:2], "big")
+                frames.append(data[2 : 2 + length])
+                data = data[2 + length :]
+        return frames
+
+    async def test_frames_queue_while_draining_and_flush_in_one_write(
+        self, mock_reader: AsyncMock
+    ) -> None:
+        release = asyncio.Event()
+        writer = self._slow_writer(release)
+        client = PlayerClient(mock_reader, writer)
+
+        await client.send_message(b"strm", b"q")
+        await client.send_message(b"audg", b"vol1")
+        await client.send_message(b"aude", b"\x01\x01")
+        await client.send_message(b"audg", b"vol2")
+
+        assert writer.write.call_count == 1
+        assert client.outbound_pending == 2
+        assert client.frames_coalesced == 1
+
+        release.set()
+        for _ in range(5):
+            await asyncio.sleep(0)
+
+        assert writer.write.call_count == 2
+        assert self._frames(writer) == [b"strmq", b"audgvol2", b"aude\x01\x01"]
+        assert client.outbound_pending == 0
+        await client.disconnect()
+
+    async def test_full_queue_blocks_only_that_player(
+        self, mock_reader: AsyncMock, mock_writer: MagicMock
+    ) -> None:
+        release = asyncio.Event()
+        slow = PlayerClient(mock_reader, self._slow_writer(release))
+        fast = PlayerClient(mock_reader, mock_writer)
+
+        with patch("resonance.player.client.OUTBOUND_QUEUE_FRAMES", 2):
+            await slow.send_message(b"strm", b"s")
+            await slow.send_message(b"aude", b"1")
+            await slow.send_message(b"aude", b"2")
+            blocked = asyncio.create_task(slow.send_message(b"aude", b"3"))
+            await asyncio.sleep(0)
+            assert not blocked.done()
+
+            await fast.send_message(b"strm", b"t")
+            mock_writer.write.assert_called_once()
+
+            await slow.disconnect()
+            with pytest.raises(ConnectionError):
+                await blocked
+
+        with pytest.raises(ConnectionError):
+            await slow.send_message(b"strm", b"t")
+
+    async def test_heartbeats_fan_out_past_a_stuck_player(
+        self,
+        player_registry: PlayerRegistry,
+        mock_reader: AsyncMock,
+    ) -> None:
+        server = SlimprotoServer(host="127.0.0.1", port=0, player_registry=player_registry)
+        stuck_writer = self._slow_writer(asyncio.Event())
+        writers = [stuck_writer]
+        for _ in range(3):
+            writer = MagicMock(spec=asyncio.StreamWriter)
+            writer.get_extra_info = MagicMock(return_value=("192.168.1.100", 54321))
+            writer.drain = AsyncMock()
+            writers.append(writer)
+
+        for i, writer in enumerate(writers):
+            client = PlayerClient(mock_reader, writer)
+            client.id = f"aa:bb:cc:dd:ee:0{i}"
+            client.status.state = PlayerState.CONNECTED
+            await player_registry.register(client)
+
+        server._running = True
+        with patch("resonance.protocol.slimproto.CLIENT_CHECK_INTERVAL_SECONDS", 0.01):
+            task = asyncio.create_task(server._check_heartbeats())
+            await asyncio.sleep(0.1)
+            server._running = False
+            task.cancel()
+
+        # The stuck player got one heartbeat out; later ones coalesce into one queued frame.
+        assert stuck_writer.write.call_count == 1
+        stuck = await player_registry.get_by_mac("aa:bb:cc:dd:ee:00")
+        assert stuck is not None and stuck.outbound_pending == 1
+        for writer in writers[1:]:
+            assert writer.write.call_count >= 3
+        await player_registry.disconnect_all()
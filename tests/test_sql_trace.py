@@ -0,0 +1,111 @@
+"""
+Tests for opt-in SQL tracing in LibraryDb (resonance.core.db.tracing).
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from resonance.core.db.models import UpsertTrack
+from resonance.core.db.tracing import SqlTracer, TracedConnection, normalize_sql, sql_tracer
+from resonance.core.library_db import LibraryDb
+from resonance.web.routes import admin
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Iterator
+
+
+@pytest.fixture
+async def db() -> AsyncIterator[LibraryDb]:
+    db = LibraryDb(":memory:")
+    await db.open()
+    await db.ensure_schema()
+    for n in range(3):
+        await db.upsert_track(UpsertTrack(path=f"/music/{n}.flac", title=f"Song {n}"))
+    await db.commit()
+    yield db
+    await db.close()
+
+
+@pytest.fixture
+def tracer() -> Iterator[SqlTracer]:
+    sql_tracer.clear()
+    yield sql_tracer
+    sql_tracer.disable()
+    sql_tracer.clear()
+
+
+class TestNormalize:
+    def test_folds_whitespace_and_placeholder_lists(self) -> None:
+        sql = "SELECT *\n  FROM tracks\n WHERE id IN (?, ?,?) AND x = ?;"
+        assert normalize_sql(sql) == "SELECT * FROM tracks WHERE id IN (?...) AND x = ?;"
+
+
+class TestSqlTracer:
+    async def test_disabled_hands_out_the_raw_connection(
+        self, db: LibraryDb, tracer: SqlTracer
+    ) -> None:
+        assert not isinstance(db._require_conn(), TracedConnection)
+        await db.list_tracks()
+        assert tracer.top() == []
+
+    async def test_records_latency_rows_source_and_plan(
+        self, db: LibraryDb, tracer: SqlTracer
+    ) -> None:
+        tracer.enable(slow_ms=0)  # everything is "slow"
+        assert len(await db.list_tracks()) == 3
+        assert await db.count_tracks() == 3
+
+        [listing] = [s for s in tracer.top() if "queries_tracks.list_tracks" in s["sources"]]
+        assert listing["calls"] == 1
+        assert listing["rows"] == 3
+        assert listing["total_ms"] > 0
+        assert listing["plan"] and any("tracks" in step for step in listing["plan"])
+
+        slow = tracer.slow_log()
+        assert slow[0]["source"] == "queries_tracks.count_tracks"
+        assert {entry["source"] for entry in slow} >= {"queries_tracks.list_tracks"}
+
+    async def test_threshold_and_ranking(self, db: LibraryDb, tracer: SqlTracer) -> None:
+        tracer.enable(slow_ms=10_000)
+        for _ in range(3):
+            await db.count_tracks()
+        await db.get_tracks_by_ids([1, 2])
+        await db.get_tracks_by_ids([1, 2, 3])
+
+        assert tracer.slow_log() == []
+        by_calls = tracer.top(2, by="calls")
+        assert [s["calls"] for s in by_calls] == [3, 2]  # IN lists share one entry
+        with pytest.raises(ValueError):
+            tracer.top(by="nope")
+
+
+class TestSqlTraceEndpoint:
+    @pytest.mark.usefixtures("tracer")
+    async def test_enable_and_read(self, db: LibraryDb) -> None:
+        app = FastAPI()
+        admin.register_admin_routes(app, admin_token="s3cret")
+        auth = {"Authorization": "Bearer s3cret"}
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            assert (await client.get("/api/admin/sql")).status_code == 401
+
+            enabled = await client.post(
+                "/api/admin/sql", json={"enabled": True, "slow_ms": 0}, headers=auth
+            )
+            assert enabled.json() == {"enabled": True, "slow_ms": 0}
+            await db.count_tracks()
+
+            report = (await client.get("/api/admin/sql", headers=auth)).json()
+            assert report["enabled"]
+            assert report["top"][0]["sources"] == ["queries_tracks.count_tracks"]
+            assert report["slow"][0]["rows"] == 1
+
+            bad = await client.post("/api/admin/sql", json={"slow_ms": "x"}, headers=auth)
+            assert bad.status_code == 400
+            for content in (b"[1]", b"not json"):
+                bad = await client.post("/api/admin/sql", content=content, headers=auth)
+                assert bad.status_code == 400
@@ -0,0 +1,79 @@
+"""
+Cold-start checks for `python -m resonance`.
+
+The entry point and the server module must not import the web stack or the
+media libraries; those load on first use (see ResonanceServer.start). The
+import-time budget is a wall-clock check and only runs with
+RESONANCE_BENCHMARKS=1.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Cumulative `-X importtime` of resonance.__main__ (best of a few runs).
+# Loading FastAPI, mutagen and Pillow eagerly put it at ~800 ms.
+STARTUP_BUDGET_MS = float(os.environ.get("RESONANCE_STARTUP_BUDGET_MS", "400"))
+
+HEAVY_MODULES = (
+    "fastapi",
+    "starlette",
+    "uvicorn",
+    "mutagen",
+    "PIL",
+    "blurhash",
+    "resonance.web.server",
+    "resonance.streaming.transcoder",
+)
+
+
+def _python(*args: str) -> subprocess.CompletedProcess[str]:
+    # Own process: the point is a cold interpreter.
+    result = subprocess.run(
+        [sys.executable, *args],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert result.returncode == 0, result.stderr
+    return result
+
+
+def _import_time_ms(module: str) -> float:
+    """Cumulative import time of `module` as reported by ``-X importtime``."""
+    stderr = _python("-X", "importtime", "-c", f"import {module}").stderr
+    for line in stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        fields = line.removeprefix("import time:").split("|")
+        if len(fields) == 3 and fields[2].strip() == module:
+            return int(fields[1]) / 1000
+    raise AssertionError(f"{module} missing from -X importtime output")
+
+
+class TestColdStart:
+    @pytest.mark.skipif(
+        not os.environ.get("RESONANCE_BENCHMARKS"),
+        reason="timing benchmark; set RESONANCE_BENCHMARKS=1 to run",
+    )
+    def test_entry_point_within_budget(self) -> None:
+        best = min(_import_time_ms("resonance.__main__") for _ in range(3))
+        assert best < STARTUP_BUDGET_MS, f"import resonance.__main__ took {best:.0f} ms"
+
+    def test_heavy_modules_load_lazily(self) -> None:
+        check = (
+            "import sys, resonance, resonance.__main__, resonance.server\n"
+            f"heavy = {HEAVY_MODULES!r}\n"
+            "print(*sorted(m for m in heavy if m in sys.modules))\n"
+            "print(resonance.ResonanceServer is resonance.server.ResonanceServer)\n"
+        )
+        loaded, exported = _python("-c", check).stdout.splitlines()
+        assert loaded == ""
+        assert exported == "True"
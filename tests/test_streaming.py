@@ -10,6 +10,7 @@ Tests cover:
 """
 
 import tempfile
+from collections.abc import Iterator
 from pathlib import Path
 from unittest.mock import MagicMock
 
@@ -360,6 +361,122 @@ def client(app: FastAPI) -> TestClient:
     return TestClient(app)
 
 
+class _FakeRegistry:
+    """Minimal PlayerRegistry stand-in that knows one device type."""
+
+    def __init__(self, device_type: str) -> None:
+        self._player = MagicMock()
+        self._player.info.device_type = device_type
+
+    async def get_by_mac(self, mac_address: str) -> MagicMock:
+        return self._player
+
+
+class TestRemuxStreaming:
+    """AAC-in-MP4 is served as ADTS to device tiers that allow remuxing."""
+
+    @pytest.fixture
+    def m4b(self, tmp_path: Path) -> Path:
+        from tests.audio_corpus import build_m4a
+
+        path = tmp_path / "book.m4b"
+        path.write_bytes(build_m4a([200] * 50))
+        return path
+
+    def _client(self, server: StreamingServer, device_type: str) -> TestClient:
+        app = FastAPI()
+        register_streaming_routes(app, server, player_registry=_FakeRegistry(device_type))
+        return TestClient(app)
+
+    def test_modern_player_gets_adts_without_transcoding(
+        self, streaming_server: StreamingServer, m4b: Path
+    ) -> None:
+        player_mac = "aa:bb:cc:dd:ee:ff"
+        streaming_server.queue_file(player_mac, m4b)
+
+        response = self._client(streaming_server, "squeezeslave").get(
+            f"/stream.mp3?player={player_mac}"
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "audio/aac"
+        assert len(response.content) == 50 * (200 + 7)
+        assert response.content[:2] == b"\xff\xf1"
+        assert response.content[7:207] == b"\x00" * 200
+
+    def test_seek_starts_at_indexed_sample(
+        self, streaming_server: StreamingServer, m4b: Path
+    ) -> None:
+        player_mac = "aa:bb:cc:dd:ee:ff"
+        streaming_server.queue_file_with_seek(player_mac, m4b, start_seconds=40 * 1024 / 44100)
+
+        response = self._client(streaming_server, "squeezeslave").get(
+            f"/stream.mp3?player={player_mac}"
+        )
+
+        assert len(response.content) == 10 * 207
+        assert response.content[7:9] == bytes([40, 40])
+        assert streaming_server.get_seek_position(player_mac) is None
+
+    def test_cancelled_stream_closes_the_frame_reader(
+        self,
+        streaming_server: StreamingServer,
+        m4b: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        import resonance.web.routes.streaming as streaming_routes
+
+        closed: list[bool] = []
+        readers: list[Iterator[bytes]] = []  # keeps garbage collection from closing it
+
+        def frames() -> Iterator[bytes]:
+            try:
+                while True:
+                    yield b"\xff\xf1"
+            finally:
+                closed.append(True)
+
+        def iter_adts(*args: object, **kwargs: object) -> Iterator[bytes]:
+            readers.append(frames())
+            return readers[-1]
+
+        monkeypatch.setattr(streaming_routes, "iter_adts", iter_adts)
+        player_mac = "aa:bb:cc:dd:ee:ff"
+        streaming_server.queue_file(player_mac, m4b)
+        token = streaming_server.get_cancellation_token(player_mac)
+        assert token is not None
+        token.cancel()
+
+        response = self._client(streaming_server, "squeezeslave").get(
+            f"/stream.mp3?player={player_mac}"
+        )
+
+        assert response.status_code == 200
+        assert closed == [True]
+
+    def test_legacy_hardware_keeps_transcoding(
+        self, streaming_server: StreamingServer, m4b: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        import resonance.web.routes.streaming as streaming_routes
+
+        called: list[Path] = []
+
+        async def fake_transcoding(request: object, player_mac: str, file_path: Path) -> object:
+            from fastapi.responses import Response
+
+            called.append(file_path)
+            return Response(b"mp3", media_type="audio/mpeg")
+
+        monkeypatch.setattr(streaming_routes, "_stream_with_transcoding", fake_transcoding)
+        player_mac = "aa:bb:cc:dd:ee:ff"
+        streaming_server.queue_file(player_mac, m4b)
+
+        response = self._client(streaming_server, "boom").get(f"/stream.mp3?player={player_mac}")
+
+        assert response.headers["content-type"] == "audio/mpeg"
+        assert called == [m4b]
+
+
 class TestStreamingEndpoint:
     """Tests for GET /stream.mp3 endpoint."""
 
@@ -4,7 +4,7 @@ Tests for the streaming transcoder module.
 Tests cover:
 - Parsing of legacy.conf rules
 - Rule matching logic
-- Command building
+- Command building and compiled command templates
 - Binary resolution
 
 Also includes lightweight tests for streaming decision policy to ensure
@@ -14,6 +14,8 @@ format-handling behavior stays consistent.
 from __future__ import annotations
 
 import textwrap
+import time
+from collections.abc import AsyncIterator
 from pathlib import Path
 from tempfile import NamedTemporaryFile
 
@@ -23,6 +25,7 @@ from resonance.streaming.transcoder import (
     TranscodeConfig,
     TranscodeRule,
     build_command,
+    compile_command,
     parse_legacy_conf,
     resolve_binary,
 )
@@ -482,6 +485,164 @@ class TestBuildCommand:
         finally:
             transcoder_module.resolve_binary = original_resolve
 
+    def test_build_command_from_stdin(self) -> None:
+        """Piped source replaces $FILE$ with '-' and drops the seek placeholders."""
+        rule = TranscodeRule(
+            source_format="m4b",
+            dest_format="mp3",
+            device_type="*",
+            device_id="*",
+            command="[faad] -q -w -f 1 $START$ $END$ $FILE$ | [lame] --silent -q 2 - -",
+            capabilities="FTI",
+        )
+
+        import resonance.streaming.transcoder as transcoder_module
+
+        original_resolve = transcoder_module.resolve_binary
+        transcoder_module.resolve_binary = lambda name: Path(f"/usr/bin/{name}")
+
+        try:
+            commands = build_command(
+                rule,
+                Path("/music/audiobook.m4b"),
+                start_seconds=60.0,
+                end_seconds=180.0,
+                from_stdin=True,
+            )
+            assert commands[0] == ["/usr/bin/faad", "-q", "-w", "-f", "1", "-"]
+            assert commands[1][-2:] == ["-", "-"]
+        finally:
+            transcoder_module.resolve_binary = original_resolve
+
+
+class TestCommandTemplates:
+    """Rules are compiled once; per-stream setup only fills placeholder slots."""
+
+    COMMAND = "[faad] -q -w -f 1 $START$ $END$ $FILE$ | [lame] --silent -q 2 - -"
+
+    @pytest.fixture
+    def resolved(self, monkeypatch: pytest.MonkeyPatch) -> list[str]:
+        import resonance.streaming.transcoder as transcoder_module
+
+        calls: list[str] = []
+
+        def mock_resolve(name: str) -> Path | None:
+            calls.append(name)
+            return Path(f"/usr/bin/{name}")
+
+        monkeypatch.setattr(transcoder_module, "resolve_binary", mock_resolve)
+        return calls
+
+    def test_binaries_resolved_once_per_rule(self, resolved: list[str]) -> None:
+        config = TranscodeConfig(rules=[TranscodeRule("m4b", "mp3", "*", "*", self.COMMAND)])
+        assert resolved == ["faad", "lame"]
+
+        rule = config.find_rule("m4b")
+        assert rule is not None
+        for i in range(10):
+            build_command(rule, Path(f"/music/{i}.m4b"), start_seconds=float(i))
+        assert resolved == ["faad", "lame"]
+
+    @pytest.mark.usefixtures("resolved")
+    def test_template_renders_like_the_command_line(self) -> None:
+        template = compile_command('[ffmpeg] -i "$FILE$" $START$ $END$ -f wav -')
+        assert template.stages[0].binary == "ffmpeg"
+        assert template.render(Path("/a b.flac"), 1.5, 9.0) == [
+            ["/usr/bin/ffmpeg", "-i", "/a b.flac", "-ss", "1.500", "-to", "9.000", "-f", "wav", "-"]
+        ]
+        assert template.render(Path("/a.flac"), 1.5, None, from_stdin=True) == [
+            ["/usr/bin/ffmpeg", "-i", "-", "-f", "wav", "-"]
+        ]
+
+    @pytest.mark.usefixtures("resolved")
+    def test_command_change_recompiles(self) -> None:
+        rule = TranscodeRule("flac", "mp3", "*", "*", "[flac] -dcs $FILE$")
+        assert build_command(rule, Path("/x.flac"))[0][0] == "/usr/bin/flac"
+        rule.command = "[sox] $FILE$ -t wav -"
+        assert build_command(rule, Path("/x.flac"))[0][0] == "/usr/bin/sox"
+
+    def test_missing_binary_fails_at_build_not_load(self) -> None:
+        config = TranscodeConfig(
+            rules=[TranscodeRule("m4b", "flc", "*", "*", "[nonexistent_binary_12345] $FILE$")]
+        )
+        rule = config.find_rule("m4b")
+        assert rule is not None
+        with pytest.raises(ValueError, match="Binary not found: nonexistent_binary_12345"):
+            build_command(rule, Path("/music/a.m4b"))
+
+    def test_find_rule_is_memoized_per_format_and_device(self) -> None:
+        generic = TranscodeRule("wma", "mp3", "*", "*", "[wmadec] $FILE$ | [lame] - -")
+        native = TranscodeRule("wma", "wma", "squeezebox2", "*", "-")
+        config = TranscodeConfig(rules=[native, generic])
+
+        assert config.find_rule("wma", device_type="squeezebox2") is native
+        assert config.find_rule("WMA", device_type="slimp3") is generic
+        assert config.find_rule(".wma", device_type="squeezebox2") is native
+        assert config.find_rule("ogg") is None
+
+    def test_reload_drops_compiled_rules(
+        self, monkeypatch: pytest.MonkeyPatch, resolved: list[str]
+    ) -> None:
+        import resonance.streaming.transcoder as transcoder_module
+
+        monkeypatch.setattr(transcoder_module, "_transcode_config", None)
+
+        first = transcoder_module.get_transcode_config()
+        assert transcoder_module.get_transcode_config() is first
+        calls = len(resolved)
+        assert calls > 0
+
+        second = transcoder_module.reload_transcode_config()
+        assert second is not first
+        assert len(resolved) == 2 * calls
+        assert second.find_rule("m4a") is not first.find_rule("m4a")
+
+    @pytest.mark.usefixtures("resolved")
+    def test_per_stream_setup_is_microseconds(self) -> None:
+        config = TranscodeConfig(
+            rules=[TranscodeRule(f"fmt{i}", "mp3", "*", "*", self.COMMAND) for i in range(40)]
+            + [TranscodeRule("m4b", "mp3", "*", "*", self.COMMAND)]
+        )
+        path = Path("/music/audiobook.m4b")
+
+        runs = 2000
+        started = time.perf_counter()
+        for _ in range(runs):
+            rule = config.find_rule("m4b", device_type="squeezebox2", device_id="aa:bb")
+            assert rule is not None
+            build_command(rule, path, start_seconds=123.4)
+        per_stream = (time.perf_counter() - started) / runs
+
+        assert per_stream < 50e-6, per_stream
+
+
+class TestTranscodeStreamFromSource:
+    """transcode_stream() pipes a caller-provided source into the first stage."""
+
+    @pytest.fixture(autouse=True)
+    async def _scheduler(self) -> AsyncIterator[None]:
+        # Keep warm helpers started by these tests out of the global scheduler.
+        from resonance.streaming.scheduler import TranscodeScheduler, set_transcode_scheduler
+
+        scheduler = TranscodeScheduler()
+        set_transcode_scheduler(scheduler)
+        yield
+        await scheduler.close()
+        set_transcode_scheduler(None)
+
+    @pytest.mark.parametrize("command", ["cat $FILE$", "cat $FILE$ | cat"])
+    async def test_source_is_piped_through_pipeline(self, command: str) -> None:
+        from resonance.streaming.transcoder import transcode_stream
+
+        rule = TranscodeRule("m4a", "aac", "*", "*", command, capabilities="I")
+        source = [bytes([i]) * 40000 for i in range(5)]
+
+        out = b""
+        async for chunk in transcode_stream(Path("/nonexistent.m4a"), rule, 30.0, source=source):
+            out += chunk
+
+        assert out == b"".join(source)
+
 
 class TestResolveBinary:
     """Tests for binary resolution."""
@@ -568,3 +729,47 @@ class TestStreamingDecisionLogic:
         assert needs_transcoding("M4B", None) is True
         assert needs_transcoding("FLAC", None) is False
         assert needs_transcoding("Mp3", None) is False
+
+    def test_remux_mode_is_selected_per_device_tier(self) -> None:
+        """AAC-in-MP4 is remuxed for tiers that allow it, transcoded otherwise."""
+        from resonance.streaming.policy import StreamMode, stream_mode, strm_expected_format_hint
+
+        for fmt in ["m4a", "m4b", "mp4"]:
+            assert stream_mode(fmt, "squeezeslave", remuxable=True) is StreamMode.REMUX
+            assert strm_expected_format_hint(fmt, "squeezeslave", remuxable=True) == "aac"
+            # Legacy hardware and unknown players have no AAC decoder.
+            assert stream_mode(fmt, "boom", remuxable=True) is StreamMode.TRANSCODE
+            assert stream_mode(fmt, None, remuxable=True) is StreamMode.TRANSCODE
+            # Files that cannot be framed as ADTS (ALAC, odd AAC configs).
+            assert stream_mode(fmt, "squeezeslave") is StreamMode.TRANSCODE
+
+        assert stream_mode("alac", "squeezeslave", remuxable=True) is StreamMode.TRANSCODE
+        assert stream_mode("flac", "squeezeslave", remuxable=True) is StreamMode.DIRECT
+
+    def test_remux_never_replaces_direct_streaming(self) -> None:
+        """A policy that streams MP4 as-is keeps doing so for remux-capable tiers."""
+        from resonance.streaming.policy import StreamingPolicy, StreamMode, stream_mode
+
+        native_mp4 = StreamingPolicy(
+            ALWAYS_TRANSCODE_FORMATS=frozenset(),
+            NATIVE_STREAM_FORMATS=frozenset({"m4a"}),
+        )
+        mode = stream_mode("m4a", "squeezeslave", remuxable=True, policy=native_mp4)
+        assert mode is StreamMode.DIRECT
+
+    async def test_resolve_stream_mode_inspects_the_file(self, tmp_path: Path) -> None:
+        """Only files whose AAC config maps onto ADTS are remuxed."""
+        from resonance.streaming.mp4index import clear_sample_index_cache
+        from resonance.streaming.policy import StreamMode, resolve_stream_mode
+        from tests.audio_corpus import build_m4a
+
+        clear_sample_index_cache()
+        aac = tmp_path / "aac.m4a"
+        aac.write_bytes(build_m4a([100] * 10))
+        # Channel configuration 0 (program config element) has no ADTS form.
+        pce = tmp_path / "pce.m4a"
+        pce.write_bytes(aac.read_bytes().replace(b"\x05\x02\x12\x10", b"\x05\x02\x12\x00"))
+
+        assert await resolve_stream_mode(aac, "squeezeslave") is StreamMode.REMUX
+        assert await resolve_stream_mode(pce, "squeezeslave") is StreamMode.TRANSCODE
+        assert await resolve_stream_mode(aac, "boom") is StreamMode.TRANSCODE
@@ -0,0 +1,233 @@
+"""
+Tests for the filesystem watcher and incremental directory sync.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import errno
+import sys
+import wave
+from pathlib import Path
+
+import pytest
+
+from resonance.core.library import MusicLibrary
+from resonance.core.library_db import LibraryDb
+from resonance.core.watcher import LibraryWatcher, _collapse, _Inotify
+
+
+def _write_wav(path: Path, frames: int = 800) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with wave.open(str(path), "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(8000)
+        w.writeframes(b"\0\0" * frames)
+
+
+async def _wait_for(predicate, timeout: float = 5.0) -> None:
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not await predicate():
+        if loop.time() > deadline:
+            raise AssertionError("condition not met in time")
+        await asyncio.sleep(0.05)
+
+
+@pytest.fixture
+async def library(tmp_path: Path) -> MusicLibrary:
+    db = LibraryDb(":memory:")
+    await db.open()
+    lib = MusicLibrary(db=db, music_root=tmp_path)
+    await lib.initialize()
+    yield lib
+    await lib.stop_watching()
+    await db.close()
+
+
+class TestSyncDirectories:
+    async def test_adds_updates_and_removes_tracks(
+        self, library: MusicLibrary, tmp_path: Path
+    ) -> None:
+        album = tmp_path / "Album"
+        _write_wav(album / "01.wav")
+        _write_wav(album / "02.wav")
+
+        result = await library.sync_directories({album: False})
+        assert result.updated_tracks == 2
+        assert await library._db.count_tracks() == 2
+
+        # Unchanged files are not re-extracted.
+        result = await library.sync_directories({album: False})
+        assert result.scanned_files == 0
+
+        (album / "02.wav").unlink()
+        _write_wav(album / "01.wav", frames=1600)
+        result = await library.sync_directories({album: False})
+        assert result.updated_tracks == 1
+        assert await library._db.count_tracks() == 1
+        row = await library._db.get_track_by_path(str(album / "01.wav"))
+        assert row is not None and row.duration_ms == 200
+
+    async def test_non_recursive_sync_leaves_subdirectories_alone(
+        self, library: MusicLibrary, tmp_path: Path
+    ) -> None:
+        _write_wav(tmp_path / "top.wav")
+        _write_wav(tmp_path / "Sub" / "nested.wav")
+
+        await library.sync_directories({tmp_path: False})
+        assert await library._db.count_tracks() == 1
+
+        await library.sync_directories({tmp_path: True})
+        assert await library._db.count_tracks() == 2
+
+    async def test_removed_directory_deletes_its_tracks(
+        self, library: MusicLibrary, tmp_path: Path
+    ) -> None:
+        _write_wav(tmp_path / "Gone" / "a.wav")
+        _write_wav(tmp_path / "Gone" / "CD2" / "b.wav")
+        _write_wav(tmp_path / "Kept" / "c.wav")
+        await library.sync_directories({tmp_path: True})
+        assert await library._db.count_tracks() == 3
+
+        for p in sorted((tmp_path / "Gone").rglob("*"), reverse=True):
+            p.unlink() if p.is_file() else p.rmdir()
+        (tmp_path / "Gone").rmdir()
+
+        await library.sync_directories({tmp_path / "Gone": True})
+        assert await library._db.count_tracks() == 1
+
+    async def test_unmounted_music_folder_keeps_its_tracks(
+        self, library: MusicLibrary, tmp_path: Path
+    ) -> None:
+        share = tmp_path / "share"
+        _write_wav(share / "Album" / "01.wav")
+        _write_wav(share / "Album" / "02.wav")
+        await library.set_music_folders([share])
+        await library.sync_directories({share: True})
+        ids = {t.id for t in await library._db.list_tracks()}
+        assert len(ids) == 2
+
+        # Share unmounted: the mount point is missing, then present but empty.
+        share.rename(tmp_path / "offline")
+        await library.sync_directories({share: True, share / "Album": True})
+        share.mkdir()
+        await library.sync_directories({share: True, share / "Album": True})
+        assert {t.id for t in await library._db.list_tracks()} == ids
+
+        # Back online: same tracks, same ids.
+        share.rmdir()
+        (tmp_path / "offline").rename(share)
+        await library.sync_directories({share: True})
+        assert {t.id for t in await library._db.list_tracks()} == ids
+
+
+class TestLibraryWatcher:
+    def test_collapse_drops_children_of_recursive_entries(self) -> None:
+        batch = {Path("/m/A"): True, Path("/m/A/CD1"): False, Path("/m/B"): False}
+        assert _collapse(batch) == {Path("/m/A"): True, Path("/m/B"): False}
+
+    async def test_debounces_events_per_directory(self, tmp_path: Path) -> None:
+        batches: list[dict[Path, bool]] = []
+
+        async def on_change(batch: dict[Path, bool]) -> None:
+            batches.append(batch)
+
+        watcher = LibraryWatcher(on_change, debounce=0.2, use_inotify=False, poll_interval=3600)
+        await watcher.start([])
+        try:
+            for _ in range(5):
+                watcher._mark(tmp_path, recursive=False)
+                await asyncio.sleep(0.02)
+            watcher._mark(tmp_path / "New", recursive=True)
+            await asyncio.sleep(0.5)
+        finally:
+            await watcher.stop()
+
+        # Each directory is reported once, after its own quiet period.
+        reported = [d for batch in batches for d in batch.items()]
+        assert reported == [(tmp_path, False), (tmp_path / "New", True)]
+
+    @pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux-only")
+    async def test_failed_tree_watch_releases_partial_watches(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        for name in ("A", "B", "C"):
+            (tmp_path / name).mkdir()
+        added: list[int] = []
+        removed: list[int] = []
+        add_watch = _Inotify.add_watch
+        rm_watch = _Inotify.rm_watch
+
+        def _add_watch(self: _Inotify, path: Path, *args: int) -> int:
+            if len(added) == 2:
+                raise OSError(errno.ENOSPC, "watch limit reached")
+            added.append(add_watch(self, path, *args))
+            return added[-1]
+
+        def _rm_watch(self: _Inotify, wd: int) -> None:
+            removed.append(wd)
+            rm_watch(self, wd)
+
+        monkeypatch.setattr(_Inotify, "add_watch", _add_watch)
+        monkeypatch.setattr(_Inotify, "rm_watch", _rm_watch)
+
+        async def on_change(batch: dict[Path, bool]) -> None:
+            pass
+
+        watcher = LibraryWatcher(on_change, poll_interval=3600)
+        await watcher.start([tmp_path])
+        try:
+            if not added:
+                pytest.skip("inotify not available in this environment")
+            assert watcher.roots == {tmp_path: "polling"}
+            assert sorted(removed) == sorted(added)
+        finally:
+            await watcher.stop()
+
+    async def test_polling_backend_reports_new_album(
+        self, library: MusicLibrary, tmp_path: Path
+    ) -> None:
+        await library.start_watching(debounce=0.05, poll_interval=0.1, use_inotify=False)
+        assert library._watcher is not None
+        assert library._watcher.roots == {tmp_path: "polling"}
+        await asyncio.sleep(0.2)  # let the baseline snapshot complete
+
+        _write_wav(tmp_path / "Artist" / "Album" / "01.wav")
+
+        async def _synced() -> bool:
+            return await library._db.count_tracks() == 1
+
+        await _wait_for(_synced)
+
+    @pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux-only")
+    async def test_inotify_backend_picks_up_moved_in_album(
+        self, library: MusicLibrary, tmp_path: Path
+    ) -> None:
+        music = tmp_path / "music"
+        music.mkdir()
+        await library.set_music_folders([music])
+        await library.start_watching(debounce=0.1)
+        assert library._watcher is not None
+        backends = library._watcher.roots
+        if backends.get(music.resolve()) != "inotify":
+            pytest.skip("inotify not available in this environment")
+
+        # A finished download is moved into place as a whole folder.
+        staging = tmp_path / "staging" / "Album"
+        _write_wav(staging / "01.wav")
+        _write_wav(staging / "CD2" / "02.wav")
+        staging.rename(music / "Album")
+
+        async def _synced() -> bool:
+            return await library._db.count_tracks() == 2
+
+        await _wait_for(_synced)
+
+        (music / "Album" / "01.wav").unlink()
+
+        async def _removed() -> bool:
+            return await library._db.count_tracks() == 1
+
+        await _wait_for(_removed)
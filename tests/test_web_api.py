@@ -176,6 +176,9 @@ async def test_jsonrpc_play_from_stop_starts_current_playlist_track(
         def __len__(self) -> int:
             return len(self._tracks)
 
+        async def hydrate_current(self) -> None:
+            return None
+
         def play(self, index: int) -> Any:
             started["playlist_play_index"] = index
             self.current_index = index
@@ -1490,3 +1493,185 @@ class TestJsonRpcWithData:
         assert "year" not in item
         assert "duration" not in item
         assert "tracknum" not in item
+
+
+# =============================================================================
+# Response Cache Tests
+# =============================================================================
+
+
+class TestResponseCache:
+    """Read-only library commands are served from a generation-keyed LRU."""
+
+    @staticmethod
+    async def _rpc(client: AsyncClient, command: list[Any]) -> dict[str, Any]:
+        response = await client.post(
+            "/jsonrpc.js",
+            json={"id": 1, "method": "slim.request", "params": ["-", command]},
+        )
+        assert response.status_code == 200
+        return response.json()["result"]
+
+    async def test_repeat_browse_is_served_from_cache(
+        self, db: LibraryDb, web_server: WebServer, client: AsyncClient
+    ) -> None:
+        await db.upsert_tracks(
+            [UpsertTrack(path="/music/a/1.mp3", title="One", artist="A", album="X")]
+        )
+        await db.commit()
+        cache = web_server.jsonrpc_handler.response_cache
+
+        first = await self._rpc(client, ["artists", 0, 10, "tags:as"])
+        hits_before = cache.hits
+        # Same request with reordered tag characters normalizes to the same key.
+        second = await self._rpc(client, ["artists", 0, 10, "tags:sa"])
+
+        assert second == first
+        assert cache.hits == hits_before + 1
+
+    async def test_library_write_invalidates_cached_results(
+        self, db: LibraryDb, client: AsyncClient
+    ) -> None:
+        await db.upsert_tracks(
+            [UpsertTrack(path="/music/a/1.mp3", title="One", artist="A", album="X")]
+        )
+        await db.commit()
+
+        before = await self._rpc(client, ["albums", 0, 10])
+        assert before["count"] == 1
+
+        await db.upsert_tracks(
+            [UpsertTrack(path="/music/b/1.mp3", title="Two", artist="B", album="Y")]
+        )
+        await db.commit()
+
+        after = await self._rpc(client, ["albums", 0, 10])
+        assert after["count"] == 2
+
+        await db.delete_album(after["albums_loop"][0]["id"])
+        assert (await self._rpc(client, ["albums", 0, 10]))["count"] == 1
+
+    async def test_browselibrary_uses_cache(
+        self, web_server: WebServer, client: AsyncClient
+    ) -> None:
+        cache = web_server.jsonrpc_handler.response_cache
+        command = ["browselibrary", "items", 0, 50, "menu:1", "mode:genres"]
+
+        await self._rpc(client, command)
+        hits_before = cache.hits
+        await self._rpc(client, command)
+
+        assert cache.hits == hits_before + 1
+
+    async def test_wipecache_invalidates_in_flight_results(
+        self, db: LibraryDb, web_server: WebServer, client: AsyncClient
+    ) -> None:
+        await db.upsert_tracks(
+            [UpsertTrack(path="/music/a/1.mp3", title="One", artist="A", album="X")]
+        )
+        await db.commit()
+        cache = web_server.jsonrpc_handler.response_cache
+        await self._rpc(client, ["albums", 0, 10])
+        generation = db.generation
+
+        result = await self._rpc(client, ["wipecache"])
+
+        assert result == {"wipecache": 1}
+        assert await db.count_tracks() == 0
+        assert (await self._rpc(client, ["albums", 0, 10]))["count"] == 0
+        assert len(cache) == 1  # only the post-wipe browse
+        # A handler that captured the old generation will not store its result.
+        assert db.generation > generation
+
+
+async def test_jsonrpc_loadtracks_starts_first_track_and_loads_rest_in_background(
+    web_server: WebServer,
+    client: AsyncClient,
+    db: LibraryDb,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """`playlist loadtracks` must not cap the selection and must start the first track first."""
+    import asyncio
+
+    from resonance.core.playlist import PlaylistManager
+    from resonance.web.handlers import playlist as playlist_handler
+
+    player_id = "aa:bb:cc:dd:ee:01"
+    await db.upsert_tracks(
+        UpsertTrack(
+            path=f"/music/big/{i:04d}.flac",
+            title=f"Track {i:04d}",
+            artist="Prolific",
+            album="Box Set",
+            track_no=i,
+        )
+        for i in range(1, 1201)
+    )
+    await db.commit()
+    artist_id = (await db.get_track_by_path("/music/big/0001.flac")).artist_id
+
+    started: list[Any] = []
+
+    async def _fake_start_track_stream(ctx: Any, player: Any, track: Any) -> None:
+        # Playback starts before the remainder of the selection is enqueued.
+        started.append((track.path, len(manager.get(player_id))))
+
+    monkeypatch.setattr(playlist_handler, "_start_track_stream", _fake_start_track_stream)
+
+    # Hold the background load so the commands below race with it.
+    release = asyncio.Event()
+    list_track_ids = db.list_track_ids
+
+    async def _gated_list_track_ids(**selection: Any) -> list[int]:
+        await release.wait()
+        return await list_track_ids(**selection)
+
+    monkeypatch.setattr(db, "list_track_ids", _gated_list_track_ids)
+
+    class _FakePlayer:
+        async def stop(self) -> None:
+            pass
+
+    class _FakePlayerRegistry:
+        async def get_by_mac(self, mac: str) -> _FakePlayer:
+            return _FakePlayer()
+
+    manager = PlaylistManager(db=db, write_delay=60)
+    web_server.jsonrpc_handler.player_registry = _FakePlayerRegistry()
+    web_server.jsonrpc_handler.playlist_manager = manager
+
+    response = await client.post(
+        "/jsonrpc.js",
+        json={
+            "id": 1,
+            "method": "slim.request",
+            "params": [player_id, ["playlist", "loadtracks", f"artist_id:{artist_id}"]],
+        },
+    )
+    assert response.status_code == 200, response.text
+    assert response.json()["result"]["count"] == 1200
+    assert started == [("/music/big/0001.flac", 1)]
+
+    # An `add` issued while the selection is still loading goes after it.
+    add = asyncio.create_task(
+        client.post(
+            "/jsonrpc.js",
+            json={
+                "id": 2,
+                "method": "slim.request",
+                "params": [player_id, ["playlist", "add", "/music/big/0002.flac"]],
+            },
+        )
+    )
+    await asyncio.sleep(0.05)
+    assert not add.done()
+    release.set()
+    assert (await add).json()["result"]["count"] == 1201
+
+    playlist = manager.get(player_id)
+    assert len(playlist) == 1201
+    assert playlist.track_ids[-1] == playlist.track_ids[1]
+    assert playlist.current_track.path == "/music/big/0001.flac"
+    await playlist.hydrate(1199, 1)
+    assert playlist.tracks[1199].title == "Track 1200"
+    await manager.close()